@@ -81,9 +81,14 @@ async def health_status(db: AsyncSession = Depends(get_db)):
             "message": f"LLM API check failed: {str(e)}"
         }
 
-    # OSS存储检查
+    # 存储检查
     try:
-        if all([settings.oss_access_key_id, settings.oss_access_key_secret,
+        if settings.storage_backend == "local":
+            health_status["checks"]["local_storage"] = {
+                "status": "healthy",
+                "message": f"Local storage: {settings.local_storage_path}"
+            }
+        elif all([settings.oss_access_key_id, settings.oss_access_key_secret,
                 settings.oss_endpoint, settings.oss_bucket_name]):
             health_status["checks"]["oss_storage"] = {
                 "status": "healthy",
@@ -9,7 +9,7 @@ import logging
 
 from database.connection import get_db, AsyncSession
 from project_manager.manager import ProjectManager
-from file_service.storage.oss_storage import OSSStorage
+from file_service.storage.factory import get_storage
 from ..models.task import (
     ProjectCreateRequest, ProjectResponse, ProjectSummaryResponse
 )
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 # 依赖注入
 def get_project_manager():
     """获取项目管理器实例"""
-    return ProjectManager(OSSStorage())
+    return ProjectManager(get_storage())
 
 
 @router.post("/create", response_model=ProjectResponse)
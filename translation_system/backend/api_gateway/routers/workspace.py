@@ -14,7 +14,7 @@ from database.connection import get_db, AsyncSession
 from database.models import TranslationTask
 from translation_core.translation_engine import TranslationEngine
 from project_manager.manager import ProjectManager
-from file_service.storage.oss_storage import OSSStorage
+from file_service.storage.factory import get_storage
 from ..models.task import TaskResponse, TaskStatus
 from pydantic import BaseModel
 
@@ -52,7 +52,7 @@ def get_translation_engine():
 
 def get_project_manager():
     """获取项目管理器实例"""
-    return ProjectManager(OSSStorage())
+    return ProjectManager(get_storage())
 
 
 @router.post("/files/upload", response_model=FileUploadResponse)
@@ -17,11 +17,19 @@ class TranslationConfig(BaseSettings):
     mysql_password: str
     mysql_database: str = "translation_system"
 
-    # OSS配置
-    oss_access_key_id: str
-    oss_access_key_secret: str
-    oss_bucket_name: str
-    oss_endpoint: str
+    # 存储配置
+    storage_backend: str = "oss"  # oss 或 local（本地文件系统，用于开发/测试）
+    local_storage_path: str = "./storage"
+    storage_max_concurrent_transfers: int = 8  # 同时进行的存储传输数（线程池大小）
+
+    # OSS配置 (storage_backend=local 时可不配置)
+    oss_access_key_id: str = ""
+    oss_access_key_secret: str = ""
+    oss_bucket_name: str = ""
+    oss_endpoint: str = ""
+    oss_multipart_threshold: int = 10 * 1024 * 1024  # 超过该大小使用分片上传
+    oss_part_size: int = 5 * 1024 * 1024
+    oss_part_concurrency: int = 4  # 单个文件的并行分片数
 
 
     # 缓存配置 (可选，如未配置则使用内存缓存)
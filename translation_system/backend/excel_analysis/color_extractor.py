@@ -0,0 +1,145 @@
+"""
+批量颜色提取
+每个工作表只读取一次填充色，保存为紧凑的颜色编码数组，供颜色任务检测向量化使用
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable
+import re
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NO_COLOR = -1  # 无填充色的编码
+
+_ADDRESS_PATTERN = re.compile(r'([A-Z]+)(\d+)')
+
+
+def _column_letter_to_index(letter: str) -> int:
+    index = 0
+    for char in letter:
+        index = index * 26 + (ord(char) - ord('A') + 1)
+    return index - 1
+
+
+class SheetColorMap:
+    """
+    工作表填充色映射
+
+    codes[r, c] 为 Excel 第 r+1 行、第 c+1 列的颜色编码（palette 下标，无颜色为 -1），
+    相同颜色只在 palette 中保存一次。
+    """
+
+    def __init__(self, n_rows: int, n_cols: int):
+        self.codes = np.full((n_rows, n_cols), NO_COLOR, dtype=np.int32)
+        self.palette: List[str] = []
+        self._palette_index: Dict[str, int] = {}
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    def color_code(self, color: str) -> int:
+        """获取颜色编码（新颜色加入palette）"""
+        code = self._palette_index.get(color)
+        if code is None:
+            code = len(self.palette)
+            self.palette.append(color)
+            self._palette_index[color] = code
+        return code
+
+    def set(self, row: int, col: int, color: Optional[str]):
+        """设置单元格颜色（row/col 从0开始，对应Excel第1行/A列）"""
+        if color:
+            self.codes[row, col] = self.color_code(color)
+
+    def mask(self, predicate: Callable[[str], bool]) -> np.ndarray:
+        """
+        按颜色谓词生成布尔掩码
+
+        谓词对每种颜色只调用一次，结果组成查找表后用编码数组整体索引。
+        """
+        lut = np.zeros(len(self.palette) + 1, dtype=bool)
+        for code, color in enumerate(self.palette):
+            lut[code] = bool(predicate(color))
+        # NO_COLOR(-1) 索引到查找表末尾的 False
+        return lut[self.codes]
+
+    def color_at(self, row: int, col: int) -> Optional[str]:
+        code = self.codes[row, col]
+        return self.palette[code] if code != NO_COLOR else None
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any], n_rows: int = 0, n_cols: int = 0) -> 'SheetColorMap':
+        """
+        从单元格元数据构建颜色映射
+
+        Args:
+            metadata: {cell_address: CellMetadata 或 dict}
+            n_rows: 最少行数（Excel行，含标题行）
+            n_cols: 最少列数
+        """
+        cells = []
+        max_row, max_col = n_rows, n_cols
+        for address, meta in metadata.items():
+            fill_color = meta.get('fill_color') if isinstance(meta, dict) else getattr(meta, 'fill_color', None)
+            if not fill_color:
+                continue
+            match = _ADDRESS_PATTERN.match(address.upper())
+            if not match:
+                continue
+            row = int(match.group(2)) - 1
+            col = _column_letter_to_index(match.group(1))
+            cells.append((row, col, fill_color))
+            max_row = max(max_row, row + 1)
+            max_col = max(max_col, col + 1)
+
+        color_map = cls(max_row, max_col)
+        for row, col, fill_color in cells:
+            color_map.set(row, col, fill_color)
+        return color_map
+
+
+class ColorClassifier:
+    """颜色分类器：记忆化每种颜色与规则的匹配结果"""
+
+    def __init__(self):
+        self._cache: Dict[tuple, bool] = {}
+
+    def matches(self, rule: Any, color: str) -> bool:
+        key = (id(rule), color)
+        result = self._cache.get(key)
+        if result is None:
+            result = rule.matches(color)
+            self._cache[key] = result
+        return result
+
+    def rule_mask(self, color_map: SheetColorMap, rule: Any) -> np.ndarray:
+        """规则对应的单元格掩码"""
+        return color_map.mask(lambda color: self.matches(rule, color))
+
+
+# 元数据 -> 颜色映射缓存（持有元数据引用，保证id不被复用）
+_COLOR_MAP_CACHE: 'OrderedDict[int, tuple]' = OrderedDict()
+_COLOR_MAP_CACHE_SIZE = 32
+
+
+def register_color_map(metadata: Dict[str, Any], color_map: SheetColorMap):
+    """登记读取阶段已构建的颜色映射，后续检测直接复用"""
+    _COLOR_MAP_CACHE[id(metadata)] = (metadata, color_map)
+    _COLOR_MAP_CACHE.move_to_end(id(metadata))
+    while len(_COLOR_MAP_CACHE) > _COLOR_MAP_CACHE_SIZE:
+        _COLOR_MAP_CACHE.popitem(last=False)
+
+
+def get_color_map(metadata: Dict[str, Any], n_rows: int = 0, n_cols: int = 0) -> SheetColorMap:
+    """获取元数据对应的颜色映射（已登记则复用，否则构建并登记）"""
+    cached = _COLOR_MAP_CACHE.get(id(metadata))
+    if cached is not None and cached[0] is metadata:
+        _COLOR_MAP_CACHE.move_to_end(id(metadata))
+        return cached[1]
+
+    color_map = SheetColorMap.from_metadata(metadata, n_rows, n_cols)
+    register_color_map(metadata, color_map)
+    return color_map
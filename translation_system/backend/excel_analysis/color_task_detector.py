@@ -5,12 +5,17 @@
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
+import numpy as np
 import pandas as pd
 import logging
 import re
 
+from .color_extractor import SheetColorMap, ColorClassifier, get_color_map
+
 logger = logging.getLogger(__name__)
 
+CHINESE_PATTERN = re.compile(r'[\u4e00-\u9fff]')
+
 
 class TaskType(Enum):
     """任务类型枚举"""
@@ -164,6 +169,7 @@ class ColorTaskDetector:
         # 合并自定义规则
         self.rules = custom_rules if custom_rules else self.default_rules
         self.rules.sort(key=lambda x: x.priority)  # 按优先级排序
+        self.classifier = ColorClassifier()  # 每种颜色只与规则匹配一次
 
         # 保存源语言配置
         self.source_langs = source_langs
@@ -176,7 +182,8 @@ class ColorTaskDetector:
         self,
         df: pd.DataFrame,
         metadata: Dict[str, Any],
-        phase: int = 1
+        phase: int = 1,
+        color_map: Optional[SheetColorMap] = None
     ) -> List[TranslationTask]:
         """
         按阶段检测任务
@@ -185,20 +192,51 @@ class ColorTaskDetector:
             df: 数据DataFrame
             metadata: 单元格元数据 {cell_address: CellMetadata}
             phase: 翻译阶段 (1=空白填充, 2=黄色翻译, 3=蓝色优化)
+            color_map: 颜色映射（默认复用读取阶段为该元数据构建的映射）
 
         Returns:
             该阶段的任务列表
         """
         if phase == 1:
             return self._detect_blank_fill_tasks(df, metadata)
-        elif phase == 2:
-            return self._detect_yellow_source_tasks(df, metadata)
-        elif phase == 3:
-            return self._detect_blue_optimize_tasks(df, metadata)
+        elif phase in (2, 3):
+            if color_map is None:
+                color_map = get_color_map(metadata, len(df) + 1, len(df.columns))
+            if phase == 2:
+                return self._detect_yellow_source_tasks(df, metadata, color_map)
+            return self._detect_blue_optimize_tasks(df, metadata, color_map)
         else:
             logger.warning(f"未知的翻译阶段: {phase}")
             return []
 
+    @staticmethod
+    def _filled_mask(series: pd.Series) -> np.ndarray:
+        """非空单元格掩码（非NaN且去空白后非空）"""
+        return (series.notna() & (series.astype(str).str.strip() != '')).to_numpy()
+
+    def _column_letters(self, df: pd.DataFrame) -> Dict[Any, str]:
+        """列名 -> 列字母（重复列名取第一个）"""
+        letters = {}
+        for i, col in enumerate(df.columns):
+            letters.setdefault(col, self._index_to_column_letter(i))
+        return letters
+
+    def _data_mask(self, color_map: SheetColorMap, rule: ColorRule, df: pd.DataFrame) -> np.ndarray:
+        """规则命中的数据单元格掩码，形状与df一致（Excel第2行起对应df第0行）"""
+        mask = self.classifier.rule_mask(color_map, rule)[1:len(df) + 1, :len(df.columns)]
+        if mask.shape != (len(df), len(df.columns)):
+            padded = np.zeros((len(df), len(df.columns)), dtype=bool)
+            padded[:mask.shape[0], :mask.shape[1]] = mask
+            mask = padded
+        return mask
+
+    @staticmethod
+    def _comment(metadata: Dict[str, Any], address: str) -> Optional[str]:
+        cell_meta = metadata.get(address)
+        if cell_meta is None:
+            return None
+        return cell_meta.get('comment') if isinstance(cell_meta, dict) else getattr(cell_meta, 'comment', None)
+
     def _detect_blank_fill_tasks(
         self,
         df: pd.DataFrame,
@@ -218,35 +256,38 @@ class ColorTaskDetector:
         logger.info(f"识别到源语言列: {source_columns}")
         logger.info(f"识别到目标语言列: {target_columns}")
 
-        for idx, row in df.iterrows():
-            for source_col in source_columns:
-                source_text = row[source_col]
-                if pd.isna(source_text) or str(source_text).strip() == '':
-                    continue
+        if not source_columns or not target_columns or df.empty:
+            logger.info("阶段1：检测到0个空白填充任务")
+            return tasks
 
-                # 对每个目标语言列检查是否需要翻译
-                for target_col in target_columns:
-                    target_text = row[target_col]
-                    if pd.isna(target_text) or str(target_text).strip() == '':
-                        # 需要翻译
-                        source_addr = self._get_cell_address(source_col, idx, df)
-                        target_addr = self._get_cell_address(target_col, idx, df)
-
-                        # 获取源单元格的批注
-                        comment = None
-                        if source_addr in metadata:
-                            comment = metadata[source_addr].comment
-
-                        task = TranslationTask(
-                            row_index=idx,
-                            source_column=source_col,
-                            target_column=target_col,
-                            source_text=str(source_text),
-                            task_type=TaskType.BLANK_FILL,
-                            cell_address=target_addr,
-                            comment=comment
-                        )
-                        tasks.append(task)
+        filled = {col: self._filled_mask(df[col]) for col in set(source_columns) | set(target_columns)}
+        pairs = [(s, t) for s in source_columns for t in target_columns]
+
+        # (行, 源列×目标列) 掩码：源有内容且目标为空；np.nonzero 按行优先返回，与逐行遍历顺序一致
+        need = np.column_stack([filled[s] & ~filled[t] for s, t in pairs])
+        row_positions, pair_indexes = np.nonzero(need)
+
+        letters = self._column_letters(df)
+        index_labels = df.index
+        source_values = {col: df[col].to_numpy(dtype=object) for col in set(source_columns)}
+        for pos, pair_idx in zip(row_positions.tolist(), pair_indexes.tolist()):
+            source_col, target_col = pairs[pair_idx]
+            idx = index_labels[pos]
+            source_text = source_values[source_col][pos]
+
+            # 获取源单元格的批注
+            source_addr = f"{letters[source_col]}{idx + 2}"
+            comment = self._comment(metadata, source_addr)
+
+            tasks.append(TranslationTask(
+                row_index=idx,
+                source_column=source_col,
+                target_column=target_col,
+                source_text=str(source_text),
+                task_type=TaskType.BLANK_FILL,
+                cell_address=f"{letters[target_col]}{idx + 2}",
+                comment=comment
+            ))
 
         logger.info(f"阶段1：检测到{len(tasks)}个空白填充任务")
         return tasks
@@ -254,7 +295,8 @@ class ColorTaskDetector:
     def _detect_yellow_source_tasks(
         self,
         df: pd.DataFrame,
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        color_map: SheetColorMap
     ) -> List[TranslationTask]:
         """
         阶段2：检测黄色单元格作为源语言的翻译任务
@@ -268,67 +310,62 @@ class ColorTaskDetector:
             logger.info("未配置黄色单元格规则")
             return tasks
 
-        # 遍历所有元数据，找出黄色单元格
-        for cell_addr, cell_meta in metadata.items():
-            # 处理元数据格式（可能是dict或CellMetadata对象）
-            fill_color = None
-            comment = None
-
-            if hasattr(cell_meta, 'fill_color'):
-                # CellMetadata对象
-                fill_color = cell_meta.fill_color
-                comment = cell_meta.comment
-            elif isinstance(cell_meta, dict):
-                # dict格式
-                fill_color = cell_meta.get('fill_color')
-                comment = cell_meta.get('comment')
-
-            if fill_color and yellow_rule.matches(fill_color):
-                col_letter, row_num = self._parse_cell_address(cell_addr)
-                row_idx = row_num - 2  # Excel行号转DataFrame索引（减去标题行）
-
-                if row_idx < 0 or row_idx >= len(df):
-                    continue
-
-                source_col = df.columns[self._column_letter_to_index(col_letter)]
-                source_text = df.iloc[row_idx][source_col]
+        # 颜色掩码一次算出所有黄色单元格，再排除空内容
+        hits = self._data_mask(color_map, yellow_rule, df)
+        row_positions, col_positions = np.nonzero(hits)
+        if len(row_positions) == 0:
+            logger.info("阶段2：检测到0个黄色源语言任务")
+            return tasks
 
-                if pd.isna(source_text) or str(source_text).strip() == '':
+        columns = list(df.columns)
+        letters = self._column_letters(df)
+        filled = {}
+        target_columns = [col for col in columns if self._is_translatable_column(col)]
+        overrides = 0
+
+        for row_idx, col_pos in zip(row_positions.tolist(), col_positions.tolist()):
+            source_col = columns[col_pos]
+            if source_col not in filled:
+                filled[source_col] = self._filled_mask(df[source_col])
+            if not filled[source_col][row_idx]:
+                continue
+
+            source_text = df.iat[row_idx, col_pos]
+            cell_addr = f"{self._index_to_column_letter(col_pos)}{row_idx + 2}"
+            fill_color = color_map.color_at(row_idx + 1, col_pos)
+            comment = self._comment(metadata, cell_addr)
+            logger.debug(f"发现黄色单元格 {cell_addr}: {source_text}")
+
+            # 黄色单元格优先级最高：无论目标列有无内容，都要覆盖翻译
+            for target_col in target_columns:
+                if target_col == source_col:
                     continue
+                if target_col not in filled:
+                    filled[target_col] = self._filled_mask(df[target_col])
+                if filled[target_col][row_idx]:
+                    overrides += 1
 
-                logger.debug(f"发现黄色单元格 {cell_addr}: {source_text}")
-
-                # 黄色单元格优先级最高：无论目标列有无内容，都要覆盖翻译
-                for target_col in df.columns:
-                    if target_col != source_col and self._is_translatable_column(target_col):
-                        target_addr = self._get_cell_address(target_col, row_idx, df)
-
-                        # 检查目标单元格是否已有内容
-                        target_text = df.iloc[row_idx][target_col]
-                        has_content = pd.notna(target_text) and str(target_text).strip() != ''
-
-                        if has_content:
-                            logger.info(f"黄色单元格优先级最高：将覆盖 {target_addr} 的现有内容")
-
-                        task = TranslationTask(
-                            row_index=row_idx,
-                            source_column=source_col,
-                            target_column=target_col,
-                            source_text=str(source_text),
-                            task_type=TaskType.YELLOW_SOURCE,
-                            cell_address=target_addr,
-                            comment=comment,
-                            metadata={'original_color': fill_color, 'override': True}  # 标记需要覆盖
-                        )
-                        tasks.append(task)
-
+                tasks.append(TranslationTask(
+                    row_index=row_idx,
+                    source_column=source_col,
+                    target_column=target_col,
+                    source_text=str(source_text),
+                    task_type=TaskType.YELLOW_SOURCE,
+                    cell_address=f"{letters[target_col]}{row_idx + 2}",
+                    comment=comment,
+                    metadata={'original_color': fill_color, 'override': True}  # 标记需要覆盖
+                ))
+
+        if overrides:
+            logger.info(f"黄色单元格优先级最高：将覆盖 {overrides} 个已有内容的单元格")
         logger.info(f"阶段2：检测到{len(tasks)}个黄色源语言任务")
         return tasks
 
     def _detect_blue_optimize_tasks(
         self,
         df: pd.DataFrame,
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        color_map: SheetColorMap
     ) -> List[TranslationTask]:
         """
         阶段3：检测蓝色单元格的优化任务
@@ -342,48 +379,34 @@ class ColorTaskDetector:
             logger.info("未配置蓝色单元格规则")
             return tasks
 
-        # 遍历所有元数据，找出蓝色单元格
-        for cell_addr, cell_meta in metadata.items():
-            # 处理元数据格式（可能是dict或CellMetadata对象）
-            fill_color = None
-            comment = None
-
-            if hasattr(cell_meta, 'fill_color'):
-                # CellMetadata对象
-                fill_color = cell_meta.fill_color
-                comment = cell_meta.comment
-            elif isinstance(cell_meta, dict):
-                # dict格式
-                fill_color = cell_meta.get('fill_color')
-                comment = cell_meta.get('comment')
-
-            if fill_color and blue_rule.matches(fill_color):
-                col_letter, row_num = self._parse_cell_address(cell_addr)
-                row_idx = row_num - 2  # Excel行号转DataFrame索引
-
-                if row_idx < 0 or row_idx >= len(df):
-                    continue
-
-                col_name = df.columns[self._column_letter_to_index(col_letter)]
-                cell_value = df.iloc[row_idx][col_name]
-
-                if pd.isna(cell_value) or str(cell_value).strip() == '':
-                    continue
-
-                logger.debug(f"发现蓝色单元格 {cell_addr}: {cell_value}")
-
-                # 优化任务不需要目标列
-                task = TranslationTask(
-                    row_index=row_idx,
-                    source_column=col_name,
-                    target_column=None,  # 优化任务回写到原单元格
-                    source_text=str(cell_value),
-                    task_type=TaskType.BLUE_OPTIMIZE,
-                    cell_address=cell_addr,
-                    comment=comment or "请缩短内容，保持核心意思",
-                    metadata={'original_color': fill_color}
-                )
-                tasks.append(task)
+        hits = self._data_mask(color_map, blue_rule, df)
+        row_positions, col_positions = np.nonzero(hits)
+
+        columns = list(df.columns)
+        filled = {}
+        for row_idx, col_pos in zip(row_positions.tolist(), col_positions.tolist()):
+            col_name = columns[col_pos]
+            if col_name not in filled:
+                filled[col_name] = self._filled_mask(df[col_name])
+            if not filled[col_name][row_idx]:
+                continue
+
+            cell_value = df.iat[row_idx, col_pos]
+            cell_addr = f"{self._index_to_column_letter(col_pos)}{row_idx + 2}"
+            comment = self._comment(metadata, cell_addr)
+            logger.debug(f"发现蓝色单元格 {cell_addr}: {cell_value}")
+
+            # 优化任务不需要目标列
+            tasks.append(TranslationTask(
+                row_index=row_idx,
+                source_column=col_name,
+                target_column=None,  # 优化任务回写到原单元格
+                source_text=str(cell_value),
+                task_type=TaskType.BLUE_OPTIMIZE,
+                cell_address=cell_addr,
+                comment=comment or "请缩短内容，保持核心意思",
+                metadata={'original_color': color_map.color_at(row_idx + 1, col_pos)}
+            ))
 
         logger.info(f"阶段3：检测到{len(tasks)}个蓝色优化任务")
         return tasks
@@ -424,13 +447,12 @@ class ColorTaskDetector:
 
     def _is_chinese_column(self, series: pd.Series) -> bool:
         """检查列是否包含中文"""
-        chinese_pattern = re.compile(r'[\u4e00-\u9fff]+')
         non_empty_values = series.dropna().astype(str)
 
         if len(non_empty_values) == 0:
             return False
 
-        chinese_count = sum(1 for val in non_empty_values if chinese_pattern.search(val))
+        chinese_count = int(non_empty_values.str.contains(CHINESE_PATTERN).sum())
         return chinese_count > len(non_empty_values) * 0.3  # 30%以上包含中文
 
     def _is_translatable_column(self, col_name: str) -> bool:
@@ -7,9 +7,18 @@ from openpyxl.comments import Comment
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from .color_extractor import SheetColorMap, register_color_map
+
 logger = logging.getLogger(__name__)
 
 
+def _rgb(color) -> Optional[str]:
+    """颜色的RGB值；主题色/索引色返回None（openpyxl对其rgb返回的是错误描述字符串）"""
+    if color is None or color.type != 'rgb':
+        return None
+    return color.rgb if isinstance(color.rgb, str) else None
+
+
 class CellMetadata:
     """单元格元数据"""
     def __init__(self):
@@ -43,6 +52,36 @@ class EnhancedExcelReader:
         """初始化读取器"""
         self.workbook = None
         self.metadata_cache = {}
+        self.color_maps: Dict[str, SheetColorMap] = {}  # {sheet_name: SheetColorMap}
+
+    @staticmethod
+    def _decode_fill(cell, cache: Dict[int, Optional[str]]) -> Optional[str]:
+        """解析填充色（过滤默认的白色/透明背景），按工作簿填充样式编号记忆"""
+        style = cell._style
+        if style is None:
+            return None  # iter_rows 为空单元格生成的占位单元格没有样式
+        key = style.fillId
+        if key not in cache:
+            fill = cell.fill
+            color = None
+            rgb = _rgb(fill.fgColor) if fill else None
+            if rgb and rgb not in ('00000000', 'FFFFFFFF'):
+                color = f"#{rgb}"
+            cache[key] = color
+        return cache[key]
+
+    @staticmethod
+    def _decode_font_color(cell, cache: Dict[int, Optional[str]]) -> Optional[str]:
+        """解析字体颜色，按工作簿字体样式编号记忆"""
+        style = cell._style
+        if style is None:
+            return None  # iter_rows 为空单元格生成的占位单元格没有样式
+        key = style.fontId
+        if key not in cache:
+            font = cell.font
+            rgb = _rgb(font.color) if font else None
+            cache[key] = f"#{rgb}" if rgb else None
+        return cache[key]
 
     def read_excel_with_metadata(self, file_path: str, sheet_name: Optional[str] = None) -> Tuple[pd.DataFrame, Dict[str, Dict[str, CellMetadata]]]:
         """
@@ -69,49 +108,53 @@ class EnhancedExcelReader:
             all_data = {}
             all_metadata = {}
 
+            # 样式在工作簿内按编号共享，每种填充/字体只解析一次
+            fill_cache = {}
+            font_cache = {}
+
             for sheet in sheets:
                 ws = self.workbook[sheet]
                 sheet_data = []
                 sheet_metadata = {}
+                color_map = SheetColorMap(ws.max_row, ws.max_column)
 
                 # 读取数据和元数据
                 for row_idx, row in enumerate(ws.iter_rows(), start=1):
                     row_data = []
                     for col_idx, cell in enumerate(row, start=1):
-                        # 创建单元格元数据
+                        value = cell.value
+                        row_data.append(value)
+
+                        # cell.fill/cell.font 每次访问都会创建代理对象，按样式编号查缓存
+                        fill_color = self._decode_fill(cell, fill_cache)
+                        font_color = self._decode_font_color(cell, font_cache)
+                        comment = cell.comment.text if cell.comment else None
+
+                        if not (comment or fill_color or font_color):
+                            continue
+
+                        font = cell.font
+                        # 只为带批注或颜色的单元格创建元数据
                         metadata = CellMetadata()
-                        metadata.value = cell.value
-
-                        # 读取批注
-                        if cell.comment:
-                            metadata.comment = cell.comment.text
-                            logger.debug(f"发现批注 [{sheet}!{cell.coordinate}]: {metadata.comment[:50]}...")
-
-                        # 读取字体信息
-                        if cell.font:
-                            if cell.font.color and cell.font.color.rgb:
-                                metadata.font_color = f"#{cell.font.color.rgb}" if isinstance(cell.font.color.rgb, str) else None
-                            metadata.font_bold = cell.font.bold or False
-                            metadata.font_italic = cell.font.italic or False
-                            metadata.font_size = cell.font.size
-                            metadata.font_name = cell.font.name
-
-                        # 读取填充色
-                        if cell.fill and cell.fill.fgColor and cell.fill.fgColor.rgb:
-                            # 过滤掉默认的白色背景
-                            if cell.fill.fgColor.rgb not in ['00000000', 'FFFFFFFF', None]:
-                                metadata.fill_color = f"#{cell.fill.fgColor.rgb}" if isinstance(cell.fill.fgColor.rgb, str) else None
-                                logger.debug(f"发现填充色 [{sheet}!{cell.coordinate}]: {metadata.fill_color}")
-
-                        # 保存元数据
-                        cell_address = cell.coordinate
-                        if metadata.comment or metadata.fill_color or metadata.font_color:
-                            sheet_metadata[cell_address] = metadata
-
-                        row_data.append(cell.value)
+                        metadata.value = value
+                        metadata.comment = comment
+                        metadata.fill_color = fill_color
+                        metadata.font_color = font_color
+                        if font:
+                            metadata.font_bold = font.bold or False
+                            metadata.font_italic = font.italic or False
+                            metadata.font_size = font.size
+                            metadata.font_name = font.name
+                        sheet_metadata[cell.coordinate] = metadata
+
+                        if fill_color:
+                            color_map.set(row_idx - 1, col_idx - 1, fill_color)
 
                     sheet_data.append(row_data)
 
+                self.color_maps[sheet] = color_map
+                register_color_map(sheet_metadata, color_map)
+
                 # 转换为DataFrame
                 if sheet_data:
                     # 使用第一行作为列名
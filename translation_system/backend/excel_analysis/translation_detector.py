@@ -4,9 +4,11 @@
 """
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 import logging
 from .header_analyzer import SheetInfo, ColumnType
+from .color_extractor import SheetColorMap
 
 logger = logging.getLogger(__name__)
 
@@ -36,15 +38,26 @@ class TranslationDetector:
             'FFFF0000': 'error'     # 红色 - 错误标记
         }
 
+    # 向量化检测使用的任务类型编码
+    _TASK_CODES = {'new': 1, 'modify': 2, 'shorten': 3}
+    _TASK_NAMES = {code: name for name, code in _TASK_CODES.items()}
+    _PLACEHOLDERS = ['todo', 'tbd', 'pending', '待翻译', '未翻译']
+
     def detect_translation_tasks(
         self,
         df: pd.DataFrame,
         sheet_info: SheetInfo,
         include_colors: bool = True,
         source_langs: Optional[List[str]] = None,  # 源语言参数
-        target_langs: Optional[List[str]] = None  # 目标语言参数
+        target_langs: Optional[List[str]] = None,  # 目标语言参数
+        color_map: Optional[SheetColorMap] = None  # 填充色映射（读取阶段构建）
     ) -> List[TranslationTask]:
-        """检测需要翻译的任务 - 按行动态检测源语言和翻译需求"""
+        """
+        检测需要翻译的任务 - 按行动态检测源语言和翻译需求
+
+        整列计算非空/占位符掩码后一次性得出所有任务，结果与逐行检测一致，
+        每轮迭代重新检测时不再逐行遍历DataFrame。
+        """
         tasks = []
 
         # 清理DataFrame列名（去除冒号等特殊字符）- 如果还没有清理
@@ -54,104 +67,144 @@ class TranslationDetector:
         # 获取所有语言列
         language_cols = [col for col in sheet_info.columns if col.language is not None]
 
-        if not language_cols:
+        if not language_cols or df.empty:
             return tasks
 
-        # 按行检测
-        for idx, row in df.iterrows():
-            # 找出该行的源语言
-            source_text = None
-            source_lang = None
-            source_col_name = None
-
-            if source_langs:
-                # 如果指定了源语言，按照指定顺序查找
-                for src_lang in source_langs:
-                    src_lang_lower = src_lang.lower()
-                    for col in language_cols:
-                        if col.language and col.language.lower() == src_lang_lower:
-                            value = row[col.name]
-                            if pd.notna(value) and str(value).strip():
-                                source_text = str(value).strip()
-                                source_lang = col.language
-                                source_col_name = col.name
-                                break
-                    if source_text:
-                        break
-            else:
-                # 未指定源语言，使用默认优先级：EN > CH > 其他
-                # 先检查EN列
-                for col in language_cols:
-                    if col.language == 'en':
-                        value = row[col.name]
-                        if pd.notna(value) and str(value).strip():
-                            source_text = str(value).strip()
-                            source_lang = 'en'
-                            source_col_name = col.name
-                            break
-
-                # 如果没有EN，检查CH列
-                if not source_text:
-                    for col in language_cols:
-                        if col.language == 'ch':
-                            value = row[col.name]
-                            if pd.notna(value) and str(value).strip():
-                                source_text = str(value).strip()
-                                source_lang = 'ch'
-                                source_col_name = col.name
-                                break
-
-                # 如果都没有，使用任何有内容的列
-                if not source_text:
-                    for col in language_cols:
-                        value = row[col.name]
-                        if pd.notna(value) and str(value).strip():
-                            source_text = str(value).strip()
-                            source_lang = col.language
-                            source_col_name = col.name
-                            break
-
-            # 如果没有源文本，跳过该行
-            if not source_text:
+        # 每列只计算一次：原值、非NaN掩码、去空白文本与非空掩码
+        values = {}
+        notna = {}
+        stripped = {}
+        filled = {}
+        for col in language_cols:
+            if col.name in filled:
                 continue
+            series = df[col.name]
+            text = series.astype(str).str.strip()
+            values[col.name] = series.to_numpy(dtype=object)
+            notna[col.name] = series.notna().to_numpy()
+            stripped[col.name] = text.to_numpy(dtype=object)
+            filled[col.name] = notna[col.name] & (text != '').to_numpy()
+
+        # 源语言候选列（按优先级）
+        if source_langs:
+            candidates = [
+                col for src_lang in source_langs for col in language_cols
+                if col.language and col.language.lower() == src_lang.lower()
+            ]
+        else:
+            # 未指定源语言，使用默认优先级：EN > CH > 其他
+            candidates = (
+                [col for col in language_cols if col.language == 'en'] +
+                [col for col in language_cols if col.language == 'ch'] +
+                language_cols
+            )
+
+        # 每行取第一个有内容的候选列作为源
+        n_rows = len(df)
+        source_choice = np.full(n_rows, -1, dtype=np.int64)
+        for k, col in enumerate(candidates):
+            source_choice[(source_choice == -1) & filled[col.name]] = k
+
+        has_source = source_choice >= 0
+        if not has_source.any():
+            return tasks
+
+        # 目标列
+        target_langs_lower = [lang.lower() for lang in target_langs] if target_langs else None
+        target_cols = [
+            col for col in language_cols
+            if not (target_langs_lower and col.language and col.language.lower() not in target_langs_lower)
+        ]
+        if not target_cols:
+            return tasks
 
-            # 检查每个目标语言列是否需要翻译
-            for col in language_cols:
-                if col.name == source_col_name:  # 跳过源语言列
-                    continue
-
-                # 如果指定了目标语言，只检测这些语言
-                if target_langs:
-                    # 将目标语言转换为小写进行比较
-                    target_langs_lower = [lang.lower() for lang in target_langs]
-                    if col.language and col.language.lower() not in target_langs_lower:
-                        continue
-
-                target_text = row[col.name]
-
-                # 获取背景色 (如果支持)
-                background_color = None
-                if include_colors:
-                    background_color = self._get_cell_background_color(df, idx, col.name)
-
-                # 判断任务类型 - 增强版本
-                task_type = self._determine_task_type_enhanced(target_text, background_color)
-
-                if task_type in ['new', 'modify', 'shorten']:
-                    task = TranslationTask(
-                        sheet_name=sheet_info.name,
-                        row_index=idx,
-                        source_text=source_text,
-                        target_column=col.name,
-                        target_language=col.language,
-                        task_type=task_type,
-                        background_color=background_color,
-                        original_translation=str(target_text) if pd.notna(target_text) else None
-                    )
-                    tasks.append(task)
+        color_codes = self._color_task_codes(df, target_cols, color_map) if include_colors else None
+        source_names = np.array([col.name for col in candidates], dtype=object)
+
+        # (行, 目标列) 任务类型编码矩阵，0 表示不需要翻译
+        codes = np.zeros((n_rows, len(target_cols)), dtype=np.int8)
+        for j, col in enumerate(target_cols):
+            col_codes = self._content_task_codes(stripped[col.name], filled[col.name])
+            if color_codes is not None:
+                colored = color_codes[:, j] >= 0
+                col_codes = np.where(colored, color_codes[:, j], col_codes)
+            is_source = np.zeros(n_rows, dtype=bool)
+            is_source[has_source] = source_names[source_choice[has_source]] == col.name
+            codes[:, j] = np.where(has_source & ~is_source, col_codes, 0)
+
+        row_positions, col_positions = np.nonzero(codes)
+        index_labels = df.index
+        for pos, j in zip(row_positions.tolist(), col_positions.tolist()):
+            col = target_cols[j]
+            source_col = candidates[source_choice[pos]]
+            background_color = None
+            if color_map is not None and include_colors:
+                background_color = self._color_at(df, color_map, pos, col.name)
+
+            tasks.append(TranslationTask(
+                sheet_name=sheet_info.name,
+                row_index=index_labels[pos],
+                source_text=stripped[source_col.name][pos],
+                target_column=col.name,
+                target_language=col.language,
+                task_type=self._TASK_NAMES[int(codes[pos, j])],
+                background_color=background_color,
+                original_translation=str(values[col.name][pos]) if notna[col.name][pos] else None
+            ))
 
         return tasks
 
+    def _content_task_codes(self, stripped: np.ndarray, filled: np.ndarray) -> np.ndarray:
+        """按内容判断任务类型（与 _determine_task_type_enhanced 的内容规则一致）"""
+        text = pd.Series(stripped, dtype=object)
+        too_short = (text.str.len() < 2).to_numpy()
+        placeholder = text.str.lower().isin(self._PLACEHOLDERS).to_numpy()
+
+        codes = np.zeros(len(stripped), dtype=np.int8)
+        codes[filled & too_short] = self._TASK_CODES['modify']
+        codes[filled & ~too_short & placeholder] = self._TASK_CODES['new']
+        codes[~filled] = self._TASK_CODES['new']
+        return codes
+
+    def _color_task_codes(
+        self,
+        df: pd.DataFrame,
+        target_cols: List,
+        color_map: Optional[SheetColorMap]
+    ) -> Optional[np.ndarray]:
+        """
+        按填充色判断任务类型
+
+        Returns:
+            (行, 目标列) 编码矩阵：-1 无颜色规则，0 已完成，其余为任务类型编码；无颜色映射时返回None
+        """
+        if color_map is None:
+            return None
+
+        # 每种颜色只查一次映射表
+        lut = np.full(len(color_map.palette) + 1, -1, dtype=np.int8)
+        for code, color in enumerate(color_map.palette):
+            color_type = self.color_mapping.get(color.lstrip('#').upper())
+            if color_type is not None:
+                lut[code] = self._TASK_CODES.get(color_type, 0)
+
+        columns = list(df.columns)
+        result = np.full((len(df), len(target_cols)), -1, dtype=np.int8)
+        rows = color_map.codes[1:len(df) + 1]
+        for j, col in enumerate(target_cols):
+            col_idx = columns.index(col.name)
+            if col_idx < rows.shape[1]:
+                result[:rows.shape[0], j] = lut[rows[:, col_idx]]
+        return result
+
+    @staticmethod
+    def _color_at(df: pd.DataFrame, color_map: SheetColorMap, pos: int, col_name: str) -> Optional[str]:
+        col_idx = list(df.columns).index(col_name)
+        if pos + 1 >= color_map.shape[0] or col_idx >= color_map.shape[1]:
+            return None
+        color = color_map.color_at(pos + 1, col_idx)
+        return color.lstrip('#').upper() if color else None
+
     def _determine_task_type_enhanced(self, target_text, background_color: str) -> str:
         """增强的任务类型判断 - 支持增量翻译"""
         # 先检查颜色标记
@@ -0,0 +1,77 @@
+"""
+阻塞IO执行器
+将同步存储SDK调用（oss2、本地文件读写）移出事件循环
+"""
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingIOExecutor:
+    """
+    有界线程池执行器
+
+    同步传输在独立线程池中运行，信号量限制同时进行的传输数，
+    超出的请求在事件循环中排队等待，不占用线程也不阻塞其他请求。
+    """
+
+    def __init__(self, max_concurrency: int = 8, name: str = "storage-io"):
+        self.max_concurrency = max_concurrency
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=name)
+        self._semaphore = None
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'total_wait_ms': 0.0,
+            'total_run_ms': 0.0
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # 延迟创建，确保绑定到运行中的事件循环
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """在线程池中执行同步函数并等待结果"""
+        self.stats['submitted'] += 1
+        queued_at = time.perf_counter()
+
+        async with self._get_semaphore():
+            started_at = time.perf_counter()
+            self.stats['total_wait_ms'] += (started_at - queued_at) * 1000
+            self.stats['in_flight'] += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+                self.stats['completed'] += 1
+                return result
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                self.stats['in_flight'] -= 1
+                self.stats['total_run_ms'] += (time.perf_counter() - started_at) * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取执行统计"""
+        done = self.stats['completed'] + self.stats['errors']
+        return {
+            **self.stats,
+            'max_concurrency': self.max_concurrency,
+            'avg_wait_ms': round(self.stats['total_wait_ms'] / done, 2) if done else 0,
+            'avg_run_ms': round(self.stats['total_run_ms'] / done, 2) if done else 0
+        }
+
+    def shutdown(self, wait: bool = True):
+        """关闭线程池"""
+        self._pool.shutdown(wait=wait)
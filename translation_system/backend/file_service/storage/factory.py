@@ -0,0 +1,36 @@
+"""
+存储后端工厂
+根据配置返回共享的存储实例（oss 或 local）
+"""
+from typing import Optional
+import logging
+
+from config.settings import settings
+from .base import CloudStorage
+
+logger = logging.getLogger(__name__)
+
+_storage: Optional[CloudStorage] = None
+
+
+def create_storage(backend: Optional[str] = None) -> CloudStorage:
+    """创建存储实例"""
+    backend = (backend or settings.storage_backend).lower()
+
+    if backend == 'local':
+        from .local_storage import LocalStorage
+        return LocalStorage(settings.local_storage_path, max_concurrency=settings.storage_max_concurrent_transfers)
+    if backend == 'oss':
+        from .oss_storage import OSSStorage
+        return OSSStorage()
+
+    raise ValueError(f"不支持的存储后端: {backend}")
+
+
+def get_storage() -> CloudStorage:
+    """获取全局存储实例（所有请求共享同一个传输线程池）"""
+    global _storage
+    if _storage is None:
+        _storage = create_storage()
+        logger.info(f"存储后端已初始化: {settings.storage_backend}")
+    return _storage
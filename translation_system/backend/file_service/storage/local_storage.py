@@ -0,0 +1,137 @@
+"""
+本地文件系统存储实现
+可替代OSS用于本地开发、测试和基准测试
+"""
+import os
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional
+import logging
+
+from .base import CloudStorage
+from .executor import BlockingIOExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStorage(CloudStorage):
+    """
+    本地文件系统存储实现
+
+    与OSSStorage相同，磁盘读写通过BlockingIOExecutor在线程池中执行。
+    元数据保存在同名的 .meta.json 文件中。
+    """
+
+    META_SUFFIX = '.meta.json'
+
+    def __init__(self, root_dir: str, executor: Optional[BlockingIOExecutor] = None,
+                 max_concurrency: int = 8):
+        self.root = Path(root_dir).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.executor = executor or BlockingIOExecutor(max_concurrency)
+
+    def _resolve(self, file_path: str) -> Path:
+        """将对象路径映射到根目录下，拒绝越界路径"""
+        path = (self.root / file_path.lstrip('/')).resolve()
+        if path != self.root and self.root not in path.parents:
+            raise ValueError(f"非法文件路径: {file_path}")
+        return path
+
+    def _write(self, file_path: str, data, metadata: Optional[Dict]):
+        path = self._resolve(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.part')
+        with open(tmp_path, 'wb') as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f, length=1024 * 1024)
+        os.replace(tmp_path, path)
+        if metadata:
+            with open(path.with_name(path.name + self.META_SUFFIX), 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, ensure_ascii=False)
+
+    def _read(self, file_path: str) -> bytes:
+        with open(self._resolve(file_path), 'rb') as f:
+            return f.read()
+
+    def _delete(self, file_path: str):
+        path = self._resolve(file_path)
+        path.unlink()
+        path.with_name(path.name + self.META_SUFFIX).unlink(missing_ok=True)
+
+    def _stat(self, file_path: str) -> Dict:
+        path = self._resolve(file_path)
+        stat = path.stat()
+        return {
+            'size': stat.st_size,
+            'last_modified': datetime.fromtimestamp(stat.st_mtime),
+            'content_type': 'application/octet-stream',
+            'etag': f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        }
+
+    async def upload(self, file: BinaryIO, file_path: str, metadata: Dict = None) -> str:
+        """上传文件返回文件路径"""
+        try:
+            await self.executor.run(self._write, file_path, file, metadata)
+            logger.info(f"文件上传成功: {file_path}")
+            return file_path
+
+        except Exception as e:
+            logger.error(f"文件上传失败: {file_path}, 错误: {e}")
+            raise
+
+    async def upload_bytes(self, content: bytes, file_path: str, metadata: Dict = None) -> str:
+        """上传字节内容"""
+        try:
+            await self.executor.run(self._write, file_path, content, metadata)
+            logger.info(f"字节内容上传成功: {file_path}")
+            return file_path
+
+        except Exception as e:
+            logger.error(f"字节内容上传失败: {file_path}, 错误: {e}")
+            raise
+
+    async def download(self, file_path: str) -> bytes:
+        """下载文件"""
+        try:
+            content = await self.executor.run(self._read, file_path)
+            logger.info(f"文件下载成功: {file_path}")
+            return content
+
+        except Exception as e:
+            logger.error(f"文件下载失败: {file_path}, 错误: {e}")
+            raise
+
+    async def get_download_url(self, file_path: str, expire_seconds: int = 3600) -> str:
+        """获取下载链接（本地文件URI，无过期时间）"""
+        return self._resolve(file_path).as_uri()
+
+    async def delete(self, file_path: str) -> bool:
+        """删除文件"""
+        try:
+            await self.executor.run(self._delete, file_path)
+            logger.info(f"文件删除成功: {file_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"文件删除失败: {file_path}, 错误: {e}")
+            return False
+
+    async def exists(self, file_path: str) -> bool:
+        """检查文件是否存在"""
+        try:
+            return await self.executor.run(self._resolve(file_path).is_file)
+        except Exception as e:
+            logger.error(f"检查文件存在失败: {file_path}, 错误: {e}")
+            return False
+
+    async def get_file_info(self, file_path: str) -> Optional[Dict]:
+        """获取文件信息"""
+        try:
+            return await self.executor.run(self._stat, file_path)
+        except Exception as e:
+            logger.error(f"获取文件信息失败: {file_path}, 错误: {e}")
+            return None
@@ -2,7 +2,9 @@
 阿里云OSS存储实现
 """
 import oss2
+from concurrent.futures import ThreadPoolExecutor
 from .base import CloudStorage
+from .executor import BlockingIOExecutor
 from typing import BinaryIO, Dict, Optional
 from config.settings import settings
 import logging
@@ -11,11 +13,45 @@ logger = logging.getLogger(__name__)
 
 
 class OSSStorage(CloudStorage):
-    """阿里云OSS存储实现"""
+    """
+    阿里云OSS存储实现
 
-    def __init__(self):
+    oss2为同步SDK，所有调用都通过BlockingIOExecutor在线程池中执行，
+    传输期间事件循环可以继续处理其他请求。
+    """
+
+    def __init__(self, executor: Optional[BlockingIOExecutor] = None):
         auth = oss2.Auth(settings.oss_access_key_id, settings.oss_access_key_secret)
         self.bucket = oss2.Bucket(auth, settings.oss_endpoint, settings.oss_bucket_name)
+        self.executor = executor or BlockingIOExecutor(settings.storage_max_concurrent_transfers)
+
+    def _put(self, file_path: str, data, headers: Dict):
+        # 大文件使用分片上传，分片并行传输
+        if isinstance(data, (bytes, bytearray)) and len(data) >= settings.oss_multipart_threshold:
+            return self._put_multipart(file_path, data, headers)
+        return self.bucket.put_object(file_path, data, headers=headers)
+
+    def _put_multipart(self, file_path: str, data: bytes, headers: Dict):
+        part_size = oss2.determine_part_size(len(data), preferred_size=settings.oss_part_size)
+        upload_id = self.bucket.init_multipart_upload(file_path, headers=headers).upload_id
+
+        def upload_part(index: int):
+            offset = index * part_size
+            chunk = data[offset:offset + part_size]
+            result = self.bucket.upload_part(file_path, upload_id, index + 1, chunk)
+            return oss2.models.PartInfo(index + 1, result.etag)
+
+        part_count = (len(data) + part_size - 1) // part_size
+        try:
+            with ThreadPoolExecutor(max_workers=settings.oss_part_concurrency) as pool:
+                parts = list(pool.map(upload_part, range(part_count)))
+            return self.bucket.complete_multipart_upload(file_path, upload_id, parts)
+        except Exception:
+            self.bucket.abort_multipart_upload(file_path, upload_id)
+            raise
+
+    def _get(self, file_path: str) -> bytes:
+        return self.bucket.get_object(file_path).read()
 
     async def upload(self, file: BinaryIO, file_path: str, metadata: Dict = None) -> str:
         """上传文件返回文件路径"""
@@ -24,7 +60,7 @@ class OSSStorage(CloudStorage):
             if metadata:
                 headers.update(metadata)
 
-            result = self.bucket.put_object(file_path, file, headers=headers)
+            await self.executor.run(self._put, file_path, file, headers)
             logger.info(f"文件上传成功: {file_path}")
             return file_path
 
@@ -39,7 +75,7 @@ class OSSStorage(CloudStorage):
             if metadata:
                 headers.update(metadata)
 
-            result = self.bucket.put_object(file_path, content, headers=headers)
+            await self.executor.run(self._put, file_path, content, headers)
             logger.info(f"字节内容上传成功: {file_path}")
             return file_path
 
@@ -50,8 +86,7 @@ class OSSStorage(CloudStorage):
     async def download(self, file_path: str) -> bytes:
         """下载文件"""
         try:
-            result = self.bucket.get_object(file_path)
-            content = result.read()
+            content = await self.executor.run(self._get, file_path)
             logger.info(f"文件下载成功: {file_path}")
             return content
 
@@ -62,6 +97,7 @@ class OSSStorage(CloudStorage):
     async def get_download_url(self, file_path: str, expire_seconds: int = 3600) -> str:
         """获取临时下载链接"""
         try:
+            # 本地签名计算，无网络IO
             url = self.bucket.sign_url('GET', file_path, expire_seconds)
             logger.info(f"生成下载链接: {file_path}")
             return url
@@ -73,7 +109,7 @@ class OSSStorage(CloudStorage):
     async def delete(self, file_path: str) -> bool:
         """删除文件"""
         try:
-            self.bucket.delete_object(file_path)
+            await self.executor.run(self.bucket.delete_object, file_path)
             logger.info(f"文件删除成功: {file_path}")
             return True
 
@@ -84,7 +120,7 @@ class OSSStorage(CloudStorage):
     async def exists(self, file_path: str) -> bool:
         """检查文件是否存在"""
         try:
-            return self.bucket.object_exists(file_path)
+            return await self.executor.run(self.bucket.object_exists, file_path)
         except Exception as e:
             logger.error(f"检查文件存在失败: {file_path}, 错误: {e}")
             return False
@@ -92,7 +128,7 @@ class OSSStorage(CloudStorage):
     async def get_file_info(self, file_path: str) -> Optional[Dict]:
         """获取文件信息"""
         try:
-            meta = self.bucket.head_object(file_path)
+            meta = await self.executor.run(self.bucket.head_object, file_path)
             return {
                 'size': meta.content_length,
                 'last_modified': meta.last_modified,
@@ -101,4 +137,4 @@ class OSSStorage(CloudStorage):
             }
         except Exception as e:
             logger.error(f"获取文件信息失败: {file_path}, 错误: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -8,7 +8,7 @@ from datetime import datetime
 from database.connection import AsyncSession
 from database.models import Project, ProjectVersion, ProjectFile, TranslationTask
 from sqlalchemy import select, func
-from file_service.storage.oss_storage import OSSStorage
+from file_service.storage.base import CloudStorage
 import json
 import logging
 import asyncio
@@ -19,8 +19,8 @@ logger = logging.getLogger(__name__)
 class ProjectManager:
     """项目管理器 - 基于Demo中的进度统计功能"""
 
-    def __init__(self, oss_storage: OSSStorage):
-        self.storage = oss_storage
+    def __init__(self, storage: CloudStorage):
+        self.storage = storage
 
     async def create_project(
         self,
@@ -0,0 +1,112 @@
+"""
+颜色任务检测基准测试
+
+生成带填充色和批注的工作表（默认 10000 行 x 10 列 = 100k 单元格），测量：
+    read      - EnhancedExcelReader 读取数据、元数据与颜色映射
+    phase1-3  - ColorTaskDetector 三阶段任务检测
+    redetect  - TranslationDetector 每轮迭代的剩余任务重新检测
+
+用法:
+    python scripts/benchmark_color_detection.py
+    python scripts/benchmark_color_detection.py --rows 50000 --fill-ratio 0.1
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill
+from openpyxl.comments import Comment
+
+from excel_analysis.enhanced_excel_reader import EnhancedExcelReader
+from excel_analysis.color_task_detector import ColorTaskDetector
+from excel_analysis.translation_detector import TranslationDetector
+from excel_analysis.header_analyzer import ColumnInfo, SheetInfo, ColumnType
+
+COLUMNS = ['ID', 'Text_CN', 'Text_EN', 'Text_PT', 'Text_TH', 'Text_IND', 'Text_VN', 'Text_ES', '备注', 'Text_X']
+LANGUAGES = {
+    'Text_CN': 'ch', 'Text_EN': 'en', 'Text_PT': 'pt', 'Text_TH': 'th',
+    'Text_IND': 'ind', 'Text_VN': 'vn', 'Text_ES': 'es'
+}
+COLORS = ['FFFFFF00', 'FF0000FF', 'FF00B0F0', 'FF00FF00', 'FFFF0000', 'FFABCDEF', 'FFFFD700']
+
+
+def build_workbook(path: str, rows: int, fill_ratio: float, comment_ratio: float):
+    """生成测试工作簿：随机空白/占位符/译文，随机填充色与批注"""
+    random.seed(42)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Sheet1'
+    ws.append(COLUMNS)
+    fills = {c: PatternFill(start_color=c, end_color=c, fill_type='solid') for c in COLORS}
+
+    for r in range(rows):
+        values = [f'ID{r}', f'你好世界{r}' if random.random() < 0.9 else None]
+        for _ in COLUMNS[2:]:
+            x = random.random()
+            values.append(None if x < 0.4 else ('todo' if x < 0.45 else f'text {r}'))
+        ws.append(values)
+        for c in range(len(COLUMNS)):
+            if random.random() < fill_ratio:
+                ws.cell(row=r + 2, column=c + 1).fill = fills[random.choice(COLORS)]
+            if random.random() < comment_ratio:
+                ws.cell(row=r + 2, column=c + 1).comment = Comment('上下文说明', 'bench')
+    wb.save(path)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="颜色任务检测基准")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--fill-ratio", type=float, default=0.05, help="带填充色的单元格比例")
+    parser.add_argument("--comment-ratio", type=float, default=0.01, help="带批注的单元格比例")
+    parser.add_argument("--iterations", type=int, default=5, help="重新检测轮数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.xlsx')
+        build_workbook(path, args.rows, args.fill_ratio, args.comment_ratio)
+
+        reader = EnhancedExcelReader()
+        (df, metadata), read_ms = timed(lambda: reader.read_excel_with_metadata(path, 'Sheet1'))
+        sheet_metadata = metadata['Sheet1']
+
+    detector = ColorTaskDetector()
+    sheet_info = SheetInfo(
+        name='Sheet1',
+        columns=[
+            ColumnInfo(index=i, name=c, column_type=ColumnType.TARGET, language=LANGUAGES.get(c))
+            for i, c in enumerate(COLUMNS)
+        ]
+    )
+    translation_detector = TranslationDetector()
+
+    print("=" * 60)
+    print(f"单元格数={args.rows * len(COLUMNS)}, 元数据单元格={len(sheet_metadata)}")
+    print("=" * 60)
+    print(f"{'stage':<12}{'tasks':>10}{'ms':>12}")
+    print(f"{'read':<12}{len(df):>10}{read_ms:>12.1f}")
+    for phase in (1, 2, 3):
+        tasks, ms = timed(lambda: detector.detect_tasks_by_phase(df, sheet_metadata, phase))
+        print(f"{'phase' + str(phase):<12}{len(tasks):>10}{ms:>12.1f}")
+
+    total_ms = 0.0
+    for _ in range(args.iterations):
+        tasks, ms = timed(lambda: translation_detector.detect_translation_tasks(df, sheet_info))
+        total_ms += ms
+    print(f"{'redetect':<12}{len(tasks):>10}{total_ms / args.iterations:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+存储传输对无关接口延迟的影响基准测试
+
+在同一事件循环中启动一个最小的FastAPI应用（/ping 与 /upload、/download），
+并发传输大文件的同时持续请求 /ping，比较两种模式下 /ping 的延迟：
+
+    inline   - 在协程中直接执行同步IO（改造前OSSStorage的行为）
+    offload  - 通过BlockingIOExecutor在线程池中执行（当前实现）
+
+用法:
+    python scripts/benchmark_storage_latency.py
+    python scripts/benchmark_storage_latency.py --file-mb 200 --transfers 8 --concurrency 4
+"""
+import os
+import sys
+import math
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request
+
+from file_service.storage.local_storage import LocalStorage
+from file_service.storage.executor import BlockingIOExecutor
+
+
+class InlineExecutor(BlockingIOExecutor):
+    """在事件循环线程中直接执行（模拟改造前的阻塞调用）"""
+
+    async def run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+def build_app(storage: LocalStorage) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/upload/{name}")
+    async def upload(name: str, request: Request):
+        await storage.upload_bytes(await request.body(), f"bench/{name}")
+        return {"ok": True}
+
+    @app.get("/download/{name}")
+    async def download(name: str):
+        content = await storage.download(f"bench/{name}")
+        return {"size": len(content)}
+
+    return app
+
+
+def percentile(samples, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * p) - 1)] if ordered else 0.0
+
+
+async def run_mode(mode: str, args, root: str) -> dict:
+    executor = InlineExecutor(args.concurrency) if mode == "inline" else BlockingIOExecutor(args.concurrency)
+    storage = LocalStorage(os.path.join(root, mode), executor=executor)
+    app = build_app(storage)
+    payload = os.urandom(args.file_mb * 1024 * 1024)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        ping_latencies = []
+        done = asyncio.Event()
+
+        async def pinger():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(args.ping_interval / 1000)
+
+        async def transfer(i: int):
+            await client.post(f"/upload/file_{i}.bin", content=payload)
+            await client.get(f"/download/file_{i}.bin")
+
+        ping_task = asyncio.create_task(pinger())
+        start = time.perf_counter()
+        await asyncio.gather(*(transfer(i) for i in range(args.transfers)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await ping_task
+
+    executor.shutdown()
+    return {
+        "mode": mode,
+        "transfer_s": round(elapsed, 2),
+        "pings": len(ping_latencies),
+        "ping_p50_ms": round(statistics.median(ping_latencies), 2) if ping_latencies else 0,
+        "ping_p99_ms": round(percentile(ping_latencies, 0.99), 2),
+        "ping_max_ms": round(max(ping_latencies), 2) if ping_latencies else 0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="存储传输期间的接口延迟基准")
+    parser.add_argument("--file-mb", type=int, default=100)
+    parser.add_argument("--transfers", type=int, default=4, help="并发上传+下载的文件数")
+    parser.add_argument("--concurrency", type=int, default=4, help="存储线程池大小")
+    parser.add_argument("--ping-interval", type=float, default=5, help="/ping 请求间隔(ms)")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"文件大小={args.file_mb}MB, 传输数={args.transfers}, 线程池={args.concurrency}")
+    print("=" * 72)
+    print(f"{'mode':<10}{'transfer_s':>12}{'pings':>8}{'p50_ms':>10}{'p99_ms':>10}{'max_ms':>10}")
+    with tempfile.TemporaryDirectory() as root:
+        for mode in ("inline", "offload"):
+            row = await run_mode(mode, args, root)
+            print(
+                f"{row['mode']:<10}{row['transfer_s']:>12}{row['pings']:>8}"
+                f"{row['ping_p50_ms']:>10}{row['ping_p99_ms']:>10}{row['ping_max_ms']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+术语索引单元测试
+"""
+from dataclasses import dataclass, field
+from typing import Dict
+
+from translation_core.terminology_index import TerminologyIndex
+
+
+@dataclass
+class Entry:
+    """与 TerminologyEntry 相同的字段（避免引入数据库依赖）"""
+    source: str
+    target: Dict[str, str] = field(default_factory=dict)
+    priority: int = 1
+    case_sensitive: bool = True
+
+
+def _index(*entries: Entry) -> TerminologyIndex:
+    return TerminologyIndex({entry.source: entry for entry in entries})
+
+
+class TestMatchSources:
+    """match_sources 报告所有出现的术语"""
+
+    def test_reports_terms_contained_in_longer_terms(self):
+        index = _index(
+            Entry('Fire Sword', {'en': 'Flame Blade'}),
+            Entry('Fire', {'en': 'Flame'}),
+            Entry('Sword', {'en': 'Blade'})
+        )
+
+        assert index.match_sources(['Fire Sword here']) == {'Fire Sword', 'Fire', 'Sword'}
+
+    def test_reports_overlapping_terms(self):
+        index = _index(Entry('火焰剑'), Entry('剑士'), Entry('士兵'))
+
+        assert index.match_sources(['火焰剑士兵']) == {'火焰剑', '剑士', '士兵'}
+
+    def test_case_insensitive_terms_are_all_reported(self):
+        index = _index(
+            Entry('HP', case_sensitive=False),
+            Entry('hp', priority=3, case_sensitive=False),
+            Entry('Boss', case_sensitive=True)
+        )
+
+        assert index.match_sources(['Restore hP', 'boss']) == {'HP', 'hp'}
+        assert index.match_sources(['Boss', None, '']) == {'Boss'}
+
+
+class TestApply:
+    """apply 只替换有目标语言译文的术语"""
+
+    def test_terms_without_target_translation_do_not_block_shorter_terms(self):
+        index = _index(Entry('ab', {'en': 'X'}), Entry('abcd', {'pt': 'Y'}))
+
+        assert index.apply('abcd', 'en') == 'Xcd'
+        assert index.apply('abcd', 'pt') == 'Y'
+        assert index.apply('abcd', 'th') == 'abcd'
+
+    def test_longest_match_wins_and_replacements_are_not_rescanned(self):
+        index = _index(
+            Entry('Fire Sword', {'en': 'Fire Blade'}),
+            Entry('Fire', {'en': 'Flame'}),
+            Entry('Blade', {'en': 'Edge'})
+        )
+
+        assert index.apply('Fire Sword and Fire', 'en') == 'Fire Blade and Flame'
+
+    def test_priority_breaks_ties_between_case_modes(self):
+        index = _index(
+            Entry('hp', {'en': 'health'}, priority=1, case_sensitive=False),
+            Entry('HP', {'en': 'Hit Points'}, priority=5, case_sensitive=True)
+        )
+
+        assert index.apply('HP and hp', 'en') == 'Hit Points and health'
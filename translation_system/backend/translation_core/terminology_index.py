@@ -0,0 +1,161 @@
+"""
+术语索引
+将术语表编译为字符前缀树，单次扫描完成匹配与替换
+"""
+from typing import Dict, List, Optional, Set, Tuple, Any
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL = ''  # 前缀树中的词尾标记，值为以该路径结尾的术语原文列表
+
+
+def _build_trie(sources, fold: bool) -> Dict:
+    """
+    构建字符前缀树
+
+    大小写不敏感的术语逐字符转小写后入树，扫描时文本也逐字符转小写，
+    匹配位置与原文一一对应。
+    """
+    root: Dict = {}
+    for source in sources:
+        node = root
+        for ch in source:
+            node = node.setdefault(ch.lower() if fold else ch, {})
+        node.setdefault(_TERMINAL, []).append(source)
+    return root
+
+
+def _walk(trie: Dict, text: str, start: int, fold: bool):
+    """从 start 出发沿前缀树前进，依次产出 (end, 以该位置结尾的术语列表)"""
+    node = trie
+    for pos in range(start, len(text)):
+        ch = text[pos]
+        node = node.get(ch.lower() if fold else ch)
+        if node is None:
+            return
+        sources = node.get(_TERMINAL)
+        if sources:
+            yield pos + 1, sources
+
+
+class _Matcher:
+    """一组术语的前缀树（大小写敏感与不敏感各一棵）"""
+
+    def __init__(self, terminology: Dict[str, Any], sources):
+        self.terminology = terminology
+        sources = [source for source in sources if source]
+        self.exact = _build_trie((s for s in sources if terminology[s].case_sensitive), fold=False)
+        self.folded = _build_trie((s for s in sources if not terminology[s].case_sensitive), fold=True)
+
+    def _longest(self, text: str, start: int) -> Optional[Tuple[int, str]]:
+        """start 处最长的术语；同样长度取高优先级（大小写敏感的术语在前）"""
+        best = None
+        best_priority = None
+        for trie, fold in ((self.exact, False), (self.folded, True)):
+            for end, sources in _walk(trie, text, start, fold):
+                for source in sources:
+                    priority = self.terminology[source].priority
+                    if best is None or end > best[0] or (end == best[0] and priority > best_priority):
+                        best, best_priority = (end, source), priority
+        return best
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = []
+        pos = 0
+        while pos < len(text):
+            found = self._longest(text, pos)
+            if found is None:
+                pos += 1
+                continue
+            end, source = found
+            matches.append((pos, end, source))
+            pos = end
+        return matches
+
+    def contained(self, text: str) -> Set[str]:
+        """文本中作为子串出现的所有术语（含相互重叠、互为包含的术语）"""
+        found: Set[str] = set()
+        for start in range(len(text)):
+            for trie, fold in ((self.exact, False), (self.folded, True)):
+                for _, sources in _walk(trie, text, start, fold):
+                    found.update(sources)
+        return found
+
+
+class TerminologyIndex:
+    """
+    编译后的术语索引
+
+    替换：每个位置取最长的术语（同一区间取高优先级），匹配互不重叠；
+    按目标语言只索引有该语言译文的术语，没有译文的长术语不会挡住其中
+    可替换的短术语。
+    识别：match_sources 报告所有出现的术语，包括相互重叠或被更长术语
+    包含的术语。
+    扫描代价只与文本长度和术语长度有关，与术语数量基本无关。
+    """
+
+    def __init__(self, terminology: Dict[str, Any]):
+        start_time = time.time()
+        self.terminology = terminology
+        self.term_count = len(terminology)
+
+        self._matcher = _Matcher(terminology, terminology.keys())
+        self._language_matchers: Dict[str, _Matcher] = {}
+
+        build_time = (time.time() - start_time) * 1000
+        logger.debug(f"术语索引构建完成: 术语数={self.term_count}, 耗时={build_time:.2f}ms")
+
+    def _matcher_for(self, target_language: str) -> _Matcher:
+        """只含有目标语言译文的术语的匹配器（每种语言构建一次）"""
+        matcher = self._language_matchers.get(target_language)
+        if matcher is None:
+            sources = [
+                source for source, entry in self.terminology.items()
+                if target_language in entry.target
+            ]
+            matcher = _Matcher(self.terminology, sources)
+            self._language_matchers[target_language] = matcher
+        return matcher
+
+    def find(self, text: str, target_language: Optional[str] = None) -> List[Tuple[int, int, str]]:
+        """
+        查找文本中的术语
+
+        Args:
+            text: 待扫描文本
+            target_language: 只匹配有该语言译文的术语（None 表示全部术语）
+
+        Returns:
+            按位置排序、互不重叠的 (start, end, 术语原文) 列表
+        """
+        if not text:
+            return []
+        matcher = self._matcher if target_language is None else self._matcher_for(target_language)
+        return matcher.find(text)
+
+    def match_sources(self, texts: List[str]) -> Set[str]:
+        """返回在任一文本中出现的所有术语原文（含重叠与被包含的术语）"""
+        found: Set[str] = set()
+        for text in texts:
+            if text:
+                found.update(self._matcher.contained(text))
+        return found
+
+    def apply(self, text: str, target_language: str) -> str:
+        """单次扫描将术语替换为目标语言译文，替换结果不会被再次匹配"""
+        if not text:
+            return text
+
+        parts = []
+        pos = 0
+        for start, end, source in self.find(text, target_language):
+            parts.append(text[pos:start])
+            parts.append(self.terminology[source].target[target_language])
+            pos = end
+
+        if not parts:
+            return text
+        parts.append(text[pos:])
+        return ''.join(parts)
@@ -2,14 +2,15 @@
 术语管理器
 """
 from typing import Dict, List, Optional, Set
+from collections import OrderedDict
 from dataclasses import dataclass
 import json
-import re
 import time
 from database.connection import AsyncSession
 from database.models import Terminology
 from sqlalchemy import select, func
 from excel_analysis.header_analyzer import SheetInfo, ColumnType
+from .terminology_index import TerminologyIndex
 import pandas as pd
 import logging
 
@@ -30,10 +31,32 @@ class TerminologyEntry:
 class TerminologyManager:
     """术语管理器"""
 
+    INDEX_CACHE_SIZE = 64  # 最多缓存的编译索引数
+
     def __init__(self):
         self.terminology_cache = {}  # 缓存术语表
         self.project_terms_cache = {}  # 项目术语内存缓存 {project_id: {source: TerminologyEntry}}
         self.cache_loaded = {}  # 记录哪些项目已加载 {project_id: bool}
+        # 编译索引缓存 {id(术语表): (术语表, TerminologyIndex)}，持有术语表引用保证id不被复用
+        self._index_cache: OrderedDict = OrderedDict()
+
+    def get_index(self, terminology: Dict[str, TerminologyEntry]) -> TerminologyIndex:
+        """获取术语表的编译索引（每个术语表版本只编译一次）"""
+        key = id(terminology)
+        cached = self._index_cache.get(key)
+        if cached is not None and cached[1].term_count == len(terminology):
+            self._index_cache.move_to_end(key)
+            return cached[1]
+
+        index = TerminologyIndex(terminology)
+        self._index_cache[key] = (terminology, index)
+        if len(self._index_cache) > self.INDEX_CACHE_SIZE:
+            self._index_cache.popitem(last=False)
+        return index
+
+    def invalidate_index(self):
+        """术语变更后丢弃所有编译索引"""
+        self._index_cache.clear()
 
     async def preload_all_terminology(self, db: AsyncSession, project_id: str):
         """预加载项目的所有术语到内存（只执行一次）"""
@@ -63,8 +86,9 @@ class TerminologyManager:
                 )
                 self.project_terms_cache[project_id][row.source] = entry
 
-            # 标记已加载
+            # 标记已加载，并预编译术语索引
             self.cache_loaded[project_id] = True
+            self.get_index(self.project_terms_cache[project_id])
 
             load_time = time.time() - start_time
             logger.info(f"术语表预加载完成: {project_id}, 数量: {len(self.project_terms_cache[project_id])}, 耗时: {load_time:.3f}秒")
@@ -118,26 +142,16 @@ class TerminologyManager:
 
         start_time = time.time()
 
-        # 合并所有文本为一个大字符串，用于快速匹配
-        combined_text = ' '.join(batch_texts).lower() if batch_texts else ''
-
-        # 获取项目的所有术语
+        # 编译索引单次扫描每条文本，耗时与术语数量基本无关
         all_terms = self.project_terms_cache[project_id]
-        matched_terms = {}
-
-        # 快速匹配相关术语
-        for source, entry in all_terms.items():
-            # 检查术语是否出现在批次文本中
-            search_term = source.lower() if not entry.case_sensitive else source
-            search_text = combined_text if not entry.case_sensitive else ' '.join(batch_texts)
+        index = self.get_index(all_terms)
 
-            if search_term in search_text:
-                # 检查术语是否有目标语言的翻译
-                has_target_translation = any(
-                    lang in entry.target for lang in target_languages
-                )
-                if has_target_translation:
-                    matched_terms[source] = entry
+        matched_terms = {}
+        for source in index.match_sources(batch_texts):
+            entry = all_terms[source]
+            # 检查术语是否有目标语言的翻译
+            if any(lang in entry.target for lang in target_languages):
+                matched_terms[source] = entry
 
         match_time = (time.time() - start_time) * 1000  # 转换为毫秒
         logger.debug(f"术语匹配完成: 批次大小={len(batch_texts)}, 匹配数={len(matched_terms)}, 耗时={match_time:.2f}ms")
@@ -149,28 +163,8 @@ class TerminologyManager:
         if not text or not terminology:
             return text
 
-        result_text = text
-
-        # 按优先级排序术语 (高优先级先处理)
-        sorted_terms = sorted(terminology.items(),
-                            key=lambda x: x[1].priority,
-                            reverse=True)
-
-        for source_term, entry in sorted_terms:
-            if target_language not in entry.target:
-                continue
-
-            target_term = entry.target[target_language]
-
-            # 根据大小写敏感性进行替换
-            if entry.case_sensitive:
-                result_text = result_text.replace(source_term, target_term)
-            else:
-                # 不区分大小写的替换
-                pattern = re.compile(re.escape(source_term), re.IGNORECASE)
-                result_text = pattern.sub(target_term, result_text)
-
-        return result_text
+        # 最长匹配优先，同一位置取高优先级术语；已替换的译文不会被再次替换
+        return self.get_index(terminology).apply(text, target_language)
 
     async def create_terminology_from_excel(self, db: AsyncSession, project_id: str, df: pd.DataFrame, sheet_info: SheetInfo):
         """从Excel术语表创建术语库"""
@@ -225,8 +219,18 @@ class TerminologyManager:
 
         await db.commit()
 
+        # 同步项目内存缓存
+        project_terms = self.project_terms_cache.get(project_id)
+        if project_terms is not None:
+            entry = project_terms.get(source)
+            if entry:
+                entry.target = target_translations
+            else:
+                project_terms[source] = TerminologyEntry(source=source, target=target_translations)
+
         # 清除缓存
         self.terminology_cache.clear()
+        self.invalidate_index()
 
     def format_terminology_for_prompt(
         self,
@@ -310,5 +314,8 @@ class TerminologyManager:
         target_language: str,
         terminology: Dict[str, TerminologyEntry]
     ) -> List[str]:
-        """批量应用术语翻译"""
-        return [self.apply_terminology(text, target_language, terminology) for text in texts]
\ No newline at end of file
+        """批量应用术语翻译（整批共用一个编译索引）"""
+        if not terminology:
+            return list(texts)
+        index = self.get_index(terminology)
+        return [index.apply(text, target_language) if text else text for text in texts]
\ No newline at end of file
@@ -18,6 +18,7 @@ from excel_analysis.header_analyzer import HeaderAnalyzer
 from excel_analysis.translation_detector import TranslationDetector
 from excel_analysis.enhanced_excel_reader import EnhancedExcelReader
 from excel_analysis.color_task_detector import ColorTaskDetector, TaskType
+from excel_analysis.color_extractor import get_color_map
 from .phase_translation_manager import PhaseTranslationManager
 
 # 使用LLM配置管理器作为唯一数据源
@@ -408,11 +409,9 @@ class TranslationEngine:
                     sheet_metadata = self.excel_metadata[sheet_name]
                     logger.info(f"Sheet '{sheet_name}' - 开始三阶段颜色任务处理，元数据包含{len(sheet_metadata)}个单元格")
 
-                    # 调试：检查是否有带颜色的单元格
-                    colored_cells = 0
-                    for addr, meta in sheet_metadata.items():
-                        if hasattr(meta, 'fill_color') and meta.fill_color:
-                            colored_cells += 1
+                    # 调试：检查是否有带颜色的单元格（复用读取阶段构建的颜色映射）
+                    color_map = get_color_map(sheet_metadata, len(current_df) + 1, len(current_df.columns))
+                    colored_cells = int((color_map.codes >= 0).sum())
                     logger.info(f"Sheet '{sheet_name}' - 发现{colored_cells}个带颜色的单元格")
 
                     # 配置三阶段处理参数
@@ -24,6 +24,7 @@ class ExecuteRequest(BaseModel):
     provider: Optional[str] = None  # Override LLM provider
     max_workers: Optional[int] = None  # Override max workers
     glossary_config: Optional[Dict] = None  # ✨ Glossary configuration
+    sheet_deadlines: Optional[Dict[str, float]] = None  # Sheet name -> seconds from start
 
 
 @router.post("/start")
@@ -116,10 +117,9 @@ async def start_execution(request: ExecuteRequest):
 
     # Get configuration
     config = config_manager.get_config()
-    llm_config = config.get('llm', {})
 
-    # Determine provider
-    provider_name = request.provider or llm_config.get('default_provider', 'openai')
+    # Determine provider (no override: default_provider, or llm.routing when enabled)
+    provider_name = request.provider
 
     # Override max workers if specified
     if request.max_workers:
@@ -128,12 +128,15 @@ async def start_execution(request: ExecuteRequest):
     try:
         # Create LLM provider
         llm_provider = LLMFactory.create_from_config_file(config, provider_name)
+        logger.info(f"Session {session_id} executing with provider {llm_provider.config.provider}")
 
         # Start execution
         result = await worker_pool.start_execution(
             session_id,
             llm_provider,
-            glossary_config=request.glossary_config  # ✨ Pass glossary config
+            glossary_config=request.glossary_config,  # ✨ Pass glossary config
+            sheet_deadlines=request.sheet_deadlines,
+            model_routing=not provider_name  # An explicit provider runs every task on it
         )
 
         if result['status'] == 'error':
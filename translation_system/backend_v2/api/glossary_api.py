@@ -172,8 +172,7 @@ async def delete_glossary(glossary_id: str):
         file_path.unlink()
 
         # Clear cache
-        if hasattr(glossary_manager, 'cache') and glossary_id in glossary_manager.cache:
-            del glossary_manager.cache[glossary_id]
+        glossary_manager.evict(glossary_id)
 
         return {
             'status': 'success',
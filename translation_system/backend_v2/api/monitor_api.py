@@ -6,7 +6,12 @@ import pandas as pd
 import logging
 
 from services.executor.worker_pool import worker_pool
+from services.executor.model_tier_router import model_tier_router
 from services.monitor.performance_monitor import performance_monitor
+from services.llm.adaptive_batching import batch_sizer
+from services.llm.hedging import hedging_policy
+from services.llm.llm_factory import LLMFactory
+from services.llm.token_estimator import get_estimator_stats
 from utils.session_manager import session_manager
 from utils.json_converter import convert_numpy_types
 from models.task_dataframe import TaskStatus
@@ -437,7 +442,12 @@ async def get_performance_metrics(session_id: Optional[str] = None, hours: int =
 
         return convert_numpy_types({
             'current': current,
-            'historical': historical
+            'historical': historical,
+            'llm_hedging': hedging_policy.get_stats(),
+            'llm_routing': LLMFactory.get_routing_stats(),
+            'token_estimation': get_estimator_stats(),
+            'model_tiers': model_tier_router.get_stats(),
+            'adaptive_batching': batch_sizer.get_stats()
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get performance metrics: {str(e)}")
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import Dict, Any
 import logging
 
 from database.mysql_connector import mysql_connector
+from services.monitor.performance_monitor import performance_monitor
 
 router = APIRouter(prefix="/api/pool", tags=["pool-monitor"])
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ async def get_pool_statistics() -> Dict[str, Any]:
         return {
             'status': 'success',
             'pool_stats': stats,
+            'event_loop': performance_monitor.get_loop_lag(),
             'message': _get_status_message(stats)
         }
     except Exception as e:
@@ -43,6 +45,7 @@ async def check_pool_health() -> Dict[str, Any]:
         return {
             'status': 'success',
             'health_check': health,
+            'event_loop': performance_monitor.get_loop_lag(),
             'summary': _get_health_summary(health)
         }
     except Exception as e:
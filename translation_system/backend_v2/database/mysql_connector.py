@@ -669,7 +669,7 @@ class MySQLConnector:
             params.extend([
                 task_id,
                 task.get('session_id', ''),  # Required for INSERT
-                task.get('status', 'pending'),
+                task.get('status'),  # NULL keeps the stored status (COALESCE below)
                 task.get('result'),
                 task.get('confidence'),
                 task.get('token_count'),
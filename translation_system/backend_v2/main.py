@@ -15,6 +15,8 @@ from api.auth_api import router as auth_router
 from api.session_api import router as session_router
 from api.glossary_api import router as glossary_router
 from utils.config_manager import config_manager
+from services.persistence.task_write_behind import task_write_behind
+from services.monitor.performance_monitor import performance_monitor
 import asyncio
 from fastapi import Request
 import time
@@ -99,13 +101,22 @@ async def startup_event():
     logger.info("Starting Translation System Backend V2 - Memory Only Mode")
     logger.info(f"Max chars per batch: {config_manager.max_chars_per_batch}")
     logger.info(f"Max concurrent workers: {config_manager.max_concurrent_workers}")
-    logger.info("Persistence disabled - running in memory-only mode")
+    if task_write_behind.enabled:
+        await task_write_behind.start()
+        logger.info(f"Task write-behind persistence enabled ({type(task_write_behind.sink).__name__})")
+    else:
+        logger.info("Persistence disabled - running in memory-only mode")
+    if config_manager.get('monitoring.enabled', True):
+        await performance_monitor.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event handler."""
     logger.info("Shutting down Translation System Backend V2 - Memory Only Mode")
+    # Flush-on-shutdown: drain coalesced task updates before exit
+    await task_write_behind.stop()
+    await performance_monitor.stop()
 
 
 if __name__ == "__main__":
@@ -56,6 +56,8 @@ class TaskDataFrameManager:
 
     def __init__(self):
         self.df = None
+        # Callables (task_id, updates) notified after every update_task
+        self.update_listeners = []
 
     def create_empty_dataframe(self) -> pd.DataFrame:
         """Create an empty task DataFrame with proper schema."""
@@ -129,6 +131,9 @@ class TaskDataFrameManager:
             for key, value in updates.items():
                 self.df.loc[mask, key] = value
 
+            for listener in self.update_listeners:
+                listener(task_id, updates)
+
     def get_task(self, task_id: str) -> Optional[pd.Series]:
         """Get task by task_id."""
         if self.df is None:
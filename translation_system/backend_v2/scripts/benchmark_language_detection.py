@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark sheet language detection on wide sheets.
+
+Builds a sheet with many language columns (default 32 columns x 100k rows)
+and compares:
+    per_text  - per-column sampling with detect_language per text and a full
+                column scan for the content check (the previous code path)
+    cold      - LanguageDetector.analyze_sheet on an empty cache
+    warm      - analyze_sheet again, as the task splitter does after analysis
+
+Usage:
+    python scripts/benchmark_language_detection.py
+    python scripts/benchmark_language_detection.py --rows 200000 --named-columns
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from collections import Counter
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from services.language_detector import LanguageDetector
+
+TEXTS = {
+    'CH': '开始游戏并领取奖励',
+    'EN': 'Start the game and claim rewards',
+    'PT': 'Inicie o jogo e resgate as recompensas para você',
+    'TH': 'เริ่มเกมและรับรางวัล',
+    'VN': 'Bắt đầu trò chơi và nhận phần thưởng',
+    'TR': 'Oyunu başlat ve ödülleri al',
+    'IND': 'Mulai permainan dan klaim hadiah untuk saya',
+    'ES': 'Inicia el juego y reclama las recompensas',
+}
+
+
+def build_sheet(rows: int, columns: int, named: bool) -> pd.DataFrame:
+    """Wide sheet cycling through the language samples; targets are sparse."""
+    random.seed(42)
+    langs = list(TEXTS.keys())
+    data = {}
+    for col_idx in range(columns):
+        lang = langs[col_idx % len(langs)]
+        name = f'{lang}_{col_idx}' if named else f'col_{col_idx}'
+        fill_ratio = 1.0 if col_idx == 0 else 0.3
+        data[name] = [
+            f'{TEXTS[lang]} {row}' if random.random() < fill_ratio else None
+            for row in range(rows)
+        ]
+    return pd.DataFrame(data)
+
+
+def per_text_analysis(df: pd.DataFrame) -> int:
+    """Previous code path: sample after converting whole columns, detect per text."""
+    detected = 0
+    for col_idx in range(df.shape[1]):
+        sample = df.iloc[:, col_idx].dropna().astype(str).head(20)
+        counts = Counter(LanguageDetector.detect_language(text) for text in sample)
+        detected += len(counts)
+        df.iloc[:, col_idx].dropna().astype(str).str.strip().str.len().sum()
+    return detected
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Language detection benchmark")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--columns", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--named-columns", action="store_true",
+                        help="Use language column names instead of content detection")
+    args = parser.parse_args()
+
+    df = build_sheet(args.rows, args.columns, args.named_columns)
+
+    def cold():
+        LanguageDetector.clear_cache()
+        LanguageDetector.analyze_sheet(df)
+
+    per_text_ms = timed(lambda: per_text_analysis(df), args.repeat)
+    cold_ms = timed(cold, args.repeat)
+    LanguageDetector.analyze_sheet(df)
+    warm_ms = timed(lambda: LanguageDetector.analyze_sheet(df), args.repeat)
+
+    result = LanguageDetector.analyze_sheet(df)
+    print("=" * 60)
+    print(f"rows={args.rows}, columns={args.columns}, named={args.named_columns}")
+    print(f"source={sorted(result['source_languages'])}, targets={result['target_languages']}")
+    print("=" * 60)
+    print(f"{'mode':<12}{'ms':>12}")
+    print(f"{'per_text':<12}{per_text_ms:>12.1f}")
+    print(f"{'cold':<12}{cold_ms:>12.1f}")
+    print(f"{'warm':<12}{warm_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,48 @@
 """Batch allocation service."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from utils.config_manager import config_manager
+from services.llm.token_estimator import TokenEstimator, get_estimator
 
 
 class BatchAllocator:
-    """Allocate tasks into batches based on character count."""
+    """Allocate tasks into batches based on estimated tokens (or character count)."""
+
+    def __init__(
+        self,
+        max_chars_per_batch: int = None,
+        max_input_tokens: int = None,
+        max_output_tokens: int = None,
+        provider: Optional[str] = None
+    ):
+        """
+        Initialize batch allocator.
+
+        Args:
+            max_chars_per_batch: Custom character limit (also enforced in token packing when given)
+            max_input_tokens: Input token budget per batch, including prompt overhead
+            max_output_tokens: Expected output token budget per batch
+            provider: Provider whose tokenizer profile is used (default: llm.default_provider)
+        """
+        batch_control = config_manager.get('task_execution.batch_control', {}) or {}
 
-    def __init__(self, max_chars_per_batch: int = None):
         # Use custom value if provided, otherwise use config default
         self.max_chars_per_batch = max_chars_per_batch or config_manager.max_chars_per_batch
+        self.packing = batch_control.get('packing', 'tokens')
+        self.enforce_chars = self.packing == 'chars' or max_chars_per_batch is not None
+
+        self.max_input_tokens = max_input_tokens or batch_control.get('max_input_tokens_per_batch', 2000)
+        self.max_output_tokens = max_output_tokens or batch_control.get('max_output_tokens_per_batch', 3000)
+        self.prompt_overhead_tokens = batch_control.get('prompt_overhead_tokens', 600)
+        self.estimator: TokenEstimator = get_estimator(provider or config_manager.get('llm.default_provider'))
 
     def allocate_batches(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Allocate tasks into batches based on max_chars_per_batch and task_type.
+        Allocate tasks into batches against the token budgets and task_type.
+
+        A batch is closed when the next task would exceed the input token
+        budget (prompt overhead included), the expected output token budget,
+        or (in char packing / with an explicit limit) max_chars_per_batch.
 
         Args:
             tasks: List of task dictionaries with 'source_text', 'target_lang', 'task_type', etc.
@@ -37,10 +66,15 @@ class BatchAllocator:
                 tasks_by_key[key] = []
             tasks_by_key[key].append(task)
 
+        use_tokens = self.packing != 'chars'
+        input_budget = max(self.max_input_tokens - self.prompt_overhead_tokens, 1)
+
         # Allocate batches for each language+type combination
         for key, key_tasks in tasks_by_key.items():
             batch_num = 0
             current_chars = 0
+            current_input = 0
+            current_output = 0
 
             for task in key_tasks:
                 # Calculate task character count
@@ -48,11 +82,22 @@ class BatchAllocator:
                 source_context = task.get('source_context', '')
                 task_chars = len(source_text) + len(source_context)
 
-                # Check if adding this task would exceed the batch limit
-                if current_chars > 0 and current_chars + task_chars > self.max_chars_per_batch:
+                # Check if adding this task would exceed the batch limits
+                over_limit = self.enforce_chars and current_chars + task_chars > self.max_chars_per_batch
+                if use_tokens:
+                    estimate = self.estimator.estimate_task(task)
+                    over_limit = (
+                        over_limit
+                        or current_input + estimate['input_tokens'] > input_budget
+                        or current_output + estimate['output_tokens'] > self.max_output_tokens
+                    )
+
+                if current_chars > 0 and over_limit:
                     # Start a new batch
                     batch_num += 1
                     current_chars = 0
+                    current_input = 0
+                    current_output = 0
 
                 # Assign batch_id with task type in the name
                 # Format: BATCH_{lang}_{TYPE}_{num}
@@ -61,9 +106,16 @@ class BatchAllocator:
                 task['batch_id'] = f"BATCH_{lang}_{task_type}_{batch_num:03d}"
                 task['char_count'] = task_chars
                 current_chars += task_chars
+                if use_tokens:
+                    current_input += estimate['input_tokens']
+                    current_output += estimate['output_tokens']
 
         return tasks
 
+    def estimate_batch_tokens(self, tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Predicted input (with prompt overhead) and output tokens of a batch."""
+        return self.estimator.estimate_batch(tasks, prefix_tokens=self.prompt_overhead_tokens)
+
     def calculate_batch_statistics(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate statistics about batch allocation."""
         if not tasks:
@@ -72,7 +124,10 @@ class BatchAllocator:
                 'batch_distribution': {},
                 'avg_chars_per_batch': 0,
                 'max_chars_in_batch': 0,
-                'min_chars_in_batch': 0
+                'min_chars_in_batch': 0,
+                'avg_input_tokens_per_batch': 0,
+                'max_input_tokens_in_batch': 0,
+                'max_output_tokens_in_batch': 0
             }
 
         # Group by batch_id
@@ -90,6 +145,12 @@ class BatchAllocator:
 
         # Calculate statistics
         batch_chars = [b['total_chars'] for b in batches.values()]
+        for batch_info in batches.values():
+            estimate = self.estimate_batch_tokens(batch_info['tasks'])
+            batch_info['input_tokens'] = estimate['input_tokens']
+            batch_info['output_tokens'] = estimate['output_tokens']
+        batch_input = [b['input_tokens'] for b in batches.values()]
+        batch_output = [b['output_tokens'] for b in batches.values()]
 
         # Build detailed batch distribution with tasks and batches count per language
         batch_distribution = {}
@@ -111,6 +172,9 @@ class BatchAllocator:
             'avg_chars_per_batch': sum(batch_chars) / len(batch_chars) if batch_chars else 0,
             'max_chars_in_batch': max(batch_chars) if batch_chars else 0,
             'min_chars_in_batch': min(batch_chars) if batch_chars else 0,
+            'avg_input_tokens_per_batch': sum(batch_input) / len(batch_input) if batch_input else 0,
+            'max_input_tokens_in_batch': max(batch_input) if batch_input else 0,
+            'max_output_tokens_in_batch': max(batch_output) if batch_output else 0,
             'batches': batches
         }
 
@@ -1,11 +1,147 @@
-"""Context extraction service."""
+"""Context extraction service.
 
+Context fragments that only depend on the sheet, a column or a row are
+derived once per sheet into a SheetContextTable; per-cell context is then a
+join of shared (interned) fragments.
+"""
+
+import sys
 import pandas as pd
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from models.excel_dataframe import ExcelDataFrame
 from models.game_info import GameInfo
 
 
+def _category_fragment(value: Any) -> Optional[str]:
+    """Category hint from the cell above (header-like text)."""
+    if value and isinstance(value, str):
+        if value.isupper() or value.endswith(':') or len(value) < 20:
+            return sys.intern(f"[Category] {value}")
+    return None
+
+
+def _row_label_fragment(value: Any) -> Optional[str]:
+    """Row label hint from the first cell of the row."""
+    if value and isinstance(value, str) and len(value) < 50:
+        return sys.intern(f"[Row Label] {value}")
+    return None
+
+
+class SheetContextTable:
+    """Precomputed context fragments for one sheet."""
+
+    def __init__(self, extractor: 'ContextExtractor', excel_df: ExcelDataFrame, sheet_name: str):
+        self.extractor = extractor
+        self.excel_df = excel_df
+        self.sheet_name = sheet_name
+
+        df = excel_df.get_sheet(sheet_name)
+        self.df = df
+        self.n_rows = len(df) if df is not None else 0
+        self.n_cols = len(df.columns) if df is not None else 0
+
+        options = extractor.context_options
+
+        # Sheet-level fragments
+        game_context = extractor.game_context if options.get('game_info', True) else ""
+        self.game_fragment = sys.intern(f"[Game] {game_context}") if game_context else None
+        sheet_context = extractor._get_sheet_context(sheet_name) if options.get('sheet_type', True) else ""
+        self.sheet_fragment = sys.intern(sheet_context) if sheet_context else None
+
+        # Column-level fragments
+        self.column_fragments: List[Optional[str]] = []
+        if df is not None:
+            for col in df.columns:
+                col_header = str(col)
+                if col_header and not col_header.startswith('Unnamed'):
+                    self.column_fragments.append(sys.intern(f"[Column] {col_header}"))
+                else:
+                    self.column_fragments.append(None)
+
+        self.comments = excel_df.comment_map.get(sheet_name, {}) if options.get('comments', True) else {}
+        self.use_neighbors = options.get('neighbors', True)
+        self.use_content = options.get('content_analysis', True)
+
+        # Column values and row-/column-level neighbor fragments, built on first use
+        self._columns: Dict[int, Any] = {}
+        self._row_labels: Optional[List[Optional[str]]] = None
+        self._categories: Dict[int, List[Optional[str]]] = {}
+
+        # Content fragment per distinct value, joined context per fragment tuple
+        self._content_fragments: Dict[str, str] = {}
+        self._joined: Dict[Tuple[Optional[str], ...], str] = {}
+
+    def _column(self, col_idx: int):
+        values = self._columns.get(col_idx)
+        if values is None:
+            values = self.df.iloc[:, col_idx].to_numpy(dtype=object)
+            self._columns[col_idx] = values
+        return values
+
+    def _row_label(self, row_idx: int) -> Optional[str]:
+        if self._row_labels is None:
+            memo: Dict[Any, Optional[str]] = {}
+            self._row_labels = [
+                memo[v] if v in memo else memo.setdefault(v, _row_label_fragment(v))
+                for v in self._column(0)
+            ]
+        return self._row_labels[row_idx]
+
+    def _category(self, row_idx: int, col_idx: int) -> Optional[str]:
+        categories = self._categories.get(col_idx)
+        if categories is None:
+            memo: Dict[Any, Optional[str]] = {}
+            # Row r takes its category from row r-1 of the same column
+            categories = [None] + [
+                memo[v] if v in memo else memo.setdefault(v, _category_fragment(v))
+                for v in self._column(col_idx)[:-1]
+            ]
+            self._categories[col_idx] = categories
+        return categories[row_idx]
+
+    def _content(self, value: str) -> Optional[str]:
+        fragment = self._content_fragments.get(value)
+        if fragment is None:
+            fragment = sys.intern(self.extractor._infer_content_context(value))
+            self._content_fragments[value] = fragment
+        return fragment or None
+
+    def context(self, row_idx: int, col_idx: int) -> str:
+        """Context string for a cell, joined from precomputed fragments."""
+        in_bounds = row_idx < self.n_rows and col_idx < self.n_cols
+
+        comment = self.comments.get((row_idx, col_idx))
+        column = self.column_fragments[col_idx] if col_idx < self.n_cols else None
+
+        category = row_label = None
+        if self.use_neighbors and self.df is not None:
+            if 0 < row_idx <= self.n_rows and col_idx < self.n_cols:
+                category = self._category(row_idx, col_idx)
+            if col_idx > 0 and row_idx < self.n_rows:
+                row_label = self._row_label(row_idx)
+
+        content = None
+        if self.use_content and in_bounds:
+            value = self._column(col_idx)[row_idx]
+            if value and isinstance(value, str):
+                content = self._content(value)
+
+        key = (
+            self.game_fragment,
+            sys.intern(f"[Comment] {comment}") if comment else None,
+            column,
+            category,
+            row_label,
+            content,
+            self.sheet_fragment
+        )
+        joined = self._joined.get(key)
+        if joined is None:
+            joined = " | ".join(part for part in key if part)
+            self._joined[key] = joined
+        return joined
+
+
 class ContextExtractor:
     """Extract context information for translation tasks."""
 
@@ -36,6 +172,24 @@ class ContextExtractor:
 
         self.context_options = {**default_options, **(context_options or {})}
 
+        # Game context is identical for every task
+        self.game_context = sys.intern(game_info.to_context_string()) if game_info else ""
+
+        # sheet_name -> precomputed context table
+        self._tables: Dict[str, SheetContextTable] = {}
+
+    def precompute_sheet(self, excel_df: ExcelDataFrame, sheet_name: str) -> SheetContextTable:
+        """Build (or reuse) the context table for a sheet."""
+        table = self._tables.get(sheet_name)
+        if table is None or table.excel_df is not excel_df:
+            table = SheetContextTable(self, excel_df, sheet_name)
+            self._tables[sheet_name] = table
+        return table
+
+    def clear_precomputed(self):
+        """Drop precomputed context tables (call after the sheet data changes)."""
+        self._tables.clear()
+
     def extract_context(
         self,
         excel_df: ExcelDataFrame,
@@ -44,6 +198,16 @@ class ContextExtractor:
         col_idx: int
     ) -> str:
         """Extract context for a specific cell."""
+        return self.precompute_sheet(excel_df, sheet_name).context(row_idx, col_idx)
+
+    def extract_context_uncached(
+        self,
+        excel_df: ExcelDataFrame,
+        sheet_name: str,
+        row_idx: int,
+        col_idx: int
+    ) -> str:
+        """Extract context for a specific cell without the sheet table."""
         context_parts = []
 
         # 1. Add game context if available and enabled
@@ -104,16 +268,16 @@ class ContextExtractor:
         # Check if previous row is a header/category
         if row_idx > 0:
             prev_cell = df.iloc[row_idx - 1, col_idx] if row_idx - 1 < len(df) else None
-            if prev_cell and isinstance(prev_cell, str):
-                # Check if it looks like a header
-                if prev_cell.isupper() or prev_cell.endswith(':') or len(prev_cell) < 20:
-                    context_parts.append(f"[Category] {prev_cell}")
+            # Check if it looks like a header
+            category = _category_fragment(prev_cell)
+            if category:
+                context_parts.append(category)
 
         # Check first cell in row (often contains context)
         if col_idx > 0:
-            first_cell = df.iloc[row_idx, 0]
-            if first_cell and isinstance(first_cell, str) and len(first_cell) < 50:
-                context_parts.append(f"[Row Label] {first_cell}")
+            row_label = _row_label_fragment(df.iloc[row_idx, 0])
+            if row_label:
+                context_parts.append(row_label)
 
         return " | ".join(context_parts)
 
@@ -12,6 +12,7 @@ from services.llm.base_provider import (
     TranslationResponse
 )
 from services.llm.batch_translator import BatchTranslator
+from services.llm.compiled_prompt import merge_prompt_stats
 from models.task_dataframe import TaskDataFrameManager, TaskStatus
 from services.executor.progress_tracker import progress_tracker
 
@@ -32,7 +33,7 @@ class BatchExecutor:
         self.llm_provider = llm_provider
         self.use_batch_optimization = use_batch_optimization
         if use_batch_optimization:
-            self.batch_translator = BatchTranslator(llm_provider, batch_size=5)
+            self.batch_translator = BatchTranslator(llm_provider)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     async def execute_batch(
@@ -80,7 +81,7 @@ class BatchExecutor:
                 )
 
         # Prepare translation requests
-        requests = self._prepare_requests(tasks, game_info, glossary_config)
+        requests = self._prepare_requests(tasks, game_info, glossary_config, session_id)
 
         # Execute translations
         results = {
@@ -89,49 +90,46 @@ class BatchExecutor:
             'successful': 0,
             'failed': 0,
             'total_tokens': 0,
-            'total_cost': 0.0
+            'total_cost': 0.0,
+            'prompt_stats': {},
+            'models': {}  # Completed tasks per model that served them
         }
 
+        # Tasks already written to the store as their streamed result arrived
+        committed = set()
+
+        async def commit_streamed(task: Dict[str, Any]):
+            await self._commit_completed(task, task_manager, results, session_id)
+            committed.add(task['task_id'])
+
         try:
             if self.use_batch_optimization:
                 # Use optimized batch translator
                 translated_tasks = await self.batch_translator.translate_batch_optimized(
                     tasks,
-                    glossary_config=glossary_config  # ✨ Pass glossary config
+                    glossary_config=glossary_config,  # ✨ Pass glossary config
+                    session_id=session_id,
+                    prompt_stats=results['prompt_stats'],
+                    on_result=commit_streamed
                 )
 
                 # Process translated tasks
                 for task in translated_tasks:
                     if task.get('status') == 'completed':
-                        # ✨ Apply post-processing if needed
-                        from services.executor.post_processor import PostProcessor
-                        final_result = PostProcessor.apply_post_processing(task, task.get('result', ''))
-
+                        self._count_model(results, task.get('llm_model'))
+                    if task['task_id'] in committed:
+                        # Token usage is only known once the stream has ended
                         task_manager.update_task(
                             task['task_id'],
                             {
-                                'status': TaskStatus.COMPLETED,
-                                'result': final_result,  # ✨ Use post-processed result
                                 'confidence': task.get('confidence', 0.7),
-                                'end_time': datetime.now(),
-                                'duration_ms': task.get('duration_ms', 0),
                                 'token_count': task.get('token_count', 0),
                                 'llm_model': task.get('llm_model', '')
                             }
                         )
-                        results['successful'] += 1
                         results['total_tokens'] += task.get('token_count', 0)
-
-                        # Trigger progress update for WebSocket
-                        if session_id:
-                            await progress_tracker.update_task_progress(
-                                session_id,
-                                task['task_id'],
-                                TaskStatus.COMPLETED,
-                                result=final_result,  # ✨ Use post-processed result
-                                confidence=task.get('confidence', 0.7),
-                                duration_ms=task.get('duration_ms', 0)
-                            )
+                    elif task.get('status') == 'completed':
+                        await self._commit_completed(task, task_manager, results, session_id)
                     else:
                         task_manager.update_task(
                             task['task_id'],
@@ -157,12 +155,15 @@ class BatchExecutor:
 
                 # Process responses
                 for task, response in zip(tasks, responses):
+                    merge_prompt_stats(results['prompt_stats'], response.prompt_stats)
                     await self._process_response(task, response, task_manager, results)
 
         except Exception as e:
             self.logger.error(f"Batch {batch_id} execution failed: {str(e)}")
-            # Mark all tasks as failed
+            # Mark all tasks as failed (streamed results are kept)
             for task in tasks:
+                if task['task_id'] in committed:
+                    continue
                 task_manager.update_task(
                     task['task_id'],
                     {
@@ -171,7 +172,7 @@ class BatchExecutor:
                         'end_time': datetime.now()
                     }
                 )
-            results['failed'] = len(tasks)
+            results['failed'] = len(tasks) - len(committed)
 
         # Calculate execution time
         results['duration_seconds'] = time.time() - start_time
@@ -190,20 +191,67 @@ class BatchExecutor:
             except Exception as e:
                 self.logger.warning(f"Failed to save task_manager to file: {e}")
 
+        prompt_stats = results['prompt_stats']
         self.logger.info(
             f"Batch {batch_id} completed: "
             f"{results['successful']} successful, "
             f"{results['failed']} failed, "
-            f"duration={results['duration_seconds']:.2f}s"
+            f"duration={results['duration_seconds']:.2f}s, "
+            f"prompt_bytes={prompt_stats.get('assembled_bytes', 0)}, "
+            f"prompt_build_ms={prompt_stats.get('build_ms', 0.0):.2f}, "
+            f"prefix_hits={prompt_stats.get('prefix_hits', 0)}/{prompt_stats.get('prompts', 0)}, "
+            f"input_tokens={prompt_stats.get('actual_input_tokens', 0)}"
+            f"/{prompt_stats.get('predicted_input_tokens', 0)} predicted, "
+            f"output_tokens={prompt_stats.get('actual_output_tokens', 0)}"
+            f"/{prompt_stats.get('predicted_output_tokens', 0)} predicted"
         )
 
         return results
 
+    async def _commit_completed(
+        self,
+        task: Dict[str, Any],
+        task_manager: TaskDataFrameManager,
+        results: Dict[str, Any],
+        session_id: Optional[str]
+    ) -> None:
+        """Write a completed batch-translated task to the task store."""
+        # ✨ Apply post-processing if needed
+        from services.executor.post_processor import PostProcessor
+        final_result = PostProcessor.apply_post_processing(task, task.get('result', ''))
+
+        task_manager.update_task(
+            task['task_id'],
+            {
+                'status': TaskStatus.COMPLETED,
+                'result': final_result,  # ✨ Use post-processed result
+                'confidence': task.get('confidence', 0.7),
+                'end_time': datetime.now(),
+                'duration_ms': task.get('duration_ms', 0),
+                'token_count': task.get('token_count', 0),
+                'llm_model': task.get('llm_model', '')
+            }
+        )
+        results['successful'] += 1
+        results['total_tokens'] += task.get('token_count', 0)
+
+        # Trigger progress update for WebSocket
+        if session_id:
+            await progress_tracker.update_task_progress(
+                session_id,
+                task['task_id'],
+                TaskStatus.COMPLETED,
+                result=final_result,  # ✨ Use post-processed result
+                confidence=task.get('confidence', 0.7),
+                duration_ms=task.get('duration_ms', 0)
+            )
+
     def _prepare_requests(
         self,
         tasks: List[Dict[str, Any]],
         game_info: Optional[Dict[str, Any]],
-        glossary_config: Optional[Dict[str, Any]] = None  # ✨ Glossary configuration
+        glossary_config: Optional[Dict[str, Any]] = None,  # ✨ Glossary configuration
+        session_id: Optional[str] = None
     ) -> List[TranslationRequest]:
         """Prepare translation requests from tasks."""
         requests = []
@@ -224,7 +272,8 @@ class BatchExecutor:
                 task_id=task['task_id'],
                 batch_id=task.get('batch_id'),
                 group_id=task.get('group_id'),
-                glossary_config=glossary_config  # ✨ Pass glossary config
+                glossary_config=glossary_config,  # ✨ Pass glossary config
+                session_id=session_id
             )
             requests.append(request)
 
@@ -273,6 +322,7 @@ class BatchExecutor:
                     }
                 )
                 results['successful'] += 1
+                self._count_model(results, response.model)
 
                 # Update token usage
                 results['total_tokens'] += response.token_usage.get('total_tokens', 0)
@@ -299,6 +349,11 @@ class BatchExecutor:
             )
             results['failed'] += 1
 
+    @staticmethod
+    def _count_model(results: Dict[str, Any], model: Optional[str]) -> None:
+        if model:
+            results['models'][model] = results['models'].get(model, 0) + 1
+
     def _estimate_cost(self, token_usage: Dict[str, int], model: str) -> float:
         """
         Estimate cost based on token usage.
@@ -394,5 +449,7 @@ class RetryableBatchExecutor(BatchExecutor):
             results['failed'] = retry_results['failed']  # Update with final failed count
             results['total_tokens'] += retry_results['total_tokens']
             results['total_cost'] += retry_results['total_cost']
+            for model, count in retry_results['models'].items():
+                results['models'][model] = results['models'].get(model, 0) + count
 
         return results
\ No newline at end of file
@@ -0,0 +1,416 @@
+"""Cost- and difficulty-aware routing of batched tasks to model tiers.
+
+Runs between batch allocation and scheduling. Each pending task is classified
+by config rules (first match wins) over its source text length, task type,
+context comment and glossary hits, and mixed
+batches are split so every batch runs on a single tier's model. Tier budgets
+cap the share of tasks, and optionally the estimated cost, that may go to the
+more expensive tiers; excess tasks move down one tier at a time, easiest
+first. Throughput, cost and latency are recorded per tier. Each batch is
+priced at the model(s) that actually served it (a router or failover may
+answer with another model than the tier's) and also at the default tier's
+model so the savings are measurable.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from services.glossary_manager import glossary_manager
+from services.llm.base_provider import BaseLLMProvider
+from services.llm.cost_calculator import cost_calculator
+from services.llm.token_estimator import get_estimator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelTier:
+    """A model tier; tiers are ordered from cheapest to most capable."""
+
+    name: str
+    provider: Optional[str] = None  # llm.providers key, None = the execution's provider
+    model: Optional[str] = None  # Model override for the tier's provider
+    max_share: Optional[float] = None  # Maximum fraction of routed tasks
+
+
+@dataclass
+class TierRule:
+    """Task feature conditions (all set ones must hold) selecting a tier."""
+
+    tier: str
+    task_types: Optional[List[str]] = None
+    min_chars: Optional[int] = None
+    max_chars: Optional[int] = None
+    min_glossary_hits: Optional[int] = None
+    max_glossary_hits: Optional[int] = None
+    has_comment: Optional[bool] = None
+
+    @property
+    def uses_glossary(self) -> bool:
+        return self.min_glossary_hits is not None or self.max_glossary_hits is not None
+
+    def matches(self, features: Dict[str, Any]) -> bool:
+        if self.task_types is not None and features['task_type'] not in self.task_types:
+            return False
+        if self.min_chars is not None and features['char_count'] < self.min_chars:
+            return False
+        if self.max_chars is not None and features['char_count'] > self.max_chars:
+            return False
+        if self.min_glossary_hits is not None and features['glossary_hits'] < self.min_glossary_hits:
+            return False
+        if self.max_glossary_hits is not None and features['glossary_hits'] > self.max_glossary_hits:
+            return False
+        if self.has_comment is not None and features['has_comment'] != self.has_comment:
+            return False
+        return True
+
+
+def task_features(task: Dict[str, Any], glossary: Optional[Dict] = None) -> Dict[str, Any]:
+    """Routing features of a task."""
+    source_text = str(task.get('source_text') or '')
+    glossary_hits = 0
+    if glossary:
+        glossary_hits = len(glossary_manager.match_terms_in_text(
+            source_text, glossary, str(task.get('target_lang') or '')
+        ))
+    return {
+        # Not task['char_count']: the allocator overwrites it with text + context length
+        'char_count': len(source_text),
+        'task_type': task.get('task_type') or 'normal',
+        'glossary_hits': glossary_hits,
+        'has_comment': '[Comment]' in str(task.get('source_context') or '')
+    }
+
+
+class ModelTierRouter:
+    """Assign tasks to model tiers and account throughput/cost/latency per tier."""
+
+    def __init__(
+        self,
+        tiers: List[ModelTier],
+        rules: List[TierRule],
+        default_tier: str,
+        enabled: bool = True,
+        max_estimated_cost_usd: Optional[float] = None,
+        latency_window: int = 500
+    ):
+        """
+        Initialize model tier router.
+
+        Args:
+            tiers: Tiers from cheapest to most capable
+            rules: Ordered rules; the first matching rule picks the tier
+            default_tier: Tier of tasks no rule matches (also the savings baseline)
+            enabled: Whether execution routes tasks at all
+            max_estimated_cost_usd: Optional cap on the estimated cost of one execution
+            latency_window: Batch latency samples kept per tier
+
+        Raises:
+            ValueError: If a rule or the default references an unknown tier
+        """
+        names = [tier.name for tier in tiers]
+        for name in [default_tier] + [rule.tier for rule in rules]:
+            if name not in names:
+                raise ValueError(f"Unknown model tier: {name}. Configured: {', '.join(names)}")
+
+        self.tiers = tiers
+        self.rules = rules
+        self.default_tier = default_tier
+        self.enabled = enabled
+        self.max_estimated_cost_usd = max_estimated_cost_usd
+        self.latency_window = latency_window
+
+        self._rank = {name: index for index, name in enumerate(names)}
+        self._models: Dict[str, str] = {}
+        self._latency: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'routed': 0,
+            'split_batches': 0,
+            'by_tier': {}
+        }
+
+    def classify(self, features: Dict[str, Any]) -> str:
+        """Tier selected by the first matching rule."""
+        for rule in self.rules:
+            if rule.matches(features):
+                return rule.tier
+        return self.default_tier
+
+    def route_batches(
+        self,
+        batches: Dict[str, List[Dict[str, Any]]],
+        glossary_config: Optional[Dict[str, Any]] = None,
+        models: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Assign every task a tier and split mixed batches per tier.
+
+        Args:
+            batches: batch_id -> tasks (from the allocator)
+            glossary_config: Execution glossary configuration
+            models: Model name per tier (for cost estimates and stats)
+
+        Returns:
+            Routed batches; a split batch gets one '<batch_id>@<tier>' entry per tier
+        """
+        if models:
+            self._models.update(models)
+
+        glossary = None
+        if glossary_config and glossary_config.get('enabled') and any(rule.uses_glossary for rule in self.rules):
+            glossary = glossary_manager.load_glossary(glossary_config.get('id'))
+
+        entries = []
+        for batch_id, tasks in batches.items():
+            for task in tasks:
+                features = task_features(task, glossary)
+                entries.append({'batch_id': batch_id, 'task': task, 'features': features,
+                                'tier': self.classify(features), 'downgraded': False})
+
+        self._enforce_shares(entries)
+        if self.max_estimated_cost_usd is not None:
+            self._enforce_cost_budget(entries)
+
+        routed: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for entry in entries:
+            entry['task']['model_tier'] = entry['tier']
+            routed.setdefault(entry['batch_id'], {}).setdefault(entry['tier'], []).append(entry['task'])
+
+        result = {}
+        for batch_id, by_tier in routed.items():
+            if len(by_tier) == 1:
+                result[batch_id] = next(iter(by_tier.values()))
+                continue
+            self.stats['split_batches'] += 1
+            for tier, tasks in by_tier.items():
+                result[f"{batch_id}@{tier}"] = tasks
+
+        with self._lock:
+            self.stats['routed'] += len(entries)
+            for entry in entries:
+                tier_stats = self._tier_stats(entry['tier'])
+                tier_stats['routed'] += 1
+                tier_stats['downgraded'] += int(entry['downgraded'])
+                tier_stats['estimated_cost_usd'] += self._estimate(entry['task'], entry['tier'])
+
+        counts = {tier.name: sum(1 for e in entries if e['tier'] == tier.name) for tier in self.tiers}
+        logger.info(f"Routed {len(entries)} tasks to model tiers {counts} ({len(result)} batches)")
+        return result
+
+    def _easiest_first(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return sorted(entries, key=lambda e: (e['features']['glossary_hits'], e['features']['char_count']))
+
+    def _downgrade(self, entry: Dict[str, Any]):
+        entry['tier'] = self.tiers[self._rank[entry['tier']] - 1].name
+        entry['downgraded'] = True
+
+    def _enforce_shares(self, entries: List[Dict[str, Any]]):
+        """Move tasks over a tier's max_share one tier down, most expensive tier first."""
+        for tier in reversed(self.tiers[1:]):
+            if tier.max_share is None:
+                continue
+            members = [entry for entry in entries if entry['tier'] == tier.name]
+            excess = len(members) - math.floor(tier.max_share * len(entries))
+            for entry in self._easiest_first(members)[:max(excess, 0)]:
+                self._downgrade(entry)
+
+    def _enforce_cost_budget(self, entries: List[Dict[str, Any]]):
+        """Downgrade tasks until the estimated execution cost fits the budget."""
+        total = sum(self._estimate(entry['task'], entry['tier']) for entry in entries)
+        for tier in reversed(self.tiers[1:]):
+            members = [entry for entry in entries if entry['tier'] == tier.name]
+            for entry in self._easiest_first(members):
+                if total <= self.max_estimated_cost_usd:
+                    return
+                before = self._estimate(entry['task'], entry['tier'])
+                self._downgrade(entry)
+                total += self._estimate(entry['task'], entry['tier']) - before
+
+    def _estimate(self, task: Dict[str, Any], tier: str) -> float:
+        """Estimated USD cost of one task on a tier's model."""
+        model = self._models.get(tier)
+        if not model:
+            return 0.0
+        tokens = get_estimator(model).estimate_task(task)
+        return float(cost_calculator.estimate_cost(tokens['input_tokens'], tokens['output_tokens'], model))
+
+    def record_batch(self, tier: str, task_count: int, result: Dict[str, Any]) -> float:
+        """
+        Record an executed batch.
+
+        Tokens are priced at the models reported in result['models'] (completed
+        tasks per served model), falling back to the tier's model.
+
+        Args:
+            tier: Tier the batch ran on
+            task_count: Tasks in the batch
+            result: BatchExecutor result
+
+        Returns:
+            Cost of the batch in USD
+        """
+        prompt_stats = result.get('prompt_stats') or {}
+        output_tokens = prompt_stats.get('actual_output_tokens', 0)
+        input_tokens = prompt_stats.get('actual_input_tokens', 0)
+        if not input_tokens and not output_tokens:
+            # No prompt/completion split reported: price the total as input
+            input_tokens = result.get('total_tokens', 0)
+
+        model = self._models.get(tier, '')
+        baseline_model = self._models.get(self.default_tier, model)
+        served = {name: count for name, count in (result.get('models') or {}).items() if name and count}
+        if not served:
+            served = {model: 1}
+        served_total = sum(served.values())
+        cost = sum(
+            float(cost_calculator.estimate_cost(
+                input_tokens * count / served_total, output_tokens * count / served_total, name
+            ))
+            for name, count in served.items()
+        )
+        baseline_cost = float(cost_calculator.estimate_cost(input_tokens, output_tokens, baseline_model))
+
+        duration = result.get('duration_seconds', 0.0)
+        now = time.monotonic()
+        with self._lock:
+            tier_stats = self._tier_stats(tier)
+            tier_stats['batches'] += 1
+            tier_stats['tasks'] += task_count
+            tier_stats['successful'] += result.get('successful', 0)
+            tier_stats['failed'] += result.get('failed', 0)
+            tier_stats['input_tokens'] += input_tokens
+            tier_stats['output_tokens'] += output_tokens
+            tier_stats['cost_usd'] += cost
+            tier_stats['baseline_cost_usd'] += baseline_cost
+            for name, count in served.items():
+                tier_stats['served_models'][name] = tier_stats['served_models'].get(name, 0) + count
+            if tier_stats['first_started'] is None:
+                tier_stats['first_started'] = now - duration
+            tier_stats['last_finished'] = now
+            samples = self._latency.setdefault(tier, deque(maxlen=self.latency_window))
+            samples.append(duration * 1000)
+        return cost
+
+    def _tier_stats(self, tier: str) -> Dict[str, Any]:
+        return self.stats['by_tier'].setdefault(tier, {
+            'routed': 0,
+            'downgraded': 0,
+            'estimated_cost_usd': 0.0,
+            'batches': 0,
+            'tasks': 0,
+            'successful': 0,
+            'failed': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cost_usd': 0.0,
+            'baseline_cost_usd': 0.0,
+            'served_models': {},
+            'first_started': None,
+            'last_finished': None
+        })
+
+    def build_providers(self, default_provider: BaseLLMProvider) -> Dict[str, BaseLLMProvider]:
+        """
+        Create a provider per tier (tiers without a provider or model use the execution's).
+
+        Args:
+            default_provider: Provider the execution was started with
+
+        Returns:
+            tier -> provider
+        """
+        from services.llm.llm_factory import LLMFactory
+        from utils.config_manager import config_manager
+
+        providers = {}
+        for tier in self.tiers:
+            provider = default_provider
+            if tier.provider or tier.model:
+                try:
+                    provider = LLMFactory.create_from_config_file(
+                        config_manager.get_config(),
+                        tier.provider,
+                        overrides={'model': tier.model} if tier.model else None
+                    )
+                except ValueError as e:
+                    logger.warning(f"Model tier {tier.name} falls back to the execution provider: {e}")
+            providers[tier.name] = provider
+        return providers
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier routing, throughput, cost and latency, plus savings against the default tier."""
+        with self._lock:
+            by_tier_raw = {tier: dict(stats) for tier, stats in self.stats['by_tier'].items()}
+            latency = {tier: list(samples) for tier, samples in self._latency.items()}
+
+        by_tier = {}
+        for tier in self.tiers:
+            stats = by_tier_raw.get(tier.name)
+            if stats is None:
+                continue
+            first_started, last_finished = stats.pop('first_started'), stats.pop('last_finished')
+            elapsed = (last_finished - first_started) if first_started is not None else 0.0
+            entry = {
+                'provider': tier.provider,
+                'model': self._models.get(tier.name),
+                **stats,
+                'estimated_cost_usd': round(stats['estimated_cost_usd'], 6),
+                'cost_usd': round(stats['cost_usd'], 6),
+                'baseline_cost_usd': round(stats['baseline_cost_usd'], 6),
+                'served_models': dict(stats['served_models']),
+                'tasks_per_minute': round(stats['successful'] / elapsed * 60, 1) if elapsed > 0 else 0.0
+            }
+            samples = latency.get(tier.name)
+            if samples:
+                p50, p95 = np.percentile(samples, [50, 95])
+                entry['avg_latency_ms'] = round(float(np.mean(samples)), 1)
+                entry['p50_latency_ms'] = round(float(p50), 1)
+                entry['p95_latency_ms'] = round(float(p95), 1)
+            by_tier[tier.name] = entry
+
+        cost = sum(entry['cost_usd'] for entry in by_tier.values())
+        baseline = sum(entry['baseline_cost_usd'] for entry in by_tier.values())
+        return {
+            'enabled': self.enabled,
+            'default_tier': self.default_tier,
+            'routed': self.stats['routed'],
+            'split_batches': self.stats['split_batches'],
+            'max_estimated_cost_usd': self.max_estimated_cost_usd,
+            'cost_usd': round(cost, 6),
+            'baseline_cost_usd': round(baseline, 6),
+            'savings_usd': round(baseline - cost, 6),
+            'savings_ratio': round(1 - cost / baseline, 4) if baseline > 0 else 0.0,
+            'by_tier': by_tier
+        }
+
+
+def _build_default_router() -> ModelTierRouter:
+    """Create the model tier router from task_execution.model_tiers config."""
+    from utils.config_manager import config_manager
+
+    cfg = config_manager.get('task_execution.model_tiers', {}) or {}
+    tiers = [
+        ModelTier(entry['name'], provider=entry.get('provider'), model=entry.get('model'),
+                  max_share=entry.get('max_share'))
+        for entry in cfg.get('tiers') or [{'name': 'standard'}]
+    ]
+    rules = [TierRule(**rule) for rule in cfg.get('rules') or []]
+    return ModelTierRouter(
+        tiers,
+        rules,
+        default_tier=cfg.get('default_tier', tiers[0].name),
+        enabled=cfg.get('enabled', False),
+        max_estimated_cost_usd=cfg.get('max_estimated_cost_usd')
+    )
+
+
+# Global model tier router (stats accumulate across executions)
+model_tier_router = _build_default_router()
@@ -0,0 +1,229 @@
+"""Priority- and deadline-aware batch scheduling for the worker pool.
+
+Batches are queued per class (task type). Classes share workers by stride
+scheduling with configurable weights, so urgent yellow re-translations get
+most dispatches without starving bulk normal work. Inside a class, batches
+are ordered by deadline, task priority and sheet size
+(small sheets finish first). A class not served for max_wait_seconds, or a
+batch whose deadline has passed, is dispatched ahead of the weighted order.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# Most urgent first; a mixed batch takes the class of its most urgent task
+CLASS_ORDER = ('yellow', 'blue', 'normal', 'caps')
+
+DEFAULT_CLASS_WEIGHTS = {
+    'yellow': 8,
+    'blue': 4,
+    'normal': 2,
+    'caps': 1
+}
+
+
+@dataclass(order=True)
+class ScheduledBatch:
+    """Queue entry; ordering is the in-class dispatch order."""
+
+    sort_key: Tuple
+    batch_id: str = field(compare=False)
+    tasks: List[Dict[str, Any]] = field(compare=False)
+    batch_class: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    deadline: Optional[float] = field(compare=False, default=None)
+
+
+def classify_batch(tasks: List[Dict[str, Any]]) -> str:
+    """Scheduling class of a batch (its most urgent task type)."""
+    types = {task.get('task_type') or 'normal' for task in tasks}
+    for batch_class in CLASS_ORDER:
+        if batch_class in types:
+            return batch_class
+    return 'normal'
+
+
+def _class_rank(batch_class: str) -> int:
+    return CLASS_ORDER.index(batch_class) if batch_class in CLASS_ORDER else len(CLASS_ORDER)
+
+
+class PriorityScheduler:
+    """Weighted-fair multi-class batch queue with starvation protection."""
+
+    def __init__(
+        self,
+        class_weights: Optional[Dict[str, float]] = None,
+        max_wait_seconds: float = 120.0,
+        wait_window: int = 500
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            class_weights: Dispatch share per class (missing classes use DEFAULT_CLASS_WEIGHTS)
+            max_wait_seconds: Time without a dispatch after which a class is served first
+            wait_window: Wait-time samples kept per class
+        """
+        self.class_weights = {**DEFAULT_CLASS_WEIGHTS, **(class_weights or {})}
+        self.max_wait_seconds = max_wait_seconds
+        self.wait_window = wait_window
+
+        self._queues: Dict[str, List[ScheduledBatch]] = {}
+        self._pass: Dict[str, float] = {}
+        self._served_at: Dict[str, float] = {}  # Last dispatch (or activation) per class
+        self._seq = itertools.count()
+        self._available = asyncio.Event()
+        self._waits: Dict[str, deque] = {}
+        self.stats = {
+            'enqueued': 0,
+            'dispatched': 0,
+            'starvation_promotions': 0,
+            'deadline_promotions': 0,
+            'by_class': {}
+        }
+
+    def put_nowait(
+        self,
+        batch_id: str,
+        tasks: List[Dict[str, Any]],
+        sheet_size: int = 0,
+        deadline: Optional[float] = None
+    ) -> str:
+        """
+        Queue a batch.
+
+        Args:
+            batch_id: Batch identifier
+            tasks: Batch tasks
+            sheet_size: Pending tasks of the batch's sheet (smaller first)
+            deadline: Optional monotonic deadline (earlier first)
+
+        Returns:
+            Scheduling class of the batch
+        """
+        batch_class = classify_batch(tasks)
+        task_priority = max((int(task.get('priority') or 0) for task in tasks), default=0)
+        sort_key = (
+            deadline if deadline is not None else math.inf,
+            -task_priority,
+            sheet_size,
+            next(self._seq)
+        )
+
+        queue = self._queues.setdefault(batch_class, [])
+        if not queue:
+            # A class that was idle joins at the current virtual time (no banked credit)
+            active = [self._pass[name] for name, items in self._queues.items() if items]
+            self._pass[batch_class] = max(self._pass.get(batch_class, 0.0), min(active, default=0.0))
+            self._served_at[batch_class] = time.monotonic()
+
+        heapq.heappush(queue, ScheduledBatch(sort_key, batch_id, tasks, batch_class, time.monotonic(), deadline))
+        self.stats['enqueued'] += 1
+        self._class_stats(batch_class)['enqueued'] += 1
+        self._available.set()
+        return batch_class
+
+    async def get(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """Wait for and return the next (batch_id, tasks)."""
+        while True:
+            entry = self.pop_nowait()
+            if entry is not None:
+                return entry.batch_id, entry.tasks
+            self._available.clear()
+            await self._available.wait()
+
+    def pop_nowait(self) -> Optional[ScheduledBatch]:
+        """Dispatch the next batch, or None if empty."""
+        active = [name for name, items in self._queues.items() if items]
+        if not active:
+            return None
+
+        now = time.monotonic()
+        batch_class = self._overdue_class(active, now)
+        if batch_class is None:
+            batch_class = min(active, key=lambda name: (self._pass[name], _class_rank(name)))
+
+        entry = heapq.heappop(self._queues[batch_class])
+        self._pass[batch_class] += 1.0 / max(self.class_weights.get(batch_class, 1), 1e-6)
+        self._served_at[batch_class] = now
+
+        wait_ms = (now - entry.enqueued_at) * 1000
+        samples = self._waits.setdefault(batch_class, deque(maxlen=self.wait_window))
+        samples.append(wait_ms)
+        class_stats = self._class_stats(batch_class)
+        class_stats['dispatched'] += 1
+        class_stats['max_wait_ms'] = max(class_stats['max_wait_ms'], round(wait_ms, 1))
+        self.stats['dispatched'] += 1
+        return entry
+
+    def _overdue_class(self, active: List[str], now: float) -> Optional[str]:
+        """Class whose head missed its deadline, else the class starved longest past max_wait."""
+        expired = [name for name in active
+                   if self._queues[name][0].deadline is not None and self._queues[name][0].deadline <= now]
+        if expired:
+            self.stats['deadline_promotions'] += 1
+            return min(expired, key=lambda name: self._queues[name][0].deadline)
+
+        starved = [name for name in active if now - self._served_at[name] >= self.max_wait_seconds]
+        if starved:
+            self.stats['starvation_promotions'] += 1
+            return min(starved, key=lambda name: self._served_at[name])
+        return None
+
+    def _class_stats(self, batch_class: str) -> Dict[str, Any]:
+        return self.stats['by_class'].setdefault(
+            batch_class, {'enqueued': 0, 'dispatched': 0, 'max_wait_ms': 0.0}
+        )
+
+    def qsize(self) -> int:
+        return sum(len(items) for items in self._queues.values())
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def clear(self):
+        """Drop all queued batches."""
+        for items in self._queues.values():
+            items.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Dispatch counters and queue wait percentiles per class."""
+        by_class = {}
+        for batch_class, class_stats in self.stats['by_class'].items():
+            samples = list(self._waits.get(batch_class, ()))
+            entry = {
+                **class_stats,
+                'weight': self.class_weights.get(batch_class, 1),
+                'queued': len(self._queues.get(batch_class, ()))
+            }
+            if samples:
+                p50, p95 = np.percentile(samples, [50, 95])
+                entry['p50_wait_ms'] = round(float(p50), 1)
+                entry['p95_wait_ms'] = round(float(p95), 1)
+            by_class[batch_class] = entry
+
+        return {
+            **{key: value for key, value in self.stats.items() if key != 'by_class'},
+            'queued': self.qsize(),
+            'max_wait_seconds': self.max_wait_seconds,
+            'by_class': by_class
+        }
+
+
+def build_scheduler() -> PriorityScheduler:
+    """Create a scheduler from task_execution.scheduling config."""
+    from utils.config_manager import config_manager
+
+    cfg = config_manager.get('task_execution.scheduling', {}) or {}
+    return PriorityScheduler(
+        class_weights=cfg.get('class_weights'),
+        max_wait_seconds=cfg.get('max_wait_seconds', 120.0)
+    )
@@ -1,15 +1,20 @@
 """Worker pool for concurrent batch execution."""
 
 import asyncio
+import time
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import logging
 from enum import Enum
 
 from services.executor.batch_executor import RetryableBatchExecutor
+from services.executor.priority_scheduler import build_scheduler
+from services.executor.model_tier_router import model_tier_router
 from services.llm.base_provider import BaseLLMProvider
 from models.task_dataframe import TaskDataFrameManager, TaskStatus
 from utils.session_manager import session_manager
+from services.persistence.task_write_behind import task_write_behind
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +41,13 @@ class WorkerPool:
         """
         self.max_workers = max_workers
         self.active_workers = []
-        self.queue = asyncio.Queue()
+        self.queue = build_scheduler()
         self.status = ExecutionStatus.IDLE
         self.current_session_id = None
         self.llm_provider = None
+        self.tier_providers: Dict[str, BaseLLMProvider] = {}
+        self._persist_listener = None
+        self._persist_task_manager = None
         self.statistics = {
             'total_batches': 0,
             'completed_batches': 0,
@@ -56,7 +64,9 @@ class WorkerPool:
         self,
         session_id: str,
         llm_provider: BaseLLMProvider,
-        glossary_config: Dict[str, Any] = None  # ✨ Glossary configuration
+        glossary_config: Dict[str, Any] = None,  # ✨ Glossary configuration
+        sheet_deadlines: Optional[Dict[str, float]] = None,
+        model_routing: bool = True
     ) -> Dict[str, Any]:
         """
         Start translation execution.
@@ -65,6 +75,8 @@ class WorkerPool:
             session_id: Session ID
             llm_provider: LLM provider instance
             glossary_config: Glossary configuration
+            sheet_deadlines: Optional seconds-from-start deadline per sheet name
+            model_routing: Route tasks to model tiers (when task_execution.model_tiers is enabled)
 
         Returns:
             Execution status
@@ -103,6 +115,24 @@ class WorkerPool:
                 'message': 'No pending tasks to execute'
             }
 
+        # Feed every task state change into the write-behind queue
+        if task_write_behind.enabled:
+            await task_write_behind.start()
+            self._attach_persistence(task_manager, session_id)
+
+        # Route tasks to model tiers (mixed batches are split per tier)
+        self.tier_providers = {}
+        if model_routing and model_tier_router.enabled:
+            self.tier_providers = model_tier_router.build_providers(llm_provider)
+            batches = model_tier_router.route_batches(
+                batches,
+                glossary_config,
+                models={
+                    tier: getattr(provider, 'model', '') or provider.config.model
+                    for tier, provider in self.tier_providers.items()
+                }
+            )
+
         # Initialize statistics
         self.statistics = {
             'total_batches': len(batches),
@@ -121,9 +151,9 @@ class WorkerPool:
             f"{self.statistics['total_tasks']} tasks"
         )
 
-        # Add batches to queue
-        for batch_id, tasks in batches.items():
-            await self.queue.put((batch_id, tasks))
+        # Add batches to the priority scheduler (fresh per execution)
+        self.queue = build_scheduler()
+        self._enqueue_batches(batches, sheet_deadlines or {})
 
         # Start worker tasks
         self.active_workers = []
@@ -160,13 +190,10 @@ class WorkerPool:
 
         # Wait for workers to finish
         await asyncio.gather(*self.active_workers, return_exceptions=True)
+        await self._detach_persistence()
 
         # Clear queue
-        while not self.queue.empty():
-            try:
-                self.queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
+        self.queue.clear()
 
         self.statistics['end_time'] = datetime.now()
 
@@ -248,6 +275,8 @@ class WorkerPool:
             'completion_rate': progress,
             'estimated_remaining_seconds': estimated_remaining,
             'active_workers': len([w for w in self.active_workers if not w.done()]),
+            'scheduling': self.queue.get_stats(),
+            'model_tiers': model_tier_router.get_stats() if self.tier_providers else None,
             'start_time': (
                 self.statistics['start_time'].isoformat()
                 if self.statistics['start_time'] else None
@@ -266,7 +295,7 @@ class WorkerPool:
     ) -> None:
         """Worker coroutine for processing batches."""
         self.logger.info(f"{worker_name} started")
-        executor = RetryableBatchExecutor(self.llm_provider)
+        executors: Dict[Optional[str], RetryableBatchExecutor] = {}
 
         try:
             while self.status in [ExecutionStatus.RUNNING, ExecutionStatus.PAUSED]:
@@ -275,6 +304,9 @@ class WorkerPool:
                     await asyncio.sleep(1)
                     continue
 
+                # Back-pressure from the write-behind queue (no-op when disabled)
+                await task_write_behind.wait_for_capacity()
+
                 try:
                     # Get batch from queue with timeout
                     batch_id, tasks = await asyncio.wait_for(
@@ -284,6 +316,14 @@ class WorkerPool:
 
                     self.logger.info(f"{worker_name} processing batch {batch_id}")
 
+                    # One executor per model tier (None = unrouted, execution provider)
+                    tier = tasks[0].get('model_tier') if self.tier_providers else None
+                    executor = executors.get(tier)
+                    if executor is None:
+                        executor = executors[tier] = RetryableBatchExecutor(
+                            self.tier_providers.get(tier, self.llm_provider)
+                        )
+
                     # Execute batch with session_id for WebSocket progress updates
                     result = await executor.execute_batch(
                         batch_id,
@@ -294,6 +334,9 @@ class WorkerPool:
                         glossary_config=self.glossary_config  # ✨ Pass glossary config
                     )
 
+                    if tier is not None:
+                        result['total_cost'] = model_tier_router.record_batch(tier, len(tasks), result)
+
                     # Update statistics
                     self.statistics['completed_batches'] += 1
                     self.statistics['completed_tasks'] += result['successful']
@@ -324,6 +367,7 @@ class WorkerPool:
             if all(worker.done() for worker in self.active_workers):
                 self.status = ExecutionStatus.COMPLETED
                 self.statistics['end_time'] = datetime.now()
+                await self._detach_persistence()
 
                 # ✅ FIX: Save final task_manager and update session state
                 if self.current_session_id:
@@ -388,6 +432,58 @@ class WorkerPool:
                 f"({status['progress']['completed']}/{status['progress']['total']})"
             )
 
+    def _enqueue_batches(
+        self,
+        batches: Dict[str, List[Dict[str, Any]]],
+        sheet_deadlines: Dict[str, float]
+    ) -> None:
+        """Queue batches with their sheet size and deadline hints."""
+        sheet_sizes = Counter()
+        for tasks in batches.values():
+            sheet_sizes.update(task.get('sheet_name') for task in tasks)
+
+        now = time.monotonic()
+        for batch_id, tasks in batches.items():
+            sheet_name = tasks[0].get('sheet_name')
+            deadline = sheet_deadlines.get(sheet_name)
+            self.queue.put_nowait(
+                batch_id,
+                tasks,
+                sheet_size=sheet_sizes[sheet_name],
+                deadline=now + deadline if deadline is not None else None
+            )
+
+        by_class = {name: stats['enqueued'] for name, stats in self.queue.get_stats()['by_class'].items()}
+        self.logger.info(f"Queued {len(batches)} batches by class: {by_class}")
+
+    def _attach_persistence(self, task_manager: TaskDataFrameManager, session_id: str) -> None:
+        """Register the session row and the write-behind listener on its task manager."""
+        self._detach_listener()
+        # Task rows reference translation_sessions; the session row is flushed first
+        task_write_behind.register_session(session_id, {
+            'filename': session_manager.get_metadata(session_id, 'filename') or session_id,
+            'status': 'executing',
+            'llm_provider': getattr(getattr(self.llm_provider, 'config', None), 'provider', ''),
+            'total_tasks': len(task_manager.df)
+        })
+        self._persist_listener = task_write_behind.listener(session_id)
+        self._persist_task_manager = task_manager
+        task_manager.update_listeners.append(self._persist_listener)
+
+    def _detach_listener(self) -> None:
+        listener, task_manager = self._persist_listener, self._persist_task_manager
+        if listener and task_manager and listener in task_manager.update_listeners:
+            task_manager.update_listeners.remove(listener)
+        self._persist_listener = None
+        self._persist_task_manager = None
+
+    async def _detach_persistence(self) -> None:
+        """Unregister the listener and flush the session's pending updates."""
+        if self._persist_listener is None:
+            return
+        self._detach_listener()
+        await task_write_behind.flush()
+
     def _group_tasks_by_batch(
         self,
         task_manager: TaskDataFrameManager
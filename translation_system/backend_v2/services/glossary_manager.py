@@ -16,6 +16,7 @@ class GlossaryManager:
         self.glossaries_dir = Path(__file__).parent.parent / 'data' / 'glossaries'
         self.glossaries_dir.mkdir(parents=True, exist_ok=True)
         self.cache = {}  # Memory cache for loaded glossaries
+        self.revisions: Dict[str, int] = {}  # Bumped whenever a glossary changes
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def load_glossary(self, glossary_id: str) -> Optional[Dict]:
@@ -52,6 +53,24 @@ class GlossaryManager:
             self.logger.error(f"Failed to load glossary {glossary_id}: {e}")
             return None
 
+    def get_glossary_version(self, glossary_id: str) -> str:
+        """
+        Get a version key that changes whenever the glossary changes.
+
+        Args:
+            glossary_id: Glossary identifier
+
+        Returns:
+            Declared glossary version plus the in-process revision
+        """
+        glossary = self.load_glossary(glossary_id) or {}
+        return f"{glossary.get('version', '1.0')}#{self.revisions.get(glossary_id, 0)}"
+
+    def evict(self, glossary_id: str) -> None:
+        """Drop a glossary from the cache and bump its revision."""
+        self.cache.pop(glossary_id, None)
+        self.revisions[glossary_id] = self.revisions.get(glossary_id, 0) + 1
+
     def match_terms_in_text(
         self,
         source_text: str,
@@ -210,6 +229,7 @@ class GlossaryManager:
 
             # Update cache
             self.cache[glossary_id] = glossary_data
+            self.revisions[glossary_id] = self.revisions.get(glossary_id, 0) + 1
 
             self.logger.info(f"Saved glossary: {glossary_id}")
             return True
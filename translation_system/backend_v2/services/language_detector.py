@@ -1,9 +1,24 @@
 """Language detection service."""
 
 import re
+import copy
+import hashlib
+import threading
+import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict, Any, Optional
-from collections import Counter
+from collections import Counter, OrderedDict
+
+# Non-empty values sampled per column for content detection
+SAMPLE_SIZE = 20
+
+# Sheet analyses cached by content fingerprint (shared by analyzer and splitter)
+_ANALYSIS_CACHE_SIZE = 64
+
+
+def _matched_length(matches: List[Any]) -> int:
+    """Total length of re.findall results (same measure as detect_language)."""
+    return sum(len(match) for match in matches)
 
 
 class LanguageDetector:
@@ -37,6 +52,10 @@ class LanguageDetector:
         'ES': ['spanish', ':es:', 'es', 'spain', '西班牙', '西班牙语']
     }
 
+    _analysis_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+    _cache_lock = threading.Lock()
+    _pattern_groups: Optional[List[Tuple[Any, List[int]]]] = None
+
     @classmethod
     def detect_language(cls, text: str) -> str:
         """Detect the primary language of a text."""
@@ -55,24 +74,94 @@ class LanguageDetector:
         return 'UNKNOWN'
 
     @classmethod
-    def detect_column_languages(cls, df: pd.DataFrame) -> Dict[int, str]:
-        """Detect language for each column based on content."""
-        column_langs = {}
+    def _get_pattern_groups(cls) -> List[Tuple[Any, List[int]]]:
+        """Unique patterns with the PATTERNS positions that share them (CH/TW, PT/BR)."""
+        if cls._pattern_groups is None:
+            groups: Dict[Tuple[str, int], Tuple[Any, List[int]]] = {}
+            for lang_idx, pattern in enumerate(cls.PATTERNS.values()):
+                key = (pattern.pattern, pattern.flags)
+                groups.setdefault(key, (pattern, []))[1].append(lang_idx)
+            cls._pattern_groups = list(groups.values())
+        return cls._pattern_groups
+
+    @classmethod
+    def _sample_columns(cls, df: pd.DataFrame) -> List[pd.Series]:
+        """
+        First SAMPLE_SIZE non-empty values of each column, as strings.
+
+        Columns are scanned in geometrically growing chunks, so dense columns
+        never touch more than a few dozen rows.
+        """
+        n_rows = len(df)
+        samples = []
+        for col_idx in range(df.shape[1]):
+            column = df.iloc[:, col_idx]
+            rows = np.empty(0, dtype=np.intp)
+            start, size = 0, SAMPLE_SIZE * 4
+            while len(rows) < SAMPLE_SIZE and start < n_rows:
+                found = np.flatnonzero(column.iloc[start:start + size].notna().to_numpy())
+                rows = np.concatenate([rows, found[:SAMPLE_SIZE - len(rows)] + start])
+                start += size
+                size *= 4
+            samples.append(column.iloc[rows].astype(str))
+        return samples
 
-        for col_idx, col in enumerate(df.columns):
-            # Sample non-empty values from column
-            sample = df.iloc[:, col_idx].dropna().astype(str).head(20)
+    @classmethod
+    def _classify_texts(cls, texts: pd.Series) -> List[str]:
+        """
+        Detect the language of many texts at once.
+
+        Each unique pattern runs once over the whole series; the per-language
+        character scores form a matrix whose row-wise argmax matches
+        detect_language (first language wins ties, all-zero is UNKNOWN).
+        """
+        if len(texts) == 0:
+            return []
+
+        langs = list(cls.PATTERNS.keys())
+        scores = np.zeros((len(texts), len(langs)), dtype=np.int64)
+        for pattern, lang_idxs in cls._get_pattern_groups():
+            lengths = texts.str.findall(pattern).map(_matched_length).to_numpy(dtype=np.int64)
+            scores[:, lang_idxs] = lengths[:, None]
+
+        best = scores.argmax(axis=1)
+        has_match = scores.max(axis=1) > 0
+        return [langs[idx] if matched else 'UNKNOWN' for idx, matched in zip(best, has_match)]
+
+    @classmethod
+    def _text_languages(
+        cls,
+        samples: List[pd.Series],
+        col_idxs: List[int]
+    ) -> Dict[int, List[str]]:
+        """Per-text languages of the sampled values of the given columns."""
+        col_idxs = [col_idx for col_idx in col_idxs if col_idx < len(samples)]
+        if not col_idxs:
+            return {}
+
+        texts = pd.concat([samples[col_idx] for col_idx in col_idxs], ignore_index=True)
+        labels = cls._classify_texts(texts)
+
+        result = {}
+        offset = 0
+        for col_idx in col_idxs:
+            size = len(samples[col_idx])
+            result[col_idx] = labels[offset:offset + size]
+            offset += size
+        return result
+
+    @classmethod
+    def _column_languages(cls, samples: List[pd.Series]) -> Dict[int, str]:
+        """Majority language per column from the sampled values."""
+        text_langs = cls._text_languages(samples, list(range(len(samples))))
+        column_langs = {}
 
+        for col_idx, sample in enumerate(samples):
             if len(sample) == 0:
                 column_langs[col_idx] = 'EMPTY'
                 continue
 
-            # Detect language for each sample
-            lang_counts = Counter()
-            for text in sample:
-                lang = cls.detect_language(text)
-                if lang != 'UNKNOWN':
-                    lang_counts[lang] += 1
+            lang_counts = Counter(lang for lang in text_langs[col_idx] if lang != 'UNKNOWN')
 
             # Get most common language
             if lang_counts:
@@ -82,9 +171,65 @@ class LanguageDetector:
 
         return column_langs
 
+    @classmethod
+    def sheet_fingerprint(cls, df: pd.DataFrame, samples: List[pd.Series] = None) -> str:
+        """
+        Fingerprint of everything language detection looks at.
+
+        Covers column names, shape and the sampled values, so two reads of the
+        same sheet share one analysis without scanning every row.
+        """
+        if samples is None:
+            samples = cls._sample_columns(df)
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((tuple(str(col) for col in df.columns), df.shape)).encode('utf-8'))
+        for sample in samples:
+            digest.update(pd.util.hash_pandas_object(sample, index=False).to_numpy().tobytes())
+            digest.update(b'|')
+        return digest.hexdigest()
+
+    @classmethod
+    def _cached(cls, fingerprint: str) -> Optional[Dict[str, Any]]:
+        with cls._cache_lock:
+            entry = cls._analysis_cache.get(fingerprint)
+            if entry is not None:
+                cls._analysis_cache.move_to_end(fingerprint)
+            return entry
+
+    @classmethod
+    def _store(cls, fingerprint: str, entry: Dict[str, Any]):
+        with cls._cache_lock:
+            cls._analysis_cache[fingerprint] = entry
+            cls._analysis_cache.move_to_end(fingerprint)
+            while len(cls._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                cls._analysis_cache.popitem(last=False)
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached sheet analyses."""
+        with cls._cache_lock:
+            cls._analysis_cache.clear()
+
+    @classmethod
+    def detect_column_languages(cls, df: pd.DataFrame) -> Dict[int, str]:
+        """Detect language for each column based on content."""
+        samples = cls._sample_columns(df)
+        fingerprint = cls.sheet_fingerprint(df, samples)
+
+        entry = cls._cached(fingerprint) or {}
+        if 'column_languages' not in entry:
+            entry = {**entry, 'column_languages': cls._column_languages(samples)}
+            cls._store(fingerprint, entry)
+        return dict(entry['column_languages'])
+
     @classmethod
     def identify_language_columns(cls, df: pd.DataFrame) -> Dict[str, List[int]]:
         """Identify source and target language columns."""
+        return cls._identify_language_columns(df, cls._sample_columns(df))
+
+    @classmethod
+    def _identify_language_columns(cls, df: pd.DataFrame, samples: List[pd.Series]) -> Dict[str, List[int]]:
         result = {
             'source_columns': [],
             'CH_columns': [],
@@ -114,7 +259,7 @@ class LanguageDetector:
 
         # If no columns identified by name, use content detection
         if not any(result.values()):
-            column_langs = cls.detect_column_languages(df)
+            column_langs = cls._column_languages(samples)
 
             for col_idx, lang in column_langs.items():
                 if lang in ['CH', 'EN', 'TW']:
@@ -140,46 +285,42 @@ class LanguageDetector:
 
         return result
 
+    @classmethod
+    def _has_content(cls, df: pd.DataFrame, samples: List[pd.Series], col_idx: int) -> bool:
+        """Whether a column has any non-blank value (checks the sample before scanning)."""
+        if samples[col_idx].str.strip().str.len().sum() > 0:
+            return True
+        return df.iloc[:, col_idx].dropna().astype(str).str.strip().str.len().sum() > 0
+
     @classmethod
     def analyze_sheet(cls, df: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze a sheet for language information."""
-        language_columns = cls.identify_language_columns(df)
+        """Analyze a sheet for language information (cached by sheet fingerprint)."""
+        samples = cls._sample_columns(df)
+        fingerprint = cls.sheet_fingerprint(df, samples)
+
+        entry = cls._cached(fingerprint) or {}
+        if 'analysis' not in entry:
+            entry = {**entry, 'analysis': cls._analyze_sheet(df, samples)}
+            cls._store(fingerprint, entry)
+        return copy.deepcopy(entry['analysis'])
+
+    @classmethod
+    def _analyze_sheet(cls, df: pd.DataFrame, samples: List[pd.Series]) -> Dict[str, Any]:
+        language_columns = cls._identify_language_columns(df, samples)
 
         # Determine source languages
         source_langs = set()
-        for col_idx in language_columns['source_columns']:
-            if col_idx < len(df.columns):
-                sample = df.iloc[:, col_idx].dropna().astype(str).head(20)
-                for text in sample:
-                    lang = cls.detect_language(text)
-                    if lang in ['CH', 'EN', 'TW']:
-                        source_langs.add(lang)
+        text_langs = cls._text_languages(samples, language_columns['source_columns'])
+        for langs in text_langs.values():
+            source_langs.update(lang for lang in langs if lang in ['CH', 'EN', 'TW'])
 
         # Also check specifically labeled language columns for source
         # ✅ FIX: Only add if column has content (not empty)
-        if language_columns['CH_columns']:
-            for col_idx in language_columns['CH_columns']:
-                if col_idx < len(df.columns):
-                    non_empty = df.iloc[:, col_idx].dropna().astype(str).str.strip().str.len().sum()
-                    if non_empty > 0:
-                        source_langs.add('CH')
-                        break
-
-        if language_columns['EN_columns']:
-            for col_idx in language_columns['EN_columns']:
-                if col_idx < len(df.columns):
-                    non_empty = df.iloc[:, col_idx].dropna().astype(str).str.strip().str.len().sum()
-                    if non_empty > 0:
-                        source_langs.add('EN')
-                        break
-
-        if language_columns['TW_columns']:
-            for col_idx in language_columns['TW_columns']:
-                if col_idx < len(df.columns):
-                    non_empty = df.iloc[:, col_idx].dropna().astype(str).str.strip().str.len().sum()
-                    if non_empty > 0:
-                        source_langs.add('TW')
-                        break
+        for lang in ['CH', 'EN', 'TW']:
+            for col_idx in language_columns[f'{lang}_columns']:
+                if col_idx < len(df.columns) and cls._has_content(df, samples, col_idx):
+                    source_langs.add(lang)
+                    break
 
         # Determine available target languages
         target_langs = []
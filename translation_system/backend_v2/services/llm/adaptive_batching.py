@@ -0,0 +1,252 @@
+"""Adaptive per-request item count for batch translation.
+
+One controller state per (provider, model, source language, target language).
+The item count grows step by step while batches stay healthy and items per
+second keep improving. When the parse/mismatch failure rate or the request
+latency goes over target it returns to the last healthy size after a probe,
+and shrinks multiplicatively otherwise. The measured output tokens per second
+also cap the size, so a request is expected to finish within the latency
+target. Rate-limited batches say nothing about the size and are only counted.
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple
+
+
+@dataclass
+class _SizeState:
+    """Controller state of one provider/model/language pair."""
+
+    size: int
+    previous_size: Optional[int] = None
+    healthy_streak: int = 0
+    failure_rate: Optional[float] = None  # EWMA of failed / items
+    tokens_per_second: Optional[float] = None  # EWMA of output tokens per second
+    tokens_per_item: Optional[float] = None  # EWMA of output tokens per translated item
+    throughput: Dict[int, float] = field(default_factory=dict)  # EWMA items/s per size
+    ceiling: Optional[int] = None  # Size that failed or lost throughput, not probed again for a while
+    ceiling_expires: int = 0
+    batches: int = 0
+    items: int = 0
+    failed_items: int = 0
+    rate_limited: int = 0
+    grown: int = 0
+    shrunk: int = 0
+    latency_ms_total: float = 0.0
+
+
+class AdaptiveBatchSizer:
+    """AIMD-style controller of the items sent in one batch request."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        initial_size: int = 5,
+        min_size: int = 1,
+        max_size: int = 20,
+        target_latency_ms: float = 20000,
+        max_failure_rate: float = 0.05,
+        grow_after: int = 3,
+        decrease_factor: float = 0.5,
+        throughput_tolerance: float = 0.05,
+        reprobe_after: int = 100,
+        smoothing: float = 0.3
+    ):
+        """
+        Initialize adaptive batch sizer.
+
+        Args:
+            enabled: Adapt the size (otherwise initial_size is always used)
+            initial_size: Items per request before anything is measured
+            min_size: Lower bound of items per request
+            max_size: Upper bound of items per request
+            target_latency_ms: Request latency above which the size shrinks
+            max_failure_rate: Parse/mismatch failure rate above which the size shrinks
+            grow_after: Consecutive healthy batches before the next size is probed
+            decrease_factor: Multiplier applied when shrinking
+            throughput_tolerance: Relative items/s loss that makes a probe revert
+            reprobe_after: Batches before a size that failed or lost throughput may be probed again
+            smoothing: EWMA weight of each new measurement
+        """
+        self.enabled = enabled
+        self.initial_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency_ms = target_latency_ms
+        self.max_failure_rate = max_failure_rate
+        self.grow_after = grow_after
+        self.decrease_factor = decrease_factor
+        self.throughput_tolerance = throughput_tolerance
+        self.reprobe_after = reprobe_after
+        self.smoothing = smoothing
+
+        self._states: Dict[Tuple, _SizeState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key: Tuple) -> _SizeState:
+        state = self._states.get(key)
+        if state is None:
+            size = min(max(self.initial_size, self.min_size), self.max_size)
+            state = self._states[key] = _SizeState(size=size)
+        return state
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        return value if current is None else (1 - self.smoothing) * current + self.smoothing * value
+
+    def batch_size(self, key: Tuple) -> int:
+        """Items to send in the next request for this key."""
+        if not self.enabled:
+            return self.initial_size
+        with self._lock:
+            return self._state(key).size
+
+    def observe(
+        self,
+        key: Tuple,
+        items: int,
+        failed: int,
+        latency_ms: float,
+        output_tokens: int = 0,
+        rate_limited: bool = False
+    ) -> int:
+        """
+        Feed one batch request's outcome into the controller.
+
+        Args:
+            key: (provider, model, source_lang, target_lang)
+            items: Items sent in the request
+            failed: Items without a usable translation (error, parse failure, count mismatch)
+            latency_ms: Request latency
+            output_tokens: Completion tokens reported by the provider
+            rate_limited: Whether the request was rejected by rate limiting
+
+        Returns:
+            Size to use for the next request
+        """
+        if items <= 0:
+            return self.batch_size(key)
+
+        with self._lock:
+            state = self._state(key)
+            state.batches += 1
+            state.items += items
+            state.failed_items += failed
+            state.latency_ms_total += latency_ms
+
+            if rate_limited:
+                # Pacing is the rate limit gate's job; the outcome says nothing about the size
+                state.rate_limited += 1
+                return state.size
+
+            if items > state.size:
+                # Sent before the last shrink (concurrent batches); already acted upon
+                return state.size
+
+            state.failure_rate = self._ewma(state.failure_rate, failed / items)
+            seconds = max(latency_ms / 1000, 1e-3)
+            if items == state.size:
+                state.throughput[items] = self._ewma(state.throughput.get(items), (items - failed) / seconds)
+            if output_tokens and items > failed:
+                state.tokens_per_second = self._ewma(state.tokens_per_second, output_tokens / seconds)
+                state.tokens_per_item = self._ewma(state.tokens_per_item, output_tokens / (items - failed))
+
+            if not self.enabled:
+                return state.size
+
+            if (failed and state.failure_rate > self.max_failure_rate) or latency_ms > self.target_latency_ms:
+                self._shrink(state)
+            else:
+                state.healthy_streak += 1
+                if state.healthy_streak >= self.grow_after:
+                    self._probe(state)
+            return state.size
+
+    def _shrink(self, state: _SizeState):
+        if state.previous_size is not None:
+            # The last probe went too far: return to the size that was healthy
+            new_size = state.previous_size
+        else:
+            new_size = max(self.min_size, int(state.size * self.decrease_factor))
+        if new_size < state.size:
+            state.ceiling = state.size
+            state.ceiling_expires = state.batches + self.reprobe_after
+            state.previous_size = None
+            state.size = new_size
+            state.shrunk += 1
+            # Judge the smaller size on its own outcomes
+            state.failure_rate = None
+        state.healthy_streak = 0
+
+    def _probe(self, state: _SizeState):
+        state.healthy_streak = 0
+        previous = state.previous_size
+        if previous is not None and previous in state.throughput and state.size in state.throughput:
+            if state.throughput[state.size] < state.throughput[previous] * (1 - self.throughput_tolerance):
+                # The larger size is slower per item: go back and stop probing for a while
+                state.ceiling = state.size
+                state.ceiling_expires = state.batches + self.reprobe_after
+                state.size = previous
+                state.previous_size = None
+                state.shrunk += 1
+                return
+
+        limit = self.max_size
+        if state.ceiling is not None and state.batches < state.ceiling_expires:
+            limit = min(limit, state.ceiling - 1)
+        if state.tokens_per_second and state.tokens_per_item:
+            # Largest size expected to finish within the latency target
+            fits = state.tokens_per_second * self.target_latency_ms / 1000 / state.tokens_per_item
+            limit = min(limit, max(self.min_size, math.floor(fits)))
+
+        new_size = min(state.size + max(1, state.size // 4), limit)
+        if new_size > state.size:
+            state.previous_size = state.size
+            state.size = new_size
+            state.grown += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current size, throughput, latency and failure rate per key."""
+        with self._lock:
+            items = list(self._states.items())
+
+        result = {}
+        for key, state in items:
+            result['/'.join(str(part) for part in key)] = {
+                'batch_size': state.size,
+                'batches': state.batches,
+                'items': state.items,
+                'failure_rate': round(state.failed_items / state.items, 4) if state.items else 0.0,
+                'avg_latency_ms': round(state.latency_ms_total / state.batches, 1) if state.batches else 0.0,
+                'items_per_second': {size: round(value, 2) for size, value in sorted(state.throughput.items())},
+                'tokens_per_second': round(state.tokens_per_second, 1) if state.tokens_per_second else None,
+                'rate_limited': state.rate_limited,
+                'grown': state.grown,
+                'shrunk': state.shrunk
+            }
+        return {'enabled': self.enabled, 'keys': result}
+
+
+def _build_default_sizer() -> AdaptiveBatchSizer:
+    """Create the batch sizer from llm.adaptive_batching config."""
+    from utils.config_manager import config_manager
+
+    cfg = config_manager.get('llm.adaptive_batching', {}) or {}
+    return AdaptiveBatchSizer(
+        enabled=cfg.get('enabled', False),
+        initial_size=cfg.get('initial_size', 5),
+        min_size=cfg.get('min_size', 1),
+        max_size=cfg.get('max_size', 20),
+        target_latency_ms=cfg.get('target_latency_ms', 20000),
+        max_failure_rate=cfg.get('max_failure_rate', 0.05),
+        grow_after=cfg.get('grow_after', 3),
+        decrease_factor=cfg.get('decrease_factor', 0.5),
+        throughput_tolerance=cfg.get('throughput_tolerance', 0.05),
+        reprobe_after=cfg.get('reprobe_after', 100),
+        smoothing=cfg.get('smoothing', 0.3)
+    )
+
+
+# Global batch sizer shared by all BatchTranslator instances
+batch_sizer = _build_default_sizer()
@@ -1,11 +1,13 @@
 """Base LLM Provider abstract class."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 
+from .rate_limit import RateLimitGate
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +25,7 @@ class TranslationRequest:
     batch_id: Optional[str] = None
     group_id: Optional[str] = None
     glossary_config: Optional[Dict[str, Any]] = None  # ✨ Glossary configuration
+    session_id: Optional[str] = None  # Keys the cached prompt prefix
 
 
 @dataclass
@@ -36,6 +39,7 @@ class TranslationResponse:
     duration_ms: int = 0
     error: Optional[str] = None
     task_id: Optional[str] = None
+    prompt_stats: Dict[str, Any] = field(default_factory=dict)  # CompiledPrompt.get_stats()
 
 
 @dataclass
@@ -51,6 +55,7 @@ class LLMConfig:
     timeout: int = 90
     max_retries: int = 3
     retry_delay: float = 3.0
+    stream: bool = False  # Use SSE streaming for translate_stream
     extra_params: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -66,6 +71,8 @@ class BaseLLMProvider(ABC):
         """
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # 429 cool-down shared by all requests of this provider instance
+        self.rate_limit_gate = RateLimitGate()
 
     @abstractmethod
     async def translate_single(
@@ -99,6 +106,35 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether translate_stream delivers output incrementally."""
+        return False
+
+    async def translate_stream(
+        self,
+        request: TranslationRequest,
+        on_delta: Callable[[str], Any]
+    ) -> TranslationResponse:
+        """
+        Translate a text, delivering output chunks as they are generated.
+
+        Providers without streaming deliver the complete result once.
+
+        Args:
+            request: Translation request
+            on_delta: Sync or async callback receiving each text chunk
+
+        Returns:
+            Final translation response (full text, usage, errors)
+        """
+        from .sse import deliver
+
+        response = await self.translate_single(request)
+        if response.translated_text and not response.error:
+            await deliver(on_delta, response.translated_text)
+        return response
+
     @abstractmethod
     async def health_check(self) -> bool:
         """
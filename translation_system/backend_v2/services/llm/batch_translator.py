@@ -1,12 +1,18 @@
 """Batch translator for optimized LLM calls."""
 
 import json
+import inspect
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import asyncio
 from dataclasses import dataclass
 
+from .adaptive_batching import AdaptiveBatchSizer, batch_sizer
 from .base_provider import BaseLLMProvider, TranslationRequest, TranslationResponse
+from .compiled_prompt import merge_prompt_stats
+from .stream_parser import IncrementalArrayParser
+from .provider_router import is_rate_limited
+from .token_estimator import get_estimator
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +29,32 @@ class BatchTranslationRequest:
 class BatchTranslator:
     """Optimized batch translator that processes multiple tasks in one LLM call."""
 
-    def __init__(self, provider: BaseLLMProvider, batch_size: int = 5):
+    def __init__(
+        self,
+        provider: BaseLLMProvider,
+        batch_size: Optional[int] = None,
+        sizer: Optional[AdaptiveBatchSizer] = None
+    ):
         """
         Initialize batch translator.
 
         Args:
             provider: LLM provider instance
-            batch_size: Number of tasks to process in one request
+            batch_size: Fixed number of tasks per request (None = adaptive sizing)
+            sizer: Adaptive batch sizer (defaults to the global batch_sizer)
         """
         self.provider = provider
         self.batch_size = batch_size
+        self.sizer = sizer or batch_sizer
         self.logger = logging.getLogger(self.__class__.__name__)
 
     async def translate_batch_optimized(
         self,
         tasks: List[Dict[str, Any]],
-        glossary_config: Dict[str, Any] = None  # ✨ Glossary configuration
+        glossary_config: Dict[str, Any] = None,  # ✨ Glossary configuration
+        session_id: Optional[str] = None,
+        prompt_stats: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Any]] = None
     ) -> List[Dict[str, Any]]:
         """
         Optimized batch translation that processes multiple tasks in fewer LLM calls.
@@ -46,6 +62,10 @@ class BatchTranslator:
         Args:
             tasks: List of translation tasks
             glossary_config: Glossary configuration
+            session_id: Session ID (keys the cached prompt prefix)
+            prompt_stats: Optional dict accumulating prompt bytes/build time
+            on_result: Optional sync/async callback invoked with each task as soon
+                as its translation is complete (streaming providers only)
 
         Returns:
             List of tasks with translation results
@@ -59,12 +79,18 @@ class BatchTranslator:
         # Process each language group
         all_results = []
         for target_lang, lang_tasks in grouped_tasks.items():
-            # Split into smaller batches
-            batches = self._split_into_batches(lang_tasks, self.batch_size)
+            # Split into smaller batches (size adapted per provider and language pair)
+            batch_size = self.batch_size or self._adaptive_size(lang_tasks[0].get('source_lang', 'CH'), target_lang)
+            batches = self._split_into_batches(lang_tasks, batch_size)
 
             # Process batches concurrently
             batch_results = await asyncio.gather(
-                *[self._process_single_batch(batch, target_lang, glossary_config) for batch in batches],
+                *[
+                    self._process_single_batch(
+                        batch, target_lang, glossary_config, session_id, prompt_stats, on_result
+                    )
+                    for batch in batches
+                ],
                 return_exceptions=True
             )
 
@@ -82,6 +108,36 @@ class BatchTranslator:
 
         return all_results
 
+    @staticmethod
+    def _sizing_key(provider: BaseLLMProvider, source_lang: str, target_lang: str) -> tuple:
+        """Adaptive sizing key: provider, model and language pair."""
+        model = getattr(provider, 'model', None) or provider.config.model
+        return (provider.config.provider, model, source_lang, target_lang)
+
+    def _members(self) -> List[BaseLLMProvider]:
+        """Providers that may serve a request (the endpoints of a ProviderRouter)."""
+        endpoints = getattr(self.provider, 'endpoints', None)
+        if endpoints:
+            return [endpoint.provider for endpoint in endpoints if endpoint.weight > 0]
+        return [self.provider]
+
+    def _adaptive_size(self, source_lang: str, target_lang: str) -> int:
+        """Smallest size learned for any provider that may serve the request."""
+        return min(
+            self.sizer.batch_size(self._sizing_key(member, source_lang, target_lang))
+            for member in self._members()
+        )
+
+    def _served_key(self, response: TranslationResponse, source_lang: str, target_lang: str) -> Optional[tuple]:
+        """Sizing key of the provider that served the response (None if unknown)."""
+        members = self._members()
+        for member in members:
+            if response.model and response.model == (getattr(member, 'model', None) or member.config.model):
+                return self._sizing_key(member, source_lang, target_lang)
+        if len(members) == 1:
+            return self._sizing_key(members[0], source_lang, target_lang)
+        return None
+
     def _group_by_language(self, tasks: List[Dict]) -> Dict[str, List[Dict]]:
         """Group tasks by target language."""
         grouped = {}
@@ -103,14 +159,25 @@ class BatchTranslator:
         self,
         batch_tasks: List[Dict],
         target_lang: str,
-        glossary_config: Dict[str, Any] = None  # ✨ Glossary configuration
+        glossary_config: Dict[str, Any] = None,  # ✨ Glossary configuration
+        session_id: Optional[str] = None,
+        prompt_stats: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Any]] = None
     ) -> List[Dict]:
         """
         Process a single batch of tasks with one LLM call.
 
+        With a streaming provider the JSON array is parsed incrementally and
+        each task is completed (and passed to on_result) as soon as its
+        element arrives, so an interrupted stream keeps the finished part.
+
         Args:
             batch_tasks: Tasks to process together
             target_lang: Target language
+            glossary_config: Glossary configuration
+            session_id: Session ID (keys the cached prompt prefix)
+            prompt_stats: Optional dict accumulating prompt bytes/build time
+            on_result: Optional callback invoked with each completed task
 
         Returns:
             Tasks with translation results
@@ -129,29 +196,80 @@ class BatchTranslator:
                 context=self._extract_context(batch_tasks),
                 game_info=batch_tasks[0].get('game_context', {}),
                 task_type=batch_task_type,
-                glossary_config=glossary_config  # ✨ Pass glossary config
+                glossary_config=glossary_config,  # ✨ Pass glossary config
+                session_id=session_id
             )
 
             # Call LLM once for all tasks
             start_time = asyncio.get_event_loop().time()
-            response = await self.provider.translate_single(translation_request)
+            committed = set()
+
+            if self.provider.supports_streaming:
+                parser = IncrementalArrayParser()
+                model = getattr(self.provider, 'model', None)
+
+                async def on_delta(delta: str):
+                    for index, text in parser.feed(delta):
+                        if index in committed or not 0 <= index < len(batch_tasks):
+                            continue
+                        committed.add(index)
+                        task = batch_tasks[index]
+                        task['result'] = text
+                        task['status'] = 'completed'
+                        task['llm_model'] = model
+                        task['duration_ms'] = int((asyncio.get_event_loop().time() - start_time) * 1000)
+                        await self._notify(on_result, task)
+
+                response = await self.provider.translate_stream(translation_request, on_delta)
+            else:
+                response = await self.provider.translate_single(translation_request)
             duration_ms = int((asyncio.get_event_loop().time() - start_time) * 1000)
 
-            # Parse batch response
-            translated_texts = self._parse_batch_response(response.translated_text, len(batch_tasks))
+            if response.prompt_stats:
+                self.logger.debug(f"Batch prompt ({len(batch_tasks)} tasks): {response.prompt_stats}")
+                if prompt_stats is not None:
+                    merge_prompt_stats(prompt_stats, response.prompt_stats)
+            if not response.error:
+                self._record_token_usage(batch_tasks, target_lang, response, prompt_stats)
+
+            # Parse batch response (streamed elements are already committed)
+            translated_texts = []
+            if not response.error:
+                translated_texts = self._parse_batch_response(response.translated_text, len(batch_tasks))
+            elif committed:
+                self.logger.warning(
+                    f"Stream interrupted after {len(committed)}/{len(batch_tasks)} translations: {response.error}"
+                )
 
             # Update each task with results
+            token_count = response.token_usage.get('total_tokens', 0) // len(batch_tasks)
             for i, task in enumerate(batch_tasks):
-                if i < len(translated_texts):
+                if i in committed:
+                    task['confidence'] = response.confidence
+                    task['token_count'] = token_count
+                    task['llm_model'] = response.model or task.get('llm_model')
+                elif i < len(translated_texts):
                     task['result'] = translated_texts[i]
                     task['status'] = 'completed'
                     task['confidence'] = response.confidence
                     task['duration_ms'] = duration_ms // len(batch_tasks)  # Average duration
-                    task['token_count'] = response.token_usage.get('total_tokens', 0) // len(batch_tasks)
+                    task['token_count'] = token_count
                     task['llm_model'] = response.model
                 else:
                     task['status'] = 'failed'
-                    task['error_message'] = 'Failed to parse translation result'
+                    task['error_message'] = response.error or 'Failed to parse translation result'
+
+            sizing_key = self._served_key(response, translation_request.source_lang, target_lang)
+            if self.batch_size is None and sizing_key is not None:
+                usage = response.token_usage or {}
+                self.sizer.observe(
+                    sizing_key,
+                    len(batch_tasks),
+                    sum(1 for task in batch_tasks if task['status'] == 'failed'),
+                    duration_ms,
+                    output_tokens=usage.get('completion_tokens', usage.get('output_tokens', 0)),
+                    rate_limited=is_rate_limited(response.error)
+                )
 
             return batch_tasks
 
@@ -163,6 +281,54 @@ class BatchTranslator:
                 task['error_message'] = str(e)
             return batch_tasks
 
+    def _record_token_usage(
+        self,
+        batch_tasks: List[Dict],
+        target_lang: str,
+        response: TranslationResponse,
+        prompt_stats: Optional[Dict[str, Any]]
+    ):
+        """Compare predicted with actual token usage and feed the estimator calibration."""
+        usage = response.token_usage or {}
+        actual_input = usage.get('prompt_tokens', usage.get('input_tokens', 0))
+        actual_output = usage.get('completion_tokens', usage.get('output_tokens', 0))
+        if not actual_input and not actual_output:
+            return
+
+        estimator = get_estimator(response.model or self.provider.config.provider)
+        overhead = (response.prompt_stats or {}).get('prefix_tokens', 0)
+        overhead += estimator.count(self._build_batch_prompt([], target_lang))
+        predicted = estimator.estimate_batch(batch_tasks, prefix_tokens=overhead)
+        estimator.observe(batch_tasks, predicted, actual_input, actual_output)
+
+        self.logger.debug(
+            f"Batch tokens ({len(batch_tasks)} tasks, {estimator.profile.name}): "
+            f"input predicted={predicted['input_tokens']} actual={actual_input}, "
+            f"output predicted={predicted['output_tokens']} actual={actual_output}"
+        )
+        if prompt_stats is not None:
+            for key, value in (
+                ('predicted_input_tokens', predicted['input_tokens']),
+                ('actual_input_tokens', actual_input),
+                ('predicted_output_tokens', predicted['output_tokens']),
+                ('actual_output_tokens', actual_output)
+            ):
+                prompt_stats[key] = prompt_stats.get(key, 0) + value
+
+    @staticmethod
+    async def _notify(callback: Optional[Callable[[Dict[str, Any]], Any]], task: Dict[str, Any]):
+        """Invoke the per-result callback; failures must not abort the stream."""
+        if callback is None:
+            return
+        try:
+            result = callback(task)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logging.getLogger(BatchTranslator.__name__).error(
+                f"Result callback failed for task {task.get('task_id')}: {e}"
+            )
+
     def _build_batch_prompt(self, tasks: List[Dict], target_lang: str) -> str:
         """
         Build a combined prompt for multiple tasks.
@@ -251,12 +417,15 @@ class BatchTranslator:
                 contexts.append(task['source_context'])
         return ' | '.join(contexts[:3])  # Limit context size
 
-    async def get_optimal_batch_size(self) -> int:
+    async def get_optimal_batch_size(self, source_lang: str = 'CH', target_lang: str = 'PT') -> int:
         """
-        Determine optimal batch size based on provider capabilities.
+        Determine optimal batch size based on observed provider performance.
+
+        Args:
+            source_lang: Source language
+            target_lang: Target language
 
         Returns:
             Optimal batch size
         """
-        # Could be enhanced with dynamic adjustment based on response times
-        return self.batch_size
\ No newline at end of file
+        return self.batch_size or self._adaptive_size(source_lang, target_lang)
\ No newline at end of file
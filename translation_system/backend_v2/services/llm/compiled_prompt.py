@@ -0,0 +1,134 @@
+"""Compiled prompts: a cached stable prefix plus a per-batch variable suffix.
+
+The prefix holds everything that is identical across the batches of one
+session/language/task type (role, game info, requirements, small glossaries)
+and is built once. Providers send it first so provider-side prompt caching
+can reuse it; only the suffix (context, matched terms, source text) changes.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple, Callable
+
+from .token_estimator import estimate_tokens
+
+
+@dataclass
+class CompiledPrompt:
+    """Prompt split into a stable prefix and a variable suffix."""
+
+    prefix: str
+    suffix: str
+    prefix_key: Tuple
+    prefix_tokens: int
+    prefix_cached: bool = False
+    build_ms: float = 0.0
+
+    @property
+    def text(self) -> str:
+        """Full prompt (prefix first)."""
+        return f"{self.prefix}\n\n{self.suffix}" if self.suffix else self.prefix
+
+    @property
+    def assembled_bytes(self) -> int:
+        """Bytes assembled for this call (the prefix is shared, not rebuilt)."""
+        return len(self.suffix.encode('utf-8'))
+
+    @property
+    def total_bytes(self) -> int:
+        return len(self.prefix.encode('utf-8')) + self.assembled_bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-call prompt statistics."""
+        return {
+            'prefix_tokens': self.prefix_tokens,
+            'prefix_cached': self.prefix_cached,
+            'assembled_bytes': self.assembled_bytes,
+            'total_bytes': self.total_bytes,
+            'build_ms': round(self.build_ms, 3)
+        }
+
+
+class PromptPrefixCache:
+    """LRU cache of built prompt prefixes with their token length."""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize prefix cache.
+
+        Args:
+            max_entries: Maximum cached prefixes
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, Tuple[str, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def get_or_build(self, key: Tuple, builder: Callable[[], str]) -> Tuple[str, int, bool]:
+        """
+        Return (prefix, token_count, cached) for a key, building it on a miss.
+
+        Args:
+            key: Prefix key (session, languages, task type, glossary version, ...)
+            builder: Callable returning the prefix text
+
+        Returns:
+            Prefix text, estimated tokens and whether it came from the cache
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[0], entry[1], True
+
+        prefix = builder()
+        entry = (prefix, estimate_tokens(prefix))
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.stats['misses'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+        return entry[0], entry[1], False
+
+    def invalidate(self, session_id: Optional[str] = None):
+        """Drop cached prefixes (all, or those of one session)."""
+        with self._lock:
+            if session_id is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == session_id]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'hit_rate': self.stats['hits'] / total if total else 0.0
+        }
+
+
+def merge_prompt_stats(totals: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Accumulate per-call prompt statistics into per-batch totals."""
+    if not stats:
+        return totals
+    totals['prompts'] = totals.get('prompts', 0) + 1
+    totals['prefix_hits'] = totals.get('prefix_hits', 0) + int(bool(stats.get('prefix_cached')))
+    totals['assembled_bytes'] = totals.get('assembled_bytes', 0) + stats.get('assembled_bytes', 0)
+    totals['total_bytes'] = totals.get('total_bytes', 0) + stats.get('total_bytes', 0)
+    totals['build_ms'] = round(totals.get('build_ms', 0.0) + stats.get('build_ms', 0.0), 3)
+    return totals
+
+
+# Global prefix cache shared by all provider instances
+prompt_prefix_cache = PromptPrefixCache()
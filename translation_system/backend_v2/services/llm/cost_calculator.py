@@ -10,6 +10,17 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# llm.providers keys / model prefixes -> pricing provider
+PROVIDER_VENDORS = {
+    'qwen': 'alibaba',
+    'qwen-plus': 'alibaba',
+    'tongyi': 'alibaba',
+    'gpt': 'openai',
+    'gpt-5-nano': 'openai',
+    'claude': 'anthropic',
+    'gemini': 'google'
+}
+
 
 @dataclass
 class ModelPricing:
@@ -114,6 +125,14 @@ class CostCalculator:
             "qwen-max", "alibaba",
             input_cost=0.008, output_cost=0.016
         )
+        self.add_model_pricing(
+            "qwen-plus", "alibaba",
+            input_cost=0.004, output_cost=0.008
+        )
+        self.add_model_pricing(
+            "qwen-turbo", "alibaba",
+            input_cost=0.002, output_cost=0.004
+        )
         self.add_model_pricing(
             "baichuan2", "baichuan",
             input_cost=0.006, output_cost=0.012
@@ -244,6 +263,60 @@ class CostCalculator:
         key = f"{provider}:{model}"
         return self.pricing_data.get(key)
 
+    def find_model_pricing(self, model: str, provider: Optional[str] = None) -> ModelPricing:
+        """
+        Resolve pricing for a model when the pricing provider key is unknown.
+
+        Tries the exact provider:model key, then the model name under any
+        provider (longest name contained in the model, e.g. qwen-max-latest),
+        then the provider fallback.
+
+        Args:
+            model: Model name
+            provider: Provider name or llm.providers key (optional)
+
+        Returns:
+            Model pricing
+        """
+        vendor = PROVIDER_VENDORS.get(provider, provider) if provider else None
+        pricing = self._get_model_pricing(model, vendor) if vendor else None
+        if pricing:
+            return pricing
+
+        model_lower = (model or '').lower()
+        matches = [p for p in self.pricing_data.values() if p.model_name in model_lower]
+        if matches:
+            return max(matches, key=lambda p: len(p.model_name))
+
+        if not vendor:
+            vendor = next((v for prefix, v in PROVIDER_VENDORS.items() if model_lower.startswith(prefix)), None)
+        return self._get_fallback_pricing(vendor)
+
+    def estimate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        model: str,
+        provider: Optional[str] = None
+    ) -> Decimal:
+        """
+        Price token usage without tracking it in the running totals.
+
+        Args:
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            model: Model name
+            provider: Provider name or llm.providers key (optional)
+
+        Returns:
+            Cost in USD
+        """
+        pricing = self.find_model_pricing(model, provider)
+        return (
+            Decimal(str(input_tokens)) * pricing.input_cost_per_1k
+            + Decimal(str(output_tokens)) * pricing.output_cost_per_1k
+        ) / Decimal('1000')
+
     def _get_fallback_pricing(self, provider: str) -> ModelPricing:
         """Get fallback pricing based on provider."""
         fallback_pricing = {
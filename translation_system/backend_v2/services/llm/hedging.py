@@ -0,0 +1,308 @@
+"""Latency-percentile request hedging for LLM providers.
+
+A request that is still running after the provider/model's rolling latency
+percentile (p95 by default) gets one duplicate; whichever finishes first is
+used and the other is cancelled. Duplicates are capped by a budget relative
+to the number of primary requests so the extra cost stays bounded.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+
+import numpy as np
+
+from .base_provider import BaseLLMProvider, TranslationRequest, TranslationResponse
+from .sse import deliver
+
+
+class LatencyTracker:
+    """Rolling latency window per (provider, model) key."""
+
+    def __init__(self, window_size: int = 200):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window_size: Samples kept per key
+        """
+        self.window_size = window_size
+        self._samples: Dict[Tuple, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Tuple, latency_ms: float):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window_size)
+            samples.append(latency_ms)
+
+    def count(self, key: Tuple) -> int:
+        samples = self._samples.get(key)
+        return len(samples) if samples else 0
+
+    def percentile(self, key: Tuple, percentile: float) -> Optional[float]:
+        """Latency percentile in ms, or None without samples."""
+        with self._lock:
+            samples = list(self._samples.get(key) or ())
+        if not samples:
+            return None
+        return float(np.percentile(samples, percentile))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 per key."""
+        with self._lock:
+            items = [(key, list(samples)) for key, samples in self._samples.items()]
+
+        result = {}
+        for key, samples in items:
+            if not samples:
+                continue
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            result['/'.join(str(part) for part in key)] = {
+                'samples': len(samples),
+                'p50_ms': round(float(p50), 1),
+                'p95_ms': round(float(p95), 1),
+                'p99_ms': round(float(p99), 1),
+                'max_ms': round(float(max(samples)), 1)
+            }
+        return result
+
+
+class HedgingPolicy:
+    """Decide when to send a duplicate request and race the two."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        percentile: float = 95,
+        window_size: int = 200,
+        min_samples: int = 20,
+        min_delay_ms: float = 1000,
+        budget_ratio: float = 0.05
+    ):
+        """
+        Initialize hedging policy.
+
+        Args:
+            enabled: Whether duplicates are sent at all (latency is tracked regardless)
+            percentile: Latency percentile after which a request is hedged
+            window_size: Rolling latency samples kept per provider/model
+            min_samples: Samples required before hedging a provider/model
+            min_delay_ms: Lower bound for the hedge delay
+            budget_ratio: Maximum duplicates per primary request (0.05 = 5% extra)
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay_ms = min_delay_ms
+        self.budget_ratio = budget_ratio
+
+        # Latency of the attempt that produced the result (drives the hedge delay)
+        self.latency = LatencyTracker(window_size)
+        # End-to-end latency seen by callers (tail latency after hedging)
+        self.observed = LatencyTracker(window_size)
+
+        self.stats = {
+            'requests': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'budget_denied': 0,
+            'cancelled': 0,
+            'extra_tokens': 0
+        }
+
+    def hedge_delay_ms(self, key: Tuple) -> Optional[float]:
+        """Delay after which a request on this key is hedged, or None."""
+        if not self.enabled or self.latency.count(key) < self.min_samples:
+            return None
+        return max(self.min_delay_ms, self.latency.percentile(key, self.percentile))
+
+    def _acquire_budget(self) -> bool:
+        if self.stats['hedged'] + 1 > self.stats['requests'] * self.budget_ratio:
+            self.stats['budget_denied'] += 1
+            return False
+        self.stats['hedged'] += 1
+        return True
+
+    async def execute(
+        self,
+        key: Tuple,
+        attempt: Callable[[int], Awaitable[TranslationResponse]],
+        owner: Callable[[], Optional[int]] = lambda: None
+    ) -> TranslationResponse:
+        """
+        Run a request, hedging it once if it exceeds the latency percentile.
+
+        Args:
+            key: (provider, model) latency key
+            attempt: Coroutine factory taking the attempt number (0 = primary, 1 = hedge)
+            owner: Returns the attempt that has already delivered output (streaming);
+                once set, no hedge is sent and that attempt's result is used
+
+        Returns:
+            Response of the winning attempt
+        """
+        loop = asyncio.get_running_loop()
+        self.stats['requests'] += 1
+        started = {0: loop.time()}
+        running = {asyncio.ensure_future(attempt(0)): 0}
+        responses: Dict[int, TranslationResponse] = {}
+
+        try:
+            delay = self.hedge_delay_ms(key)
+            if delay is not None:
+                done, _ = await asyncio.wait(running.keys(), timeout=delay / 1000)
+                if not done and owner() is None and self._acquire_budget():
+                    started[1] = loop.time()
+                    running[asyncio.ensure_future(attempt(1))] = 1
+
+            pending = set(running)
+            winner = None
+            while winner is None and pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    responses[running[future]] = self._result(future)
+                winner = self._pick(responses, owner(), bool(pending))
+        finally:
+            for future in running:
+                if not future.done():
+                    future.cancel()
+                    self.stats['cancelled'] += 1
+
+        if winner is None:
+            winner = min(responses)
+        response = responses[winner]
+        now = loop.time()
+
+        if not response.error:
+            self.latency.record(key, (now - started[winner]) * 1000)
+        self.observed.record(key, (now - started[0]) * 1000)
+        if len(started) > 1:
+            # The duplicate costs roughly as much as the request it raced
+            self.stats['extra_tokens'] += response.token_usage.get('total_tokens', 0)
+            if winner == 1:
+                self.stats['hedge_wins'] += 1
+        return response
+
+    @staticmethod
+    def _result(future) -> TranslationResponse:
+        try:
+            return future.result()
+        except Exception as e:
+            return TranslationResponse(translated_text="", confidence=0.0, error=str(e))
+
+    @staticmethod
+    def _pick(
+        responses: Dict[int, TranslationResponse],
+        owner: Optional[int],
+        pending: bool
+    ) -> Optional[int]:
+        if owner is not None:
+            return owner if owner in responses else None
+        for index in sorted(responses):
+            if not responses[index].error:
+                return index
+        if not pending and responses:
+            return min(responses)
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hedging counters, extra-request ratio and tail latency per provider/model."""
+        requests = self.stats['requests']
+        return {
+            **self.stats,
+            'enabled': self.enabled,
+            'percentile': self.percentile,
+            'budget_ratio': self.budget_ratio,
+            'extra_request_ratio': round(self.stats['hedged'] / requests, 4) if requests else 0.0,
+            'attempt_latency': self.latency.snapshot(),
+            'observed_latency': self.observed.snapshot()
+        }
+
+
+class HedgedProvider(BaseLLMProvider):
+    """Provider wrapper that hedges slow requests according to a HedgingPolicy."""
+
+    def __init__(self, provider: BaseLLMProvider, policy: Optional[HedgingPolicy] = None):
+        """
+        Initialize hedged provider.
+
+        Args:
+            provider: Wrapped provider
+            policy: Hedging policy (defaults to the global hedging_policy)
+        """
+        super().__init__(provider.config)
+        self.provider = provider
+        self.policy = policy or hedging_policy
+        self.key = (provider.config.provider, getattr(provider, 'model', provider.config.model))
+
+    def __getattr__(self, name):
+        # Expose wrapped provider attributes (model, base_url, prompt_template, ...)
+        provider = self.__dict__.get('provider')
+        if provider is None:
+            raise AttributeError(name)
+        return getattr(provider, name)
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.provider.supports_streaming
+
+    async def translate_single(self, request: TranslationRequest) -> TranslationResponse:
+        return await self.policy.execute(self.key, lambda _: self.provider.translate_single(request))
+
+    async def translate_stream(
+        self,
+        request: TranslationRequest,
+        on_delta: Callable[[str], Any]
+    ) -> TranslationResponse:
+        """Hedge until one attempt has delivered output, then stay with it."""
+        if not self.provider.supports_streaming:
+            return await super().translate_stream(request, on_delta)
+
+        state = {'owner': None}
+
+        def attempt(index: int):
+            async def forward(delta: str):
+                if state['owner'] is None:
+                    state['owner'] = index
+                if state['owner'] == index:
+                    await deliver(on_delta, delta)
+            return self.provider.translate_stream(request, forward)
+
+        return await self.policy.execute(self.key, attempt, lambda: state['owner'])
+
+    async def translate_batch(self, requests: List[TranslationRequest]) -> List[TranslationResponse]:
+        # Same concurrency limit as the providers' own batch methods
+        semaphore = asyncio.Semaphore(5)
+
+        async def run(request: TranslationRequest) -> TranslationResponse:
+            async with semaphore:
+                return await self.translate_single(request)
+
+        return list(await asyncio.gather(*[run(request) for request in requests]))
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
+
+
+def _build_default_policy() -> HedgingPolicy:
+    """Create the hedging policy from config."""
+    from utils.config_manager import config_manager
+
+    cfg = config_manager.get('llm.hedging', {}) or {}
+    return HedgingPolicy(
+        enabled=cfg.get('enabled', False),
+        percentile=cfg.get('percentile', 95),
+        window_size=cfg.get('window_size', 200),
+        min_samples=cfg.get('min_samples', 20),
+        min_delay_ms=cfg.get('min_delay_ms', 1000),
+        budget_ratio=cfg.get('budget_ratio', 0.05)
+    )
+
+
+# Global hedging policy shared by all provider instances
+hedging_policy = _build_default_policy()
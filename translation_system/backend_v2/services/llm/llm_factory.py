@@ -1,11 +1,15 @@
 """LLM Provider Factory."""
 
 from typing import Dict, Any, Optional
+import json
 import logging
+import threading
 
 from .base_provider import BaseLLMProvider, LLMConfig
 from .openai_provider import OpenAIProvider
 from .qwen_provider import QwenProvider
+from .hedging import HedgedProvider
+from .provider_router import ProviderRouter, ProviderEndpoint, CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +27,10 @@ class LLMFactory:
         'tongyi': QwenProvider,  # Alias for Qwen
     }
 
+    # Provider routers keyed by routing configuration
+    _routers: Dict[str, ProviderRouter] = {}
+    _router_lock = threading.Lock()
+
     @classmethod
     def create_provider(
         cls,
@@ -61,6 +69,7 @@ class LLMFactory:
             timeout=config.get('timeout', 90),
             max_retries=config.get('max_retries', 3),
             retry_delay=config.get('retry_delay', 3.0),
+            stream=config.get('stream', False),
             extra_params=config.get('extra_params', {})
         )
 
@@ -82,14 +91,19 @@ class LLMFactory:
     def create_from_config_file(
         cls,
         config_dict: Dict[str, Any],
-        provider_name: Optional[str] = None
+        provider_name: Optional[str] = None,
+        overrides: Optional[Dict[str, Any]] = None
     ) -> BaseLLMProvider:
         """
         Create LLM provider from configuration dictionary.
 
+        Without an explicit provider name and with llm.routing enabled, a
+        ProviderRouter over the configured endpoints is returned instead.
+
         Args:
             config_dict: Full configuration dictionary
             provider_name: Override provider name (optional)
+            overrides: Provider settings replacing llm.providers.<name> values (optional)
 
         Returns:
             LLM provider instance
@@ -100,6 +114,9 @@ class LLMFactory:
         # Get LLM configuration section
         llm_config = config_dict.get('llm', {})
 
+        if not provider_name and not overrides and llm_config.get('routing', {}).get('enabled', False):
+            return cls.create_router_from_config(config_dict)
+
         # Determine provider
         if not provider_name:
             provider_name = llm_config.get('default_provider')
@@ -107,6 +124,91 @@ class LLMFactory:
         if not provider_name:
             raise ValueError("No provider specified and no default provider configured")
 
+        return cls._create_configured_provider(llm_config, provider_name, overrides=overrides)
+
+    @classmethod
+    def create_router_from_config(cls, config_dict: Dict[str, Any]) -> ProviderRouter:
+        """
+        Create (or reuse) the provider router described by llm.routing.
+
+        Routers are cached per routing configuration so circuit breaker state
+        and counters survive across executions.
+
+        Args:
+            config_dict: Full configuration dictionary
+
+        Returns:
+            Provider router
+
+        Raises:
+            ValueError: If no routing endpoint could be created
+        """
+        llm_config = config_dict.get('llm', {})
+        routing_config = llm_config.get('routing', {})
+        cache_key = json.dumps(routing_config, sort_keys=True, default=str)
+
+        with cls._router_lock:
+            router = cls._routers.get(cache_key)
+            if router is not None:
+                return router
+
+            endpoints = []
+            for index, entry in enumerate(routing_config.get('providers', [])):
+                entry = dict(entry)
+                name = entry.pop('name')
+                weight = entry.pop('weight', 1)
+                label = entry.pop('label', None) or (name if 'api_key' not in entry else f"{name}#{index}")
+                # One attempt per member: the router fails over on errors and 429s
+                # instead of waiting through member retries and cool-downs
+                entry['max_retries'] = 1
+                try:
+                    provider = cls._create_configured_provider(llm_config, name, overrides=entry)
+                except ValueError as e:
+                    logger.warning(f"Skipping routing endpoint {label}: {e}")
+                    continue
+
+                endpoints.append(ProviderEndpoint(
+                    label,
+                    provider,
+                    weight=weight,
+                    breaker=CircuitBreaker(
+                        failure_threshold=routing_config.get('failure_threshold', 3),
+                        recovery_timeout=routing_config.get('recovery_timeout', 30.0)
+                    )
+                ))
+
+            if not endpoints:
+                raise ValueError("No usable provider configured in llm.routing")
+
+            router = ProviderRouter(
+                endpoints,
+                strategy=routing_config.get('strategy', 'weighted'),
+                max_failover=routing_config.get('max_failover', 2),
+                rate_limit_cooldown=routing_config.get('rate_limit_cooldown', 10.0)
+            )
+            cls._routers[cache_key] = router
+
+        logger.info(
+            f"Created provider router ({router.strategy}) over "
+            f"{', '.join(f'{e.name}(w={e.weight:g})' for e in endpoints)}"
+        )
+        return router
+
+    @classmethod
+    def get_routing_stats(cls) -> Dict[str, Any]:
+        """Counters and breaker state of the active provider routers."""
+        with cls._router_lock:
+            routers = list(cls._routers.values())
+        return {'routers': [router.get_stats() for router in routers]}
+
+    @classmethod
+    def _create_configured_provider(
+        cls,
+        llm_config: Dict[str, Any],
+        provider_name: str,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> BaseLLMProvider:
+        """Create one provider from llm.providers.<name> (plus optional overrides)."""
         # Get provider-specific configuration
         providers_config = llm_config.get('providers', {})
         provider_config = providers_config.get(provider_name)
@@ -118,12 +220,22 @@ class LLMFactory:
         if not provider_config.get('enabled', True):
             raise ValueError(f"Provider {provider_name} is disabled")
 
-        # Add retry configuration
+        # Add retry configuration (endpoint overrides such as api_key win)
         retry_config = llm_config.get('retry', {})
-        provider_config['max_retries'] = retry_config.get('max_attempts', 3)
-        provider_config['retry_delay'] = retry_config.get('delay_seconds', 5.0)
+        provider_config = {
+            **provider_config,
+            'max_retries': retry_config.get('max_attempts', 3),
+            'retry_delay': retry_config.get('delay_seconds', 5.0),
+            **(overrides or {})
+        }
 
-        return cls.create_provider(provider_name, provider_config)
+        provider = cls.create_provider(provider_name, provider_config)
+
+        # Hedge straggling requests (latency tracked per provider/model)
+        if llm_config.get('hedging', {}).get('enabled', False):
+            provider = HedgedProvider(provider)
+
+        return provider
 
     @classmethod
     def get_supported_providers(cls) -> list:
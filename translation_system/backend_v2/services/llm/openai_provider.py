@@ -2,7 +2,7 @@
 
 import asyncio
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 import httpx
 import json
 import logging
@@ -14,6 +14,8 @@ from .base_provider import (
     LLMConfig
 )
 from .prompt_template import PromptTemplate
+from .sse import iter_sse_data, deliver, StreamInterruptedError
+from .rate_limit import parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -41,27 +43,7 @@ class OpenAIProvider(BaseLLMProvider):
         self._log_request(request)
 
         try:
-            # Build task-specific prompt (根据任务类型选择合适的prompt)
-            prompt = self.prompt_template.build_task_specific_prompt(
-                source_text=request.source_text,
-                source_lang=request.source_lang,
-                target_lang=request.target_lang,
-                task_type=request.task_type,
-                context=request.context,
-                game_info=request.game_info
-            )
-
-            # Prepare API request
-            api_request = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": "You are a professional game translator."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": self.config.temperature,
-                "max_tokens": self.config.max_tokens,
-                "response_format": {"type": "text"}
-            }
+            prompt, api_request = self._build_api_request(request)
 
             # Make API call with retries
             translated_text, usage = await self._call_api_with_retry(api_request)
@@ -76,7 +58,8 @@ class OpenAIProvider(BaseLLMProvider):
                 token_usage=usage,
                 model=self.model,
                 duration_ms=int((time.time() - start_time) * 1000),
-                task_id=request.task_id
+                task_id=request.task_id,
+                prompt_stats=prompt.get_stats()
             )
 
             self._log_response(response)
@@ -92,6 +75,82 @@ class OpenAIProvider(BaseLLMProvider):
                 duration_ms=int((time.time() - start_time) * 1000)
             )
 
+    @property
+    def supports_streaming(self) -> bool:
+        return self.config.stream
+
+    async def translate_stream(
+        self,
+        request: TranslationRequest,
+        on_delta: Callable[[str], Any]
+    ) -> TranslationResponse:
+        """Translate using the SSE streaming API, delivering chunks as they arrive."""
+        if not self.config.stream:
+            return await super().translate_stream(request, on_delta)
+
+        start_time = time.time()
+        self._log_request(request)
+        prompt = None
+
+        try:
+            prompt, api_request = self._build_api_request(request)
+            api_request["stream"] = True
+            api_request["stream_options"] = {"include_usage": True}
+
+            translated_text, usage = await self._stream_api_with_retry(api_request, on_delta)
+
+            response = TranslationResponse(
+                translated_text=translated_text,
+                confidence=self._calculate_confidence(request.source_text, translated_text),
+                token_usage=usage,
+                model=self.model,
+                duration_ms=int((time.time() - start_time) * 1000),
+                task_id=request.task_id,
+                prompt_stats=prompt.get_stats()
+            )
+
+            self._log_response(response)
+            return response
+
+        except Exception as e:
+            logger.error(f"Streaming translation failed for task {request.task_id}: {str(e)}")
+            return TranslationResponse(
+                translated_text=getattr(e, 'partial_text', ''),
+                confidence=0.0,
+                model=self.model,
+                error=str(e),
+                task_id=request.task_id,
+                duration_ms=int((time.time() - start_time) * 1000),
+                prompt_stats=prompt.get_stats() if prompt else {}
+            )
+
+    def _build_api_request(self, request: TranslationRequest) -> tuple:
+        """Build the compiled prompt and chat completion request body."""
+        # Build task-specific prompt (根据任务类型选择合适的prompt)
+        prompt = self.prompt_template.compile_task_prompt(
+            source_text=request.source_text,
+            source_lang=request.source_lang,
+            target_lang=request.target_lang,
+            task_type=request.task_type,
+            context=request.context,
+            game_info=request.game_info,
+            glossary_config=request.glossary_config,
+            session_id=request.session_id
+        )
+
+        # Stable prefix first so OpenAI prompt caching can reuse it
+        api_request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": prompt.prefix},
+                {"role": "user", "content": prompt.suffix}
+            ],
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "response_format": {"type": "text"}
+        }
+        return prompt, api_request
+
     async def translate_batch(
         self,
         requests: List[TranslationRequest]
@@ -100,20 +159,15 @@ class OpenAIProvider(BaseLLMProvider):
         # OpenAI doesn't have native batch API, so we use concurrent requests
         tasks = [self.translate_single(req) for req in requests]
 
-        # Limit concurrent requests to avoid rate limiting
-        max_concurrent = min(5, len(requests))
-        responses = []
+        # Bounded concurrency; pacing comes from the rate limit gate (429 / Retry-After)
+        semaphore = asyncio.Semaphore(5)
 
-        for i in range(0, len(tasks), max_concurrent):
-            batch = tasks[i:i + max_concurrent]
-            batch_responses = await asyncio.gather(*batch)
-            responses.extend(batch_responses)
+        async def run(task):
+            async with semaphore:
+                await self.rate_limit_gate.wait()
+                return await task
 
-            # Small delay between batches to avoid rate limiting
-            if i + max_concurrent < len(tasks):
-                await asyncio.sleep(1)
-
-        return responses
+        return list(await asyncio.gather(*[run(task) for task in tasks]))
 
     async def health_check(self) -> bool:
         """Check OpenAI API health."""
@@ -134,6 +188,7 @@ class OpenAIProvider(BaseLLMProvider):
         last_error = None
 
         for attempt in range(self.config.max_retries):
+            await self.rate_limit_gate.wait()
             try:
                 async with httpx.AsyncClient(timeout=self.config.timeout) as client:
                     response = await client.post(
@@ -159,10 +214,11 @@ class OpenAIProvider(BaseLLMProvider):
                         return translated_text, token_usage
 
                     elif response.status_code == 429:
-                        # Rate limited, wait longer
+                        # Rate limited: cool down every request of this provider (Retry-After wins)
                         wait_time = self.config.retry_delay * (2 ** attempt)
-                        logger.warning(f"Rate limited, waiting {wait_time}s...")
-                        await asyncio.sleep(wait_time)
+                        last_error = "Rate limited (429)"
+                        self.rate_limit_gate.hit(parse_retry_after(response.headers.get("retry-after")), wait_time)
+                        logger.warning(f"Rate limited, cooling down (backoff {wait_time}s)...")
 
                     else:
                         error_msg = f"API error: {response.status_code} - {response.text}"
@@ -177,8 +233,79 @@ class OpenAIProvider(BaseLLMProvider):
                 last_error = str(e)
                 logger.error(f"API call failed: {last_error}")
 
-            # Wait before retry
-            if attempt < self.config.max_retries - 1:
+            # Wait before retry (after a 429 the rate limit gate paces the retry)
+            if attempt < self.config.max_retries - 1 and last_error != "Rate limited (429)":
+                await asyncio.sleep(self.config.retry_delay * (attempt + 1))
+
+        raise Exception(f"Failed after {self.config.max_retries} attempts: {last_error}")
+
+    async def _stream_api_with_retry(
+        self,
+        request: Dict[str, Any],
+        on_delta: Callable[[str], Any]
+    ) -> tuple:
+        """
+        Call the streaming API with retry logic.
+
+        Retries only while nothing has been delivered; once output has been
+        passed to on_delta a failure raises StreamInterruptedError.
+        """
+        last_error = None
+
+        for attempt in range(self.config.max_retries):
+            await self.rate_limit_gate.wait()
+            parts = []
+            try:
+                async with httpx.AsyncClient(timeout=self.config.timeout) as client:
+                    async with client.stream(
+                        "POST",
+                        f"{self.base_url}/chat/completions",
+                        headers=self.headers,
+                        json=request
+                    ) as response:
+                        if response.status_code == 200:
+                            usage = {}
+                            async for data in iter_sse_data(response):
+                                chunk = json.loads(data)
+                                if chunk.get("usage"):
+                                    usage = chunk["usage"]
+                                for choice in chunk.get("choices") or []:
+                                    delta = (choice.get("delta") or {}).get("content")
+                                    if delta:
+                                        parts.append(delta)
+                                        await deliver(on_delta, delta)
+
+                            token_usage = {
+                                "prompt_tokens": usage.get("prompt_tokens", 0),
+                                "completion_tokens": usage.get("completion_tokens", 0),
+                                "total_tokens": usage.get("total_tokens", 0)
+                            }
+                            return "".join(parts).strip(), token_usage
+
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        if response.status_code == 429:
+                            # Rate limited: cool down every request of this provider (Retry-After wins)
+                            wait_time = self.config.retry_delay * (2 ** attempt)
+                            last_error = "Rate limited (429)"
+                            self.rate_limit_gate.hit(parse_retry_after(response.headers.get("retry-after")), wait_time)
+                            logger.warning(f"Rate limited, cooling down (backoff {wait_time}s)...")
+                        else:
+                            last_error = f"API error: {response.status_code} - {body}"
+                            logger.error(last_error)
+
+            except httpx.TimeoutException:
+                last_error = "Request timeout"
+                logger.warning(f"Stream timeout on attempt {attempt + 1}")
+
+            except Exception as e:
+                last_error = str(e)
+                logger.error(f"Streaming API call failed: {last_error}")
+
+            if parts:
+                raise StreamInterruptedError(f"Stream interrupted: {last_error}", "".join(parts))
+
+            # Wait before retry (after a 429 the rate limit gate paces the retry)
+            if attempt < self.config.max_retries - 1 and last_error != "Rate limited (429)":
                 await asyncio.sleep(self.config.retry_delay * (attempt + 1))
 
-        raise Exception(f"Failed after {self.config.max_retries} attempts: {last_error}")
\ No newline at end of file
+        raise Exception(f"Failed after {self.config.max_retries} attempts: {last_error}")
@@ -1,8 +1,11 @@
 """Translation prompt templates."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import time
 import logging
 
+from .compiled_prompt import CompiledPrompt, PromptPrefixCache, prompt_prefix_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,6 +76,206 @@ class PromptTemplate:
         'VI': '越南'
     }
 
+    # Compiled prompt building blocks (static parts live in the cached prefix)
+    GAME_REQUIREMENTS = """翻译要求：
+1. 保持游戏术语的一致性
+2. 符合目标地区的文化习惯和语言规范
+3. 保留特殊标记和变量（如{0}, %s, %d, {name}等格式化占位符）
+4. 注意UI文本长度限制，翻译不要过长
+5. 保持原文的语气和风格
+6. 对于专有名词（角色名、地名、技能名等）保持统一翻译"""
+
+    SIMPLE_REQUIREMENTS = """翻译要求：
+1. 准确传达原文含义
+2. 符合目标语言的表达习惯
+3. 保留特殊格式和标记
+4. 不要添加额外的解释"""
+
+    TASK_TYPE_INSTRUCTIONS = {
+        'yellow': "特别注意：这是重译任务，请重新审视现有翻译质量，提供更准确和地道的翻译。",
+        'blue': "特别注意：请在保持意思的前提下减少3-10个字，尽量缩短译文长度。"
+    }
+
+    # Glossaries up to this size are placed in the cached prefix in full;
+    # larger ones are matched per batch into the variable suffix
+    PREFIX_GLOSSARY_MAX_TERMS = 200
+
+    def __init__(self, prefix_cache: PromptPrefixCache = None):
+        """
+        Initialize prompt template.
+
+        Args:
+            prefix_cache: Cache for compiled prompt prefixes (shared global by default)
+        """
+        self.prefix_cache = prefix_cache or prompt_prefix_cache
+
+    def compile_task_prompt(
+        self,
+        source_text: str,
+        source_lang: str,
+        target_lang: str,
+        task_type: str = 'normal',
+        context: str = "",
+        game_info: Any = None,
+        glossary_config: Dict[str, Any] = None,
+        session_id: Optional[str] = None
+    ) -> CompiledPrompt:
+        """
+        Build a task prompt as a cached stable prefix plus a variable suffix.
+
+        The prefix (role, game info, requirements, task-type instruction and a
+        small glossary) is keyed by session, languages, task type and glossary
+        version and built once; the suffix carries the context, per-batch
+        glossary matches, English reference and source text.
+
+        Args:
+            source_text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+            task_type: Task type ('normal', 'yellow', 'blue')
+            context: Translation context
+            game_info: Game information dict (or a game context string)
+            glossary_config: Glossary configuration
+            session_id: Session the prompt belongs to
+
+        Returns:
+            CompiledPrompt with prefix, suffix and build statistics
+        """
+        start_time = time.perf_counter()
+
+        game_fields = self._game_fields(game_info)
+        glossary_id, glossary, glossary_version = self._resolve_glossary(glossary_config)
+        glossary_in_prefix = glossary is not None and \
+            len(glossary.get('terms', [])) <= self.PREFIX_GLOSSARY_MAX_TERMS
+
+        prefix_key = (
+            session_id, source_lang.upper(), target_lang.upper(), task_type,
+            glossary_id, glossary_version, glossary_in_prefix, game_fields
+        )
+        prefix, prefix_tokens, cached = self.prefix_cache.get_or_build(
+            prefix_key,
+            lambda: self._build_prefix(
+                source_lang, target_lang, task_type, game_fields,
+                glossary if glossary_in_prefix else None
+            )
+        )
+
+        suffix_parts = []
+        if game_fields:
+            suffix_parts.append(f"上下文信息:\n{context or '无额外上下文'}")
+        if glossary is not None and not glossary_in_prefix:
+            glossary_text = self._inject_glossary(source_text, glossary_id, target_lang)
+            if glossary_text:
+                suffix_parts.append(glossary_text)
+        reference_en = game_info.get('reference_en', '') if isinstance(game_info, dict) else ''
+        if task_type == 'yellow' and reference_en:
+            target_lang_name = self.LANGUAGE_NAMES.get(target_lang.upper(), target_lang)
+            suffix_parts.append(
+                f"【英文参考翻译】\n{reference_en}\n【英文参考结束】\n\n"
+                f"请参考上述英文翻译，保持风格和术语一致，提供准确、地道的{target_lang_name}翻译。"
+            )
+        suffix_parts.append(f"【原文】\n{source_text}\n【原文结束】")
+
+        return CompiledPrompt(
+            prefix=prefix,
+            suffix="\n\n".join(suffix_parts),
+            prefix_key=prefix_key,
+            prefix_tokens=prefix_tokens,
+            prefix_cached=cached,
+            build_ms=(time.perf_counter() - start_time) * 1000
+        )
+
+    def _game_fields(self, game_info: Any) -> Tuple[str, ...]:
+        """Prompt-relevant game info fields (empty tuple when there is none)."""
+        if isinstance(game_info, str):
+            return ('', '', '', game_info) if game_info else ()
+        if not game_info:
+            return ()
+        fields = tuple(
+            str(game_info.get(key) or '')
+            for key in ('game_type', 'world_view', 'game_style', 'additional_context')
+        )
+        return fields if any(fields) else ()
+
+    def _resolve_glossary(self, glossary_config: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
+        """Resolve (glossary_id, glossary, version) for an enabled glossary config."""
+        if not (glossary_config and glossary_config.get('enabled') and glossary_config.get('id')):
+            return None, None, None
+
+        glossary_id = glossary_config['id']
+        try:
+            from services.glossary_manager import glossary_manager
+
+            glossary = glossary_manager.load_glossary(glossary_id)
+            if glossary:
+                return glossary_id, glossary, glossary_manager.get_glossary_version(glossary_id)
+        except Exception as e:
+            logger.warning(f"Failed to load glossary {glossary_id}: {e}")
+
+        return None, None, None
+
+    def _build_prefix(
+        self,
+        source_lang: str,
+        target_lang: str,
+        task_type: str,
+        game_fields: Tuple[str, ...],
+        glossary: Optional[Dict]
+    ) -> str:
+        """Build the stable part of a task prompt."""
+        source_lang_name = self.LANGUAGE_NAMES.get(source_lang.upper(), source_lang)
+        target_lang_name = self.LANGUAGE_NAMES.get(target_lang.upper(), target_lang)
+
+        parts = [f"你是一名专业的游戏翻译专家。请将{source_lang_name}文本翻译成{target_lang_name}。"]
+
+        if game_fields:
+            game_type, world_view, game_style, additional = game_fields
+            game_lines = [
+                "游戏信息:",
+                f"- 类型: {game_type or '未知'}",
+                f"- 世界观: {world_view or '未知'}",
+                f"- 风格: {game_style or '未知'}",
+                f"- 目标地区: {self.TARGET_REGIONS.get(target_lang.upper(), '')}"
+            ]
+            if additional:
+                game_lines.append(f"- 补充: {additional}")
+            parts.append("\n".join(game_lines))
+
+        if glossary is not None:
+            glossary_text = self._format_full_glossary(glossary, target_lang)
+            if glossary_text:
+                parts.append(glossary_text)
+
+        parts.append(self.GAME_REQUIREMENTS if game_fields else self.SIMPLE_REQUIREMENTS)
+
+        instruction = self.TASK_TYPE_INSTRUCTIONS.get(task_type)
+        if instruction:
+            parts.append(instruction)
+
+        parts.append("只返回翻译后的文本，不要包含其他解释或标记。")
+        return "\n\n".join(parts)
+
+    def _format_full_glossary(self, glossary: Dict, target_lang: str) -> str:
+        """Format every term with a translation for target_lang."""
+        try:
+            from services.glossary_manager import glossary_manager
+
+            terms = [
+                {
+                    'source': term.get('source', ''),
+                    'target': term.get('translations', {}).get(target_lang),
+                    'priority': term.get('priority', 5)
+                }
+                for term in glossary.get('terms', [])
+            ]
+            terms = [term for term in terms if term['source'] and term['target']]
+            terms.sort(key=lambda x: x['priority'], reverse=True)
+            return glossary_manager.format_glossary_for_prompt(terms)
+
+        except Exception as e:
+            logger.warning(f"Failed to format glossary: {e}")
+            return ""
+
     def build_translation_prompt(
         self,
         source_text: str,
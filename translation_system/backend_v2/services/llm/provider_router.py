@@ -0,0 +1,321 @@
+"""Route translation requests across several LLM providers/keys.
+
+Each endpoint (a configured provider, optionally with its own API key) has a
+weight and a circuit breaker. Requests go to the next endpoint by smooth
+weighted round-robin or least outstanding requests; errors and 429s trip the
+breaker (a 429 cools the endpoint down immediately) and the request fails
+over to another endpoint.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from .base_provider import BaseLLMProvider, LLMConfig, TranslationRequest, TranslationResponse
+from .sse import deliver
+
+STRATEGIES = ('weighted', 'least_outstanding')
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open trial after a timeout."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds before an open circuit allows a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_count = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a request may be sent (claims the half-open trial slot)."""
+        if self.state == self.OPEN:
+            if time.monotonic() < self._open_until:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def available(self) -> bool:
+        """Whether allow() would currently succeed (does not claim anything)."""
+        if self.state == self.OPEN:
+            return time.monotonic() >= self._open_until
+        if self.state == self.HALF_OPEN:
+            return not self._trial_in_flight
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip(self.recovery_timeout)
+
+    def trip(self, duration: float):
+        """Open the circuit for the given number of seconds."""
+        self.state = self.OPEN
+        self.opened_count += 1
+        self._open_until = max(self._open_until, time.monotonic() + duration)
+        self._trial_in_flight = False
+
+
+class ProviderEndpoint:
+    """A routable provider instance with its weight, breaker and counters."""
+
+    def __init__(self, name: str, provider: BaseLLMProvider, weight: float = 1.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.provider = provider
+        self.weight = max(float(weight), 0.0)
+        self.breaker = breaker or CircuitBreaker()
+        self.outstanding = 0
+        self.current_weight = 0.0  # Smooth weighted round-robin state
+        self.stats = {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'rate_limited': 0,
+            'latency_ms_total': 0.0
+        }
+
+    @property
+    def model(self) -> str:
+        return getattr(self.provider, 'model', '') or self.provider.config.model
+
+    @property
+    def cooling_down(self) -> bool:
+        """Whether the provider's own rate limit gate would hold the next request."""
+        provider = getattr(self.provider, 'provider', self.provider)  # Unwrap HedgedProvider
+        gate = getattr(provider, 'rate_limit_gate', None)
+        return gate is not None and gate.cooling_down
+
+    def available(self) -> bool:
+        return self.weight > 0 and not self.cooling_down and self.breaker.available()
+
+    def get_stats(self) -> Dict[str, Any]:
+        successes = self.stats['successes']
+        return {
+            'model': self.model,
+            'weight': self.weight,
+            'state': self.breaker.state,
+            'outstanding': self.outstanding,
+            'opened_count': self.breaker.opened_count,
+            'requests': self.stats['requests'],
+            'successes': successes,
+            'failures': self.stats['failures'],
+            'rate_limited': self.stats['rate_limited'],
+            'avg_latency_ms': round(self.stats['latency_ms_total'] / successes, 1) if successes else 0.0
+        }
+
+
+def is_rate_limited(error: Optional[str]) -> bool:
+    """Whether a provider error message reports a 429 / rate limit."""
+    if not error:
+        return False
+    lowered = error.lower()
+    return '429' in lowered or 'rate limit' in lowered
+
+
+class ProviderRouter(BaseLLMProvider):
+    """Provider facade that balances requests over endpoints with failover."""
+
+    def __init__(
+        self,
+        endpoints: List[ProviderEndpoint],
+        strategy: str = 'weighted',
+        max_failover: int = 2,
+        rate_limit_cooldown: float = 10.0,
+        max_concurrent: int = 5
+    ):
+        """
+        Initialize provider router.
+
+        Args:
+            endpoints: Routable endpoints (at least one)
+            strategy: 'weighted' (smooth weighted round-robin) or 'least_outstanding'
+            max_failover: Extra endpoints tried after a failed request
+            rate_limit_cooldown: Seconds an endpoint is ejected after a 429
+            max_concurrent: Concurrency of translate_batch
+        """
+        if not endpoints:
+            raise ValueError("ProviderRouter requires at least one endpoint")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown routing strategy: {strategy}. Supported: {', '.join(STRATEGIES)}")
+
+        primary = max(endpoints, key=lambda endpoint: endpoint.weight)
+        super().__init__(LLMConfig(
+            provider='router',
+            api_key='',
+            model=primary.model,
+            stream=any(endpoint.provider.supports_streaming for endpoint in endpoints)
+        ))
+        self.endpoints = endpoints
+        self.strategy = strategy
+        self.max_failover = max_failover
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.max_concurrent = max_concurrent
+        self.model = primary.model
+        self.stats = {
+            'requests': 0,
+            'failovers': 0,
+            'unavailable': 0,
+            'health_ejections': 0
+        }
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.config.stream
+
+    def _select(self, exclude: set) -> Optional[ProviderEndpoint]:
+        candidates = [
+            endpoint for endpoint in self.endpoints
+            if endpoint.name not in exclude and endpoint.available()
+        ]
+        if not candidates:
+            return None
+
+        if self.strategy == 'least_outstanding':
+            chosen = min(
+                candidates,
+                key=lambda endpoint: (endpoint.outstanding / endpoint.weight, endpoint.stats['requests'])
+            )
+        else:
+            total = sum(endpoint.weight for endpoint in candidates)
+            for endpoint in candidates:
+                endpoint.current_weight += endpoint.weight
+            chosen = max(candidates, key=lambda endpoint: endpoint.current_weight)
+            chosen.current_weight -= total
+
+        return chosen if chosen.breaker.allow() else None
+
+    def _record(self, endpoint: ProviderEndpoint, response: TranslationResponse, elapsed_ms: float):
+        endpoint.stats['requests'] += 1
+        if not response.error:
+            endpoint.stats['successes'] += 1
+            endpoint.stats['latency_ms_total'] += elapsed_ms
+            endpoint.breaker.record_success()
+        elif is_rate_limited(response.error):
+            endpoint.stats['rate_limited'] += 1
+            endpoint.stats['failures'] += 1
+            endpoint.breaker.trip(self.rate_limit_cooldown)
+            self.logger.warning(f"Endpoint {endpoint.name} rate limited, cooling down {self.rate_limit_cooldown}s")
+        else:
+            endpoint.stats['failures'] += 1
+            endpoint.breaker.record_failure()
+
+    async def _route(
+        self,
+        request: TranslationRequest,
+        call: Callable[[ProviderEndpoint], Awaitable[TranslationResponse]],
+        can_failover: Callable[[], bool] = lambda: True
+    ) -> TranslationResponse:
+        self.stats['requests'] += 1
+        tried = set()
+        response = None
+
+        for attempt in range(self.max_failover + 1):
+            endpoint = self._select(tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.name)
+            if attempt > 0:
+                self.stats['failovers'] += 1
+
+            endpoint.outstanding += 1
+            start = time.monotonic()
+            try:
+                response = await call(endpoint)
+            except Exception as e:
+                response = TranslationResponse(translated_text="", error=str(e), task_id=request.task_id)
+            finally:
+                endpoint.outstanding -= 1
+
+            self._record(endpoint, response, (time.monotonic() - start) * 1000)
+            if not response.error or not can_failover():
+                return response
+
+            self.logger.warning(f"Endpoint {endpoint.name} failed for task {request.task_id}: {response.error}")
+
+        if response is None:
+            self.stats['unavailable'] += 1
+            response = TranslationResponse(
+                translated_text="",
+                error="No healthy LLM provider available",
+                task_id=request.task_id
+            )
+        return response
+
+    async def translate_single(self, request: TranslationRequest) -> TranslationResponse:
+        return await self._route(request, lambda endpoint: endpoint.provider.translate_single(request))
+
+    async def translate_stream(
+        self,
+        request: TranslationRequest,
+        on_delta: Callable[[str], Any]
+    ) -> TranslationResponse:
+        """Stream from one endpoint; fail over only while nothing was delivered."""
+        delivered = False
+
+        async def forward(delta: str):
+            nonlocal delivered
+            delivered = True
+            await deliver(on_delta, delta)
+
+        return await self._route(
+            request,
+            lambda endpoint: endpoint.provider.translate_stream(request, forward),
+            lambda: not delivered
+        )
+
+    async def translate_batch(self, requests: List[TranslationRequest]) -> List[TranslationResponse]:
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def run(request: TranslationRequest) -> TranslationResponse:
+            async with semaphore:
+                return await self.translate_single(request)
+
+        return list(await asyncio.gather(*[run(request) for request in requests]))
+
+    async def health_check(self) -> bool:
+        """Probe every endpoint and eject the unhealthy ones."""
+        results = await asyncio.gather(
+            *[endpoint.provider.health_check() for endpoint in self.endpoints],
+            return_exceptions=True
+        )
+        healthy = False
+        for endpoint, result in zip(self.endpoints, results):
+            if result is True:
+                healthy = True
+                continue
+            endpoint.breaker.trip(endpoint.breaker.recovery_timeout)
+            self.stats['health_ejections'] += 1
+            self.logger.warning(f"Endpoint {endpoint.name} failed health check, ejected")
+        return healthy
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'strategy': self.strategy,
+            'endpoints': {endpoint.name: endpoint.get_stats() for endpoint in self.endpoints}
+        }
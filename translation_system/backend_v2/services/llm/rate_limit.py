@@ -0,0 +1,72 @@
+"""Rate limit feedback shared by the requests of one provider instance.
+
+A 429 response opens a cool-down (the server's Retry-After when present,
+otherwise the provider's backoff); every request of the provider waits for it
+to pass before being sent. Requests are only delayed while the API is
+actually pushing back, instead of sleeping a fixed time between chunks.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds form only)."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds >= 0 else None
+
+
+class RateLimitGate:
+    """Cool-down window opened by rate-limited responses."""
+
+    def __init__(self, max_wait: float = 60.0):
+        """
+        Initialize rate limit gate.
+
+        Args:
+            max_wait: Upper bound for a single cool-down in seconds
+        """
+        self.max_wait = max_wait
+        self._until = 0.0
+        self.stats = {
+            'rate_limited': 0,
+            'waits': 0,
+            'wait_seconds': 0.0
+        }
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self._until
+
+    def hit(self, retry_after: Optional[float], backoff: float):
+        """
+        Register a rate-limited response.
+
+        Args:
+            retry_after: Server-provided Retry-After seconds (None if absent)
+            backoff: Provider backoff used when the server gives no hint
+        """
+        delay = min(retry_after if retry_after is not None else backoff, self.max_wait)
+        self.stats['rate_limited'] += 1
+        self._until = max(self._until, time.monotonic() + delay)
+
+    async def wait(self):
+        """Sleep until the current cool-down (if any) has passed."""
+        while True:
+            remaining = self._until - time.monotonic()
+            if remaining <= 0:
+                return
+            self.stats['waits'] += 1
+            self.stats['wait_seconds'] += remaining
+            await asyncio.sleep(remaining)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'wait_seconds': round(self.stats['wait_seconds'], 3),
+            'cooling_down': self.cooling_down
+        }
@@ -0,0 +1,52 @@
+"""Server-sent events helpers for streaming LLM responses."""
+
+import inspect
+from typing import AsyncIterator, Any, Callable
+
+
+class StreamInterruptedError(Exception):
+    """A stream failed after output was already delivered (not retryable)."""
+
+    def __init__(self, message: str, partial_text: str = ""):
+        super().__init__(message)
+        self.partial_text = partial_text
+
+
+async def iter_sse_data(response) -> AsyncIterator[str]:
+    """
+    Yield the ``data`` payload of each event in an SSE response.
+
+    Multi-line data fields are joined with newlines; comments and other
+    fields are ignored; ``[DONE]`` ends the stream.
+
+    Args:
+        response: Streaming httpx response
+    """
+    data_lines = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data_lines:
+                payload = '\n'.join(data_lines)
+                data_lines = []
+                if payload == '[DONE]':
+                    return
+                yield payload
+            continue
+
+        if line.startswith(':'):
+            continue
+        field, _, value = line.partition(':')
+        if field == 'data':
+            data_lines.append(value[1:] if value.startswith(' ') else value)
+
+    if data_lines:
+        payload = '\n'.join(data_lines)
+        if payload != '[DONE]':
+            yield payload
+
+
+async def deliver(callback: Callable[[str], Any], delta: str) -> None:
+    """Invoke a sync or async delta callback."""
+    result = callback(delta)
+    if inspect.isawaitable(result):
+        await result
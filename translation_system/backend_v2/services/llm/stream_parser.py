@@ -0,0 +1,123 @@
+"""Incremental parser for streamed batch translation results."""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Keys accepted for the translated text in ID-keyed elements
+TEXT_KEYS = ('translation', 'text', 'result')
+
+
+class IncrementalArrayParser:
+    """
+    Emit the elements of a streamed JSON array as soon as each one is complete.
+
+    Text before the opening '[' (e.g. a ```json fence) and after the closing
+    ']' is ignored. Elements may be plain strings (position = index) or
+    objects keyed by a 1-based ``id`` / 0-based ``index`` with the text under
+    one of TEXT_KEYS.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.emitted = 0
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._element: List[str] = []
+        self._position = 0
+
+    def feed(self, chunk: str) -> List[Tuple[int, str]]:
+        """
+        Consume a chunk of streamed text.
+
+        Args:
+            chunk: Next piece of the model output
+
+        Returns:
+            (task index, translated text) for every element completed by this chunk
+        """
+        results = []
+        for char in chunk:
+            if self.finished:
+                break
+
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._element.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._emit(results)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._element.append(char)
+            elif char in '[{':
+                self._depth += 1
+                self._element.append(char)
+            elif char in ']}':
+                if self._depth == 1:
+                    # End of the top-level array (flush a trailing scalar)
+                    self._emit(results)
+                    self.finished = True
+                    break
+                self._depth -= 1
+                self._element.append(char)
+                if self._depth == 1:
+                    self._emit(results)
+            elif char == ',' and self._depth == 1:
+                self._emit(results)
+            elif self._depth > 1 or not char.isspace():
+                self._element.append(char)
+
+        return results
+
+    def _emit(self, results: List[Tuple[int, str]]):
+        raw = ''.join(self._element).strip()
+        self._element = []
+        if not raw:
+            return
+
+        position = self._position
+        self._position += 1
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping malformed streamed element #{position}: {raw[:80]}")
+            return
+
+        item = self._to_result(position, value)
+        if item is not None:
+            self.emitted += 1
+            results.append(item)
+
+    @staticmethod
+    def _to_result(position: int, value: Any) -> Optional[Tuple[int, str]]:
+        if isinstance(value, dict):
+            if 'id' in value:
+                index = int(value['id']) - 1
+            elif 'index' in value:
+                index = int(value['index'])
+            else:
+                index = position
+            text = next((value[key] for key in TEXT_KEYS if key in value), None)
+            return (index, str(text)) if text is not None else None
+
+        if value is None:
+            return None
+        return position, value if isinstance(value, str) else str(value)
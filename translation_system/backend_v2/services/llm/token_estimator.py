@@ -0,0 +1,261 @@
+"""Lightweight token count estimation for prompts and batches.
+
+Offline approximations of provider tokenizers: text is bucketed by script
+(CJK, Thai, Vietnamese, Latin, other) and each bucket has a tokens-per-char
+rate per tokenizer profile. Actual usage reported by the provider feeds an
+EWMA correction factor per (direction, script) so the estimate self-corrects.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+# CJK ideographs, kana, hangul and Thai are roughly one token per character
+_DENSE_CHARS = re.compile(r'[฀-๿぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]')
+
+# Average characters per token for Latin-script text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without a model tokenizer."""
+    if not text:
+        return 0
+    dense = len(_DENSE_CHARS.findall(text))
+    other = len(text) - dense
+    return dense + (other + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+SCRIPTS = ('cjk', 'thai', 'vietnamese', 'latin', 'other')
+
+_SCRIPT_PATTERNS = {
+    'cjk': re.compile(r'[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿　-〿＀-￯]'),
+    'thai': re.compile(r'[฀-๿]'),
+    'latin': re.compile(r'[\x00-\x7fÀ-ɏ̀-ͯḀ-ỿ]')
+}
+
+# Letters that mark Latin-script text as Vietnamese (tokenizes denser than other Latin)
+_VIETNAMESE_MARKERS = re.compile(r'[ăđơưĂĐƠƯạ-ỹẠ-Ỹ]')
+
+# Script of each target language's output
+LANGUAGE_SCRIPTS = {
+    'CH': 'cjk', 'ZH': 'cjk', 'JA': 'cjk', 'JP': 'cjk', 'KO': 'cjk', 'KR': 'cjk',
+    'TH': 'thai',
+    'VN': 'vietnamese', 'VI': 'vietnamese'
+}
+
+# Output characters per source character, by source script and target script
+EXPANSION = {
+    'cjk': {'cjk': 1.0, 'thai': 2.4, 'vietnamese': 3.2, 'latin': 3.0, 'other': 3.0},
+    'default': {'cjk': 0.4, 'thai': 1.0, 'vietnamese': 1.1, 'latin': 1.1, 'other': 1.1}
+}
+
+# Tokens per batch item beyond the text itself (numbering, quotes, separators)
+ITEM_INPUT_OVERHEAD = 3
+ITEM_OUTPUT_OVERHEAD = 4
+
+
+@dataclass
+class TokenizerProfile:
+    """Approximate tokens per character for each script."""
+
+    name: str
+    tokens_per_char: Dict[str, float] = field(default_factory=dict)
+
+    def rate(self, script: str) -> float:
+        return self.tokens_per_char.get(script, self.tokens_per_char.get('other', 0.5))
+
+
+# Offline approximations of the providers' tokenizers
+TOKENIZER_PROFILES: Dict[str, TokenizerProfile] = {
+    'openai': TokenizerProfile('openai', {
+        'cjk': 0.9, 'thai': 0.5, 'vietnamese': 0.45, 'latin': 0.25, 'other': 0.5
+    }),
+    'qwen': TokenizerProfile('qwen', {
+        'cjk': 0.7, 'thai': 0.45, 'vietnamese': 0.45, 'latin': 0.27, 'other': 0.5
+    })
+}
+
+# Provider names (llm.providers keys and aliases) -> profile
+PROVIDER_PROFILES = {
+    'qwen': 'qwen', 'qwen-plus': 'qwen', 'tongyi': 'qwen',
+    'openai': 'openai', 'gpt4': 'openai', 'gpt-5-nano': 'openai'
+}
+
+
+def register_profile(profile: TokenizerProfile, providers: Optional[List[str]] = None):
+    """Register a tokenizer profile (optionally mapping provider names to it)."""
+    TOKENIZER_PROFILES[profile.name] = profile
+    for provider in providers or []:
+        PROVIDER_PROFILES[provider] = profile.name
+
+
+def script_counts(text: str) -> Dict[str, int]:
+    """Character count per script."""
+    if not text:
+        return {}
+    counts = {}
+    remaining = len(text)
+    for script, pattern in _SCRIPT_PATTERNS.items():
+        found = len(pattern.findall(text))
+        if found:
+            counts[script] = found
+            remaining -= found
+    if remaining > 0:
+        counts['other'] = remaining
+    if 'latin' in counts and _VIETNAMESE_MARKERS.search(text):
+        counts['vietnamese'] = counts.pop('latin')
+    return counts
+
+
+def dominant_script(counts: Dict[str, int]) -> str:
+    significant = {script: count for script, count in counts.items() if script != 'latin'}
+    if significant and max(significant.values()) * 4 >= sum(counts.values()):
+        return max(significant, key=significant.get)
+    return 'latin' if counts else 'other'
+
+
+class TokenEstimator:
+    """Per-script token estimator with self-correcting calibration."""
+
+    def __init__(self, profile: TokenizerProfile, smoothing: float = 0.2):
+        """
+        Initialize estimator.
+
+        Args:
+            profile: Tokenizer profile
+            smoothing: EWMA weight of each observed actual/predicted ratio
+        """
+        self.profile = profile
+        self.smoothing = smoothing
+        self._factors: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'observations': 0,
+            'predicted_input': 0,
+            'actual_input': 0,
+            'predicted_output': 0,
+            'actual_output': 0
+        }
+
+    def factor(self, key: str) -> float:
+        return self._factors.get(key, 1.0)
+
+    def raw_tokens(self, text: str) -> float:
+        """Uncalibrated token estimate of a text."""
+        return sum(self.profile.rate(script) * count for script, count in script_counts(text).items())
+
+    def count(self, text: str) -> int:
+        """Calibrated token estimate of a text."""
+        if not text:
+            return 0
+        counts = script_counts(text)
+        raw = sum(self.profile.rate(script) * count for script, count in counts.items())
+        return int(round(raw * self.factor(f"input:{dominant_script(counts)}")))
+
+    def estimate_task(self, task: Dict[str, Any]) -> Dict[str, int]:
+        """Input and expected output tokens of one batch item."""
+        source_text = str(task.get('source_text') or '')
+        context = str(task.get('source_context') or '')
+        counts = script_counts(source_text)
+        source_script = dominant_script(counts)
+
+        input_raw = sum(self.profile.rate(script) * count for script, count in counts.items())
+        input_raw += self.raw_tokens(context)
+        input_tokens = input_raw * self.factor(f"input:{source_script}") + ITEM_INPUT_OVERHEAD
+
+        target_lang = str(task.get('target_lang') or '').upper()
+        target_script = LANGUAGE_SCRIPTS.get(target_lang, 'latin')
+        expansion = EXPANSION.get(source_script, EXPANSION['default'])[target_script]
+        output_raw = len(source_text) * expansion * self.profile.rate(target_script)
+        output_tokens = output_raw * self.factor(f"output:{target_lang}") + ITEM_OUTPUT_OVERHEAD
+
+        return {'input_tokens': int(round(input_tokens)), 'output_tokens': int(round(output_tokens))}
+
+    def estimate_batch(self, tasks: List[Dict[str, Any]], prefix_tokens: int = 0) -> Dict[str, int]:
+        """Input (including prompt prefix) and expected output tokens of a batch."""
+        input_tokens = prefix_tokens
+        output_tokens = 0
+        for task in tasks:
+            estimate = self.estimate_task(task)
+            input_tokens += estimate['input_tokens']
+            output_tokens += estimate['output_tokens']
+        return {'input_tokens': input_tokens, 'output_tokens': output_tokens}
+
+    def observe(
+        self,
+        tasks: List[Dict[str, Any]],
+        predicted: Dict[str, int],
+        actual_input: int,
+        actual_output: int
+    ):
+        """
+        Correct the calibration factors from a batch's actual token usage.
+
+        Args:
+            tasks: Batch tasks (used for the dominant source script and target language)
+            predicted: estimate_batch() result for the same call
+            actual_input: Prompt tokens reported by the provider
+            actual_output: Completion tokens reported by the provider
+        """
+        if not tasks:
+            return
+        source_script = dominant_script(script_counts(''.join(str(t.get('source_text') or '') for t in tasks)))
+        target_lang = str(tasks[0].get('target_lang') or '').upper()
+
+        with self._lock:
+            self.stats['observations'] += 1
+            self.stats['predicted_input'] += predicted.get('input_tokens', 0)
+            self.stats['predicted_output'] += predicted.get('output_tokens', 0)
+            self.stats['actual_input'] += actual_input
+            self.stats['actual_output'] += actual_output
+            self._update(f"input:{source_script}", predicted.get('input_tokens', 0), actual_input)
+            self._update(f"output:{target_lang}", predicted.get('output_tokens', 0), actual_output)
+
+    def _update(self, key: str, predicted: int, actual: int):
+        if predicted <= 0 or actual <= 0:
+            return
+        current = self._factors.get(key, 1.0)
+        ratio = current * actual / predicted
+        # Clamp single observations so one odd response cannot swing the estimate
+        ratio = min(max(ratio, current * 0.5), current * 2.0)
+        self._factors[key] = (1 - self.smoothing) * current + self.smoothing * ratio
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        for direction in ('input', 'output'):
+            predicted = stats[f'predicted_{direction}']
+            stats[f'{direction}_error_ratio'] = (
+                round(stats[f'actual_{direction}'] / predicted, 3) if predicted else None
+            )
+        return {
+            'profile': self.profile.name,
+            **stats,
+            'factors': {key: round(value, 3) for key, value in self._factors.items()}
+        }
+
+
+_estimators: Dict[str, TokenEstimator] = {}
+_estimators_lock = threading.Lock()
+
+
+def get_estimator(provider: Optional[str] = None) -> TokenEstimator:
+    """Shared estimator for a provider or model name (unknown names use the openai profile)."""
+    name = (provider or '').lower()
+    profile_name = name if name in TOKENIZER_PROFILES else PROVIDER_PROFILES.get(name)
+    if profile_name is None:
+        # Model names such as qwen-max / gpt-4-turbo
+        profile_name = next((profile for profile in TOKENIZER_PROFILES if profile in name), 'openai')
+    with _estimators_lock:
+        estimator = _estimators.get(profile_name)
+        if estimator is None:
+            estimator = _estimators[profile_name] = TokenEstimator(TOKENIZER_PROFILES[profile_name])
+        return estimator
+
+
+def get_estimator_stats() -> Dict[str, Any]:
+    """Predicted vs actual token usage per tokenizer profile."""
+    with _estimators_lock:
+        estimators = list(_estimators.values())
+    return {estimator.profile.name: estimator.get_stats() for estimator in estimators}
@@ -12,6 +12,8 @@ from collections import deque
 import threading
 from logging.handlers import RotatingFileHandler
 
+from .log_store import LogSegmentStore
+
 
 @dataclass
 class LogEntry:
@@ -65,6 +67,9 @@ class LogPersister:
         self.file_handlers: Dict[str, RotatingFileHandler] = {}
         self._setup_file_handlers()
 
+        # Indexed segment store backing query_logs / export_session_logs
+        self.log_store = LogSegmentStore(self.log_dir / "segments")
+
         # Background task control
         self._flush_task = None
         self._running = False
@@ -74,7 +79,9 @@ class LogPersister:
             'total_logs': 0,
             'logs_to_file': 0,
             'logs_to_db': 0,
+            'logs_to_store': 0,
             'db_errors': 0,
+            'store_errors': 0,
             'file_errors': 0,
             'last_flush': None
         }
@@ -207,10 +214,10 @@ class LogPersister:
             except Exception as e:
                 self.logger.error(f"Error in flush loop: {e}")
 
-    async def flush_logs(self):
-        """Flush buffered logs to file only (database write disabled for performance)."""
+    async def flush_logs(self) -> int:
+        """Flush buffered logs to files and the indexed log store (database write disabled for performance)."""
         if not self.log_buffer:
-            return
+            return 0
 
         # Get logs from buffer
         with self.buffer_lock:
@@ -218,13 +225,20 @@ class LogPersister:
             self.log_buffer.clear()
 
         if not logs_to_process:
-            return
+            return 0
 
-        # Write to files only (database write disabled for memory-only mode)
+        # Database write disabled for memory-only mode; the segment store serves queries
         await self._write_to_files(logs_to_process)
+        await self._write_to_store(logs_to_process)
 
         self.stats['last_flush'] = datetime.now().isoformat()
         self.logger.debug(f"Flushed {len(logs_to_process)} log entries")
+        return len(logs_to_process)
+
+    async def flush(self) -> Dict[str, Any]:
+        """Force a flush and report how many entries were written."""
+        flushed = await self.flush_logs()
+        return {'flushed': flushed}
 
     async def _write_to_files(self, logs: List[LogEntry]):
         """Write logs to file handlers."""
@@ -280,6 +294,29 @@ class LogPersister:
             self.stats['file_errors'] += 1
             self.logger.error(f"Failed to write logs to files: {e}")
 
+    async def _write_to_store(self, logs: List[LogEntry]):
+        """Append logs to the indexed segment store."""
+        try:
+            records = [self._entry_to_dict(log_entry) for log_entry in logs]
+            self.stats['logs_to_store'] += await asyncio.to_thread(self.log_store.append, records)
+        except Exception as e:
+            self.stats['store_errors'] += 1
+            self.logger.error(f"Failed to write logs to store: {e}")
+
+    @staticmethod
+    def _entry_to_dict(log_entry: LogEntry) -> Dict[str, Any]:
+        """Convert a LogEntry into a store record."""
+        return {
+            'timestamp': log_entry.timestamp,
+            'session_id': log_entry.session_id,
+            'level': log_entry.level,
+            'message': log_entry.message,
+            'component': log_entry.component,
+            'details': log_entry.details,
+            'thread_id': log_entry.thread_id,
+            'process_id': log_entry.process_id
+        }
+
     async def _write_to_database(self, logs: List[LogEntry]):
         """Write logs to database in batches (disabled for memory-only mode)."""
         pass
@@ -294,7 +331,11 @@ class LogPersister:
         limit: int = 1000
     ) -> List[Dict[str, Any]]:
         """
-        Query logs from database.
+        Query logs from the indexed log store.
+
+        Only segment blocks whose index summary can match the filters are read.
+        Entries still waiting in the in-memory buffer are flushed first so
+        recent logs are visible.
 
         Args:
             session_id: Session identifier to filter by
@@ -305,53 +346,41 @@ class LogPersister:
             limit: Maximum number of results
 
         Returns:
-            List of log entries
+            List of log entries (newest first)
         """
         try:
-            # Build query
-            where_clauses = []
-            params = []
-
-            if session_id:
-                where_clauses.append("session_id = %s")
-                params.append(session_id)
-
-            if level:
-                where_clauses.append("level = %s")
-                params.append(level.upper())
-
-            if component:
-                where_clauses.append("component = %s")
-                params.append(component)
-
-            if start_time:
-                where_clauses.append("timestamp >= %s")
-                params.append(start_time)
-
-            if end_time:
-                where_clauses.append("timestamp <= %s")
-                params.append(end_time)
-
-            where_clause = ""
-            if where_clauses:
-                where_clause = "WHERE " + " AND ".join(where_clauses)
-
-            query = f"""
-                SELECT *
-                FROM execution_logs
-                {where_clause}
-                ORDER BY timestamp DESC
-                LIMIT %s
-            """
-            params.append(limit)
-
-            results = await mysql_connector.fetch_all(query, tuple(params))
-            return results
+            await self.flush_logs()
+            return await asyncio.to_thread(
+                self.log_store.query,
+                session_id=session_id,
+                level=level,
+                component=component,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit
+            )
 
         except Exception as e:
             self.logger.error(f"Failed to query logs: {e}")
             return []
 
+    async def get_log_stats(self, session_id: str = None) -> Dict[str, Any]:
+        """
+        Aggregate log counts from the indexed log store.
+
+        Args:
+            session_id: Optional session identifier to filter by
+
+        Returns:
+            Total count, counts by level and component, and last-hour activity
+        """
+        await self.flush_logs()
+        return await asyncio.to_thread(
+            self.log_store.aggregate,
+            session_id=session_id,
+            recent_since=datetime.now() - timedelta(hours=1)
+        )
+
     def get_log_files(self) -> List[Dict[str, Any]]:
         """Get information about log files."""
         log_files = []
@@ -386,23 +415,32 @@ class LogPersister:
             'buffer_size': len(self.log_buffer),
             'running': self._running,
             'log_dir': str(self.log_dir),
-            'file_handlers': list(self.file_handlers.keys())
+            'file_handlers': list(self.file_handlers.keys()),
+            'store': self.log_store.get_statistics()
         }
 
     async def cleanup_old_logs(self, days_old: int = 30):
         """
-        Clean up old log files.
+        Clean up old log files and drop expired log store segments.
 
         Args:
             days_old: Remove files older than this many days
+
+        Returns:
+            Number of files and segments removed
         """
         try:
             if not self.log_dir.exists():
-                return
+                return 0
 
             current_time = datetime.now()
             cleanup_count = 0
 
+            # Retention in the store is whole-segment: no rewriting of live data
+            dropped = self.log_store.drop_segments_before(current_time - timedelta(days=days_old))
+            if dropped > 0:
+                self.logger.info(f"Dropped {dropped} expired log segments")
+
             for log_file in self.log_dir.glob("*.log*"):
                 try:
                     file_time = datetime.fromtimestamp(log_file.stat().st_mtime)
@@ -419,8 +457,11 @@ class LogPersister:
             if cleanup_count > 0:
                 self.logger.info(f"Cleaned up {cleanup_count} old log files")
 
+            return cleanup_count + dropped
+
         except Exception as e:
             self.logger.error(f"Failed to cleanup old logs: {e}")
+            return 0
 
     async def export_session_logs(self, session_id: str, format: str = 'json') -> str:
         """
@@ -434,7 +475,7 @@ class LogPersister:
             Path to exported file
         """
         try:
-            # Query logs for session
+            # Query logs for session (seeks only to blocks containing this session)
             logs = await self.query_logs(session_id=session_id, limit=10000)
 
             if not logs:
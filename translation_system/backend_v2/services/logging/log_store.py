@@ -0,0 +1,419 @@
+"""Embedded append-only log store with per-segment sparse indexes.
+
+Logs are appended as JSON lines to segment files. Every segment has a sidecar
+index that describes fixed-size blocks of records (byte offset, length, time
+range, and the session_ids / levels / components present in the block), so
+filtered queries only seek to and read the blocks that can match instead of
+scanning every file. Retention drops whole segments.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable
+from datetime import datetime
+
+
+SEGMENT_SUFFIX = '.seg'
+INDEX_SUFFIX = '.idx'
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Convert datetime / ISO string / number to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+class LogSegment:
+    """A single append-only segment file plus its sparse block index."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = path.with_suffix(INDEX_SUFFIX)
+        self.blocks: List[Dict[str, Any]] = []
+        self.size = 0
+        self.created_at = datetime.now().timestamp()
+
+    @property
+    def min_ts(self) -> Optional[float]:
+        return min(b['min_ts'] for b in self.blocks) if self.blocks else None
+
+    @property
+    def max_ts(self) -> Optional[float]:
+        return max(b['max_ts'] for b in self.blocks) if self.blocks else None
+
+    @property
+    def record_count(self) -> int:
+        return sum(b['count'] for b in self.blocks)
+
+    def load(self):
+        """Load the sidecar index and re-index any unindexed tail."""
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.blocks = data.get('blocks', [])
+                self.created_at = data.get('created_at', self.created_at)
+            except (OSError, ValueError):
+                self.blocks = []
+
+        indexed_end = 0
+        if self.blocks:
+            last = self.blocks[-1]
+            indexed_end = last['offset'] + last['length']
+
+        file_size = self.path.stat().st_size if self.path.exists() else 0
+        if file_size < indexed_end:
+            # Index points past the data (truncated segment): rebuild fully
+            self.blocks = []
+            indexed_end = 0
+
+        if file_size > indexed_end:
+            self._reindex_tail(indexed_end, file_size)
+            self.save_index()
+
+        self.size = self.path.stat().st_size if self.path.exists() else 0
+
+    def _reindex_tail(self, start: int, end: int, block_records: int = 256):
+        """Rebuild block metadata for bytes appended after the last index save."""
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+
+        offset = start
+        block_lines: List[bytes] = []
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                # Torn write at crash time: drop the partial record
+                with open(self.path, 'r+b') as f:
+                    f.truncate(offset + sum(len(l) for l in block_lines))
+                break
+            block_lines.append(line)
+            if len(block_lines) >= block_records:
+                offset = self._add_block(offset, block_lines)
+                block_lines = []
+        if block_lines:
+            self._add_block(offset, block_lines)
+
+    def _add_block(self, offset: int, lines: List[bytes]) -> int:
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        length = sum(len(l) for l in lines)
+        if records:
+            self.blocks.append(self._describe_block(offset, length, records))
+        return offset + length
+
+    @staticmethod
+    def _describe_block(offset: int, length: int, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        timestamps = [r['ts'] for r in records]
+        return {
+            'offset': offset,
+            'length': length,
+            'count': len(records),
+            'min_ts': min(timestamps),
+            'max_ts': max(timestamps),
+            'sessions': sorted({r.get('session_id') or '' for r in records}),
+            'levels': sorted({r.get('level') or '' for r in records}),
+            'components': sorted({r.get('component') or '' for r in records}),
+        }
+
+    def append(self, records: List[Dict[str, Any]], block_records: int):
+        """Append records as one or more indexed blocks."""
+        with open(self.path, 'ab') as f:
+            for start in range(0, len(records), block_records):
+                chunk = records[start:start + block_records]
+                payload = b''.join(
+                    (json.dumps(r, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+                    for r in chunk
+                )
+                offset = f.tell()
+                f.write(payload)
+                self.blocks.append(self._describe_block(offset, len(payload), chunk))
+            f.flush()
+            os.fsync(f.fileno())
+            self.size = f.tell()
+        self.save_index()
+
+    def save_index(self):
+        """Atomically persist the block index."""
+        tmp_path = self.index_path.with_suffix(INDEX_SUFFIX + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': self.created_at, 'blocks': self.blocks}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def matching_blocks(
+        self,
+        session_id: Optional[str],
+        level: Optional[str],
+        component: Optional[str],
+        start_ts: Optional[float],
+        end_ts: Optional[float]
+    ) -> Iterable[Dict[str, Any]]:
+        """Yield blocks whose summary can contain matching records."""
+        for block in self.blocks:
+            if start_ts is not None and block['max_ts'] < start_ts:
+                continue
+            if end_ts is not None and block['min_ts'] > end_ts:
+                continue
+            if session_id is not None and session_id not in block['sessions']:
+                continue
+            if level is not None and level not in block['levels']:
+                continue
+            if component is not None and component not in block['components']:
+                continue
+            yield block
+
+    def read_block(self, block: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Seek to a block and decode its records."""
+        with open(self.path, 'rb') as f:
+            f.seek(block['offset'])
+            data = f.read(block['length'])
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def remove(self):
+        """Delete the segment and its index."""
+        for path in (self.path, self.index_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class LogSegmentStore:
+    """Append-only segmented log store with sparse block indexes."""
+
+    def __init__(
+        self,
+        store_dir: str,
+        max_segment_bytes: int = 16 * 1024 * 1024,  # 16MB
+        max_segment_age: int = 3600,  # seconds
+        block_records: int = 256
+    ):
+        """
+        Initialize LogSegmentStore.
+
+        Args:
+            store_dir: Directory holding segment and index files
+            max_segment_bytes: Roll to a new segment above this size
+            max_segment_age: Roll to a new segment after this many seconds
+            block_records: Records per indexed block
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.block_records = block_records
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.segments: List[LogSegment] = []
+        self._load_segments()
+
+    def _load_segments(self):
+        """Open existing segments (oldest first) and recover their indexes."""
+        for path in sorted(self.store_dir.glob(f"*{SEGMENT_SUFFIX}")):
+            segment = LogSegment(path)
+            try:
+                segment.load()
+            except OSError as e:
+                self.logger.warning(f"Failed to load log segment {path}: {e}")
+                continue
+            self.segments.append(segment)
+        # Orphaned indexes whose segment file is gone
+        for idx_path in self.store_dir.glob(f"*{INDEX_SUFFIX}"):
+            if not idx_path.with_suffix(SEGMENT_SUFFIX).exists():
+                idx_path.unlink()
+
+    def _new_segment(self) -> LogSegment:
+        self._seq += 1
+        name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{self._seq:04d}{SEGMENT_SUFFIX}"
+        segment = LogSegment(self.store_dir / name)
+        self.segments.append(segment)
+        return segment
+
+    def _active_segment(self) -> LogSegment:
+        if self.segments:
+            segment = self.segments[-1]
+            age = datetime.now().timestamp() - segment.created_at
+            if segment.size < self.max_segment_bytes and age < self.max_segment_age:
+                return segment
+        return self._new_segment()
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Append log records.
+
+        Each record must carry a ``timestamp`` (datetime or ISO string).
+
+        Returns:
+            Number of records written
+        """
+        if not records:
+            return 0
+
+        prepared = []
+        for record in records:
+            item = dict(record)
+            ts = item.get('timestamp')
+            item['ts'] = _to_epoch(ts)
+            if isinstance(ts, datetime):
+                item['timestamp'] = ts.isoformat()
+            prepared.append(item)
+        prepared.sort(key=lambda r: r['ts'])
+
+        with self._lock:
+            self._active_segment().append(prepared, self.block_records)
+        return len(prepared)
+
+    def query(
+        self,
+        session_id: str = None,
+        level: str = None,
+        component: str = None,
+        start_time: datetime = None,
+        end_time: datetime = None,
+        limit: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Query records, newest first, reading only candidate blocks.
+
+        Returns:
+            List of log records (without the internal ``ts`` field)
+        """
+        level = level.upper() if level else None
+        start_ts = _to_epoch(start_time)
+        end_ts = _to_epoch(end_time)
+
+        with self._lock:
+            segments = [s for s in self.segments if s.blocks]
+        segments.sort(key=lambda s: s.max_ts, reverse=True)
+
+        results: List[Dict[str, Any]] = []
+        for i, segment in enumerate(segments):
+            if start_ts is not None and segment.max_ts < start_ts:
+                continue
+            if end_ts is not None and segment.min_ts > end_ts:
+                continue
+
+            for block in segment.matching_blocks(session_id, level, component, start_ts, end_ts):
+                results.extend(
+                    r for r in segment.read_block(block)
+                    if (session_id is None or r.get('session_id') == session_id)
+                    and (level is None or r.get('level') == level)
+                    and (component is None or r.get('component') == component)
+                    and (start_ts is None or r['ts'] >= start_ts)
+                    and (end_ts is None or r['ts'] <= end_ts)
+                )
+
+            # Stop once the remaining (older) segments cannot displace the
+            # newest `limit` records already found.
+            if len(results) >= limit and i + 1 < len(segments):
+                results.sort(key=lambda r: r['ts'], reverse=True)
+                del results[limit:]
+                if results[-1]['ts'] >= segments[i + 1].max_ts:
+                    break
+
+        results.sort(key=lambda r: r['ts'], reverse=True)
+        results = results[:limit]
+        for record in results:
+            record.pop('ts', None)
+        return results
+
+    def aggregate(
+        self,
+        session_id: str = None,
+        recent_since: datetime = None,
+        top_components: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Count records by level and component (reading only candidate blocks).
+
+        Args:
+            session_id: Optional session filter
+            recent_since: Also count records at or after this time
+            top_components: Number of most frequent components returned
+
+        Returns:
+            total, by_level, by_component and recent counts
+        """
+        recent_ts = _to_epoch(recent_since)
+        with self._lock:
+            segments = [s for s in self.segments if s.blocks]
+
+        total = recent = 0
+        by_level: Dict[str, int] = {}
+        by_component: Dict[str, int] = {}
+        for segment in segments:
+            for block in segment.matching_blocks(session_id, None, None, None, None):
+                for record in segment.read_block(block):
+                    if session_id is not None and record.get('session_id') != session_id:
+                        continue
+                    total += 1
+                    if record.get('level'):
+                        by_level[record['level']] = by_level.get(record['level'], 0) + 1
+                    if record.get('component'):
+                        by_component[record['component']] = by_component.get(record['component'], 0) + 1
+                    if recent_ts is not None and record.get('ts', 0) >= recent_ts:
+                        recent += 1
+
+        top = sorted(by_component.items(), key=lambda item: item[1], reverse=True)[:top_components]
+        return {
+            'total': total,
+            'by_level': by_level,
+            'by_component': dict(top),
+            'recent': recent
+        }
+
+    def drop_segments_before(self, cutoff: datetime) -> int:
+        """
+        Drop whole segments whose newest record is older than cutoff.
+
+        The active (newest) segment is never dropped.
+
+        Returns:
+            Number of segments removed
+        """
+        cutoff_ts = _to_epoch(cutoff)
+        removed = 0
+        with self._lock:
+            keep = []
+            for i, segment in enumerate(self.segments):
+                is_active = i == len(self.segments) - 1
+                newest = segment.max_ts if segment.blocks else segment.created_at
+                if not is_active and newest < cutoff_ts:
+                    segment.remove()
+                    removed += 1
+                else:
+                    keep.append(segment)
+            self.segments = keep
+        return removed
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            return {
+                'store_dir': str(self.store_dir),
+                'segments': len(self.segments),
+                'blocks': sum(len(s.blocks) for s in self.segments),
+                'records': sum(s.record_count for s in self.segments),
+                'size_bytes': sum(s.size for s in self.segments)
+            }
@@ -1,10 +1,16 @@
-"""Real-time performance monitoring service."""
+"""Real-time performance monitoring service.
+
+A background collector takes non-blocking snapshots (``psutil.cpu_percent``
+with ``interval=None``, blocking probes run in a worker thread) at a fixed
+cadence into a ring buffer, and a lightweight probe measures event-loop lag.
+API handlers only read the latest precomputed snapshot.
+"""
 
 import os
 import psutil
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from collections import deque
@@ -29,6 +35,8 @@ class SystemMetrics:
     active_sessions: int
     python_objects: int
     thread_count: int
+    loop_lag_ms: float = 0.0  # most recent event-loop lag sample
+    loop_lag_max_ms: float = 0.0  # worst lag since the previous snapshot
 
 
 @dataclass
@@ -66,7 +74,9 @@ class PerformanceMonitor:
         self,
         collection_interval: int = 30,  # seconds
         retention_hours: int = 24,
-        alert_thresholds: Dict[str, float] = None
+        alert_thresholds: Dict[str, float] = None,
+        lag_probe_interval: float = 0.5,  # seconds
+        lag_window: int = 120
     ):
         """
         Initialize PerformanceMonitor.
@@ -75,19 +85,24 @@ class PerformanceMonitor:
             collection_interval: Metrics collection interval in seconds
             retention_hours: Hours to retain metrics in memory
             alert_thresholds: Thresholds for alerts
+            lag_probe_interval: Event-loop lag probe interval in seconds
+            lag_window: Number of recent lag samples kept in memory
         """
         self.collection_interval = collection_interval
         self.retention_hours = retention_hours
+        self.lag_probe_interval = lag_probe_interval
         self.logger = logging.getLogger(self.__class__.__name__)
 
-        # Default alert thresholds
-        self.alert_thresholds = alert_thresholds or {
+        # Default alert thresholds (overridden per key by alert_thresholds)
+        self.alert_thresholds = {
             'cpu_percent': 80.0,
             'memory_percent': 85.0,
             'disk_usage_percent': 90.0,
             'error_rate': 0.1,  # 10%
-            'low_memory_mb': 500.0
+            'low_memory_mb': 500.0,
+            'loop_lag_ms': 500.0
         }
+        self.alert_thresholds.update(alert_thresholds or {})
 
         # Metrics storage
         max_metrics = int((retention_hours * 3600) / collection_interval)
@@ -95,12 +110,20 @@ class PerformanceMonitor:
         self.session_metrics: Dict[str, deque] = {}
         self.metrics_lock = threading.Lock()
 
+        # Event-loop lag samples in milliseconds (ring buffer)
+        self.loop_lag: deque = deque(maxlen=lag_window)
+        self._lag_since_snapshot = 0.0
+
+        # Latest snapshot served by get_current_metrics (rebuilt by the collector)
+        self._current: Optional[Dict[str, Any]] = None
+
         # Alerts
         self.alerts: List[Alert] = []
         self.alert_callbacks: List[Callable] = []
 
         # Monitoring task control
         self._monitor_task = None
+        self._lag_task = None
         self._running = False
 
         # Performance statistics
@@ -109,7 +132,9 @@ class PerformanceMonitor:
             'total_collections': 0,
             'total_alerts': 0,
             'last_collection': None,
-            'collection_errors': 0
+            'collection_errors': 0,
+            'lag_samples': 0,
+            'max_loop_lag_ms': 0.0
         }
 
         # Process reference for resource monitoring
@@ -123,7 +148,11 @@ class PerformanceMonitor:
         self._running = True
         self.stats['monitoring_start'] = datetime.now()
 
+        # Prime the CPU counters: interval=None compares against the previous call
+        psutil.cpu_percent(interval=None)
+
         self._monitor_task = asyncio.create_task(self._monitoring_loop())
+        self._lag_task = asyncio.create_task(self._lag_probe_loop())
 
         self.logger.info(
             f"Performance monitoring started "
@@ -140,12 +169,15 @@ class PerformanceMonitor:
 
         self._running = False
 
-        if self._monitor_task:
-            self._monitor_task.cancel()
-            try:
-                await self._monitor_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._monitor_task, self._lag_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._monitor_task = None
+        self._lag_task = None
 
         self.logger.info("Performance monitoring stopped")
 
@@ -166,6 +198,8 @@ class PerformanceMonitor:
                 self.stats['total_collections'] += 1
                 self.stats['last_collection'] = datetime.now()
 
+                self._refresh_current()
+
                 await asyncio.sleep(self.collection_interval)
 
             except asyncio.CancelledError:
@@ -175,34 +209,61 @@ class PerformanceMonitor:
                 self.logger.error(f"Error in monitoring loop: {e}")
                 await asyncio.sleep(5)  # Brief pause before retry
 
+    async def _lag_probe_loop(self):
+        """Measure event-loop lag: how late a short sleep wakes up."""
+        loop = asyncio.get_running_loop()
+        while self._running:
+            try:
+                start = loop.time()
+                await asyncio.sleep(self.lag_probe_interval)
+                lag_ms = max(0.0, (loop.time() - start - self.lag_probe_interval) * 1000)
+                self._record_loop_lag(lag_ms)
+            except asyncio.CancelledError:
+                break
+
+    def _record_loop_lag(self, lag_ms: float):
+        """Record one event-loop lag sample."""
+        self.loop_lag.append(lag_ms)
+        self._lag_since_snapshot = max(self._lag_since_snapshot, lag_ms)
+        self.stats['lag_samples'] += 1
+        if lag_ms > self.stats['max_loop_lag_ms']:
+            self.stats['max_loop_lag_ms'] = lag_ms
+
+    def _sample_system(self) -> Dict[str, Any]:
+        """Take a non-blocking system snapshot (runs in a worker thread)."""
+        memory = psutil.virtual_memory()
+        disk_usage = psutil.disk_usage('.')
+        return {
+            # interval=None returns usage since the previous call without sleeping
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': memory.percent,
+            'memory_used_mb': memory.used / (1024 * 1024),
+            'memory_available_mb': memory.available / (1024 * 1024),
+            'disk_usage_percent': disk_usage.percent,
+            'disk_free_gb': disk_usage.free / (1024 * 1024 * 1024),
+            'python_objects': len(gc.get_objects()),
+            'thread_count': threading.active_count()
+        }
+
     async def _collect_system_metrics(self):
         """Collect system-wide performance metrics."""
         try:
-            # CPU and memory
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-
-            # Disk usage for current directory
-            disk_usage = psutil.disk_usage('.')
+            sample = await asyncio.to_thread(self._sample_system)
 
             # Active sessions
             active_sessions = len(session_manager.get_active_sessions())
 
-            # Python-specific metrics
-            python_objects = len(gc.get_objects())
-            thread_count = threading.active_count()
+            # Event-loop lag since the previous snapshot
+            loop_lag_ms = self.loop_lag[-1] if self.loop_lag else 0.0
+            loop_lag_max_ms = self._lag_since_snapshot
+            self._lag_since_snapshot = 0.0
 
             metrics = SystemMetrics(
                 timestamp=datetime.now(),
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                memory_used_mb=memory.used / (1024 * 1024),
-                memory_available_mb=memory.available / (1024 * 1024),
-                disk_usage_percent=disk_usage.percent,
-                disk_free_gb=disk_usage.free / (1024 * 1024 * 1024),
                 active_sessions=active_sessions,
-                python_objects=python_objects,
-                thread_count=thread_count
+                loop_lag_ms=loop_lag_ms,
+                loop_lag_max_ms=loop_lag_max_ms,
+                **sample
             )
 
             with self.metrics_lock:
@@ -211,29 +272,42 @@ class PerformanceMonitor:
         except Exception as e:
             self.logger.error(f"Failed to collect system metrics: {e}")
 
+    def _sample_sessions(self) -> List[Tuple[str, Dict[str, Any], float]]:
+        """
+        Read task statistics and DataFrame memory per active session.
+
+        Runs in a worker thread: value_counts over the task frame and
+        memory_usage(deep=True), which walks every object cell, take long
+        enough on large sessions to stall the event loop.
+        """
+        samples = []
+        for session_id in list(session_manager.get_active_sessions()):
+            try:
+                task_manager = session_manager.get_task_manager(session_id)
+                if not task_manager or task_manager.df is None:
+                    continue
+                samples.append((
+                    session_id,
+                    task_manager.get_statistics(),
+                    self._estimate_session_memory(session_id)
+                ))
+            except Exception as e:
+                self.logger.warning(f"Failed to sample session {session_id}: {e}")
+        return samples
+
     async def _collect_session_metrics(self):
         """Collect per-session performance metrics."""
         try:
-            active_sessions = session_manager.get_active_sessions()
+            samples = await asyncio.to_thread(self._sample_sessions)
 
-            for session_id, session_info in active_sessions.items():
+            for session_id, stats, memory_usage in samples:
                 try:
-                    # Get task statistics
-                    task_manager = session_manager.get_task_manager(session_id)
-                    if not task_manager or not task_manager.df is not None:
-                        continue
-
-                    stats = task_manager.get_statistics()
-
                     # Calculate processing rate (tasks per minute)
                     processing_rate = self._calculate_processing_rate(session_id, stats)
 
                     # Calculate average response time (if available)
                     avg_response_time = self._calculate_avg_response_time(session_id)
 
-                    # Estimate memory usage for session
-                    memory_usage = self._estimate_session_memory(session_id)
-
                     # Calculate error rate
                     total_tasks = stats.get('total', 1)
                     failed_tasks = stats.get('by_status', {}).get('failed', 0)
@@ -362,6 +436,17 @@ class PerformanceMonitor:
                     }
                 ))
 
+            if latest_metrics.loop_lag_max_ms > self.alert_thresholds['loop_lag_ms']:
+                alerts.append(self._create_alert(
+                    'WARNING',
+                    'EVENT_LOOP',
+                    f"Event loop stalled for {latest_metrics.loop_lag_max_ms:.0f} ms",
+                    {
+                        'loop_lag_ms': latest_metrics.loop_lag_ms,
+                        'loop_lag_max_ms': latest_metrics.loop_lag_max_ms
+                    }
+                ))
+
             if latest_metrics.memory_available_mb < self.alert_thresholds['low_memory_mb']:
                 alerts.append(self._create_alert(
                     'CRITICAL',
@@ -477,12 +562,12 @@ class PerformanceMonitor:
         except Exception as e:
             self.logger.error(f"Failed to log system info: {e}")
 
-    def get_current_metrics(self) -> Dict[str, Any]:
-        """Get current performance metrics."""
+    def _refresh_current(self):
+        """Rebuild the snapshot served by get_current_metrics."""
         try:
             with self.metrics_lock:
                 if not self.system_metrics:
-                    return {'error': 'No metrics available'}
+                    return
 
                 latest_system = self.system_metrics[-1]
 
@@ -497,23 +582,12 @@ class PerformanceMonitor:
                         'disk_free_gb': latest_system.disk_free_gb,
                         'active_sessions': latest_system.active_sessions,
                         'python_objects': latest_system.python_objects,
-                        'thread_count': latest_system.thread_count
+                        'thread_count': latest_system.thread_count,
+                        'loop_lag_ms': latest_system.loop_lag_ms,
+                        'loop_lag_max_ms': latest_system.loop_lag_max_ms
                     },
                     'sessions': {},
-                    'alerts': {
-                        'active_alerts': [
-                            {
-                                'alert_id': alert.alert_id,
-                                'timestamp': alert.timestamp.isoformat(),
-                                'level': alert.level,
-                                'category': alert.category,
-                                'message': alert.message
-                            }
-                            for alert in self.alerts if not alert.resolved
-                        ],
-                        'total_alerts': len(self.alerts)
-                    },
-                    'statistics': self.stats.copy()
+                    'alerts': self._alert_summary()
                 }
 
                 # Add session metrics
@@ -532,11 +606,48 @@ class PerformanceMonitor:
                             'error_rate': latest_session.error_rate
                         }
 
-                return current_metrics
+                self._current = current_metrics
 
         except Exception as e:
-            self.logger.error(f"Failed to get current metrics: {e}")
-            return {'error': str(e)}
+            self.logger.error(f"Failed to refresh current metrics: {e}")
+
+    def _alert_summary(self) -> Dict[str, Any]:
+        """Summarize unresolved alerts."""
+        return {
+            'active_alerts': [
+                {
+                    'alert_id': alert.alert_id,
+                    'timestamp': alert.timestamp.isoformat(),
+                    'level': alert.level,
+                    'category': alert.category,
+                    'message': alert.message
+                }
+                for alert in self.alerts if not alert.resolved
+            ],
+            'total_alerts': len(self.alerts)
+        }
+
+    def get_current_metrics(self) -> Dict[str, Any]:
+        """Get current performance metrics (latest collector snapshot)."""
+        current = self._current
+        if current is None:
+            return {'error': 'No metrics available'}
+
+        return {
+            **current,
+            'event_loop': self.get_loop_lag(),
+            'statistics': self.stats.copy()
+        }
+
+    def get_loop_lag(self) -> Dict[str, Any]:
+        """Get the most recent event-loop lag readings."""
+        return {
+            'current_ms': self.loop_lag[-1] if self.loop_lag else 0.0,
+            'max_since_snapshot_ms': self._lag_since_snapshot,
+            'max_ms': self.stats['max_loop_lag_ms'],
+            'probe_interval': self.lag_probe_interval,
+            'running': self._running
+        }
 
     def get_historical_metrics(
         self,
@@ -558,7 +669,8 @@ class PerformanceMonitor:
                             'memory_percent': metric.memory_percent,
                             'memory_used_mb': metric.memory_used_mb,
                             'disk_usage_percent': metric.disk_usage_percent,
-                            'active_sessions': metric.active_sessions
+                            'active_sessions': metric.active_sessions,
+                            'loop_lag_max_ms': metric.loop_lag_max_ms
                         })
 
                 # Session metrics
@@ -597,6 +709,8 @@ class PerformanceMonitor:
                 alert.resolved = True
                 alert.resolved_at = datetime.now()
                 self.logger.info(f"Alert resolved: {alert.message}")
+                if self._current is not None:
+                    self._current = {**self._current, 'alerts': self._alert_summary()}
                 break
 
     async def cleanup_old_data(self):
@@ -617,5 +731,18 @@ class PerformanceMonitor:
             self.logger.error(f"Failed to cleanup old monitoring data: {e}")
 
 
+def _build_default_monitor() -> PerformanceMonitor:
+    """Create the performance monitor from config."""
+    from utils.config_manager import config_manager
+
+    cfg = config_manager.get('monitoring', {}) or {}
+    return PerformanceMonitor(
+        collection_interval=cfg.get('collection_interval', 30),
+        retention_hours=cfg.get('retention_hours', 24),
+        lag_probe_interval=cfg.get('lag_probe_interval', 0.5),
+        lag_window=cfg.get('lag_window', 120)
+    )
+
+
 # Global performance monitor instance
-performance_monitor = PerformanceMonitor()
\ No newline at end of file
+performance_monitor = _build_default_monitor()
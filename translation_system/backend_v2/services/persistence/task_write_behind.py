@@ -0,0 +1,473 @@
+"""Coalescing write-behind queue for task state persistence.
+
+Every task state change is recorded in memory keyed by task_id; repeated
+updates to the same task are merged so only the latest value of each field is
+written. A background flusher drains the queue in size/time-bounded
+multi-row statements through a sink exposing ``batch_update_tasks`` (the
+MySQLConnector upsert, or SQLiteTaskSink for offline use). Registered session
+rows are written first so task rows never precede their parent session. Rows
+that keep failing are dropped after ``max_retries`` attempts, and producers
+are only throttled up to ``max_throttle_wait`` seconds at a time.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+
+logger = logging.getLogger(__name__)
+
+# Fields understood by MySQLConnector.batch_update_tasks
+PERSISTED_FIELDS = (
+    'status', 'result', 'confidence', 'token_count', 'cost', 'llm_model',
+    'error_message', 'retry_count', 'duration_ms', 'is_final',
+    'start_time', 'end_time'
+)
+
+
+class TaskWriteBehind:
+    """Coalesce task updates in memory and flush them in multi-row batches."""
+
+    def __init__(
+        self,
+        sink=None,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 20000,
+        retry_delay: float = 2.0,
+        max_retries: int = 5,
+        max_throttle_wait: float = 30.0
+    ):
+        """
+        Initialize write-behind queue.
+
+        Args:
+            sink: Object with async ``batch_update_tasks(rows) -> int``
+            max_batch_size: Maximum rows per flush statement
+            flush_interval: Maximum seconds an update waits before flushing
+            max_pending: Pending task count above which producers are throttled
+            retry_delay: Delay before retrying a failed flush (seconds)
+            max_retries: Failed writes after which a row (or session) is dropped
+            max_throttle_wait: Longest a producer waits for capacity (seconds)
+        """
+        self.sink = sink
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self.max_throttle_wait = max_throttle_wait
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # task_id -> merged row (insertion order == oldest first)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Dict[str, int] = {}  # task_id -> failed writes so far
+        # session_id -> session row still to be written before its tasks
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._session_attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_event = asyncio.Event()
+        self._capacity_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.stats = {
+            'submitted': 0,
+            'coalesced': 0,
+            'flushed_rows': 0,
+            'flush_statements': 0,
+            'flush_errors': 0,
+            'dropped_rows': 0,
+            'dropped_sessions': 0,
+            'throttled': 0,
+            'throttle_timeouts': 0,
+            'last_flush': None
+        }
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def submit(self, session_id: str, task_id: str, updates: Dict[str, Any]) -> None:
+        """
+        Record a task state change (non-blocking).
+
+        Args:
+            session_id: Session the task belongs to
+            task_id: Task identifier
+            updates: Changed task fields (TaskDataFrameManager naming)
+        """
+        if self.sink is None:
+            return
+
+        fields = {k: v for k, v in updates.items() if k in PERSISTED_FIELDS}
+        if not fields:
+            return
+
+        with self._lock:
+            row = self._pending.get(task_id)
+            if row is None:
+                self._pending[task_id] = {'task_id': task_id, 'session_id': session_id, **fields}
+            else:
+                row.update(fields)
+                self.stats['coalesced'] += 1
+            self.stats['submitted'] += 1
+            pending = len(self._pending)
+
+        if pending >= self.max_batch_size:
+            self._flush_event.set()
+
+    def register_session(self, session_id: str, session_data: Dict[str, Any]) -> None:
+        """
+        Queue the session row; it is written before any of its task rows.
+
+        Args:
+            session_id: Session identifier
+            session_data: Row for the sink's ``create_session_idempotent``
+        """
+        if self.sink is None:
+            return
+        with self._lock:
+            self._sessions[session_id] = {'session_id': session_id, **session_data}
+            self._session_attempts.pop(session_id, None)
+
+    def listener(self, session_id: str) -> Callable[[str, Dict[str, Any]], None]:
+        """Build a TaskDataFrameManager update listener bound to a session."""
+        def _on_update(task_id: str, updates: Dict[str, Any]) -> None:
+            self.submit(session_id, task_id, updates)
+        return _on_update
+
+    async def wait_for_capacity(self, timeout: Optional[float] = None) -> bool:
+        """
+        Throttle producers while the pending set is over max_pending.
+
+        Args:
+            timeout: Longest wait in seconds (default max_throttle_wait)
+
+        Returns:
+            False if the deadline passed while the queue was still full
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.max_throttle_wait if timeout is None else timeout)
+        while self._running and len(self._pending) >= self.max_pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self.stats['throttle_timeouts'] += 1
+                self.logger.warning(
+                    f"Write-behind still has {len(self._pending)} pending tasks; "
+                    f"continuing without waiting for the flush"
+                )
+                return False
+            self.stats['throttled'] += 1
+            self._flush_event.set()
+            self._capacity_event.clear()
+            try:
+                await asyncio.wait_for(self._capacity_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        if self._running:
+            return
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self.logger.info(
+            f"Task write-behind started (batch={self.max_batch_size}, "
+            f"interval={self.flush_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and flush everything still pending."""
+        if not self._running:
+            return
+        self._running = False
+        self._flush_event.set()
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        self._capacity_event.set()
+        self.logger.info("Task write-behind stopped")
+
+    async def _flush_loop(self) -> None:
+        """Flush when a batch fills up or flush_interval elapses."""
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_event.clear()
+                if not await self.flush():
+                    await asyncio.sleep(self.retry_delay)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in write-behind flush loop: {e}")
+
+    def _take_batch(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            batch = []
+            for task_id in list(self._pending)[:min(limit or self.max_batch_size, self.max_batch_size)]:
+                batch.append(self._pending.pop(task_id))
+            return batch
+
+    def _requeue(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Put a failed batch back behind the other pending rows.
+
+        Newer updates for the same task win. Rows that have failed
+        max_retries times are dropped instead.
+
+        Returns:
+            Number of dropped rows
+        """
+        dropped = 0
+        with self._lock:
+            for row in batch:
+                task_id = row['task_id']
+                attempts = self._attempts.get(task_id, 0) + 1
+                if attempts >= self.max_retries:
+                    self._attempts.pop(task_id, None)
+                    dropped += 1
+                    continue
+                self._attempts[task_id] = attempts
+                newer = self._pending.pop(task_id, None)
+                if newer is not None:
+                    row.update(newer)
+                self._pending[task_id] = row
+        self.stats['dropped_rows'] += dropped
+        return dropped
+
+    async def _write_sessions(self) -> bool:
+        """Write registered session rows; False if one failed and was kept for retry."""
+        create = getattr(self.sink, 'create_session_idempotent', None)
+        if create is None:
+            self._sessions.clear()
+            return True
+
+        for session_id, session_data in list(self._sessions.items()):
+            try:
+                await create(session_data)
+            except Exception as e:
+                self.stats['flush_errors'] += 1
+                attempts = self._session_attempts.get(session_id, 0) + 1
+                self._session_attempts[session_id] = attempts
+                if attempts < self.max_retries:
+                    self.logger.error(f"Write-behind session row {session_id} failed: {e}")
+                    return False
+                self.stats['dropped_sessions'] += 1
+                self.logger.error(
+                    f"Dropping session row {session_id} after {attempts} failed writes: {e}"
+                )
+            self._sessions.pop(session_id, None)
+            self._session_attempts.pop(session_id, None)
+        return True
+
+    async def flush(self) -> bool:
+        """
+        Drain all pending updates in multi-row statements.
+
+        Session rows go first; each pending task row is attempted at most once
+        per call.
+
+        Returns:
+            False if a statement failed (rows are kept for retry or dropped)
+        """
+        if self.sink is None:
+            return True
+
+        async with self._flush_lock:
+            if not await self._write_sessions():
+                return False
+
+            success = True
+            remaining = len(self._pending)
+            while remaining > 0:
+                batch = self._take_batch(remaining)
+                if not batch:
+                    break
+                remaining -= len(batch)
+                try:
+                    await self.sink.batch_update_tasks(batch)
+                except Exception as e:
+                    success = False
+                    self.stats['flush_errors'] += 1
+                    dropped = self._requeue(batch)
+                    self.logger.error(f"Write-behind flush of {len(batch)} tasks failed: {e}")
+                    if dropped:
+                        self.logger.error(
+                            f"Dropped {dropped} task updates after {self.max_retries} failed writes"
+                        )
+                else:
+                    with self._lock:
+                        for row in batch:
+                            self._attempts.pop(row['task_id'], None)
+                    self.stats['flushed_rows'] += len(batch)
+                    self.stats['flush_statements'] += 1
+                    self.stats['last_flush'] = datetime.now().isoformat()
+
+                if len(self._pending) < self.max_pending:
+                    self._capacity_event.set()
+        return success
+
+    @property
+    def enabled(self) -> bool:
+        return self.sink is not None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get write-behind statistics."""
+        return {
+            **self.stats,
+            'pending': len(self._pending),
+            'pending_sessions': len(self._sessions),
+            'running': self._running,
+            'sink': type(self.sink).__name__ if self.sink else None
+        }
+
+
+class SQLiteTaskSink:
+    """SQLite stand-in for MySQLConnector.batch_update_tasks."""
+
+    _COLUMNS = (
+        'task_id', 'session_id', 'status', 'result', 'confidence', 'token_count',
+        'cost', 'llm_model', 'error_message', 'retry_count', 'duration_ms',
+        'is_final', 'started_at', 'completed_at'
+    )
+
+    def __init__(self, db_path: str = ':memory:'):
+        """
+        Initialize SQLite sink.
+
+        Args:
+            db_path: SQLite database file (':memory:' for tests)
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translation_tasks (
+                task_id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                status TEXT DEFAULT 'pending',
+                result TEXT,
+                confidence REAL,
+                token_count INTEGER DEFAULT 0,
+                cost REAL DEFAULT 0,
+                llm_model TEXT,
+                error_message TEXT,
+                retry_count INTEGER DEFAULT 0,
+                duration_ms INTEGER,
+                is_final INTEGER DEFAULT 0,
+                started_at TEXT,
+                completed_at TEXT
+            )
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.statements = 0
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if hasattr(value, 'item'):  # numpy scalars
+            return value.item()
+        if value is not None and not isinstance(value, (str, int, float, bytes)):
+            return str(value)
+        return value
+
+    def _upsert(self, task_updates: List[Dict[str, Any]]) -> int:
+        rows = []
+        for task in task_updates:
+            if not task.get('task_id'):
+                continue
+            rows.append(tuple(self._normalize(v) for v in (
+                task['task_id'],
+                task.get('session_id', ''),
+                task.get('status'),
+                task.get('result'),
+                task.get('confidence'),
+                task.get('token_count'),
+                task.get('cost'),
+                task.get('llm_model'),
+                task.get('error_message'),
+                task.get('retry_count'),
+                task.get('duration_ms'),
+                task.get('is_final', False),
+                task.get('start_time'),
+                task.get('end_time')
+            )))
+        if not rows:
+            return 0
+
+        placeholders = ', '.join(['(' + ', '.join('?' * len(self._COLUMNS)) + ')'] * len(rows))
+        updates = ', '.join(
+            f"{col} = COALESCE(excluded.{col}, {col})" for col in self._COLUMNS[2:]
+        )
+        query = (
+            f"INSERT INTO translation_tasks ({', '.join(self._COLUMNS)}) "
+            f"VALUES {placeholders} "
+            f"ON CONFLICT(task_id) DO UPDATE SET {updates}"
+        )
+        params = [v for row in rows for v in row]
+        with self._lock:
+            self._conn.execute(query, params)
+            self._conn.commit()
+            self.statements += 1
+        return len(rows)
+
+    async def batch_update_tasks(self, task_updates: List[Dict[str, Any]]) -> int:
+        """Multi-row upsert, same contract as MySQLConnector.batch_update_tasks."""
+        return await asyncio.to_thread(self._upsert, task_updates)
+
+    def fetch_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read back a persisted task row."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM translation_tasks WHERE task_id = ?",
+                (task_id,)
+            )
+            row = cursor.fetchone()
+        return dict(zip(self._COLUMNS, row)) if row else None
+
+    def close(self):
+        self._conn.close()
+
+
+def _build_default_write_behind() -> TaskWriteBehind:
+    """Create the write-behind queue from config (sink is None when disabled)."""
+    from utils.config_manager import config_manager
+
+    cfg = config_manager.get('persistence.write_behind', {}) or {}
+    sink = None
+    if cfg.get('enabled', False):
+        backend = cfg.get('backend', 'mysql')
+        if backend == 'sqlite':
+            sink = SQLiteTaskSink(cfg.get('sqlite_path', 'data/tasks.db'))
+        else:
+            from database.mysql_connector import mysql_connector
+            sink = mysql_connector
+
+    return TaskWriteBehind(
+        sink=sink,
+        max_batch_size=cfg.get('max_batch_size', 500),
+        flush_interval=cfg.get('flush_interval', 1.0),
+        max_pending=cfg.get('max_pending', 20000),
+        retry_delay=cfg.get('retry_delay', 2.0),
+        max_retries=cfg.get('max_retries', 5),
+        max_throttle_wait=cfg.get('max_throttle_wait', 30.0)
+    )
+
+
+# Global write-behind instance (no-op unless persistence.write_behind.enabled)
+task_write_behind = _build_default_write_behind()
@@ -30,6 +30,7 @@ class TaskSplitter:
         """
         self.excel_df = excel_df
         self.game_info = game_info
+        self.game_context = game_info.to_context_string() if game_info else ""
         self.extract_context = extract_context
         self.context_extractor = ContextExtractor(game_info, context_options) if extract_context else None
         self.batch_allocator = BatchAllocator(max_chars_per_batch)
@@ -501,7 +502,7 @@ class TaskSplitter:
             'source_lang': source_lang,
             'source_text': source_text,
             'source_context': source_context,
-            'game_context': self.game_info.to_context_string() if self.game_info else "",
+            'game_context': self.game_context,
             'reference_en': reference_en,  # ✨ 英文参考
             'target_lang': target_lang,
             'excel_id': self.excel_df.excel_id,
@@ -0,0 +1,241 @@
+"""Unit tests for adaptive batch sizing and rate limit feedback."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.llm import adaptive_batching
+from services.llm.adaptive_batching import AdaptiveBatchSizer
+from services.llm.base_provider import BaseLLMProvider, LLMConfig, TranslationRequest, TranslationResponse
+from services.llm.batch_translator import BatchTranslator
+from services.llm.provider_router import ProviderEndpoint, ProviderRouter
+from services.llm.rate_limit import RateLimitGate, parse_retry_after
+
+KEY = ('qwen', 'qwen-plus', 'CH', 'PT')
+
+
+def _simulate(sizer, batches, latency_ms, failed=lambda size: 0, tokens_per_item=20):
+    """Feed simulated outcomes; returns the sizes used."""
+    sizes = []
+    for _ in range(batches):
+        size = sizer.batch_size(KEY)
+        sizes.append(size)
+        sizer.observe(KEY, size, failed(size), latency_ms(size), output_tokens=tokens_per_item * size)
+    return sizes
+
+
+class TestAdaptiveBatchSizer:
+    """Test the controller against simulated provider behaviour."""
+
+    def test_grows_while_larger_batches_are_faster_per_item(self):
+        sizer = AdaptiveBatchSizer(initial_size=5, max_size=20)
+        sizes = _simulate(sizer, 60, latency_ms=lambda size: 1000 + 100 * size)
+
+        assert sizes[-1] == 20
+        assert sizes == sorted(sizes)
+
+    def test_shrinks_below_the_size_where_responses_get_truncated(self):
+        sizer = AdaptiveBatchSizer(initial_size=5, max_size=20)
+        # The model drops every item past the 8th (count mismatch)
+        sizes = _simulate(sizer, 200, latency_ms=lambda size: 1000 + 100 * size,
+                          failed=lambda size: max(0, size - 8))
+
+        late = sizes[100:]
+        assert sum(1 for size in late if size > 8) <= 3  # Occasional re-probe only
+        assert late[-1] == 8
+        failures = sum(max(0, size - 8) for size in late) / sum(late)
+        assert failures < 0.05
+
+    def test_latency_target_and_token_rate_cap_the_size(self):
+        sizer = AdaptiveBatchSizer(initial_size=5, max_size=20, target_latency_ms=20000)
+        sizes = _simulate(sizer, 100, latency_ms=lambda size: 3000 * size)
+
+        assert max(sizes[20:]) <= 6
+
+    def test_probe_reverts_when_items_per_second_drop(self):
+        sizer = AdaptiveBatchSizer(initial_size=5, max_size=20)
+        sizes = _simulate(sizer, 40, latency_ms=lambda size: 500 + 100 * size ** 2)
+        stats = sizer.get_stats()['keys']['qwen/qwen-plus/CH/PT']
+
+        assert max(sizes) == 6
+        assert sizes[-1] == 5
+        assert stats['shrunk'] >= 1
+
+    def test_rate_limited_batches_do_not_move_the_size(self):
+        sizer = AdaptiveBatchSizer(initial_size=5, grow_after=1)
+        for _ in range(5):
+            sizer.observe(KEY, 5, 5, 100000, rate_limited=True)
+
+        assert sizer.batch_size(KEY) == 5
+        assert sizer.get_stats()['keys']['qwen/qwen-plus/CH/PT']['rate_limited'] == 5
+
+    def test_disabled_keeps_initial_size(self):
+        sizer = AdaptiveBatchSizer(enabled=False, initial_size=5)
+        _simulate(sizer, 20, latency_ms=lambda size: 100)
+        assert sizer.batch_size(KEY) == 5
+
+
+class TruncatingProvider(BaseLLMProvider):
+    """Returns at most `capacity` translations per batch request."""
+
+    def __init__(self, capacity, model='fake-model'):
+        super().__init__(LLMConfig(provider='fake', api_key='test', model=model, stream=False))
+        self.model = model
+        self.capacity = capacity
+        self.request_sizes = []
+
+    async def translate_single(self, request):
+        count = int(request.source_text.split(' ')[3])
+        self.request_sizes.append(count)
+        await asyncio.sleep(0.001 * count)
+        texts = [f'pt{i}' for i in range(min(count, self.capacity))]
+        return TranslationResponse(translated_text=json.dumps(texts), model=self.model,
+                                   token_usage={'completion_tokens': 5 * len(texts)})
+
+    async def translate_batch(self, requests):
+        return [await self.translate_single(request) for request in requests]
+
+    async def health_check(self):
+        return True
+
+
+class TestBatchTranslatorSizing:
+    """Test that BatchTranslator follows and feeds the sizer."""
+
+    def test_translator_learns_provider_capacity(self):
+        provider = TruncatingProvider(capacity=6)
+        sizer = AdaptiveBatchSizer(initial_size=5, max_size=20, grow_after=2)
+        translator = BatchTranslator(provider, sizer=sizer)
+
+        async def run():
+            results = []
+            for round_index in range(30):
+                tasks = [{'task_id': f'{round_index}-{i}', 'source_text': f'文本{i}', 'source_lang': 'CH',
+                          'target_lang': 'PT'} for i in range(40)]
+                results.append(await translator.translate_batch_optimized(tasks))
+            return results
+
+        results = asyncio.run(run())
+        last_round = results[-1]
+
+        assert 5 <= sizer.batch_size(('fake', 'fake-model', 'CH', 'PT')) <= 6
+        assert sum(1 for task in last_round if task['status'] == 'failed') <= 2
+        assert max(provider.request_sizes) > 6  # It did probe beyond the capacity
+
+    def test_router_sizes_are_learned_per_serving_model(self):
+        small = TruncatingProvider(capacity=3, model='small-model')
+        large = TruncatingProvider(capacity=100, model='large-model')
+        router = ProviderRouter([ProviderEndpoint('small', small, weight=1),
+                                 ProviderEndpoint('large', large, weight=3)])
+        sizer = AdaptiveBatchSizer(initial_size=5, max_size=20, grow_after=1)
+        translator = BatchTranslator(router, sizer=sizer)
+
+        async def run():
+            for round_index in range(20):
+                tasks = [{'task_id': f'{round_index}-{i}', 'source_text': f'文本{i}', 'source_lang': 'CH',
+                          'target_lang': 'PT'} for i in range(20)]
+                await translator.translate_batch_optimized(tasks)
+
+        asyncio.run(run())
+        keys = sizer.get_stats()['keys']
+
+        assert set(keys) == {'fake/small-model/CH/PT', 'fake/large-model/CH/PT'}
+        assert keys['fake/small-model/CH/PT']['batches'] == len(small.request_sizes)
+        assert keys['fake/large-model/CH/PT']['batches'] == len(large.request_sizes)
+        assert sizer.batch_size(('fake', 'small-model', 'CH', 'PT')) <= 3
+        # Requests are sized for the smallest member, so the small model is not overrun
+        assert asyncio.run(translator.get_optimal_batch_size()) <= 3
+
+    def test_fixed_batch_size_is_respected(self):
+        provider = TruncatingProvider(capacity=100)
+        translator = BatchTranslator(provider, batch_size=3, sizer=AdaptiveBatchSizer())
+        tasks = [{'task_id': str(i), 'source_text': 'x', 'target_lang': 'PT'} for i in range(7)]
+
+        asyncio.run(translator.translate_batch_optimized(tasks))
+
+        assert sorted(provider.request_sizes) == [1, 3, 3]
+
+
+class TestRateLimitGate:
+    """Test the 429 cool-down feedback."""
+
+    def test_retry_after_wins_over_backoff(self):
+        assert parse_retry_after('2') == 2.0
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') is None
+
+        gate = RateLimitGate()
+        gate.hit(0.05, backoff=30)
+
+        started = time.monotonic()
+        asyncio.run(gate.wait())
+        assert 0.04 <= time.monotonic() - started < 1
+        assert not gate.cooling_down
+        assert gate.get_stats()['rate_limited'] == 1
+
+    def test_provider_honours_retry_after_instead_of_fixed_sleep(self):
+        pytest.importorskip('httpx')
+        from services.llm.openai_provider import OpenAIProvider
+
+        calls = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                calls.append(time.monotonic())
+                if len(calls) == 1:
+                    status, body, headers = 429, {'error': 'slow down'}, {'Retry-After': '0.2'}
+                else:
+                    status, body, headers = 200, {
+                        'choices': [{'message': {'content': 'Iniciar'}}],
+                        'usage': {'total_tokens': 12}
+                    }, {}
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            provider = OpenAIProvider(LLMConfig(
+                provider='openai', api_key='test', model='stub', stream=False,
+                base_url=f"http://127.0.0.1:{server.server_address[1]}",
+                max_retries=2, retry_delay=30
+            ))
+            requests = [TranslationRequest(source_text=f'开始{i}', source_lang='CH', target_lang='PT',
+                                           task_id=f't{i}') for i in range(3)]
+
+            started = time.monotonic()
+            responses = asyncio.run(provider.translate_batch(requests))
+
+            assert all(response.translated_text == 'Iniciar' for response in responses)
+            assert time.monotonic() - started < 5  # Retry-After (0.2s), not the 30s backoff
+            assert provider.rate_limit_gate.get_stats()['rate_limited'] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestDefaultSizer:
+    """Test the global sizer configuration."""
+
+    def test_all_settings_are_read_from_config(self, monkeypatch):
+        from utils.config_manager import config_manager
+
+        cfg = {'enabled': True, 'throughput_tolerance': 0.2, 'reprobe_after': 7, 'smoothing': 0.9}
+        monkeypatch.setattr(config_manager, 'get',
+                            lambda key, default=None: cfg if key == 'llm.adaptive_batching' else default)
+        sizer = adaptive_batching._build_default_sizer()
+
+        assert (sizer.throughput_tolerance, sizer.reprobe_after, sizer.smoothing) == (0.2, 7, 0.9)
@@ -0,0 +1,41 @@
+"""Unit tests for compiled prompts with a cached stable prefix."""
+
+from services.llm.compiled_prompt import PromptPrefixCache
+from services.llm.prompt_template import PromptTemplate
+
+
+GAME_INFO = {'game_type': 'RPG', 'world_view': '奇幻', 'game_style': '卡通'}
+
+
+class TestCompiledPrompt:
+    """Test prefix reuse and prefix/suffix separation."""
+
+    def test_prefix_is_built_once_per_key(self):
+        template = PromptTemplate(prefix_cache=PromptPrefixCache())
+
+        first = template.compile_task_prompt('开始游戏', 'CH', 'PT', context='按钮', game_info=GAME_INFO, session_id='s1')
+        second = template.compile_task_prompt('退出游戏', 'CH', 'PT', context='菜单', game_info=GAME_INFO, session_id='s1')
+
+        assert first.prefix_cached is False
+        assert second.prefix_cached is True
+        assert second.prefix is first.prefix
+        assert first.prefix_tokens > 0
+        assert '开始游戏' not in first.prefix and '退出游戏' in second.suffix
+        assert second.text.startswith(second.prefix)
+        assert second.get_stats()['assembled_bytes'] == len(second.suffix.encode('utf-8'))
+
+        other_type = template.compile_task_prompt('退出游戏', 'CH', 'PT', task_type='blue', game_info=GAME_INFO, session_id='s1')
+        assert other_type.prefix_cached is False
+        assert '缩短' in other_type.prefix
+        assert template.prefix_cache.get_stats()['hits'] == 1
+
+    def test_reference_and_game_context_string_stay_in_suffix(self):
+        template = PromptTemplate(prefix_cache=PromptPrefixCache())
+        game_info = {**GAME_INFO, 'reference_en': 'Start Game'}
+
+        prompt = template.compile_task_prompt('开始游戏', 'CH', 'TH', task_type='yellow', game_info=game_info)
+        assert '重译任务' in prompt.prefix
+        assert 'Start Game' in prompt.suffix and 'Start Game' not in prompt.prefix
+
+        prompt = template.compile_task_prompt('开始游戏', 'CH', 'TH', game_info='Game Type: RPG')
+        assert 'Game Type: RPG' in prompt.prefix
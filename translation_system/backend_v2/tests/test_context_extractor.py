@@ -0,0 +1,45 @@
+"""Unit tests for the precomputed sheet context table."""
+
+import pandas as pd
+
+from models.excel_dataframe import ExcelDataFrame
+from models.game_info import GameInfo
+from services.context_extractor import ContextExtractor
+
+
+def _excel():
+    excel_df = ExcelDataFrame()
+    excel_df.sheets['UI_main'] = pd.DataFrame({
+        'Key': ['MENU', 'btn_start', 'btn_quit', None],
+        'CH': ['菜单:', '开始游戏', '获得 {count} 金币!', '50%'],
+        'Unnamed: 2': [None, None, None, None],
+    })
+    excel_df.comment_map['UI_main'] = {(1, 1): '主界面按钮'}
+    return excel_df
+
+
+class TestContextTable:
+    """Test that table-based context matches per-cell extraction."""
+
+    def test_matches_uncached_extraction(self):
+        excel_df = _excel()
+        extractor = ContextExtractor(GameInfo(game_type='RPG'))
+
+        for row_idx in range(4):
+            for col_idx in range(3):
+                assert extractor.extract_context(excel_df, 'UI_main', row_idx, col_idx) == \
+                    extractor.extract_context_uncached(excel_df, 'UI_main', row_idx, col_idx)
+
+        context = extractor.extract_context(excel_df, 'UI_main', 1, 1)
+        assert '[Comment] 主界面按钮' in context
+        assert '[Row Label] btn_start' in context
+        assert '[Sheet Type] UI/Interface text' in context
+
+    def test_identical_contexts_share_one_string(self):
+        excel_df = _excel()
+        extractor = ContextExtractor(context_options={'neighbors': False})
+
+        first = extractor.extract_context(excel_df, 'UI_main', 2, 1)
+        second = extractor.extract_context(excel_df, 'UI_main', 2, 1)
+        assert first is second
+        assert extractor.precompute_sheet(excel_df, 'UI_main') is extractor.precompute_sheet(excel_df, 'UI_main')
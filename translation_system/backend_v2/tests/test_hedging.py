@@ -0,0 +1,93 @@
+"""Unit tests for latency-percentile request hedging."""
+
+import asyncio
+
+from services.llm.base_provider import BaseLLMProvider, LLMConfig, TranslationRequest, TranslationResponse
+from services.llm.hedging import HedgedProvider, HedgingPolicy
+
+
+class ScriptedProvider(BaseLLMProvider):
+    """Provider whose calls take scripted delays (seconds)."""
+
+    def __init__(self, delays):
+        super().__init__(LLMConfig(provider='stub', api_key='test', model='stub-model'))
+        self.model = 'stub-model'
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def translate_single(self, request):
+        call = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[call])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return TranslationResponse(translated_text=f'call-{call}', model=self.model,
+                                   token_usage={'total_tokens': 10})
+
+    async def translate_batch(self, requests):
+        return [await self.translate_single(request) for request in requests]
+
+    async def health_check(self):
+        return True
+
+
+def _policy(**overrides):
+    options = {'percentile': 95, 'min_samples': 5, 'min_delay_ms': 0, 'budget_ratio': 0.5}
+    options.update(overrides)
+    return HedgingPolicy(**options)
+
+
+REQUEST = TranslationRequest(source_text='开始', source_lang='CH', target_lang='PT')
+
+
+class TestHedging:
+    """Test hedge triggering, cancellation and the budget cap."""
+
+    def test_straggler_is_hedged_and_loser_cancelled(self):
+        provider = ScriptedProvider([0.01] * 5 + [1.0, 0.01])
+        hedged = HedgedProvider(provider, _policy())
+
+        async def run():
+            for _ in range(5):
+                await hedged.translate_single(REQUEST)
+            return await hedged.translate_single(REQUEST)
+
+        response = asyncio.run(run())
+        stats = hedged.policy.get_stats()
+
+        assert response.translated_text == 'call-6'
+        assert provider.cancelled == 1
+        assert stats['hedged'] == 1 and stats['hedge_wins'] == 1
+        assert stats['extra_tokens'] == 10
+        assert stats['observed_latency']['stub/stub-model']['max_ms'] < 500
+        assert hedged.model == 'stub-model'
+
+    def test_budget_caps_extra_requests(self):
+        provider = ScriptedProvider([0.01] * 5 + [0.1] * 20)
+        hedged = HedgedProvider(provider, _policy(percentile=50, budget_ratio=0.2))
+
+        async def run():
+            for _ in range(10):
+                await hedged.translate_single(REQUEST)
+
+        asyncio.run(run())
+        stats = hedged.policy.get_stats()
+
+        assert stats['hedged'] == 2
+        assert stats['budget_denied'] == 3
+        assert stats['extra_request_ratio'] <= 0.2
+
+    def test_no_hedge_before_min_samples_or_when_disabled(self):
+        provider = ScriptedProvider([0.05] * 10)
+        hedged = HedgedProvider(provider, _policy(enabled=False))
+
+        async def run():
+            for _ in range(10):
+                await hedged.translate_single(REQUEST)
+
+        asyncio.run(run())
+        assert provider.calls == 10
+        assert hedged.policy.get_stats()['hedged'] == 0
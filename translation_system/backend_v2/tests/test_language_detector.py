@@ -0,0 +1,51 @@
+"""Unit tests for column-level language detection and its sheet cache."""
+
+import pandas as pd
+
+from services.language_detector import LanguageDetector
+
+
+def _sheet():
+    return pd.DataFrame({
+        'col_a': ['开始游戏', None, '设置', '退出游戏'],
+        'col_b': ['Start Game', 'Settings', None, 'Exit Game'],
+        'col_c': ['เริ่มเกม', None, None, 'ออกจากเกม'],
+        'col_d': [None, None, None, None],
+    })
+
+
+class TestLanguageDetectorColumns:
+    """Test vectorized column scoring and fingerprint caching."""
+
+    def setup_method(self):
+        LanguageDetector.clear_cache()
+
+    def test_column_scoring_matches_per_text_detection(self):
+        df = _sheet()
+        column_langs = LanguageDetector.detect_column_languages(df)
+
+        assert column_langs == {0: 'CH', 1: 'EN', 2: 'TH', 3: 'EMPTY'}
+        texts = pd.Series(['开始游戏', 'Start Game', 'Oyunu başlat ve', '123'])
+        assert LanguageDetector._classify_texts(texts) == [
+            LanguageDetector.detect_language(text) for text in texts
+        ]
+
+    def test_analysis_is_cached_by_sheet_fingerprint(self, monkeypatch):
+        first = LanguageDetector.analyze_sheet(_sheet())
+        assert first['target_languages'] == ['TH']
+
+        calls = []
+        original = LanguageDetector._analyze_sheet.__func__
+        monkeypatch.setattr(
+            LanguageDetector, '_analyze_sheet',
+            classmethod(lambda cls, df, samples: calls.append(1) or original(cls, df, samples))
+        )
+
+        # Same content in a new DataFrame object hits the cache
+        assert LanguageDetector.analyze_sheet(_sheet()) == first
+        assert calls == []
+
+        changed = _sheet()
+        changed.iloc[0, 2] = 'Iniciar o jogo de novo'
+        LanguageDetector.analyze_sheet(changed)
+        assert calls == [1]
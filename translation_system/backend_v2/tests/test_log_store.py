@@ -0,0 +1,114 @@
+"""Unit tests for the indexed LogSegmentStore."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from services.logging.log_store import LogSegmentStore
+
+
+def _record(ts, session_id="s1", level="INFO", component="executor", message="msg"):
+    return {
+        'timestamp': ts,
+        'session_id': session_id,
+        'level': level,
+        'component': component,
+        'message': message,
+        'details': {}
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LogSegmentStore(tmp_path / "segments", block_records=4)
+
+
+class TestLogSegmentStoreQuery:
+    """Test filtered queries over indexed segments."""
+
+    def test_filters_by_session_level_and_component(self, store):
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        store.append([_record(base + timedelta(seconds=i), session_id=f"s{i % 3}") for i in range(30)])
+        store.append([_record(base + timedelta(seconds=40), session_id="s9", level="ERROR", component="llm")])
+
+        results = store.query(session_id="s1")
+        assert len(results) == 10
+        assert all(r['session_id'] == "s1" for r in results)
+
+        errors = store.query(level="error")
+        assert len(errors) == 1
+        assert errors[0]['component'] == "llm"
+
+        assert store.query(component="missing") == []
+
+    def test_results_newest_first_and_limited(self, store):
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        store.append([_record(base + timedelta(seconds=i), message=str(i)) for i in range(20)])
+
+        results = store.query(limit=5)
+        assert [r['message'] for r in results] == ['19', '18', '17', '16', '15']
+
+    def test_time_range(self, store):
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        store.append([_record(base + timedelta(minutes=i), message=str(i)) for i in range(10)])
+
+        results = store.query(
+            start_time=base + timedelta(minutes=3),
+            end_time=base + timedelta(minutes=5)
+        )
+        assert sorted(r['message'] for r in results) == ['3', '4', '5']
+
+
+class TestLogSegmentStoreDurability:
+    """Test index recovery and segment retention."""
+
+    def test_reopen_recovers_unindexed_tail(self, tmp_path):
+        store = LogSegmentStore(tmp_path, block_records=4)
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        store.append([_record(base + timedelta(seconds=i)) for i in range(6)])
+
+        segment = store.segments[-1]
+        # Simulate a crash after data was written but before the index was saved
+        segment.index_path.unlink()
+        with open(segment.path, 'ab') as f:
+            f.write(b'{"partial": ')
+
+        reopened = LogSegmentStore(tmp_path, block_records=4)
+        assert len(reopened.query()) == 6
+
+    def test_drop_segments_before_keeps_active_segment(self, tmp_path):
+        store = LogSegmentStore(tmp_path, max_segment_bytes=1)
+        old = datetime.now() - timedelta(days=60)
+        store.append([_record(old)])
+        store.append([_record(old + timedelta(seconds=1))])
+        store.append([_record(datetime.now())])
+
+        removed = store.drop_segments_before(datetime.now() - timedelta(days=30))
+
+        assert removed == 2
+        assert len(store.segments) == 1
+        assert len(store.query()) == 1
+
+
+class TestLogSegmentStoreAggregate:
+    """Test stats aggregation served by /api/logs/stats."""
+
+    def test_counts_by_level_component_and_recent(self, store):
+        old = datetime.now() - timedelta(hours=3)
+        store.append([_record(old + timedelta(seconds=i), session_id=f"s{i % 2}") for i in range(6)])
+        store.append([
+            _record(datetime.now(), session_id="s1", level="ERROR", component="llm"),
+            _record(datetime.now(), session_id="s0", level="WARNING", component="llm")
+        ])
+
+        stats = store.aggregate(recent_since=datetime.now() - timedelta(hours=1))
+        assert stats == {
+            'total': 8,
+            'by_level': {'INFO': 6, 'ERROR': 1, 'WARNING': 1},
+            'by_component': {'executor': 6, 'llm': 2},
+            'recent': 2
+        }
+
+        session_stats = store.aggregate(session_id="s1", recent_since=datetime.now() - timedelta(hours=1))
+        assert session_stats['total'] == 4
+        assert session_stats['by_level'] == {'INFO': 3, 'ERROR': 1}
+        assert session_stats['recent'] == 1
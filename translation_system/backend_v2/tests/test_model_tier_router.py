@@ -0,0 +1,158 @@
+"""Unit tests for model tier routing, tier budgets and per-tier cost accounting."""
+
+import pytest
+
+from services.batch_allocator import BatchAllocator
+from services.executor.model_tier_router import ModelTier, ModelTierRouter, TierRule, task_features
+from services.llm.cost_calculator import cost_calculator
+
+MODELS = {'economy': 'qwen-turbo', 'standard': 'qwen-plus', 'premium': 'qwen-max'}
+
+
+def _task(task_id, text, task_type='normal', context='', target_lang='PT'):
+    return {
+        'task_id': task_id,
+        'source_text': text,
+        'source_context': context,
+        'task_type': task_type,
+        'target_lang': target_lang,
+        'char_count': len(text)
+    }
+
+
+def _router(premium_share=None, max_cost=None):
+    tiers = [
+        ModelTier('economy', provider='qwen-plus', model='qwen-turbo'),
+        ModelTier('standard'),
+        ModelTier('premium', provider='qwen', max_share=premium_share)
+    ]
+    rules = [
+        TierRule('premium', min_glossary_hits=2),
+        TierRule('premium', min_chars=50),
+        TierRule('economy', max_chars=10, has_comment=False, task_types=['normal'])
+    ]
+    return ModelTierRouter(tiers, rules, default_tier='standard', max_estimated_cost_usd=max_cost)
+
+
+class TestModelTierRouter:
+    """Test classification, budgets, batch splitting and accounting."""
+
+    def test_features_and_rules(self):
+        glossary = {'terms': [
+            {'source': '攻击', 'translations': {'PT': 'Ataque'}},
+            {'source': '防御', 'translations': {'PT': 'Defesa'}}
+        ]}
+        router = _router()
+
+        features = task_features(_task('t1', '攻击和防御', context='[Comment] 按钮'), glossary)
+        assert features == {'char_count': 5, 'task_type': 'normal', 'glossary_hits': 2, 'has_comment': True}
+        assert router.classify(features) == 'premium'
+
+        assert router.classify(task_features(_task('t2', '确定'))) == 'economy'
+        assert router.classify(task_features(_task('t3', '确定', context='[Comment] 按钮'))) == 'standard'
+        assert router.classify(task_features(_task('t4', '确定', task_type='yellow'))) == 'standard'
+        assert router.classify(task_features(_task('t5', '长' * 60))) == 'premium'
+
+    def test_allocated_task_is_classified_by_source_text_length(self):
+        task = _task('t1', '确定', context='[Sheet] UI | [Row] 12 | ' + '上下文' * 20)
+        BatchAllocator(max_input_tokens=100000, provider='qwen-plus').allocate_batches([task])
+        assert task['char_count'] > 50  # Text plus context
+
+        features = task_features(task)
+        assert features['char_count'] == 2
+        assert _router().classify(features) == 'economy'
+
+    def test_unknown_tier_is_rejected(self):
+        with pytest.raises(ValueError):
+            ModelTierRouter([ModelTier('standard')], [TierRule('premium')], default_tier='standard')
+
+    def test_mixed_batches_are_split_per_tier(self):
+        router = _router()
+        batches = {
+            'batch_a': [_task('t1', '确定'), _task('t2', '取消')],
+            'batch_b': [_task('t3', '确定'), _task('t4', '长' * 60), _task('t5', '这是一句普通长度的对话文本')]
+        }
+
+        routed = router.route_batches(batches, models=MODELS)
+
+        assert set(routed) == {'batch_a', 'batch_b@economy', 'batch_b@premium', 'batch_b@standard'}
+        assert [t['task_id'] for t in routed['batch_b@premium']] == ['t4']
+        assert all(t['model_tier'] == 'economy' for t in routed['batch_a'])
+        assert router.get_stats()['split_batches'] == 1
+
+    def test_max_share_downgrades_easiest_tasks(self):
+        router = _router(premium_share=0.25)
+        tasks = [_task(f't{i}', '长' * (50 + i * 10)) for i in range(4)]
+        tasks += [_task(f's{i}', '这是一句普通长度的对话文本') for i in range(4)]
+
+        routed = router.route_batches({'batch': tasks}, models=MODELS)
+
+        premium = [t['task_id'] for t in routed['batch@premium']]
+        assert premium == ['t2', 't3']  # floor(0.25 * 8) hardest tasks kept
+        assert router.get_stats()['by_tier']['standard']['downgraded'] == 2
+
+    def test_cost_budget_downgrades_until_it_fits(self):
+        tasks = [_task(f't{i}', '长' * 100) for i in range(10)]
+        unbounded = _router()
+        unbounded.route_batches({'batch': [dict(t) for t in tasks]}, models=MODELS)
+        full_cost = unbounded.get_stats()['by_tier']['premium']['estimated_cost_usd']
+
+        router = _router(max_cost=full_cost * 0.75)
+        routed = router.route_batches({'batch': [dict(t) for t in tasks]}, models=MODELS)
+        stats = router.get_stats()['by_tier']
+
+        assert 0 < len(routed['batch@premium']) < 10
+        assert sum(entry['estimated_cost_usd'] for entry in stats.values()) <= full_cost * 0.75
+
+    def test_record_batch_reports_cost_and_savings(self):
+        router = _router()
+        router.route_batches({'batch': [_task('t1', '确定'), _task('t2', '长' * 60)]}, models=MODELS)
+
+        result = {'successful': 1, 'failed': 0, 'duration_seconds': 0.5, 'total_tokens': 3000,
+                  'prompt_stats': {'actual_input_tokens': 2000, 'actual_output_tokens': 1000}}
+        economy_cost = router.record_batch('economy', 1, result)
+        premium_cost = router.record_batch('premium', 1, result)
+        stats = router.get_stats()
+
+        standard_cost = float(cost_calculator.estimate_cost(2000, 1000, 'qwen-plus'))
+        assert economy_cost == pytest.approx(float(cost_calculator.estimate_cost(2000, 1000, 'qwen-turbo')))
+        assert economy_cost < standard_cost < premium_cost
+        assert stats['by_tier']['economy']['p95_latency_ms'] == pytest.approx(500.0)
+        assert stats['by_tier']['premium']['baseline_cost_usd'] == pytest.approx(standard_cost)
+        assert stats['savings_usd'] == pytest.approx(2 * standard_cost - economy_cost - premium_cost)
+
+    def test_record_batch_prices_the_models_that_served_it(self):
+        router = _router()
+        router.route_batches({'batch': [_task('t1', '确定')]}, models=MODELS)
+
+        # A failover answered three of the four economy tasks with qwen-max
+        result = {'successful': 4, 'failed': 0, 'duration_seconds': 0.5, 'total_tokens': 4000,
+                  'models': {'qwen-turbo': 1, 'qwen-max': 3},
+                  'prompt_stats': {'actual_input_tokens': 4000, 'actual_output_tokens': 0}}
+        cost = router.record_batch('economy', 4, result)
+
+        assert cost == pytest.approx(float(cost_calculator.estimate_cost(1000, 0, 'qwen-turbo'))
+                                     + float(cost_calculator.estimate_cost(3000, 0, 'qwen-max')))
+        assert router.get_stats()['by_tier']['economy']['served_models'] == {'qwen-turbo': 1, 'qwen-max': 3}
+
+    def test_build_providers_applies_tier_model(self, monkeypatch):
+        from services.llm.llm_factory import LLMFactory
+
+        calls = []
+        monkeypatch.setattr(LLMFactory, 'create_from_config_file',
+                            lambda config, name, overrides=None: calls.append((name, overrides)) or name)
+        providers = _router().build_providers('execution-provider')
+
+        assert providers == {'economy': 'qwen-plus', 'standard': 'execution-provider', 'premium': 'qwen'}
+        assert calls == [('qwen-plus', {'model': 'qwen-turbo'}), ('qwen', None)]
+
+
+class TestCostEstimate:
+    """Test non-tracking cost estimates."""
+
+    def test_estimate_does_not_touch_totals(self):
+        before = cost_calculator.total_cost_usd
+        cost = cost_calculator.estimate_cost(1000, 1000, 'qwen-max-latest', 'qwen')
+        assert float(cost) == pytest.approx(0.024)
+        assert cost_calculator.find_model_pricing('gpt-4-turbo-preview').model_name == 'gpt-4-turbo'
+        assert cost_calculator.total_cost_usd == before
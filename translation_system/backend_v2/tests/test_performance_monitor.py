@@ -0,0 +1,104 @@
+"""Unit tests for the sampled PerformanceMonitor."""
+
+import asyncio
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from services.monitor.performance_monitor import PerformanceMonitor
+
+performance_monitor_module = sys.modules[PerformanceMonitor.__module__]
+
+
+class FakeTaskManager:
+    """Task manager recording the thread statistics are read on."""
+
+    def __init__(self, threads):
+        self.df = pd.DataFrame({'status': ['completed', 'failed', 'pending', 'pending'], 'source_text': ['文本'] * 4})
+        self.threads = threads
+
+    def get_statistics(self):
+        self.threads.append(('stats', threading.get_ident()))
+        return {'total': len(self.df), 'by_status': self.df['status'].value_counts().to_dict()}
+
+
+class FakeSessionManager:
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+
+    def get_active_sessions(self):
+        return {'s1': {}}
+
+    def get_task_manager(self, session_id):
+        return self.task_manager
+
+    def get_excel_df(self, session_id):
+        return None
+
+
+class TestPerformanceMonitorSampling:
+    """Test background sampling and event-loop lag tracking."""
+
+    def test_current_metrics_served_from_snapshot(self):
+        monitor = PerformanceMonitor(collection_interval=60)
+        assert monitor.get_current_metrics() == {'error': 'No metrics available'}
+
+        async def collect_once():
+            await monitor._collect_system_metrics()
+            monitor._refresh_current()
+
+        started = time.perf_counter()
+        asyncio.run(collect_once())
+        assert time.perf_counter() - started < 1.0  # no blocking cpu_percent(interval=1)
+
+        current = monitor.get_current_metrics()
+        assert 'loop_lag_ms' in current['system']
+        assert current['event_loop']['running'] is False
+        assert monitor.get_current_metrics()['system'] is current['system']
+
+    def test_lag_probe_records_loop_stalls(self):
+        monitor = PerformanceMonitor(lag_probe_interval=0.01, alert_thresholds={'loop_lag_ms': 100.0})
+
+        async def stall_loop():
+            monitor._running = True
+            probe = asyncio.create_task(monitor._lag_probe_loop())
+            await asyncio.sleep(0.02)
+            time.sleep(0.2)  # blocking call on the event loop
+            await asyncio.sleep(0.05)
+            monitor._running = False
+            probe.cancel()
+
+        asyncio.run(stall_loop())
+
+        assert monitor.stats['lag_samples'] > 0
+        assert monitor.stats['max_loop_lag_ms'] >= 150
+        assert monitor.get_loop_lag()['max_since_snapshot_ms'] >= 150
+
+    def test_session_metrics_are_sampled_off_the_event_loop(self, monkeypatch):
+        threads = []
+        monkeypatch.setattr(performance_monitor_module, 'session_manager',
+                            FakeSessionManager(FakeTaskManager(threads)))
+        monitor = PerformanceMonitor(collection_interval=60)
+        estimate = monitor._estimate_session_memory
+
+        def recording_estimate(session_id):
+            threads.append(('memory', threading.get_ident()))
+            return estimate(session_id)
+
+        monkeypatch.setattr(monitor, '_estimate_session_memory', recording_estimate)
+
+        async def collect_once():
+            await monitor._collect_session_metrics()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(collect_once())
+
+        assert [name for name, _ in threads] == ['stats', 'memory']
+        assert all(ident != loop_thread for _, ident in threads)
+        metrics = monitor.session_metrics['s1'][-1]
+        assert metrics.tasks_total == 4
+        assert metrics.tasks_failed == 1
+        assert metrics.error_rate == 0.25
+        assert metrics.memory_usage_mb > 0
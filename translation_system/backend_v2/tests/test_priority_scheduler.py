@@ -0,0 +1,74 @@
+"""Unit tests for the priority batch scheduler."""
+
+import asyncio
+import time
+
+from services.executor.priority_scheduler import PriorityScheduler, classify_batch
+
+
+def _batch(task_type='normal', priority=5, sheet='Sheet1'):
+    return [{'task_type': task_type, 'priority': priority, 'sheet_name': sheet}]
+
+
+def _drain(scheduler):
+    order = []
+    while True:
+        entry = scheduler.pop_nowait()
+        if entry is None:
+            return order
+        order.append(entry.batch_id)
+
+
+class TestPriorityScheduler:
+    """Test weighted-fair dispatch, in-class ordering and starvation protection."""
+
+    def test_classify_uses_most_urgent_task(self):
+        assert classify_batch(_batch('normal') + _batch('yellow')) == 'yellow'
+        assert classify_batch([{}]) == 'normal'
+
+    def test_weighted_share_between_classes(self):
+        scheduler = PriorityScheduler(class_weights={'yellow': 3, 'normal': 1})
+        for i in range(40):
+            scheduler.put_nowait(f'n{i}', _batch('normal'))
+        for i in range(10):
+            scheduler.put_nowait(f'y{i}', _batch('yellow'))
+
+        first = _drain(scheduler)[:16]
+        assert sum(1 for batch_id in first if batch_id.startswith('y')) == 10
+        assert first[0] == 'y0'
+
+    def test_in_class_order_deadline_task_priority_then_small_sheet(self):
+        scheduler = PriorityScheduler()
+        now = time.monotonic()
+        scheduler.put_nowait('bulk', _batch(), sheet_size=500)
+        scheduler.put_nowait('small', _batch(), sheet_size=3)
+        scheduler.put_nowait('important', _batch(priority=9), sheet_size=500)
+        scheduler.put_nowait('due', _batch(), sheet_size=500, deadline=now + 60)
+
+        assert _drain(scheduler) == ['due', 'important', 'small', 'bulk']
+
+    def test_starved_class_is_promoted(self):
+        scheduler = PriorityScheduler(class_weights={'yellow': 1000, 'caps': 0.001}, max_wait_seconds=0.05)
+        scheduler.put_nowait('caps', _batch('caps'))
+        for i in range(5):
+            scheduler.put_nowait(f'y{i}', _batch('yellow'))
+
+        assert scheduler.pop_nowait().batch_id == 'y0'
+        time.sleep(0.06)
+        assert scheduler.pop_nowait().batch_id == 'caps'
+        stats = scheduler.get_stats()
+        assert stats['starvation_promotions'] == 1
+        assert stats['by_class']['caps']['p95_wait_ms'] >= 50
+
+    def test_get_waits_for_put(self):
+        scheduler = PriorityScheduler()
+
+        async def run():
+            waiter = asyncio.create_task(scheduler.get())
+            await asyncio.sleep(0.01)
+            scheduler.put_nowait('b1', _batch('blue'))
+            return await asyncio.wait_for(waiter, timeout=1)
+
+        batch_id, tasks = asyncio.run(run())
+        assert batch_id == 'b1' and tasks[0]['task_type'] == 'blue'
+        assert scheduler.empty()
@@ -0,0 +1,237 @@
+"""Unit tests for multi-provider routing, circuit breaking and failover."""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.llm.base_provider import BaseLLMProvider, LLMConfig, TranslationRequest, TranslationResponse
+from services.llm.provider_router import CircuitBreaker, ProviderEndpoint, ProviderRouter
+
+
+class FakeProvider(BaseLLMProvider):
+    """In-process endpoint with injected latency (seconds) and error rate."""
+
+    def __init__(self, name, latency=0.0, error_rate=0.0, error='API error: 500', seed=0):
+        super().__init__(LLMConfig(provider=name, api_key='test', model=f'{name}-model'))
+        self.model = f'{name}-model'
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error = error
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.healthy = True
+
+    async def translate_single(self, request):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.random.random() < self.error_rate:
+            return TranslationResponse(translated_text='', error=self.error, task_id=request.task_id)
+        return TranslationResponse(translated_text=f'{self.model}:{request.source_text}',
+                                   model=self.model, task_id=request.task_id)
+
+    async def translate_batch(self, requests):
+        return [await self.translate_single(request) for request in requests]
+
+    async def health_check(self):
+        return self.healthy
+
+
+def _request(i=0):
+    return TranslationRequest(source_text=f'文本{i}', source_lang='CH', target_lang='PT', task_id=f't{i}')
+
+
+def _router(providers, weights=None, **options):
+    weights = weights or [1] * len(providers)
+    endpoints = [
+        ProviderEndpoint(provider.config.provider, provider, weight=weight,
+                         breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=0.2))
+        for provider, weight in zip(providers, weights)
+    ]
+    return ProviderRouter(endpoints, **options)
+
+
+class TestProviderRouter:
+    """Test balancing, ejection and failover over fake endpoints."""
+
+    def test_weighted_round_robin_spreads_by_weight(self):
+        a, b = FakeProvider('a'), FakeProvider('b')
+        router = _router([a, b], weights=[3, 1])
+
+        async def run():
+            return await router.translate_batch([_request(i) for i in range(40)])
+
+        responses = asyncio.run(run())
+        assert all(not response.error for response in responses)
+        assert (a.calls, b.calls) == (30, 10)
+
+    def test_least_outstanding_prefers_the_fast_endpoint(self):
+        slow, fast = FakeProvider('slow', latency=0.05), FakeProvider('fast', latency=0.005)
+        router = _router([slow, fast], strategy='least_outstanding', max_concurrent=4)
+
+        async def run():
+            return await router.translate_batch([_request(i) for i in range(40)])
+
+        asyncio.run(run())
+        assert fast.calls > 2 * slow.calls
+
+    def test_failover_and_breaker_ejection(self):
+        broken = FakeProvider('broken', error_rate=1.0)
+        healthy = FakeProvider('healthy', latency=0.001)
+        router = _router([broken, healthy])
+
+        async def run():
+            return [await router.translate_single(_request(i)) for i in range(10)]
+
+        responses = asyncio.run(run())
+        stats = router.get_stats()
+
+        assert all(not response.error for response in responses)
+        assert broken.calls == 2  # Ejected after failure_threshold consecutive errors
+        assert stats['endpoints']['broken']['state'] == CircuitBreaker.OPEN
+        assert stats['failovers'] == 2
+
+        # After the recovery timeout one trial request is let through again
+        time.sleep(0.25)
+        broken.error_rate = 0.0
+        asyncio.run(run())
+        assert router.get_stats()['endpoints']['broken']['state'] == CircuitBreaker.CLOSED
+
+    def test_rate_limited_endpoint_cools_down_immediately(self):
+        limited = FakeProvider('limited', error='Failed after 3 attempts: Rate limited (429)', error_rate=1.0)
+        other = FakeProvider('other')
+        router = _router([limited, other], rate_limit_cooldown=60)
+
+        async def run():
+            return [await router.translate_single(_request(i)) for i in range(6)]
+
+        responses = asyncio.run(run())
+        assert all(not response.error for response in responses)
+        assert limited.calls == 1
+        assert router.get_stats()['endpoints']['limited']['rate_limited'] == 1
+
+    def test_endpoint_with_closed_rate_limit_gate_is_skipped(self):
+        limited = FakeProvider('limited')
+        other = FakeProvider('other')
+        limited.rate_limit_gate.hit(retry_after=30, backoff=30)
+        router = _router([limited, other])
+
+        async def run():
+            return [await router.translate_single(_request(i)) for i in range(4)]
+
+        start = time.monotonic()
+        responses = asyncio.run(run())
+
+        assert time.monotonic() - start < 1.0
+        assert all(not response.error for response in responses)
+        assert limited.calls == 0
+
+    def test_flaky_endpoints_aggregate_and_health_ejection(self):
+        providers = [FakeProvider(name, latency=0.002, error_rate=0.2, seed=seed)
+                     for seed, name in enumerate(['k1', 'k2', 'k3'])]
+        router = _router(providers)
+        providers[2].healthy = False
+
+        async def run():
+            assert await router.health_check() is True
+            return await router.translate_batch([_request(i) for i in range(60)])
+
+        responses = asyncio.run(run())
+        succeeded = sum(1 for response in responses if not response.error)
+
+        assert router.get_stats()['health_ejections'] == 1
+        assert providers[2].calls == 0
+        assert succeeded >= 57
+
+
+def _stub_server(status, body):
+    """Local OpenAI-compatible endpoint returning a fixed status/body."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestProviderRouterHttp:
+    """Test failover between real providers pointed at local stub endpoints."""
+
+    def test_429_endpoint_fails_over_to_second_key(self):
+        pytest.importorskip('httpx')
+        from services.llm.openai_provider import OpenAIProvider
+
+        limited = _stub_server(429, {'error': 'rate limited'})
+        ok = _stub_server(200, {
+            'choices': [{'message': {'content': 'Iniciar'}}],
+            'usage': {'total_tokens': 12}
+        })
+        try:
+            endpoints = []
+            for name, server in [('key1', limited), ('key2', ok)]:
+                provider = OpenAIProvider(LLMConfig(
+                    provider='openai', api_key=name, model='stub',
+                    base_url=f"http://127.0.0.1:{server.server_address[1]}",
+                    max_retries=1, retry_delay=0
+                ))
+                endpoints.append(ProviderEndpoint(name, provider))
+            router = ProviderRouter(endpoints)
+
+            response = asyncio.run(router.translate_single(_request()))
+
+            assert response.translated_text == 'Iniciar'
+            assert router.get_stats()['endpoints']['key1']['rate_limited'] == 1
+            assert router.get_stats()['endpoints']['key1']['state'] == CircuitBreaker.OPEN
+        finally:
+            for server in (limited, ok):
+                server.shutdown()
+                server.server_close()
+
+    def test_configured_router_fails_over_without_member_retries(self, monkeypatch):
+        pytest.importorskip('httpx')
+        from services.llm.llm_factory import LLMFactory
+
+        monkeypatch.setattr(LLMFactory, '_routers', {})
+        limited = _stub_server(429, {'error': 'rate limited'})
+        ok = _stub_server(200, {
+            'choices': [{'message': {'content': 'Iniciar'}}],
+            'usage': {'total_tokens': 12}
+        })
+        try:
+            config = {'llm': {
+                'providers': {'openai': {'api_key': 'key', 'model': 'stub'}},
+                'retry': {'max_attempts': 3, 'delay_seconds': 30},
+                'routing': {'enabled': True, 'providers': [
+                    {'name': 'openai', 'label': name, 'weight': weight,
+                     'base_url': f"http://127.0.0.1:{server.server_address[1]}"}
+                    for name, server, weight in [('key1', limited, 3), ('key2', ok, 1)]
+                ]}
+            }}
+            router = LLMFactory.create_from_config_file(config)
+
+            start = time.monotonic()
+            response = asyncio.run(router.translate_single(_request()))
+
+            assert response.translated_text == 'Iniciar'
+            assert time.monotonic() - start < 5.0
+            assert [endpoint.provider.config.max_retries for endpoint in router.endpoints] == [1, 1]
+            assert router.get_stats()['endpoints']['key1']['rate_limited'] == 1
+        finally:
+            for server in (limited, ok):
+                server.shutdown()
+                server.server_close()
@@ -0,0 +1,109 @@
+"""Unit tests for streamed (SSE) batch translation."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.llm.stream_parser import IncrementalArrayParser
+
+
+class TestIncrementalArrayParser:
+    """Test element-by-element parsing of a streamed JSON array."""
+
+    def test_emits_each_element_when_complete(self):
+        parser = IncrementalArrayParser()
+        assert parser.feed('```json\n["Ol') == []
+        assert parser.feed('á, \\"herói\\"", "Sa') == [(0, 'Olá, "herói"')]
+        assert parser.feed('ir", "[x]"]\n```') == [(1, 'Sair'), (2, '[x]')]
+        assert parser.finished and parser.emitted == 3
+        assert parser.feed('["ignored"]') == []
+
+    def test_id_keyed_objects_and_malformed_elements(self):
+        parser = IncrementalArrayParser()
+        results = parser.feed('[{"id": 2, "translation": "B"}, oops, {"index": 0, "text": "A"}]')
+        assert results == [(1, 'B'), (0, 'A')]
+
+
+def _sse_stub(chunks, cut=False):
+    """Start a local OpenAI-style SSE server; cut=True drops the connection mid-stream."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+
+            events = [{'choices': [{'delta': {'content': chunk}}]} for chunk in chunks]
+            if not cut:
+                events.append({'choices': [], 'usage': {'total_tokens': 30}})
+            for event in events:
+                self._write_chunk(f"data: {json.dumps(event)}\n\n")
+            if not cut:
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            self.close_connection = True
+
+        def _write_chunk(self, text):
+            data = text.encode('utf-8')
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _translate(chunks, cut=False):
+    pytest.importorskip('httpx')
+    from services.llm.base_provider import LLMConfig
+    from services.llm.batch_translator import BatchTranslator
+    from services.llm.openai_provider import OpenAIProvider
+
+    server = _sse_stub(chunks, cut)
+    try:
+        provider = OpenAIProvider(LLMConfig(
+            provider='openai', api_key='test', model='stub',
+            base_url=f"http://127.0.0.1:{server.server_address[1]}",
+            max_retries=1, retry_delay=0, stream=True
+        ))
+        translator = BatchTranslator(provider, batch_size=3)
+        tasks = [
+            {'task_id': f't{i}', 'source_text': text, 'source_lang': 'CH', 'target_lang': 'PT'}
+            for i, text in enumerate(['开始', '退出', '设置'])
+        ]
+        streamed = []
+        results = asyncio.run(translator.translate_batch_optimized(tasks, on_result=streamed.append))
+        return results, [task['task_id'] for task in streamed]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestStreamingBatchTranslation:
+    """Test incremental commits against a local SSE stub server."""
+
+    def test_results_are_delivered_as_they_stream(self):
+        results, streamed = _translate(['["Iniciar", "Sa', 'ir"', ', "Configurações"]'])
+
+        assert streamed == ['t0', 't1', 't2']
+        assert [task['result'] for task in results] == ['Iniciar', 'Sair', 'Configurações']
+        assert all(task['status'] == 'completed' for task in results)
+        assert all(task['token_count'] == 10 for task in results)
+
+    def test_interrupted_stream_keeps_completed_translations(self):
+        results, streamed = _translate(['["Iniciar", ', '"Sair", "Config'], cut=True)
+
+        assert streamed == ['t0', 't1']
+        assert [task['status'] for task in results] == ['completed', 'completed', 'failed']
+        assert 'interrupted' in results[2]['error_message']
@@ -0,0 +1,204 @@
+"""Unit tests for the coalescing task write-behind queue."""
+
+import asyncio
+from datetime import datetime
+
+from services.persistence.task_write_behind import TaskWriteBehind, SQLiteTaskSink
+
+
+class FailingSink:
+    """Sink that fails a fixed number of times before delegating."""
+
+    def __init__(self, inner, failures=1):
+        self.inner = inner
+        self.failures = failures
+
+    async def batch_update_tasks(self, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        return await self.inner.batch_update_tasks(rows)
+
+
+class BrokenSink:
+    """Sink whose every write fails."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def batch_update_tasks(self, rows):
+        self.calls += 1
+        raise RuntimeError("Cannot add or update a child row: a foreign key constraint fails")
+
+
+class SessionCheckingSink:
+    """Sink that rejects task rows of unknown sessions (like the MySQL foreign key)."""
+
+    def __init__(self):
+        self.sessions = set()
+        self.calls = []
+
+    async def create_session_idempotent(self, session_data):
+        self.calls.append(('session', session_data['session_id']))
+        self.sessions.add(session_data['session_id'])
+        return session_data['session_id']
+
+    async def batch_update_tasks(self, rows):
+        if any(row['session_id'] not in self.sessions for row in rows):
+            raise RuntimeError("foreign key constraint fails")
+        self.calls.append(('tasks', len(rows)))
+        return len(rows)
+
+
+class TestTaskWriteBehindCoalescing:
+    """Test coalescing and batched flushing."""
+
+    def test_updates_to_same_task_are_merged(self):
+        sink = SQLiteTaskSink()
+        wb = TaskWriteBehind(sink=sink, max_batch_size=100)
+
+        wb.submit("s1", "T1", {'status': 'processing', 'start_time': datetime(2025, 1, 1)})
+        wb.submit("s1", "T1", {'status': 'completed', 'result': 'Olá'})
+        wb.submit("s1", "T2", {'status': 'processing'})
+
+        assert wb.pending_count == 2
+        assert wb.stats['coalesced'] == 1
+
+        assert asyncio.run(wb.flush()) is True
+        assert sink.statements == 1
+
+        row = sink.fetch_task("T1")
+        assert row['status'] == 'completed'
+        assert row['result'] == 'Olá'
+        assert row['started_at'] == '2025-01-01T00:00:00'
+
+    def test_flush_splits_into_bounded_statements(self):
+        sink = SQLiteTaskSink()
+        wb = TaskWriteBehind(sink=sink, max_batch_size=10)
+        for i in range(25):
+            wb.submit("s1", f"T{i}", {'status': 'completed'})
+
+        asyncio.run(wb.flush())
+
+        assert sink.statements == 3
+        assert wb.stats['flushed_rows'] == 25
+        assert wb.pending_count == 0
+
+    def test_ignores_non_persisted_fields_and_disabled_sink(self):
+        wb = TaskWriteBehind(sink=SQLiteTaskSink())
+        wb.submit("s1", "T1", {'updated_at': datetime.now()})
+        assert wb.pending_count == 0
+
+        disabled = TaskWriteBehind(sink=None)
+        disabled.submit("s1", "T1", {'status': 'completed'})
+        assert disabled.pending_count == 0
+
+
+class TestTaskWriteBehindDurability:
+    """Test failure handling and shutdown flush."""
+
+    def test_failed_flush_requeues_with_newer_updates_winning(self):
+        sink = SQLiteTaskSink()
+        wb = TaskWriteBehind(sink=FailingSink(sink), max_batch_size=100)
+        wb.submit("s1", "T1", {'status': 'processing', 'retry_count': 1})
+
+        assert asyncio.run(wb.flush()) is False
+        wb.submit("s1", "T1", {'status': 'completed'})
+        assert asyncio.run(wb.flush()) is True
+
+        row = sink.fetch_task("T1")
+        assert row['status'] == 'completed'
+        assert row['retry_count'] == 1
+
+    def test_stop_flushes_pending_updates(self):
+        sink = SQLiteTaskSink()
+
+        async def run():
+            wb = TaskWriteBehind(sink=sink, flush_interval=60)
+            await wb.start()
+            wb.submit("s1", "T1", {'status': 'completed'})
+            await wb.stop()
+            return wb
+
+        wb = asyncio.run(run())
+        assert wb.pending_count == 0
+        assert sink.fetch_task("T1")['status'] == 'completed'
+
+    def test_update_without_status_keeps_stored_status(self):
+        sink = SQLiteTaskSink()
+        wb = TaskWriteBehind(sink=sink)
+        wb.submit("s1", "T1", {'status': 'completed'})
+        asyncio.run(wb.flush())
+
+        wb.submit("s1", "T1", {'retry_count': 2})
+        asyncio.run(wb.flush())
+
+        row = sink.fetch_task("T1")
+        assert row['status'] == 'completed'
+        assert row['retry_count'] == 2
+
+    def test_session_row_is_written_before_its_tasks(self):
+        sink = SessionCheckingSink()
+        wb = TaskWriteBehind(sink=sink)
+        wb.register_session("s1", {'filename': 'game.xlsx'})
+        wb.submit("s1", "T1", {'status': 'completed'})
+
+        assert asyncio.run(wb.flush()) is True
+        assert sink.calls == [('session', 's1'), ('tasks', 1)]
+
+        wb.submit("s1", "T2", {'status': 'completed'})
+        asyncio.run(wb.flush())
+        assert sink.calls[-1] == ('tasks', 1)  # Session row is written only once
+
+
+class TestTaskWriteBehindFailingSink:
+    """Test that a sink failing on every call never blocks the workers."""
+
+    def test_rows_are_dropped_after_max_retries(self):
+        sink = BrokenSink()
+        wb = TaskWriteBehind(sink=sink, max_batch_size=10, max_retries=3)
+        for i in range(25):
+            wb.submit("s1", f"T{i}", {'status': 'completed'})
+
+        for _ in range(3):
+            assert asyncio.run(wb.flush()) is False
+
+        assert wb.pending_count == 0
+        assert wb.stats['dropped_rows'] == 25
+        assert sink.calls == 9  # Every row attempted once per flush, three statements each
+
+    def test_producers_are_not_blocked_forever(self):
+        sink = BrokenSink()
+
+        async def run():
+            wb = TaskWriteBehind(sink=sink, max_batch_size=5, flush_interval=0.01, max_pending=10,
+                                 retry_delay=0.01, max_retries=3, max_throttle_wait=0.2)
+            await wb.start()
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            # A worker producing faster than the (broken) database can absorb
+            for i in range(100):
+                await wb.wait_for_capacity()
+                wb.submit("s1", f"T{i}", {'status': 'completed'})
+            elapsed = loop.time() - started
+            while wb.pending_count and loop.time() - started < 5:
+                await asyncio.sleep(0.01)
+            await wb.stop()
+            return wb, elapsed
+
+        wb, elapsed = asyncio.run(asyncio.wait_for(run(), timeout=10))
+
+        assert elapsed < 5
+        assert wb.pending_count == 0
+        assert wb.stats['dropped_rows'] == 100
+
+    def test_wait_for_capacity_honours_deadline(self):
+        async def run():
+            wb = TaskWriteBehind(sink=BrokenSink(), max_pending=1, flush_interval=60)
+            wb._running = True  # Flusher not started: capacity never frees up
+            wb.submit("s1", "T1", {'status': 'completed'})
+            return wb, await wb.wait_for_capacity(timeout=0.05)
+
+        wb, has_capacity = asyncio.run(run())
+        assert has_capacity is False
+        assert wb.stats['throttle_timeouts'] == 1
@@ -0,0 +1,78 @@
+"""Unit tests for script-aware token estimation and token-budget batch packing."""
+
+from services.batch_allocator import BatchAllocator
+from services.llm.token_estimator import (
+    TokenEstimator, TOKENIZER_PROFILES, get_estimator, script_counts, dominant_script
+)
+
+
+def _tasks(text, target_lang, count=40):
+    return [
+        {'task_id': f'T{i}', 'source_text': text, 'target_lang': target_lang, 'task_type': 'normal'}
+        for i in range(count)
+    ]
+
+
+class TestTokenEstimator:
+    """Test per-script estimates, profile lookup and calibration."""
+
+    def test_script_buckets(self):
+        assert script_counts('开始游戏') == {'cjk': 4}
+        assert dominant_script(script_counts('Bắt đầu trò chơi')) == 'vietnamese'
+        assert dominant_script(script_counts('เริ่มเกม')) == 'thai'
+        assert dominant_script(script_counts('Start the game')) == 'latin'
+
+    def test_profile_lookup(self):
+        assert get_estimator('qwen-plus').profile.name == 'qwen'
+        assert get_estimator('qwen-max').profile.name == 'qwen'
+        assert get_estimator('gpt-4-turbo').profile.name == 'openai'
+
+    def test_output_estimate_depends_on_target_script(self):
+        estimator = TokenEstimator(TOKENIZER_PROFILES['openai'])
+        to_pt = estimator.estimate_task({'source_text': '开始游戏并领取奖励', 'target_lang': 'PT'})
+        to_th = estimator.estimate_task({'source_text': '开始游戏并领取奖励', 'target_lang': 'TH'})
+        assert to_th['output_tokens'] > to_pt['output_tokens']
+
+    def test_calibration_moves_towards_actual_usage(self):
+        estimator = TokenEstimator(TOKENIZER_PROFILES['qwen'])
+        tasks = _tasks('开始游戏并领取奖励', 'TH', count=5)
+        before = estimator.estimate_batch(tasks)
+
+        for _ in range(20):
+            predicted = estimator.estimate_batch(tasks)
+            estimator.observe(tasks, predicted, predicted['input_tokens'] * 2, predicted['output_tokens'] // 2)
+
+        after = estimator.estimate_batch(tasks)
+        assert after['input_tokens'] > 1.7 * before['input_tokens']
+        assert after['output_tokens'] < 0.7 * before['output_tokens']
+        stats = estimator.get_stats()
+        assert stats['observations'] == 20 and 'input:cjk' in stats['factors']
+
+
+class TestTokenPacking:
+    """Test that BatchAllocator packs against token budgets."""
+
+    def _batches(self, allocator, tasks):
+        batches = {}
+        for task in allocator.allocate_batches(tasks):
+            batches.setdefault(task['batch_id'], []).append(task)
+        return list(batches.values())
+
+    def test_batches_respect_token_budgets(self):
+        allocator = BatchAllocator(max_input_tokens=800, max_output_tokens=600, provider='openai')
+        for text, lang in [('开始游戏并领取奖励，完成每日任务', 'TH'), ('Start the game and claim rewards', 'PT')]:
+            for batch in self._batches(allocator, _tasks(text, lang)):
+                estimate = allocator.estimator.estimate_batch(batch)
+                assert estimate['output_tokens'] <= 600
+                assert estimate['input_tokens'] <= 800 - allocator.prompt_overhead_tokens
+
+    def test_dense_scripts_get_fewer_tasks_per_batch(self):
+        allocator = BatchAllocator(max_input_tokens=800, max_output_tokens=600, provider='openai')
+        cjk_to_thai = self._batches(allocator, _tasks('开始游戏并领取奖励，完成每日任务', 'TH'))
+        latin_to_pt = self._batches(allocator, _tasks('Start the game and claim rewards', 'PT'))
+        assert len(cjk_to_thai) > len(latin_to_pt)
+
+    def test_explicit_char_limit_still_applies(self):
+        allocator = BatchAllocator(max_chars_per_batch=100)
+        for batch in self._batches(allocator, _tasks('A' * 30, 'EN')):
+            assert sum(task['char_count'] for task in batch) <= 100
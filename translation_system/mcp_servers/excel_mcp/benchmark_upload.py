@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark excel_analyze inline upload paths: base64 'file' argument vs POST /mcp/upload.
+
+For every workbook size a fresh server process is started, one workbook is
+submitted and analyzed, and the server's peak RSS (VmHWM, Linux only) and the
+submit / end-to-end latencies are reported.
+
+Usage:
+    python benchmark_upload.py
+    python benchmark_upload.py --sizes 10 50 100 --token test_token_123
+"""
+
+import os
+import sys
+import time
+import base64
+import secrets
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import requests
+import openpyxl
+
+SERVER = Path(__file__).parent / 'server.py'
+
+
+def make_workbook(path: Path, target_mb: int):
+    """Write an .xlsx of roughly target_mb (random text barely compresses)."""
+    def write(rows: int):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        ws.append(['key', 'CH', 'EN'])
+        for i in range(rows):
+            ws.append([f'KEY_{i}', secrets.token_hex(48), secrets.token_hex(48)])
+        wb.save(path)
+
+    # Calibrate bytes per row on a small sample, then write the real file
+    write(2000)
+    bytes_per_row = path.stat().st_size / 2000
+    write(int(target_mb * 1024 * 1024 / bytes_per_row))
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def start_server(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, str(SERVER), '--http', f'--port={port}'],
+        cwd=SERVER.parent, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            requests.get(f'http://localhost:{port}/health', timeout=1)
+            return proc
+        except requests.RequestException:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError('excel_mcp server did not start')
+
+
+def call_tool(port: int, tool: str, arguments: dict, **kwargs) -> dict:
+    response = requests.post(
+        f'http://localhost:{port}/mcp/tool', json={'tool': tool, 'arguments': arguments}, **kwargs
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def submit_base64(port: int, token: str, path: Path) -> dict:
+    encoded = base64.b64encode(path.read_bytes()).decode('ascii')
+    return call_tool(port, 'excel_analyze', {'token': token, 'file': encoded, 'filename': path.name})
+
+
+def submit_upload(port: int, token: str, path: Path) -> dict:
+    with open(path, 'rb') as f:
+        response = requests.post(
+            f'http://localhost:{port}/mcp/upload', data=f,
+            headers={'Authorization': token, 'X-Filename': path.name}
+        )
+    response.raise_for_status()
+    upload_id = response.json()['upload_id']
+    return call_tool(port, 'excel_analyze', {'token': token, 'upload_id': upload_id})
+
+
+def run_once(mode: str, path: Path, port: int, token: str) -> dict:
+    proc = start_server(port)
+    try:
+        baseline = peak_rss_mb(proc.pid)
+        start = time.perf_counter()
+        result = (submit_upload if mode == 'upload' else submit_base64)(port, token, path)
+        submit_ms = (time.perf_counter() - start) * 1000
+        if 'session_id' not in result:
+            raise RuntimeError(f'excel_analyze failed: {result}')
+
+        while True:
+            status = call_tool(port, 'excel_get_status', {'token': token, 'session_id': result['session_id']})
+            if status.get('status') in ('completed', 'failed'):
+                break
+            time.sleep(0.1)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        return {
+            'mode': mode,
+            'status': status['status'],
+            'submit_ms': round(submit_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'baseline_rss_mb': round(baseline, 1),
+            'peak_rss_mb': round(peak_rss_mb(proc.pid), 1)
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark excel_analyze upload paths')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100], help='workbook sizes in MB')
+    parser.add_argument('--port', type=int, default=8921)
+    parser.add_argument('--token', default='test_token_123')
+    args = parser.parse_args()
+
+    # Peak RSS is measured on the server process; worker processes would hide the parse cost
+    os.environ.setdefault('EXCEL_MCP_PROCESS_WORKERS', '0')
+    os.environ.setdefault('EXCEL_MCP_MAX_UPLOAD_MB', str(max(args.sizes) * 2))
+
+    print('=' * 86)
+    print(f"{'size_mb':>8}{'mode':>9}{'status':>11}{'submit_ms':>12}{'total_ms':>12}{'base_rss':>11}{'peak_rss':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f'bench_{size}mb.xlsx'
+            make_workbook(path, size)
+            actual_mb = path.stat().st_size / 1024 / 1024
+            for mode in ('base64', 'upload'):
+                row = run_once(mode, path, args.port, args.token)
+                print(
+                    f"{actual_mb:>8.1f}{row['mode']:>9}{row['status']:>11}{row['submit_ms']:>12}"
+                    f"{row['total_ms']:>12}{row['baseline_rss_mb']:>11}{row['peak_rss_mb']:>11}"
+                )
+            path.unlink()
+    print('=' * 86)
+
+
+if __name__ == '__main__':
+    main()
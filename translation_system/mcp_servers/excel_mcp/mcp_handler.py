@@ -6,11 +6,13 @@ import base64
 import json
 from typing import Dict, Any
 from io import BytesIO
+from pathlib import Path
 
 from utils.token_validator import token_validator
 from utils.session_manager import session_manager
+from utils.upload_store import upload_store
 from models.session_data import SessionStatus
-from services.task_queue import task_queue
+from services.task_queue import task_queue, TaskQueueFullError
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +38,7 @@ class MCPHandler:
                 return self._error_response("Missing token")
 
             try:
-                payload = token_validator.validate(token)
+                payload = await token_validator.validate_async(token)
             except Exception as e:
                 return self._error_response(f"Token validation failed: {str(e)}")
 
@@ -72,12 +74,22 @@ class MCPHandler:
         """Handle excel_analyze tool."""
         file_url = arguments.get('file_url')
         file_base64 = arguments.get('file')
+        upload_id = arguments.get('upload_id')
         filename = arguments.get('filename', 'uploaded.xlsx')
         options = arguments.get('options', {})
 
-        # Must provide either file_url or file
-        if not file_url and not file_base64:
-            return self._error_response("Must provide either file_url or file")
+        # Must provide one of file_url, upload_id or file
+        if not file_url and not file_base64 and not upload_id:
+            return self._error_response("Must provide either file_url, upload_id or file")
+
+        # Claim a file streamed to POST /mcp/upload
+        file_path = None
+        if upload_id:
+            upload = upload_store.claim(upload_id, payload.get('user_id'))
+            if upload is None:
+                return self._error_response(f"Upload not found: {upload_id}")
+            file_path = str(upload['path'])
+            filename = arguments.get('filename', upload['filename'])
 
         # Create session
         session_id = session_manager.create_session()
@@ -85,7 +97,7 @@ class MCPHandler:
 
         # Prepare file data
         file_data = None
-        if file_base64:
+        if file_base64 and not file_path:
             try:
                 file_bytes = base64.b64decode(file_base64)
                 file_data = BytesIO(file_bytes)
@@ -93,13 +105,20 @@ class MCPHandler:
                 return self._error_response(f"Invalid file encoding: {str(e)}")
 
         # Submit task to queue
-        await task_queue.submit_analysis_task(
-            session_id=session_id,
-            file_data=file_data,
-            file_url=file_url,
-            filename=filename,
-            options=options
-        )
+        try:
+            await task_queue.submit_analysis_task(
+                session_id=session_id,
+                file_data=file_data,
+                file_url=None if file_path else file_url,
+                file_path=file_path,
+                filename=filename,
+                options=options
+            )
+        except TaskQueueFullError as e:
+            session_manager.delete_session(session_id)
+            if file_path:
+                Path(file_path).unlink(missing_ok=True)
+            return self._error_response(str(e))
 
         return {
             "session_id": session_id,
@@ -289,13 +308,16 @@ class MCPHandler:
             return self._error_response("Excel data not available")
 
         # Submit task splitting to queue
-        await task_queue.submit_task_split(
-            session_id=session_id,
-            source_lang=source_lang,
-            target_langs=target_langs,
-            extract_context=extract_context,
-            context_options=context_options
-        )
+        try:
+            await task_queue.submit_task_split(
+                session_id=session_id,
+                source_lang=source_lang,
+                target_langs=target_langs,
+                extract_context=extract_context,
+                context_options=context_options
+            )
+        except TaskQueueFullError as e:
+            return self._error_response(str(e))
 
         return {
             "session_id": session_id,
@@ -394,11 +416,14 @@ class MCPHandler:
             return self._error_response("Tasks not available. Run excel_split_tasks first.")
 
         # Submit export task to queue
-        await task_queue.submit_export_task(
-            session_id=session_id,
-            export_format=export_format,
-            include_context=include_context
-        )
+        try:
+            await task_queue.submit_export_task(
+                session_id=session_id,
+                export_format=export_format,
+                include_context=include_context
+            )
+        except TaskQueueFullError as e:
+            return self._error_response(str(e))
 
         # Check if export is already completed (in metadata)
         if 'download_url' in session.metadata:
@@ -7,7 +7,7 @@ import json
 TOOLS = [
     {
         "name": "excel_analyze",
-        "description": "Analyze Excel file comprehensively (async). Returns session_id for tracking. Supports both HTTP URL and direct file upload.",
+        "description": "Analyze Excel file comprehensively (async). Returns session_id for tracking. Supports HTTP URL, streamed upload (upload_id) and base64 file upload.",
         "inputSchema": {
             "type": "object",
             "properties": {
@@ -19,9 +19,13 @@ TOOLS = [
                     "type": "string",
                     "description": "HTTP URL to download Excel file from (optional if file is provided)"
                 },
+                "upload_id": {
+                    "type": "string",
+                    "description": "Upload ID returned by POST /mcp/upload (preferred for direct upload; no base64 overhead)"
+                },
                 "file": {
                     "type": "string",
-                    "description": "Base64-encoded file data for direct upload (optional if file_url is provided)"
+                    "description": "Base64-encoded file data for direct upload (optional if file_url or upload_id is provided)"
                 },
                 "filename": {
                     "type": "string",
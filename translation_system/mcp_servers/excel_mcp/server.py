@@ -18,6 +18,9 @@ import aiohttp_cors
 from mcp_tools import get_tool_list
 from mcp_handler import mcp_handler
 from utils.session_manager import session_manager
+from utils.token_validator import token_validator
+from utils.upload_store import upload_store, UploadTooLargeError
+from services.task_queue import task_queue
 
 # Configure logging
 logging.basicConfig(
@@ -93,6 +96,7 @@ async def cleanup_task():
         try:
             await asyncio.sleep(3600)  # Run every hour
             session_manager.cleanup_expired_sessions(timeout_hours=8)
+            upload_store.cleanup_expired()
             logger.info("Session cleanup completed")
         except Exception as e:
             logger.error(f"Error in cleanup task: {e}")
@@ -117,12 +121,65 @@ async def http_tool_handler(request: web.Request) -> web.Response:
         return web.json_response({'error': str(e)}, status=500)
 
 
+async def _iter_part(part, chunk_size: int = 1024 * 1024):
+    """Yield the body of a multipart part chunk by chunk."""
+    while True:
+        chunk = await part.read_chunk(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def http_upload_handler(request: web.Request) -> web.Response:
+    """
+    Streamed upload endpoint for excel_analyze.
+
+    Accepts either a multipart/form-data body with a 'file' field or a raw
+    body (filename from the X-Filename header or ?filename=). The file is
+    written to disk as it arrives; pass the returned upload_id to
+    excel_analyze instead of a base64 'file' argument.
+    """
+    token = request.headers.get('Authorization') or request.query.get('token')
+    if not token:
+        return web.json_response({'error': 'Missing token'}, status=401)
+    try:
+        payload = await token_validator.validate_async(token)
+    except Exception as e:
+        return web.json_response({'error': f'Token validation failed: {str(e)}'}, status=401)
+
+    try:
+        if request.content_type.startswith('multipart/'):
+            reader = await request.multipart()
+            part = await reader.next()
+            while part is not None and part.name != 'file':
+                part = await reader.next()
+            if part is None:
+                return web.json_response({'error': "Missing 'file' field"}, status=400)
+            filename = part.filename or 'uploaded.xlsx'
+            chunks = _iter_part(part)
+        else:
+            filename = request.headers.get('X-Filename') or request.query.get('filename', 'uploaded.xlsx')
+            chunks = request.content.iter_chunked(1024 * 1024)
+
+        result = await upload_store.save(chunks, Path(filename).name, payload.get('user_id'))
+        return web.json_response(result)
+
+    except UploadTooLargeError as e:
+        return web.json_response({'error': str(e)}, status=413)
+    except Exception as e:
+        logger.error(f"Upload handler error: {e}", exc_info=True)
+        return web.json_response({'error': str(e)}, status=500)
+
+
 async def http_health(request: web.Request) -> web.Response:
     """Health check endpoint."""
     return web.json_response({
         'status': 'healthy',
         'service': 'excel_mcp',
-        'sessions': session_manager.get_session_count()
+        'sessions': session_manager.get_session_count(),
+        'auth': token_validator.get_stats(),
+        'task_queue': task_queue.get_stats(),
+        'uploads': upload_store.get_stats()
     })
 
 
@@ -137,6 +194,7 @@ async def run_http_server(port: int = 8889):
 
     # Setup routes
     http_app.router.add_post('/mcp/tool', http_tool_handler)
+    http_app.router.add_post('/mcp/upload', http_upload_handler)
     http_app.router.add_get('/health', http_health)
     http_app.router.add_get('/', http_redirect)
 
@@ -207,6 +265,8 @@ async def main():
                 )
     finally:
         cleanup_task_handle.cancel()
+        await task_queue.shutdown()
+        await token_validator.close()
         logger.info("Excel MCP Server stopped")
 
 
@@ -5,6 +5,8 @@ import openpyxl
 from openpyxl.styles import PatternFill
 from typing import Optional, Dict, Any, Union
 from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlparse
 import uuid
 import logging
 
@@ -33,11 +35,31 @@ class ExcelLoader:
         """
         logger.info(f"Loading Excel from URL: {url}")
 
-        # Download file
-        file_data = http_client.download_file(url)
+        # Stream to a temporary file, then parse it in place
+        path = http_client.download_to_file(url)
+        try:
+            return ExcelLoader.load_from_file(path, Path(urlparse(url).path).name or "downloaded.xlsx")
+        finally:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def load_from_file(path: Union[str, Path], filename: Optional[str] = None) -> ExcelDataFrame:
+        """
+        Load Excel file directly from disk (no in-memory copy of the file).
+
+        Args:
+            path: Path to the Excel file
+            filename: Original filename (default: basename of path)
 
-        # Load from BytesIO
-        return ExcelLoader.load_from_bytes(file_data)
+        Returns:
+            ExcelDataFrame with all data and metadata
+
+        Raises:
+            Exception: If loading fails
+        """
+        path = Path(path)
+        logger.info(f"Loading Excel from file: {path}")
+        return ExcelLoader._load(str(path), filename or path.name)
 
     @staticmethod
     def load_from_bytes(file_data: Union[BytesIO, bytes], filename: str = "uploaded.xlsx") -> ExcelDataFrame:
@@ -60,18 +82,34 @@ class ExcelLoader:
         if isinstance(file_data, bytes):
             file_data = BytesIO(file_data)
 
+        return ExcelLoader._load(file_data, filename)
+
+    @staticmethod
+    def _load(source: Union[str, BytesIO], filename: str) -> ExcelDataFrame:
+        """
+        Load workbook data, colors and comments from a path or BytesIO.
+
+        Args:
+            source: File path or BytesIO
+            filename: Original filename
+
+        Returns:
+            ExcelDataFrame with all data and metadata
+        """
         excel_df = ExcelDataFrame()
         excel_df.filename = filename
         excel_df.excel_id = str(uuid.uuid4())
 
         try:
             # Load workbook for metadata extraction
-            file_data.seek(0)
-            wb = openpyxl.load_workbook(file_data, data_only=False)
+            if isinstance(source, BytesIO):
+                source.seek(0)
+            wb = openpyxl.load_workbook(source, data_only=False)
 
             # Load all sheets with pandas
-            file_data.seek(0)
-            excel_data = pd.read_excel(file_data, sheet_name=None)
+            if isinstance(source, BytesIO):
+                source.seek(0)
+            excel_data = pd.read_excel(source, sheet_name=None)
 
             for sheet_name, df in excel_data.items():
                 # Add DataFrame
@@ -1,10 +1,22 @@
-"""Simple async task queue for processing Excel analysis tasks."""
+"""Async task queue for processing Excel analysis tasks.
 
+Jobs are dispatched to a pool of async workers with per-session round-robin
+fairness (one session's large workbook cannot starve other callers, and a
+session's own jobs still run in submission order). CPU-bound openpyxl/pandas
+work runs in a process pool so throughput scales with cores.
+"""
+
+import os
+import time
 import asyncio
 import logging
-from typing import Dict, Any, Optional, Callable
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Callable, Deque, List
 from io import BytesIO
 from pathlib import Path
+from urllib.parse import urlparse
 
 from models.session_data import SessionData, SessionStatus
 from utils.session_manager import session_manager
@@ -12,22 +24,216 @@ from services.excel_loader import excel_loader
 from services.excel_analyzer import excel_analyzer
 from services.task_splitter_service import task_splitter_service
 from services.task_exporter import task_exporter
+from utils.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
 
+class TaskQueueFullError(Exception):
+    """Raised when the backlog limit is reached."""
+
+
+# ----------------------------------------------------------------------
+# CPU-bound job bodies (module level so they can run in worker processes)
+# ----------------------------------------------------------------------
+
+def _load_and_analyze(file_path: Optional[str], file_bytes: Optional[bytes],
+                      filename: str, options: Dict[str, Any]):
+    """Load a workbook and analyze it; returns (ExcelDataFrame, analysis dict)."""
+    if file_path:
+        excel_df = excel_loader.load_from_file(file_path, filename)
+    elif file_bytes is not None:
+        excel_df = excel_loader.load_from_bytes(BytesIO(file_bytes), filename)
+    else:
+        raise ValueError("Either file_url or file_data must be provided")
+
+    analysis_result = excel_analyzer.analyze(excel_df, options)
+    return excel_df, analysis_result.to_dict()
+
+
+def _split_excel(excel_df, source_lang, target_langs, extract_context, context_options):
+    """Split a workbook into translation tasks."""
+    return task_splitter_service.split_excel(
+        excel_df=excel_df,
+        source_lang=source_lang,
+        target_langs=target_langs,
+        extract_context=extract_context,
+        context_options=context_options
+    )
+
+
 class TaskQueue:
-    """Simple async task queue for Excel analysis."""
+    """Fair multi-worker task queue for Excel analysis, splitting and export."""
+
+    WAIT_SAMPLES = 500
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        max_backlog: Optional[int] = None
+    ):
+        """
+        Initialize task queue.
+
+        Args:
+            max_workers: Concurrent jobs (default: EXCEL_MCP_WORKERS or CPU count, max 8)
+            process_workers: Worker processes for CPU-bound work; 0 runs it in
+                threads (default: EXCEL_MCP_PROCESS_WORKERS or max_workers)
+            max_backlog: Maximum queued jobs before submissions are rejected
+                (default: EXCEL_MCP_MAX_BACKLOG or 100)
+        """
+        cpu_count = os.cpu_count() or 1
+        self.max_workers = max_workers or int(os.getenv('EXCEL_MCP_WORKERS', min(cpu_count, 8)))
+        self.process_workers = process_workers if process_workers is not None else int(
+            os.getenv('EXCEL_MCP_PROCESS_WORKERS', self.max_workers)
+        )
+        self.max_backlog = max_backlog or int(os.getenv('EXCEL_MCP_MAX_BACKLOG', 100))
+
+        # session_id -> pending jobs; dict order is the round-robin rotation
+        self._pending: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._backlog = 0
+        self._running_sessions = set()
+        self._work_available: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self._wait_times: Deque[float] = deque(maxlen=self.WAIT_SAMPLES)
+        self.stats = {
+            'submitted': 0,
+            'processed': 0,
+            'errors': 0,
+            'rejected': 0,
+            'peak_backlog': 0,
+            'process_fallbacks': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _ensure_workers(self):
+        if self._work_available is None:
+            self._work_available = asyncio.Event()
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.max_workers:
+            self._workers.append(asyncio.create_task(self._worker(len(self._workers))))
+
+    async def _enqueue(self, task: Dict[str, Any]) -> None:
+        if self._backlog >= self.max_backlog:
+            self.stats['rejected'] += 1
+            raise TaskQueueFullError(
+                f"Task queue is full ({self._backlog} jobs waiting), retry later"
+            )
+
+        task['enqueued_at'] = time.monotonic()
+        self._pending.setdefault(task['session_id'], deque()).append(task)
+        self._backlog += 1
+        self.stats['submitted'] += 1
+        self.stats['peak_backlog'] = max(self.stats['peak_backlog'], self._backlog)
+
+        self._ensure_workers()
+        self._work_available.set()
+
+    def _next_task(self) -> Optional[Dict[str, Any]]:
+        """Take the head job of the next session in rotation that is not already running."""
+        for session_id in list(self._pending):
+            if session_id in self._running_sessions:
+                continue
+            jobs = self._pending.pop(session_id)
+            task = jobs.popleft()
+            if jobs:
+                # Re-append so the session goes to the back of the rotation
+                self._pending[session_id] = jobs
+            self._backlog -= 1
+            return task
+        return None
+
+    async def _worker(self, worker_id: int):
+        """Run jobs until cancelled."""
+        while True:
+            task = self._next_task()
+            if task is None:
+                self._work_available.clear()
+                await self._work_available.wait()
+                continue
+
+            session_id = task['session_id']
+            self._running_sessions.add(session_id)
+            self._wait_times.append(time.monotonic() - task['enqueued_at'])
+            try:
+                await self._process_task(task)
+                self.stats['processed'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Worker {worker_id} failed on {session_id}: {e}", exc_info=True)
+            finally:
+                self._running_sessions.discard(session_id)
+                # The session's next job (if any) may now be runnable
+                self._work_available.set()
+
+    async def _run_cpu_bound(self, fn: Callable, *args):
+        """Run CPU-bound work in the process pool (threads if disabled or broken)."""
+        if self.process_workers > 0:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.process_workers)
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            except BrokenProcessPool as e:
+                logger.warning(f"Process pool broken ({e}), recreating and running in thread")
+                self._executor = None
+                self.stats['process_fallbacks'] += 1
+        return await asyncio.to_thread(fn, *args)
+
+    async def shutdown(self):
+        """Stop workers and the process pool."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue metrics.
+
+        Returns:
+            Queue depth, running jobs, wait-time percentiles (seconds) and counters
+        """
+        waits = sorted(self._wait_times)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))], 3)
+
+        return {
+            **self.stats,
+            'queue_depth': self._backlog,
+            'queued_sessions': len(self._pending),
+            'running': len(self._running_sessions),
+            'max_workers': self.max_workers,
+            'process_workers': self.process_workers,
+            'max_backlog': self.max_backlog,
+            'wait_time_avg': round(sum(waits) / len(waits), 3) if waits else 0.0,
+            'wait_time_p50': percentile(0.5),
+            'wait_time_p95': percentile(0.95),
+            'wait_time_max': round(waits[-1], 3) if waits else 0.0
+        }
 
-    def __init__(self):
-        self._queue = asyncio.Queue()
-        self._processing = False
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
 
     async def submit_analysis_task(
         self,
         session_id: str,
         file_data: Optional[BytesIO] = None,
         file_url: Optional[str] = None,
+        file_path: Optional[str] = None,
         filename: str = "uploaded.xlsx",
         options: Dict[str, Any] = None
     ) -> None:
@@ -38,39 +244,24 @@ class TaskQueue:
             session_id: Session ID for tracking
             file_data: File data as BytesIO (if uploading)
             file_url: URL to download file from (if using URL)
+            file_path: Path of an uploaded file; deleted after analysis
             filename: Original filename
             options: Analysis options
+
+        Raises:
+            TaskQueueFullError: If the backlog limit is reached
         """
         task = {
             'session_id': session_id,
             'file_data': file_data,
             'file_url': file_url,
+            'file_path': file_path,
             'filename': filename,
             'options': options or {}
         }
 
-        await self._queue.put(task)
-        logger.info(f"Task submitted to queue: {session_id}")
-
-        # Start processing if not already running
-        if not self._processing:
-            asyncio.create_task(self._process_queue())
-
-    async def _process_queue(self):
-        """Process tasks from the queue."""
-        self._processing = True
-
-        try:
-            while not self._queue.empty():
-                task = await self._queue.get()
-                await self._process_task(task)
-                self._queue.task_done()
-
-        except Exception as e:
-            logger.error(f"Error processing queue: {e}")
-
-        finally:
-            self._processing = False
+        await self._enqueue(task)
+        logger.info(f"Task submitted to queue: {session_id} (depth={self._backlog})")
 
     async def _process_task(self, task: Dict[str, Any]):
         """
@@ -97,9 +288,12 @@ class TaskQueue:
         """
         session_id = task['session_id']
         session = session_manager.get_session(session_id)
+        local_path = Path(task['file_path']) if task.get('file_path') else None
 
         if not session:
             logger.error(f"Session not found: {session_id}")
+            if local_path:
+                local_path.unlink(missing_ok=True)
             return
 
         try:
@@ -108,24 +302,34 @@ class TaskQueue:
             session.progress = 10
             logger.info(f"Processing analysis task: {session_id}")
 
-            # Load Excel file
+            # Stream URL downloads to disk (progress 10 -> 40) so neither the
+            # event loop nor the worker process holds the whole file in memory
+            file_data = task['file_data']
+            file_bytes = file_data.getvalue() if isinstance(file_data, BytesIO) else file_data
             if task['file_url']:
-                logger.info(f"Loading Excel from URL: {task['file_url']}")
-                excel_df = await asyncio.to_thread(
-                    excel_loader.load_from_url,
-                    task['file_url']
-                )
-            elif task['file_data']:
-                logger.info(f"Loading Excel from bytes: {task['filename']}")
-                excel_df = await asyncio.to_thread(
-                    excel_loader.load_from_bytes,
-                    task['file_data'],
-                    task['filename']
+                def on_progress(downloaded: int, total: Optional[int]):
+                    if total:
+                        session.progress = 10 + int(30 * min(downloaded, total) / total)
+
+                local_path = await http_client.download_to_file_async(
+                    task['file_url'], progress_callback=on_progress
                 )
+                session.progress = 40
+                filename = Path(urlparse(task['file_url']).path).name or task['filename']
             else:
-                raise ValueError("Either file_url or file_data must be provided")
+                filename = task['filename']
+
+            # Load and analyze Excel file in one worker-process round trip
+            logger.info(f"Loading and analyzing Excel: {task['file_url'] or task['filename']}")
+            excel_df, analysis = await self._run_cpu_bound(
+                _load_and_analyze,
+                str(local_path) if local_path else None,
+                file_bytes,
+                filename,
+                task['options']
+            )
 
-            session.progress = 40
+            session.progress = 90
             session.excel_df = excel_df
             session.file_info = {
                 'filename': excel_df.filename,
@@ -133,17 +337,7 @@ class TaskQueue:
                 'sheets': excel_df.get_sheet_names(),
                 'sheet_count': len(excel_df.sheets)
             }
-
-            # Perform analysis
-            logger.info(f"Analyzing Excel: {session_id}")
-            analysis_result = await asyncio.to_thread(
-                excel_analyzer.analyze,
-                excel_df,
-                task['options']
-            )
-
-            session.progress = 90
-            session.analysis = analysis_result.to_dict()
+            session.analysis = analysis
 
             # Mark analysis as completed
             session.has_analysis = True
@@ -158,6 +352,9 @@ class TaskQueue:
                 'code': 'ANALYSIS_FAILED',
                 'message': str(e)
             }
+        finally:
+            if local_path:
+                local_path.unlink(missing_ok=True)
 
     async def _process_split_task(self, task: Dict[str, Any]):
         """
@@ -182,13 +379,13 @@ class TaskQueue:
 
             # Perform task splitting directly with ExcelDataFrame
             logger.info(f"Calling task_splitter_service.split_excel...")
-            split_result = await asyncio.to_thread(
-                task_splitter_service.split_excel,
-                excel_df=session.excel_df,
-                source_lang=task['source_lang'],
-                target_langs=task['target_langs'],
-                extract_context=task['extract_context'],
-                context_options=task['context_options']
+            split_result = await self._run_cpu_bound(
+                _split_excel,
+                session.excel_df,
+                task['source_lang'],
+                task['target_langs'],
+                task['extract_context'],
+                task['context_options']
             )
             logger.info(f"Task splitting completed, result keys: {split_result.keys()}")
 
@@ -280,6 +477,9 @@ class TaskQueue:
             target_langs: Target languages list
             extract_context: Whether to extract context
             context_options: Context extraction options
+
+        Raises:
+            TaskQueueFullError: If the backlog limit is reached
         """
         task = {
             'type': 'split',
@@ -290,13 +490,9 @@ class TaskQueue:
             'context_options': context_options or {}
         }
 
-        await self._queue.put(task)
+        await self._enqueue(task)
         logger.info(f"Task split submitted to queue: {session_id}")
 
-        # Start processing if not already running
-        if not self._processing:
-            asyncio.create_task(self._process_queue())
-
     async def submit_export_task(
         self,
         session_id: str,
@@ -310,6 +506,9 @@ class TaskQueue:
             session_id: Session ID
             export_format: Export format (excel/json/csv)
             include_context: Include context in export
+
+        Raises:
+            TaskQueueFullError: If the backlog limit is reached
         """
         task = {
             'type': 'export',
@@ -318,13 +517,9 @@ class TaskQueue:
             'include_context': include_context
         }
 
-        await self._queue.put(task)
+        await self._enqueue(task)
         logger.info(f"Export task submitted to queue: {session_id}")
 
-        # Start processing if not already running
-        if not self._processing:
-            asyncio.create_task(self._process_queue())
-
 
 # Global task queue instance
 task_queue = TaskQueue()
@@ -1,30 +1,78 @@
 """HTTP client for downloading files from URLs."""
 
+import os
+import tempfile
 import requests
+import aiohttp
 import logging
-from typing import Optional, Dict, Any
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+from urllib.parse import urlparse
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
+# Maximum accepted download size (EXCEL_MCP_MAX_DOWNLOAD_MB, default 100MB)
+DEFAULT_MAX_DOWNLOAD_BYTES = int(os.getenv('EXCEL_MCP_MAX_DOWNLOAD_MB', 100)) * 1024 * 1024
+
+# progress_callback(downloaded_bytes, total_bytes_or_None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class DownloadTooLargeError(Exception):
+    """Raised when a download exceeds the configured size cap."""
+
 
 class HTTPClient:
     """HTTP client for downloading files."""
 
-    def __init__(self, timeout: int = 60):
+    def __init__(
+        self,
+        timeout: int = 60,
+        max_bytes: int = DEFAULT_MAX_DOWNLOAD_BYTES,
+        chunk_size: int = 1024 * 1024,
+        spool_dir: Optional[str] = None
+    ):
         """
         Initialize HTTP client.
 
         Args:
             timeout: Request timeout in seconds (default: 60)
+            max_bytes: Maximum download size in bytes
+            chunk_size: Streaming chunk size in bytes
+            spool_dir: Directory for downloaded files (default: system temp dir)
         """
         self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.spool_dir = spool_dir or os.getenv('EXCEL_MCP_SPOOL_DIR') or None
         self.session = requests.Session()
 
+    def _check_size(self, size: Optional[int], max_bytes: int, url: str):
+        if size is not None and size > max_bytes:
+            raise DownloadTooLargeError(
+                f"File at {url} exceeds size limit ({size} > {max_bytes} bytes)"
+            )
+
+    def _open_spool_file(self, url: str):
+        suffix = Path(urlparse(url).path).suffix or '.xlsx'
+        if self.spool_dir:
+            Path(self.spool_dir).mkdir(parents=True, exist_ok=True)
+        return tempfile.NamedTemporaryFile(
+            prefix='excel_dl_', suffix=suffix, dir=self.spool_dir, delete=False
+        )
+
+    @staticmethod
+    def _content_length(headers) -> Optional[int]:
+        value = headers.get('Content-Length')
+        return int(value) if value and value.isdigit() else None
+
     def download_file(self, url: str, headers: Optional[Dict[str, str]] = None) -> BytesIO:
         """
         Download file from URL and return as BytesIO.
 
+        Prefer download_to_file/download_to_file_async for large files.
+
         Args:
             url: URL to download from
             headers: Optional HTTP headers
@@ -35,27 +83,129 @@ class HTTPClient:
         Raises:
             Exception: If download fails
         """
+        path = self.download_to_file(url, headers=headers)
+        try:
+            return BytesIO(path.read_bytes())
+        finally:
+            path.unlink(missing_ok=True)
+
+    def download_to_file(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Path:
+        """
+        Stream a file from URL to a temporary file (blocking).
+
+        Args:
+            url: URL to download from
+            headers: Optional HTTP headers
+            max_bytes: Size cap (default: client max_bytes)
+            progress_callback: Called with (downloaded, total) after each chunk
+
+        Returns:
+            Path of the downloaded file (caller deletes it)
+
+        Raises:
+            DownloadTooLargeError: If the file exceeds the size cap
+            Exception: If download fails
+        """
+        max_bytes = max_bytes or self.max_bytes
+        path = None
         try:
             logger.info(f"Downloading file from URL: {url}")
 
-            response = self.session.get(
-                url,
-                headers=headers,
-                timeout=self.timeout,
-                stream=True
-            )
-            response.raise_for_status()
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                total = self._content_length(response.headers)
+                self._check_size(total, max_bytes, url)
 
-            # Read content into BytesIO
-            file_data = BytesIO(response.content)
-            file_data.seek(0)
+                downloaded = 0
+                with self._open_spool_file(url) as spool:
+                    path = Path(spool.name)
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        downloaded += len(chunk)
+                        self._check_size(downloaded, max_bytes, url)
+                        spool.write(chunk)
+                        if progress_callback:
+                            progress_callback(downloaded, total)
 
-            logger.info(f"Successfully downloaded file ({len(response.content)} bytes)")
-            return file_data
+            logger.info(f"Successfully downloaded file ({downloaded} bytes) to {path}")
+            return path
 
         except requests.exceptions.RequestException as e:
+            if path:
+                path.unlink(missing_ok=True)
+            logger.error(f"Failed to download file from {url}: {e}")
+            raise Exception(f"Download failed: {str(e)}")
+        except Exception:
+            if path:
+                path.unlink(missing_ok=True)
+            raise
+
+    async def download_to_file_async(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> Path:
+        """
+        Stream a file from URL to a temporary file without blocking the event loop.
+
+        The size cap is enforced from Content-Length before reading the body and
+        again on the running byte count, so oversized files are rejected early
+        and peak memory stays at one chunk.
+
+        Args:
+            url: URL to download from
+            headers: Optional HTTP headers
+            max_bytes: Size cap (default: client max_bytes)
+            progress_callback: Called with (downloaded, total) after each chunk
+
+        Returns:
+            Path of the downloaded file (caller deletes it)
+
+        Raises:
+            DownloadTooLargeError: If the file exceeds the size cap
+            Exception: If download fails
+        """
+        max_bytes = max_bytes or self.max_bytes
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        path = None
+        try:
+            logger.info(f"Downloading file from URL: {url}")
+
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    total = response.content_length
+                    self._check_size(total, max_bytes, url)
+
+                    downloaded = 0
+                    with self._open_spool_file(url) as spool:
+                        path = Path(spool.name)
+                        async for chunk in response.content.iter_chunked(self.chunk_size):
+                            downloaded += len(chunk)
+                            self._check_size(downloaded, max_bytes, url)
+                            spool.write(chunk)
+                            if progress_callback:
+                                progress_callback(downloaded, total)
+
+            logger.info(f"Successfully downloaded file ({downloaded} bytes) to {path}")
+            return path
+
+        except aiohttp.ClientError as e:
+            if path:
+                path.unlink(missing_ok=True)
             logger.error(f"Failed to download file from {url}: {e}")
             raise Exception(f"Download failed: {str(e)}")
+        except BaseException:
+            if path:
+                path.unlink(missing_ok=True)
+            raise
 
     def validate_url(self, url: str) -> Dict[str, Any]:
         """
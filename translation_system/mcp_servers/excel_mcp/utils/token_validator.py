@@ -1,28 +1,211 @@
-"""JWT token validator for excel_mcp (calls backend_service)."""
+"""JWT token validator for excel_mcp (local HS256 verification, backend_service fallback)."""
 
+import os
+import json
+import time
+import asyncio
 import logging
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import jwt
+import aiohttp
 import requests
-from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# backend_service keeps the signing key and fixed tokens here
+DEFAULT_TOKENS_FILE = Path(__file__).parent.parent.parent / "backend_service" / "tokens.json"
+
 
 class TokenValidator:
-    """Token validator that calls unified backend_service API."""
+    """
+    Token validator.
+
+    Modes:
+        local:  verify HS256 signature and exp in-process (no network)
+        remote: ask backend_service /auth/validate
+        auto:   verify locally, fall back to backend_service when the key is
+                unavailable or the signature does not match (e.g. key rotated)
+
+    Valid payloads are cached until their ``exp`` claim; concurrent remote
+    validations of the same token share one request.
+    """
 
-    def __init__(self, backend_url: str = "http://localhost:9000"):
+    def __init__(
+        self,
+        backend_url: str = "http://localhost:9000",
+        mode: str = "auto",
+        secret_key: Optional[str] = None,
+        tokens_file: Optional[str] = None,
+        fixed_token_ttl: int = 300,
+        max_cache_size: int = 10000
+    ):
         """
         Initialize token validator.
 
         Args:
             backend_url: Backend service URL
+            mode: Validation mode ('local', 'remote' or 'auto')
+            secret_key: HS256 signing key (default: read from tokens_file)
+            tokens_file: backend_service token configuration (secret_key, fixed_tokens)
+            fixed_token_ttl: Cache lifetime for payloads without an exp claim (seconds)
+            max_cache_size: Maximum cached tokens
         """
         self.backend_url = backend_url
         self.validate_endpoint = f"{backend_url}/auth/validate"
+        self.mode = mode
+        self.fixed_token_ttl = fixed_token_ttl
+        self.max_cache_size = max_cache_size
 
-    def validate(self, token: str) -> Dict[str, Any]:
+        self.secret_key, self.fixed_tokens = self._load_key_material(secret_key, tokens_file)
+
+        # token -> (payload, expires_at)
+        self._cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        # token -> in-flight remote validation
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._http_session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            'cache_hits': 0,
+            'local_validations': 0,
+            'remote_validations': 0,
+            'coalesced': 0,
+            'failures': 0
+        }
+
+    def _load_key_material(
+        self,
+        secret_key: Optional[str],
+        tokens_file: Optional[str]
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Load the signing key and fixed tokens shared with backend_service."""
+        path = Path(tokens_file) if tokens_file else DEFAULT_TOKENS_FILE
+        config = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load token config {path}: {e}")
+        elif self.mode != "remote":
+            logger.warning(f"Token config not found: {path}")
+
+        return secret_key or config.get('secret_key'), config.get('fixed_tokens', {})
+
+    @staticmethod
+    def _strip_bearer(token: str) -> str:
+        return token[7:] if token.startswith('Bearer ') else token
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, token: str) -> Optional[Dict[str, Any]]:
+        entry = self._cache.get(token)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if time.time() >= expires_at:
+            del self._cache[token]
+            return None
+        self.stats['cache_hits'] += 1
+        return payload
+
+    def _cache_put(self, token: str, payload: Dict[str, Any]):
+        exp = payload.get('exp')
+        expires_at = float(exp) if exp else time.time() + self.fixed_token_ttl
+        if len(self._cache) >= self.max_cache_size:
+            now = time.time()
+            for key in [k for k, (_, e) in self._cache.items() if e <= now]:
+                del self._cache[key]
+            if len(self._cache) >= self.max_cache_size:
+                del self._cache[next(iter(self._cache))]
+        self._cache[token] = (payload, expires_at)
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def _validate_local(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a token in-process.
+
+        Returns:
+            Payload, or None if it cannot be decided locally (auto mode falls back)
+
+        Raises:
+            Exception: If the token is definitely invalid (expired, malformed)
         """
-        Validate JWT token by calling backend_service API.
+        if token in self.fixed_tokens:
+            self.stats['local_validations'] += 1
+            return dict(self.fixed_tokens[token])
+
+        if not self.secret_key:
+            if self.mode == "local":
+                raise Exception("No signing key configured for local validation")
+            return None
+
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
+        except jwt.ExpiredSignatureError:
+            raise Exception("Token has expired")
+        except jwt.InvalidSignatureError:
+            if self.mode == "local":
+                raise Exception("Invalid token: signature verification failed")
+            return None
+        except jwt.InvalidTokenError as e:
+            raise Exception(f"Invalid token: {str(e)}")
+
+        self.stats['local_validations'] += 1
+        return payload
+
+    @staticmethod
+    def _parse_remote_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        if not result.get('valid'):
+            raise Exception(result.get('error', 'Unknown error'))
+        payload = result.get('payload')
+        if not payload:
+            raise Exception("No payload returned from backend service")
+        return payload
+
+    async def _validate_remote(self, token: str) -> Dict[str, Any]:
+        """Ask backend_service; concurrent calls for one token share a request."""
+        inflight = self._inflight.get(token)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[token] = future
+        try:
+            if self._http_session is None or self._http_session.closed:
+                self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+            try:
+                async with self._http_session.post(self.validate_endpoint, json={"token": token}) as response:
+                    if response.status != 200:
+                        raise Exception(f"Backend service error: {response.status}")
+                    result = await response.json()
+            except aiohttp.ClientError as e:
+                raise Exception(f"Token validation service unavailable: {str(e)}")
+
+            self.stats['remote_validations'] += 1
+            payload = self._parse_remote_result(result)
+            future.set_result(payload)
+            return payload
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited shared future does not warn
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._inflight[token]
+
+    async def validate_async(self, token: str) -> Dict[str, Any]:
+        """
+        Validate JWT token without blocking the event loop.
 
         Args:
             token: JWT token string (with or without 'Bearer ' prefix)
@@ -33,38 +216,79 @@ class TokenValidator:
         Raises:
             Exception: If token is invalid or expired
         """
+        token = self._strip_bearer(token)
+
+        payload = self._cache_get(token)
+        if payload is not None:
+            return payload
+
         try:
-            # Call backend_service validation API
-            response = requests.post(
-                self.validate_endpoint,
-                json={"token": token},
-                timeout=5
-            )
+            payload = None
+            if self.mode != "remote":
+                payload = self._validate_local(token)
+            if payload is None:
+                payload = await self._validate_remote(token)
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.error(f"Token validation failed: {e}")
+            raise Exception(f"Token validation failed: {str(e)}")
 
-            if response.status_code != 200:
-                raise Exception(f"Backend service error: {response.status_code}")
+        self._cache_put(token, payload)
+        logger.debug(f"Token validated for user: {payload.get('user_id', 'unknown')}")
+        return payload
 
-            result = response.json()
+    def validate(self, token: str) -> Dict[str, Any]:
+        """
+        Validate JWT token (blocking; prefer validate_async inside the event loop).
 
-            if not result.get('valid'):
-                error_msg = result.get('error', 'Unknown error')
-                logger.error(f"Token validation failed: {error_msg}")
-                raise Exception(error_msg)
+        Args:
+            token: JWT token string (with or without 'Bearer ' prefix)
 
-            payload = result.get('payload')
-            if not payload:
-                raise Exception("No payload returned from backend service")
+        Returns:
+            Token payload dictionary
 
-            logger.info(f"Token validated successfully for user: {payload.get('user_id', 'unknown')}")
+        Raises:
+            Exception: If token is invalid or expired
+        """
+        token = self._strip_bearer(token)
+
+        payload = self._cache_get(token)
+        if payload is not None:
             return payload
 
+        try:
+            payload = None
+            if self.mode != "remote":
+                payload = self._validate_local(token)
+            if payload is None:
+                response = requests.post(self.validate_endpoint, json={"token": token}, timeout=5)
+                if response.status_code != 200:
+                    raise Exception(f"Backend service error: {response.status_code}")
+                self.stats['remote_validations'] += 1
+                payload = self._parse_remote_result(response.json())
+
         except requests.RequestException as e:
+            self.stats['failures'] += 1
             logger.error(f"Failed to connect to backend_service: {e}")
             raise Exception(f"Token validation service unavailable: {str(e)}")
         except Exception as e:
+            self.stats['failures'] += 1
             logger.error(f"Token validation failed: {e}")
             raise Exception(f"Token validation failed: {str(e)}")
 
+        self._cache_put(token, payload)
+        return payload
+
+    async def close(self):
+        """Close the remote validation HTTP session."""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get validation statistics."""
+        return {**self.stats, 'mode': self.mode, 'cached_tokens': len(self._cache)}
+
     def check_permission(self, payload: Dict[str, Any], permission: str) -> bool:
         """
         Check if token has specific permission.
@@ -99,4 +323,9 @@ class TokenValidator:
 
 
 # Global token validator instance
-token_validator = TokenValidator()
+token_validator = TokenValidator(
+    backend_url=os.getenv('BACKEND_SERVICE_URL', 'http://localhost:9000'),
+    mode=os.getenv('TOKEN_VALIDATION_MODE', 'auto'),
+    secret_key=os.getenv('JWT_SECRET_KEY'),
+    tokens_file=os.getenv('TOKENS_CONFIG_FILE')
+)
@@ -0,0 +1,145 @@
+"""Upload store for excel_mcp - streams uploaded workbooks to disk and hands out upload IDs."""
+
+import os
+import time
+import uuid
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Maximum accepted upload size (EXCEL_MCP_MAX_UPLOAD_MB, default 200MB)
+DEFAULT_MAX_UPLOAD_BYTES = int(os.getenv('EXCEL_MCP_MAX_UPLOAD_MB', 200)) * 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size cap."""
+
+
+class UploadStore:
+    """
+    Stores uploaded files until an excel_analyze call claims them.
+
+    Uploads are written chunk by chunk to the spool directory, so the server
+    never holds a whole workbook (or a base64 copy of it) in memory. Each
+    upload is bound to the user that uploaded it and can be claimed once.
+    """
+
+    def __init__(
+        self,
+        spool_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_UPLOAD_BYTES,
+        ttl_seconds: int = 3600
+    ):
+        """
+        Initialize upload store.
+
+        Args:
+            spool_dir: Directory for uploaded files (default: system temp dir)
+            max_bytes: Maximum upload size in bytes
+            ttl_seconds: Unclaimed uploads are deleted after this many seconds
+        """
+        self.spool_dir = spool_dir or os.getenv('EXCEL_MCP_SPOOL_DIR') or None
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._uploads: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'uploads': 0, 'bytes': 0, 'claimed': 0, 'expired': 0, 'rejected': 0}
+
+    async def save(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream an upload to disk.
+
+        Args:
+            chunks: Async iterator of body chunks.
+            filename: Original filename.
+            user_id: Owner of the upload (from the token payload).
+
+        Returns:
+            Upload info (upload_id, filename, size).
+
+        Raises:
+            UploadTooLargeError: If the upload exceeds the size cap.
+        """
+        suffix = Path(filename).suffix or '.xlsx'
+        if self.spool_dir:
+            Path(self.spool_dir).mkdir(parents=True, exist_ok=True)
+
+        size = 0
+        with tempfile.NamedTemporaryFile(
+            prefix='excel_up_', suffix=suffix, dir=self.spool_dir, delete=False
+        ) as spool:
+            path = Path(spool.name)
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        self.stats['rejected'] += 1
+                        raise UploadTooLargeError(
+                            f"Upload exceeds size limit ({self.max_bytes} bytes)"
+                        )
+                    spool.write(chunk)
+            except BaseException:
+                spool.close()
+                path.unlink(missing_ok=True)
+                raise
+
+        upload_id = f"upload_{uuid.uuid4().hex[:16]}"
+        self._uploads[upload_id] = {
+            'path': path,
+            'filename': filename,
+            'size': size,
+            'user_id': user_id,
+            'created_at': time.time()
+        }
+        self.stats['uploads'] += 1
+        self.stats['bytes'] += size
+        logger.info(f"Stored upload {upload_id}: {filename} ({size} bytes)")
+
+        return {'upload_id': upload_id, 'filename': filename, 'size': size}
+
+    def claim(self, upload_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Take ownership of an upload; the caller deletes the file when done.
+
+        Args:
+            upload_id: Upload ID returned by save().
+            user_id: Claiming user; must match the uploader.
+
+        Returns:
+            Upload info with 'path', or None if unknown, expired or owned by another user.
+        """
+        upload = self._uploads.get(upload_id)
+        if upload is None or upload['user_id'] != user_id:
+            return None
+        del self._uploads[upload_id]
+        self.stats['claimed'] += 1
+        return upload
+
+    def cleanup_expired(self):
+        """Delete uploads that were never claimed."""
+        cutoff = time.time() - self.ttl_seconds
+        expired = [uid for uid, u in self._uploads.items() if u['created_at'] < cutoff]
+        for upload_id in expired:
+            self._uploads.pop(upload_id)['path'].unlink(missing_ok=True)
+        if expired:
+            self.stats['expired'] += len(expired)
+            logger.info(f"Cleaned up {len(expired)} expired uploads")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get upload statistics."""
+        return {
+            **self.stats,
+            'pending': len(self._uploads),
+            'pending_bytes': sum(u['size'] for u in self._uploads.values())
+        }
+
+
+# Global upload store instance
+upload_store = UploadStore()
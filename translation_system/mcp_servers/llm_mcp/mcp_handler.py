@@ -12,6 +12,7 @@ from datetime import datetime
 from utils.session_manager import session_manager
 from utils.token_validator import token_validator
 from utils.http_client import download_file
+from utils.http_pool import http_pool
 from services.task_loader import task_loader
 from services.translation_executor import translation_executor
 from services.result_exporter import result_exporter
@@ -125,6 +126,8 @@ class MCPHandler:
             'max_workers': arguments.get('max_workers', 5),
             'temperature': arguments.get('temperature', 0.3)
         }
+        if 'pipeline' in arguments:
+            session.config['pipeline'] = bool(arguments['pipeline'])
 
         # Calculate statistics
         stats = {
@@ -192,7 +195,8 @@ class MCPHandler:
             'elapsed_time': stats.get('elapsed_time', 0),
             'estimated_remaining': stats.get('estimated_remaining', 0),
             'current_cost': stats.get('current_cost', 0),
-            'tokens_used': stats.get('tokens_used', 0)
+            'tokens_used': stats.get('tokens_used', 0),
+            'http_pool': http_pool.get_stats()
         }
 
     async def _handle_pause_resume(self, arguments: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -48,6 +48,10 @@ def get_llm_tools() -> List[Dict[str, Any]]:
                         "maximum": 2,
                         "default": 0.3,
                         "description": "Model temperature"
+                    },
+                    "pipeline": {
+                        "type": "boolean",
+                        "description": "Pipelined execution across batches (default from config: true)"
                     }
                 },
                 "required": ["token", "provider"],
@@ -24,6 +24,7 @@ from mcp.server.stdio import stdio_server
 from mcp_tools import get_llm_tools
 from mcp_handler import MCPHandler
 from utils.session_manager import session_manager
+from utils.http_pool import http_pool
 
 # Setup logging
 logging.basicConfig(
@@ -70,11 +71,14 @@ async def run_stdio_server():
         # Start background cleanup task
         asyncio.create_task(session_cleanup_task())
 
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+        try:
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+        finally:
+            await http_pool.close()
 
 
 async def session_cleanup_task():
@@ -134,7 +138,8 @@ async def http_health(request: web.Request) -> web.Response:
         'version': '1.0.0',
         'sessions': session_manager.get_session_count(),
         'providers': enabled_providers,
-        'default_provider': config_loader.get_default_provider()
+        'default_provider': config_loader.get_default_provider(),
+        'http_pool': http_pool.get_stats()
     })
 
 
@@ -223,6 +228,12 @@ async def run_http_server(port: int = 8023):
     for route in list(http_app.router.routes()):
         cors.add(route)
 
+    # Close the shared provider connection pool on shutdown
+    async def close_http_pool(app):
+        await http_pool.close()
+
+    http_app.on_cleanup.append(close_http_pool)
+
     # Start background cleanup task
     asyncio.create_task(session_cleanup_task())
 
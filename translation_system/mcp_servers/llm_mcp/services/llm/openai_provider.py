@@ -9,6 +9,7 @@ from typing import Dict, Any, Optional
 import asyncio
 
 from services.llm.base_provider import BaseLLMProvider
+from utils.http_pool import http_pool
 from models.session_data import TranslationResult
 
 logger = logging.getLogger(__name__)
@@ -50,10 +51,9 @@ class OpenAIProvider(BaseLLMProvider):
         self.max_tokens = max_tokens
         self.timeout = timeout
 
-        # Initialize client
+        # Initialize client (shared per base_url/api_key so connections are reused)
         try:
-            from openai import AsyncOpenAI
-            self.client = AsyncOpenAI(
+            self.client = http_pool.get_openai_client(
                 api_key=self.api_key,
                 base_url=self.base_url,
                 timeout=self.timeout
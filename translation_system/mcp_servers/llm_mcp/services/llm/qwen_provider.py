@@ -11,6 +11,7 @@ import hashlib
 import time
 
 from services.llm.base_provider import BaseLLMProvider
+from utils.http_pool import http_pool
 from models.session_data import TranslationResult
 
 logger = logging.getLogger(__name__)
@@ -103,57 +104,56 @@ class QwenProvider(BaseLLMProvider):
             logger.info("=" * 80)
 
             # Make API call
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.ENDPOINT,
-                    headers=headers,
-                    json=payload,
-                    timeout=60
-                ) as response:
-                    result = await response.json()
-
-                    # Log response
-                    logger.info("=" * 80)
-                    logger.info(f"✅ Qwen API Response (Status: {response.status})")
-                    logger.info(f"Request ID: {result.get('request_id')}")
-                    if response.status == 200:
-                        output = result.get('output', {})
-                        choices = output.get('choices', [])
-                        if choices:
-                            content = choices[0]['message']['content']
-                            logger.info("-" * 80)
-                            logger.info(f"Translated Text (完整):\n{content}")
-                            logger.info("-" * 80)
-                        usage = output.get('usage', {})
-                        logger.info(f"Token使用: input={usage.get('input_tokens')}, output={usage.get('output_tokens')}, total={usage.get('total_tokens')}")
-
-                        # Calculate cost
-                        input_tokens = usage.get('input_tokens', 0)
-                        output_tokens = usage.get('output_tokens', 0)
-                        pricing = self.PRICING.get(self.model, self.PRICING['qwen-plus'])
-                        cost = (input_tokens / 1000 * pricing['input']) + (output_tokens / 1000 * pricing['output'])
-                        logger.info(f"本次费用: ${cost:.6f}")
-                    else:
-                        logger.error(f"Error Response: {json.dumps(result, ensure_ascii=False)}")
-                    logger.info("=" * 80)
-
-                    if response.status != 200:
-                        error_msg = result.get('message', 'Unknown error')
-                        raise Exception(f"Qwen API error: {error_msg}")
-
-                    # Extract result
+            async with http_pool.post(
+                self.ENDPOINT,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                result = await response.json()
+
+                # Log response
+                logger.info("=" * 80)
+                logger.info(f"✅ Qwen API Response (Status: {response.status})")
+                logger.info(f"Request ID: {result.get('request_id')}")
+                if response.status == 200:
                     output = result.get('output', {})
                     choices = output.get('choices', [])
-                    if not choices:
-                        raise Exception("No translation result from Qwen")
-
-                    translated_text = choices[0]['message']['content'].strip()
-
-                    # Get token usage
+                    if choices:
+                        content = choices[0]['message']['content']
+                        logger.info("-" * 80)
+                        logger.info(f"Translated Text (完整):\n{content}")
+                        logger.info("-" * 80)
                     usage = output.get('usage', {})
+                    logger.info(f"Token使用: input={usage.get('input_tokens')}, output={usage.get('output_tokens')}, total={usage.get('total_tokens')}")
+
+                    # Calculate cost
                     input_tokens = usage.get('input_tokens', 0)
                     output_tokens = usage.get('output_tokens', 0)
-                    total_tokens = usage.get('total_tokens', input_tokens + output_tokens)
+                    pricing = self.PRICING.get(self.model, self.PRICING['qwen-plus'])
+                    cost = (input_tokens / 1000 * pricing['input']) + (output_tokens / 1000 * pricing['output'])
+                    logger.info(f"本次费用: ${cost:.6f}")
+                else:
+                    logger.error(f"Error Response: {json.dumps(result, ensure_ascii=False)}")
+                logger.info("=" * 80)
+
+                if response.status != 200:
+                    error_msg = result.get('message', 'Unknown error')
+                    raise Exception(f"Qwen API error: {error_msg}")
+
+                # Extract result
+                output = result.get('output', {})
+                choices = output.get('choices', [])
+                if not choices:
+                    raise Exception("No translation result from Qwen")
+
+                translated_text = choices[0]['message']['content'].strip()
+
+                # Get token usage
+                usage = output.get('usage', {})
+                input_tokens = usage.get('input_tokens', 0)
+                output_tokens = usage.get('output_tokens', 0)
+                total_tokens = usage.get('total_tokens', input_tokens + output_tokens)
 
             # Calculate cost
             cost = self._calculate_cost(input_tokens, output_tokens)
@@ -200,14 +200,13 @@ class QwenProvider(BaseLLMProvider):
                 }
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.ENDPOINT,
-                    headers=headers,
-                    json=payload,
-                    timeout=10
-                ) as response:
-                    return response.status == 200
+            async with http_pool.post(
+                self.ENDPOINT,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                return response.status == 200
 
         except:
             return False
@@ -15,6 +15,62 @@ from models.session_data import SessionStatus, TranslationSession
 logger = logging.getLogger(__name__)
 
 
+class _SessionProgress:
+    """Incrementally maintained execution statistics for one session run."""
+
+    def __init__(self, session: TranslationSession, batches: Dict[str, List[Dict]], provider: Any):
+        self.session = session
+        self.provider = provider
+        self.total_tasks = len(session.tasks)
+        self.total_batches = len(batches)
+        self.start_time = time.time()
+        self.completed_tasks = 0
+        self.failed_tasks = 0
+        self.completed_batches = 0
+        self._batch_remaining = {batch_id: len(tasks) for batch_id, tasks in batches.items()}
+
+    def record(self, task: Dict):
+        """Account for one finished task and publish updated stats (O(1))."""
+        if task.get('status') == 'completed':
+            self.completed_tasks += 1
+        else:
+            self.failed_tasks += 1
+
+        batch_id = task.get('batch_id', 'default')
+        self._batch_remaining[batch_id] -= 1
+        if self._batch_remaining[batch_id] == 0:
+            self.completed_batches += 1
+
+        self.publish()
+
+    def publish(self):
+        elapsed_time = time.time() - self.start_time
+        tasks_per_second = self.completed_tasks / elapsed_time if elapsed_time > 0 else 0
+        remaining_tasks = self.total_tasks - self.completed_tasks - self.failed_tasks
+        estimated_remaining = remaining_tasks / tasks_per_second if tasks_per_second > 0 else 0
+
+        stats = {
+            'completed_tasks': self.completed_tasks,
+            'failed_tasks': self.failed_tasks,
+            'total_tasks': self.total_tasks,
+            'current_batch': min(self.completed_batches + 1, self.total_batches),
+            'completed_batches': self.completed_batches,
+            'total_batches': self.total_batches,
+            'elapsed_time': int(elapsed_time),
+            'estimated_remaining': int(estimated_remaining),
+            'tasks_per_second': round(tasks_per_second, 2)
+        }
+
+        # Calculate cost if available
+        if hasattr(self.provider, 'get_total_cost'):
+            stats['current_cost'] = self.provider.get_total_cost()
+        if hasattr(self.provider, 'get_total_tokens'):
+            stats['tokens_used'] = self.provider.get_total_tokens()
+
+        self.session.update_progress(self.completed_tasks, self.total_tasks)
+        self.session.update_stats(stats)
+
+
 class TranslationExecutor:
     """Executes translation tasks asynchronously."""
 
@@ -43,85 +99,11 @@ class TranslationExecutor:
 
             # Group tasks by batch
             batches = self._group_tasks_by_batch(session.tasks)
-            total_batches = len(batches)
-            completed_tasks = 0
-            failed_tasks = 0
-
-            # Process batches
-            for batch_idx, (batch_id, batch_tasks) in enumerate(batches.items()):
-                # Check if should stop
-                if session.should_stop:
-                    session.status = SessionStatus.STOPPED
-                    break
-
-                # Check if paused
-                while session.is_paused:
-                    await asyncio.sleep(1)
-                    if session.should_stop:
-                        session.status = SessionStatus.STOPPED
-                        break
-
-                # Process batch
-                logger.info(f"Processing batch {batch_id} ({batch_idx + 1}/{total_batches})")
-
-                # Create workers for concurrent translation
-                max_workers = session.config.get('max_workers', 5)
-                semaphore = asyncio.Semaphore(max_workers)
 
-                async def translate_task(task):
-                    async with semaphore:
-                        return await self._translate_single_task(task, provider, session)
-
-                # Execute tasks concurrently
-                results = await asyncio.gather(
-                    *[translate_task(task) for task in batch_tasks],
-                    return_exceptions=True
-                )
-
-                # Update task statuses
-                for task, result in zip(batch_tasks, results):
-                    if isinstance(result, Exception):
-                        task['status'] = 'failed'
-                        task['error'] = str(result)
-                        failed_tasks += 1
-                    else:
-                        task.update(result)
-                        if task['status'] == 'completed':
-                            completed_tasks += 1
-                        else:
-                            failed_tasks += 1
-
-                # Update progress
-                progress = ((batch_idx + 1) / total_batches) * 100
-                session.update_progress(completed_tasks, len(session.tasks))
-
-                # Calculate statistics
-                elapsed_time = time.time() - start_time
-                tasks_per_second = completed_tasks / elapsed_time if elapsed_time > 0 else 0
-                remaining_tasks = len(session.tasks) - completed_tasks - failed_tasks
-                estimated_remaining = remaining_tasks / tasks_per_second if tasks_per_second > 0 else 0
-
-                # Update session stats
-                stats = {
-                    'completed_tasks': completed_tasks,
-                    'failed_tasks': failed_tasks,
-                    'total_tasks': len(session.tasks),
-                    'current_batch': batch_idx + 1,
-                    'total_batches': total_batches,
-                    'elapsed_time': int(elapsed_time),
-                    'estimated_remaining': int(estimated_remaining),
-                    'tasks_per_second': round(tasks_per_second, 2)
-                }
-
-                # Calculate cost if available
-                if hasattr(provider, 'get_total_cost'):
-                    stats['current_cost'] = provider.get_total_cost()
-                if hasattr(provider, 'get_total_tokens'):
-                    stats['tokens_used'] = provider.get_total_tokens()
-
-                session.update_stats(stats)
-
-                logger.info(f"Batch {batch_id} completed: {completed_tasks}/{len(session.tasks)} tasks")
+            if self._pipeline_enabled(session):
+                await self._execute_pipelined(session, provider, batches)
+            else:
+                await self._execute_batched(session, provider, batches, start_time)
 
             # Mark session as completed
             if session.status == SessionStatus.TRANSLATING:
@@ -135,6 +117,164 @@ class TranslationExecutor:
                 session.status = SessionStatus.FAILED
                 session.update_stats({'error': str(e)})
 
+    def _pipeline_enabled(self, session: TranslationSession) -> bool:
+        """Pipeline mode unless disabled per session or in execution config."""
+        if 'pipeline' in session.config:
+            return bool(session.config['pipeline'])
+        return bool(config_loader.get_execution_config().get('pipeline', True))
+
+    async def _execute_pipelined(self, session: TranslationSession, provider: Any,
+                                 batches: Dict[str, List[Dict]]):
+        """
+        Run all batches through one bounded work queue.
+
+        Tasks are fed in batch order (priority order within a batch), but no
+        batch waits for the previous one: as soon as a worker finishes a task
+        it takes the next, so one slow LLM call only occupies its own slot.
+        """
+        max_workers = session.config.get('max_workers', 5)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_workers * 2)
+        progress = _SessionProgress(session, batches, provider)
+        progress.publish()
+
+        logger.info(
+            f"Pipelined execution: {progress.total_tasks} tasks in "
+            f"{progress.total_batches} batches, {max_workers} workers"
+        )
+
+        async def wait_if_paused() -> bool:
+            """Block while paused; return False once the session should stop."""
+            while session.is_paused and not session.should_stop:
+                await asyncio.sleep(1)
+            return not session.should_stop
+
+        async def producer():
+            for batch_tasks in batches.values():
+                for task in batch_tasks:
+                    if not await wait_if_paused():
+                        return
+                    await queue.put(task)
+
+        async def worker():
+            while True:
+                task = await queue.get()
+                try:
+                    if task is None:
+                        return
+                    if not await wait_if_paused():
+                        continue
+                    try:
+                        result = await self._translate_single_task(task, provider, session)
+                        task.update(result)
+                    except Exception as e:
+                        task['status'] = 'failed'
+                        task['error'] = str(e)
+                    progress.record(task)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max_workers)]
+        try:
+            await producer()
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                if not w.done():
+                    w.cancel()
+
+        if session.should_stop:
+            session.status = SessionStatus.STOPPED
+
+        logger.info(
+            f"Pipeline finished: {progress.completed_tasks} completed, "
+            f"{progress.failed_tasks} failed of {progress.total_tasks} tasks"
+        )
+
+    async def _execute_batched(self, session: TranslationSession, provider: Any,
+                               batches: Dict[str, List[Dict]], start_time: float):
+        """Legacy mode: process batches one after another."""
+        total_batches = len(batches)
+        completed_tasks = 0
+        failed_tasks = 0
+
+        # Process batches
+        for batch_idx, (batch_id, batch_tasks) in enumerate(batches.items()):
+            # Check if should stop
+            if session.should_stop:
+                session.status = SessionStatus.STOPPED
+                break
+
+            # Check if paused
+            while session.is_paused:
+                await asyncio.sleep(1)
+                if session.should_stop:
+                    session.status = SessionStatus.STOPPED
+                    break
+
+            # Process batch
+            logger.info(f"Processing batch {batch_id} ({batch_idx + 1}/{total_batches})")
+
+            # Create workers for concurrent translation
+            max_workers = session.config.get('max_workers', 5)
+            semaphore = asyncio.Semaphore(max_workers)
+
+            async def translate_task(task):
+                async with semaphore:
+                    return await self._translate_single_task(task, provider, session)
+
+            # Execute tasks concurrently
+            results = await asyncio.gather(
+                *[translate_task(task) for task in batch_tasks],
+                return_exceptions=True
+            )
+
+            # Update task statuses
+            for task, result in zip(batch_tasks, results):
+                if isinstance(result, Exception):
+                    task['status'] = 'failed'
+                    task['error'] = str(result)
+                    failed_tasks += 1
+                else:
+                    task.update(result)
+                    if task['status'] == 'completed':
+                        completed_tasks += 1
+                    else:
+                        failed_tasks += 1
+
+            # Update progress
+            progress = ((batch_idx + 1) / total_batches) * 100
+            session.update_progress(completed_tasks, len(session.tasks))
+
+            # Calculate statistics
+            elapsed_time = time.time() - start_time
+            tasks_per_second = completed_tasks / elapsed_time if elapsed_time > 0 else 0
+            remaining_tasks = len(session.tasks) - completed_tasks - failed_tasks
+            estimated_remaining = remaining_tasks / tasks_per_second if tasks_per_second > 0 else 0
+
+            # Update session stats
+            stats = {
+                'completed_tasks': completed_tasks,
+                'failed_tasks': failed_tasks,
+                'total_tasks': len(session.tasks),
+                'current_batch': batch_idx + 1,
+                'total_batches': total_batches,
+                'elapsed_time': int(elapsed_time),
+                'estimated_remaining': int(estimated_remaining),
+                'tasks_per_second': round(tasks_per_second, 2)
+            }
+
+            # Calculate cost if available
+            if hasattr(provider, 'get_total_cost'):
+                stats['current_cost'] = provider.get_total_cost()
+            if hasattr(provider, 'get_total_tokens'):
+                stats['tokens_used'] = provider.get_total_tokens()
+
+            session.update_stats(stats)
+
+            logger.info(f"Batch {batch_id} completed: {completed_tasks}/{len(session.tasks)} tasks")
+
     async def resume_translation(self, session_id: str):
         """Resume paused translation."""
         session = session_manager.get_session(session_id)
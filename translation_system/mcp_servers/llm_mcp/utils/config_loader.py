@@ -87,7 +87,15 @@ class ConfigLoader:
             },
             'execution': {
                 'max_workers': 5,
-                'batch_size': 10
+                'batch_size': 10,
+                'pipeline': True
+            },
+            'http_pool': {
+                'limit': 100,
+                'limit_per_host': 20,
+                'keepalive_timeout': 30,
+                'dns_cache_ttl': 300,
+                'connect_timeout': 10
             }
         }
 
@@ -128,7 +136,18 @@ class ConfigLoader:
         """Get execution configuration."""
         return self._config.get('execution', {
             'max_workers': 5,
-            'batch_size': 10
+            'batch_size': 10,
+            'pipeline': True
+        })
+
+    def get_http_pool_config(self) -> Dict[str, Any]:
+        """Get shared HTTP connection pool configuration."""
+        return self._config.get('http_pool', {
+            'limit': 100,
+            'limit_per_host': 20,
+            'keepalive_timeout': 30,
+            'dns_cache_ttl': 300,
+            'connect_timeout': 10
         })
 
 
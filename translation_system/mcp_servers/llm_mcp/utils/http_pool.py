@@ -0,0 +1,163 @@
+"""
+Shared HTTP Connection Pool for LLM MCP Server
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Tuple
+
+import aiohttp
+
+from utils.config_loader import config_loader
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPSessionPool:
+    """
+    Process-wide aiohttp session shared by all LLM providers.
+
+    Connections are kept alive between requests and DNS results are cached,
+    so a translation call reuses an open TLS connection instead of paying a
+    handshake and lookup each time. OpenAI SDK clients are cached per
+    (base_url, api_key) for the same reason.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._openai_clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = asyncio.Lock()
+        self._config: Dict[str, Any] = {}
+
+        # Utilization counters
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+        self.queued_for_connection = 0
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_create(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_reuse(session, ctx, params):
+            self.connections_reused += 1
+
+        async def on_dns_hit(session, ctx, params):
+            self.dns_cache_hits += 1
+
+        async def on_dns_miss(session, ctx, params):
+            self.dns_cache_misses += 1
+
+        async def on_queued(session, ctx, params):
+            self.queued_for_connection += 1
+
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+        trace.on_dns_cache_hit.append(on_dns_hit)
+        trace.on_dns_cache_miss.append(on_dns_miss)
+        trace.on_connection_queued_start.append(on_queued)
+        return trace
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use."""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                self._config = config_loader.get_http_pool_config()
+                connector = aiohttp.TCPConnector(
+                    limit=self._config.get('limit', 100),
+                    limit_per_host=self._config.get('limit_per_host', 20),
+                    ttl_dns_cache=self._config.get('dns_cache_ttl', 300),
+                    keepalive_timeout=self._config.get('keepalive_timeout', 30),
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(
+                        total=None,
+                        connect=self._config.get('connect_timeout', 10)
+                    ),
+                    trace_configs=[self._trace_config()]
+                )
+                logger.info(
+                    f"HTTP pool created (limit={connector.limit}, "
+                    f"per_host={connector.limit_per_host})"
+                )
+        return self._session
+
+    @asynccontextmanager
+    async def post(self, url: str, **kwargs):
+        """POST through the shared session, tracking in-flight requests."""
+        session = await self.get_session()
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            async with session.post(url, **kwargs) as response:
+                yield response
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def get_openai_client(self, api_key: str, base_url: str, timeout: float):
+        """Get a cached AsyncOpenAI client (keeps its connection pool warm)."""
+        key = (base_url, api_key)
+        client = self._openai_clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+            self._openai_clients[key] = client
+        return client
+
+    async def close(self):
+        """Close the shared session and cached SDK clients."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            # Give the connector a moment to close underlying SSL transports
+            await asyncio.sleep(0.25)
+        self._session = None
+
+        for client in self._openai_clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close OpenAI client: {e}")
+        self._openai_clients.clear()
+        logger.info("HTTP pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilization counters."""
+        connector = self._session.connector if self._session and not self._session.closed else None
+        limit = connector.limit if connector else self._config.get('limit', 100)
+        return {
+            'active': connector is not None,
+            'limit': limit,
+            'limit_per_host': connector.limit_per_host if connector else self._config.get('limit_per_host', 20),
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'utilization': round(self.in_flight / limit, 3) if limit else 0,
+            'requests': self.requests,
+            'errors': self.errors,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'queued_for_connection': self.queued_for_connection,
+            'dns_cache_hits': self.dns_cache_hits,
+            'dns_cache_misses': self.dns_cache_misses,
+            'openai_clients': len(self._openai_clients)
+        }
+
+
+# Global HTTP pool instance
+http_pool = HTTPSessionPool()
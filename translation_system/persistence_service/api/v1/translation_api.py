@@ -21,6 +21,7 @@ from services.query_service import query_service
 from services.recovery_service import recovery_service
 from services.stats_service import stats_service
 from services.cleanup_service import cleanup_service
+from storage.pagination import InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
@@ -137,7 +138,8 @@ async def query_sessions(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
     sort_by: str = Query("created_at", description="Sort by field"),
-    order: str = Query("desc", description="Sort order (asc/desc)")
+    order: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from previous page (next_cursor)")
 ):
     """
     Query sessions with pagination
@@ -152,7 +154,8 @@ async def query_sessions(
     - **page_size**: Page size (default: 20, max: 100)
     - **sort_by**: Sort by field (default: created_at)
     - **order**: Sort order (default: desc)
-    - Returns: Paginated query results
+    - **cursor**: next_cursor of the previous page; seeks instead of OFFSET (overrides page)
+    - Returns: Paginated query results (total may be cached for a few seconds)
     """
     try:
         # Parse filters
@@ -168,7 +171,8 @@ async def query_sessions(
             page=page,
             page_size=min(page_size, 100),
             sort_by=sort_by,
-            order=order
+            order=order,
+            cursor=cursor
         )
 
         # Query
@@ -178,6 +182,8 @@ async def query_sessions(
 
         return result
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to query sessions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -216,7 +222,8 @@ async def get_session_tasks(
     status: Optional[str] = Query(None, description="Filter by status"),
     sheet_name: Optional[str] = Query(None, description="Filter by sheet name"),
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Page size")
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from previous page (next_cursor)")
 ):
     """
     Get tasks for a session
@@ -228,6 +235,7 @@ async def get_session_tasks(
     - **sheet_name**: Filter by sheet name (optional)
     - **page**: Page number (default: 1)
     - **page_size**: Page size (default: 20, max: 100)
+    - **cursor**: next_cursor of the previous page; seeks instead of OFFSET (overrides page)
     - Returns: Paginated task results
     """
     try:
@@ -243,7 +251,8 @@ async def get_session_tasks(
             page=page,
             page_size=min(page_size, 100),
             sort_by="row_index",
-            order="asc"
+            order="asc",
+            cursor=cursor
         )
 
         # Query
@@ -253,6 +262,8 @@ async def get_session_tasks(
 
         return result
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to query session tasks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -268,7 +279,8 @@ async def query_tasks(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
     sort_by: str = Query("created_at", description="Sort by field"),
-    order: str = Query("desc", description="Sort order (asc/desc)")
+    order: str = Query("desc", description="Sort order (asc/desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from previous page (next_cursor)")
 ):
     """
     Query tasks with pagination
@@ -284,7 +296,8 @@ async def query_tasks(
     - **page_size**: Page size (default: 20, max: 100)
     - **sort_by**: Sort by field (default: created_at)
     - **order**: Sort order (default: desc)
-    - Returns: Paginated query results
+    - **cursor**: next_cursor of the previous page; seeks instead of OFFSET (overrides page)
+    - Returns: Paginated query results (total may be cached for a few seconds)
     """
     try:
         # Parse filters
@@ -301,7 +314,8 @@ async def query_tasks(
             page=page,
             page_size=min(page_size, 100),
             sort_by=sort_by,
-            order=order
+            order=order,
+            cursor=cursor
         )
 
         # Query
@@ -311,6 +325,8 @@ async def query_tasks(
 
         return result
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to query tasks: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -419,6 +435,7 @@ async def delete_session(session_id: str):
         if not success:
             raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
 
+        query_service.count_cache.invalidate()
         logger.info(f"Deleted session: {session_id}")
 
         return DeleteResponse(
@@ -452,6 +469,8 @@ async def cleanup_sessions(
     """
     try:
         result = await cleanup_service.cleanup(completed_days, failed_days, dry_run)
+        if not dry_run:
+            query_service.count_cache.invalidate()
 
         logger.info(
             f"Cleanup {'(dry run) ' if dry_run else ''}: "
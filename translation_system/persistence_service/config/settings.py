@@ -19,6 +19,28 @@ class BufferSettings(BaseSettings):
     """Buffer configuration"""
     max_buffer_size: int = 1000
     flush_interval: int = 30
+    # Records held in memory; further batches stay in the spool until reloaded
+    max_buffered_records: int = 20000
+    # Write-ahead spool (durability before acknowledgement)
+    spool_dir: str = "data/spool"
+    spool_segment_bytes: int = 67108864  # 64MB
+    spool_fsync: bool = True
+    # Background flusher
+    max_retries: int = 5
+    retry_backoff: float = 1.0
+    max_concurrent_flushes: int = 4
+
+
+class StorageSettings(BaseSettings):
+    """Storage backend selection"""
+    backend: str = "mysql"  # mysql | sqlite
+    sqlite_path: str = "data/persistence.db"
+
+
+class QuerySettings(BaseSettings):
+    """Query configuration"""
+    count_cache_ttl: float = 30.0  # seconds a COUNT(*) result is reused
+    count_cache_size: int = 1024
 
 
 class DatabaseSettings(BaseSettings):
@@ -66,6 +88,8 @@ class Settings:
         # Initialize settings
         self.service = ServiceSettings(**config_data.get('service', {}))
         self.buffer = BufferSettings(**config_data.get('buffer', {}))
+        self.storage = StorageSettings(**config_data.get('storage', {}))
+        self.query = QuerySettings(**config_data.get('query', {}))
         self.database = DatabaseSettings(**config_data.get('database', {}))
         self.logging = LoggingSettings(**config_data.get('logging', {}))
 
@@ -95,6 +119,12 @@ class Settings:
         if db_database:
             self.database.database = db_database
 
+        # Storage backend override
+        if os.getenv("STORAGE_BACKEND"):
+            self.storage.backend = os.getenv("STORAGE_BACKEND")
+        if os.getenv("SQLITE_PATH"):
+            self.storage.sqlite_path = os.getenv("SQLITE_PATH")
+
         # Service overrides
         if os.getenv("SERVICE_HOST"):
             self.service.host = os.getenv("SERVICE_HOST")
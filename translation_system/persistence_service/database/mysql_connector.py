@@ -7,6 +7,7 @@ import aiomysql
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from config.settings import settings
+from storage.pagination import keyset_clause, order_clause, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -371,26 +372,104 @@ class MySQLConnector:
             logger.error(f"Failed to delete session {session_id}: {e}")
             raise
 
+    async def _paged_query(
+        self,
+        table: str,
+        primary_key: str,
+        where_clauses: List[str],
+        params: List[Any],
+        page: int,
+        page_size: int,
+        sort_by: str,
+        order: str,
+        cursor: Optional[str],
+        include_total: bool
+    ) -> Dict[str, Any]:
+        """
+        Run a filtered page query using keyset (seek) pagination
+
+        With a cursor the page is located by an index seek on (sort_by, primary_key);
+        without one the page number is used as OFFSET (first pages / legacy clients).
+        One extra row is fetched to decide whether a next page exists.
+
+        Args:
+            table: Table name
+            primary_key: Primary key column used as tie-breaker
+            where_clauses: Filter predicates
+            params: Filter parameters
+            page: Page number (ignored when cursor is given)
+            page_size: Number of items per page
+            sort_by: Validated sort column
+            order: 'ASC' or 'DESC'
+            cursor: Cursor from a previous page
+            include_total: Whether to run COUNT(*)
+
+        Returns:
+            Dictionary with total (None if not counted), items and next_cursor
+        """
+        filter_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+        seek_clause, seek_params = keyset_clause(sort_by, order, primary_key, cursor)
+        page_clause = f"{filter_clause} AND {seek_clause}" if seek_clause else filter_clause
+
+        query_sql = f"""
+            SELECT * FROM {table}
+            WHERE {page_clause}
+            ORDER BY {order_clause(sort_by, order, primary_key)}
+            LIMIT %s
+        """
+        query_params = params + seek_params + [page_size + 1]
+        if not cursor:
+            query_sql += " OFFSET %s"
+            query_params.append((page - 1) * page_size)
+
+        async with self.pool.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as db_cursor:
+                total = None
+                if include_total:
+                    await db_cursor.execute(
+                        f"SELECT COUNT(*) as total FROM {table} WHERE {filter_clause}", params
+                    )
+                    total = (await db_cursor.fetchone())['total']
+
+                await db_cursor.execute(query_sql, query_params)
+                items = list(await db_cursor.fetchall())
+
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor(sort_by, order, items[-1], primary_key)
+
+        return {
+            'total': total,
+            'items': items,
+            'next_cursor': next_cursor
+        }
+
     async def query_sessions(
         self,
         filters: Dict[str, Any],
         page: int = 1,
         page_size: int = 20,
         sort_by: str = "created_at",
-        order: str = "desc"
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         Query sessions with pagination, filtering, and sorting
 
         Args:
             filters: Dictionary of filters (status, from_date, to_date, llm_provider)
-            page: Page number (1-indexed)
+            page: Page number (1-indexed, ignored when cursor is given)
             page_size: Number of items per page
             sort_by: Column to sort by
             order: Sort order ('asc' or 'desc')
+            cursor: Keyset cursor from a previous page
+            include_total: Whether to count matching rows
 
         Returns:
-            Dictionary with total count and items
+            Dictionary with total count, items and next_cursor
         """
         try:
             # Build WHERE clause
@@ -413,8 +492,6 @@ class MySQLConnector:
                 where_clauses.append("llm_provider = %s")
                 params.append(filters['llm_provider'])
 
-            where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-
             # Validate sort_by to prevent SQL injection
             allowed_sort_columns = ['session_id', 'filename', 'status', 'created_at', 'updated_at']
             if sort_by not in allowed_sort_columns:
@@ -423,41 +500,19 @@ class MySQLConnector:
             # Validate order
             order = order.upper() if order.upper() in ['ASC', 'DESC'] else 'DESC'
 
-            # Query total count
-            count_sql = f"SELECT COUNT(*) as total FROM translation_sessions WHERE {where_clause}"
-
-            # Query items with pagination
-            offset = (page - 1) * page_size
-            query_sql = f"""
-                SELECT * FROM translation_sessions
-                WHERE {where_clause}
-                ORDER BY {sort_by} {order}
-                LIMIT %s OFFSET %s
-            """
-            query_params = params + [page_size, offset]
-
-            async with self.pool.acquire() as conn:
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
-                    # Get total count
-                    await cursor.execute(count_sql, params)
-                    count_result = await cursor.fetchone()
-                    total = count_result['total']
-
-                    # Get items
-                    await cursor.execute(query_sql, query_params)
-                    items = await cursor.fetchall()
+            result = await self._paged_query(
+                "translation_sessions", "session_id", where_clauses, params,
+                page, page_size, sort_by, order, cursor, include_total
+            )
 
-                    # Parse JSON fields
-                    for item in items:
-                        if item.get('game_info'):
-                            item['game_info'] = json.loads(item['game_info'])
-                        if item.get('metadata'):
-                            item['metadata'] = json.loads(item['metadata'])
+            # Parse JSON fields
+            for item in result['items']:
+                if item.get('game_info'):
+                    item['game_info'] = json.loads(item['game_info'])
+                if item.get('metadata'):
+                    item['metadata'] = json.loads(item['metadata'])
 
-                    return {
-                        'total': total,
-                        'items': items
-                    }
+            return result
 
         except Exception as e:
             logger.error(f"Failed to query sessions: {e}")
@@ -469,20 +524,24 @@ class MySQLConnector:
         page: int = 1,
         page_size: int = 20,
         sort_by: str = "created_at",
-        order: str = "desc"
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         Query tasks with pagination, filtering, and sorting
 
         Args:
             filters: Dictionary of filters (session_id, status, sheet_name, from_date, to_date)
-            page: Page number (1-indexed)
+            page: Page number (1-indexed, ignored when cursor is given)
             page_size: Number of items per page
             sort_by: Column to sort by
             order: Sort order ('asc' or 'desc')
+            cursor: Keyset cursor from a previous page
+            include_total: Whether to count matching rows
 
         Returns:
-            Dictionary with total count and items
+            Dictionary with total count, items and next_cursor
         """
         try:
             # Build WHERE clause
@@ -509,8 +568,6 @@ class MySQLConnector:
                 where_clauses.append("created_at <= %s")
                 params.append(filters['to_date'])
 
-            where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-
             # Validate sort_by to prevent SQL injection
             allowed_sort_columns = ['task_id', 'session_id', 'status', 'created_at', 'updated_at', 'row_index']
             if sort_by not in allowed_sort_columns:
@@ -519,34 +576,10 @@ class MySQLConnector:
             # Validate order
             order = order.upper() if order.upper() in ['ASC', 'DESC'] else 'DESC'
 
-            # Query total count
-            count_sql = f"SELECT COUNT(*) as total FROM translation_tasks WHERE {where_clause}"
-
-            # Query items with pagination
-            offset = (page - 1) * page_size
-            query_sql = f"""
-                SELECT * FROM translation_tasks
-                WHERE {where_clause}
-                ORDER BY {sort_by} {order}
-                LIMIT %s OFFSET %s
-            """
-            query_params = params + [page_size, offset]
-
-            async with self.pool.acquire() as conn:
-                async with conn.cursor(aiomysql.DictCursor) as cursor:
-                    # Get total count
-                    await cursor.execute(count_sql, params)
-                    count_result = await cursor.fetchone()
-                    total = count_result['total']
-
-                    # Get items
-                    await cursor.execute(query_sql, query_params)
-                    items = await cursor.fetchall()
-
-                    return {
-                        'total': total,
-                        'items': items
-                    }
+            return await self._paged_query(
+                "translation_tasks", "task_id", where_clauses, params,
+                page, page_size, sort_by, order, cursor, include_total
+            )
 
         except Exception as e:
             logger.error(f"Failed to query tasks: {e}")
@@ -100,6 +100,7 @@ CREATE TABLE IF NOT EXISTS translation_tasks (
     INDEX idx_batch_id (batch_id),
     INDEX idx_status (status),
     INDEX idx_session_status (session_id, status),
+    INDEX idx_session_row (session_id, row_index),
     INDEX idx_sheet_name (sheet_name),
     INDEX idx_created_at (created_at)
 
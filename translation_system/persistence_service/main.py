@@ -36,7 +36,10 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 60)
     logger.info("Starting Persistence Service...")
     logger.info(f"Service: {settings.service.host}:{settings.service.port}")
-    logger.info(f"Database: {settings.database.host}:{settings.database.port}/{settings.database.database}")
+    if settings.storage.backend == "sqlite":
+        logger.info(f"Storage: sqlite ({settings.storage.sqlite_path})")
+    else:
+        logger.info(f"Database: {settings.database.host}:{settings.database.port}/{settings.database.database}")
     logger.info(f"Buffer: max_size={settings.buffer.max_buffer_size}, flush_interval={settings.buffer.flush_interval}s")
     logger.info("=" * 60)
 
@@ -45,6 +48,11 @@ async def lifespan(app: FastAPI):
         setup_storage_backends()
         await StorageBackendRegistry.initialize_all()
 
+        # Replay writes accepted before the last shutdown/crash
+        recovered = await buffer_manager.recover()
+        if recovered:
+            logger.info(f"Recovered {recovered} spooled records for replay")
+
         # Start periodic buffer flush task
         asyncio.create_task(buffer_manager.start_periodic_flush())
         logger.info("Periodic buffer flush task started")
@@ -75,7 +83,8 @@ async def lifespan(app: FastAPI):
             f"{result['tasks']} tasks"
         )
     except Exception as e:
-        logger.error(f"Failed to flush buffer during shutdown: {e}")
+        logger.error(f"Failed to flush buffer during shutdown (kept in spool): {e}")
+    buffer_manager.spool.close()
 
     # Close storage backends
     await StorageBackendRegistry.close_all()
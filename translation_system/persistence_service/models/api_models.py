@@ -86,6 +86,8 @@ class QueryResponse(BaseModel):
     page_size: int = Field(..., ge=1, description="每页大小")
     total_pages: int = Field(..., ge=0, description="总页数")
     items: List[Dict[str, Any]] = Field(..., description="数据项")
+    next_cursor: Optional[str] = Field(None, description="下一页游标 (最后一页为空)")
+    total_cached: bool = Field(False, description="总数是否来自缓存 (可能略有滞后)")
 
 
 class SessionDetailResponse(BaseModel):
@@ -208,6 +210,7 @@ class Pagination(BaseModel):
     page_size: int = Field(20, ge=1, le=100, description="每页大小 (1-100)")
     sort_by: str = Field("created_at", description="排序字段")
     order: str = Field("desc", description="排序方向: asc, desc")
+    cursor: Optional[str] = Field(None, description="游标 (上一页返回的 next_cursor, 优先于 page)")
 
 
 class SessionFilters(BaseModel):
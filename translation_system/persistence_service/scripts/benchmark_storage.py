@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Storage backend benchmark
+Runs the same persistence workload against any registered storage backend
+
+Usage:
+    python scripts/benchmark_storage.py --backend sqlite
+    python scripts/benchmark_storage.py --backend mysql --sessions 20 --tasks-per-session 5000
+"""
+import os
+import sys
+import math
+import time
+import uuid
+import asyncio
+import argparse
+import statistics
+from typing import Dict, Any, List, Callable, Awaitable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.registry import StorageBackendRegistry  # noqa: E402
+
+
+def _create_sqlite(args):
+    from storage.sqlite_plugin import SQLitePlugin
+    return SQLitePlugin(args.sqlite_path)
+
+
+def _create_mysql(args):
+    from storage.mysql_plugin import MySQLPlugin
+    return MySQLPlugin()
+
+
+BACKEND_FACTORIES = {
+    "sqlite": _create_sqlite,
+    "mysql": _create_mysql,
+}
+
+
+class Timer:
+    """Collects per-operation latencies for one workload phase"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: List[float] = []
+        self.rows = 0
+
+    async def measure(self, fn: Callable[[], Awaitable[Any]], rows: int = 1):
+        start = time.perf_counter()
+        result = await fn()
+        self.samples.append((time.perf_counter() - start) * 1000)
+        self.rows += rows
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        total_ms = sum(self.samples)
+        ordered = sorted(self.samples)
+        p95 = ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)] if ordered else 0
+        return {
+            "phase": self.name,
+            "ops": len(self.samples),
+            "rows": self.rows,
+            "total_ms": round(total_ms, 1),
+            "rows_per_sec": round(self.rows / (total_ms / 1000), 1) if total_ms else 0,
+            "p50_ms": round(statistics.median(ordered), 2) if ordered else 0,
+            "p95_ms": round(p95, 2),
+        }
+
+
+def _make_session(session_id: str) -> Dict[str, Any]:
+    return {
+        "session_id": session_id,
+        "filename": "benchmark.xlsx",
+        "file_path": f"/tmp/{session_id}.xlsx",
+        "status": "processing",
+        "game_info": {"game_name": "bench"},
+        "llm_provider": "qwen",
+        "metadata": {"benchmark": True},
+        "total_tasks": 0,
+    }
+
+
+def _make_task(session_id: str, index: int, batch_size: int) -> Dict[str, Any]:
+    return {
+        "task_id": f"{session_id[:8]}_{index:08d}",
+        "session_id": session_id,
+        "batch_id": f"{session_id[:8]}_B{index // batch_size:05d}",
+        "sheet_name": f"Sheet{index % 5}",
+        "row_index": index,
+        "column_name": "PT",
+        "source_text": f"源文本 {index}",
+        "status": "pending",
+        "retry_count": 0,
+    }
+
+
+async def run_workload(backend, args) -> List[Dict[str, Any]]:
+    """
+    Workload: write sessions, bulk-insert tasks, upsert task results,
+    point reads, filtered/paginated queries, then delete sessions.
+    """
+    session_ids = [str(uuid.uuid4()) for _ in range(args.sessions)]
+    phases = {name: Timer(name) for name in (
+        "write_sessions", "insert_tasks", "update_tasks",
+        "read_task", "query_session_status", "query_batch", "delete_sessions"
+    )}
+
+    await phases["write_sessions"].measure(
+        lambda: backend.write("translation_sessions", [_make_session(s) for s in session_ids]),
+        rows=len(session_ids)
+    )
+
+    for session_id in session_ids:
+        tasks = [_make_task(session_id, i, args.batch_size) for i in range(args.tasks_per_session)]
+        for start in range(0, len(tasks), args.write_batch):
+            chunk = tasks[start:start + args.write_batch]
+            await phases["insert_tasks"].measure(
+                lambda chunk=chunk: backend.write("translation_tasks", chunk), rows=len(chunk)
+            )
+
+        for task in tasks:
+            task.update(status="completed", target_text="resultado", confidence=0.9, duration_ms=120)
+        for start in range(0, len(tasks), args.write_batch):
+            chunk = tasks[start:start + args.write_batch]
+            await phases["update_tasks"].measure(
+                lambda chunk=chunk: backend.write("translation_tasks", chunk), rows=len(chunk)
+            )
+
+    for i in range(args.reads):
+        session_id = session_ids[i % len(session_ids)]
+        task_id = f"{session_id[:8]}_{(i * 7919) % args.tasks_per_session:08d}"
+        await phases["read_task"].measure(lambda: backend.read("translation_tasks", task_id))
+
+    pages = max(1, args.tasks_per_session // args.page_size)
+    for i in range(args.queries):
+        session_id = session_ids[i % len(session_ids)]
+        page = (i % pages) + 1
+        await phases["query_session_status"].measure(lambda: backend.query(
+            "translation_tasks",
+            {"session_id": session_id, "status": "completed"},
+            page=page, page_size=args.page_size, sort_by="row_index", order="asc"
+        ), rows=args.page_size)
+        batch_id = f"{session_id[:8]}_B{i % max(1, args.tasks_per_session // args.batch_size):05d}"
+        await phases["query_batch"].measure(lambda: backend.query(
+            "translation_tasks", {"batch_id": batch_id}, page=1, page_size=args.page_size
+        ))
+
+    for session_id in session_ids:
+        await phases["delete_sessions"].measure(lambda: backend.delete("translation_sessions", session_id))
+
+    return [timer.report() for timer in phases.values()]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark a storage backend")
+    parser.add_argument("--backend", choices=sorted(BACKEND_FACTORIES), default="sqlite")
+    parser.add_argument("--sqlite-path", default="data/benchmark.db")
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--tasks-per-session", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=20, help="tasks per translation batch_id")
+    parser.add_argument("--write-batch", type=int, default=500, help="rows per write() call")
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    StorageBackendRegistry.register(args.backend, BACKEND_FACTORIES[args.backend](args))
+    backend = StorageBackendRegistry.get_backend_by_name(args.backend)
+    await backend.initialize()
+
+    try:
+        print("=" * 78)
+        print(f"Storage benchmark: backend={args.backend}, sessions={args.sessions}, "
+              f"tasks/session={args.tasks_per_session}")
+        print("=" * 78)
+        print(f"{'phase':<22}{'ops':>7}{'rows':>9}{'total_ms':>11}{'rows/s':>11}{'p50_ms':>9}{'p95_ms':>9}")
+        for row in await run_workload(backend, args):
+            print(
+                f"{row['phase']:<22}{row['ops']:>7}{row['rows']:>9}{row['total_ms']:>11}"
+                f"{row['rows_per_sec']:>11}{row['p50_ms']:>9}{row['p95_ms']:>9}"
+            )
+    finally:
+        await backend.close()
+        if args.backend == "sqlite" and args.sqlite_path != ":memory:":
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(args.sqlite_path + suffix):
+                    os.remove(args.sqlite_path + suffix)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,8 @@
 """
 Buffer Manager - Task 5.1
-Manages in-memory buffers for batch writes with automatic flushing
+Manages in-memory buffers for batch writes with automatic flushing.
+Writes are spooled to a local WAL before acknowledgement and flushed to
+storage by a background flusher, so ingest never waits on the database.
 """
 import asyncio
 import time
@@ -9,6 +11,7 @@ from typing import List, Dict, Any
 from datetime import datetime
 from config.settings import settings
 from storage.registry import StorageBackendRegistry
+from services.wal_spool import WALSpool
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +22,25 @@ class BufferManager:
     Accumulates data in memory and flushes to storage based on:
     - Buffer size threshold
     - Time interval threshold
+
+    Durability: every batch is appended to the WAL spool before it is
+    buffered; spool records are released only after the backend write
+    succeeds. Failed flushes are retried with backoff and the data is put
+    back into the buffer instead of being dropped.
+
+    Memory: at most max_buffered_records are held in the buffers. Batches
+    arriving above the cap are only spooled ("spilled") and are read back
+    from the spool, in order, once a flush has made room.
     """
 
+    RELOAD_CHUNK = 16  # Spilled batches read back from the spool at a time
+
     def __init__(
         self,
         max_buffer_size: int = None,
-        flush_interval: int = None
+        flush_interval: int = None,
+        spool: WALSpool = None,
+        max_buffered_records: int = None
     ):
         """
         Initialize buffer manager
@@ -32,13 +48,30 @@ class BufferManager:
         Args:
             max_buffer_size: Maximum buffer size before auto-flush
             flush_interval: Flush interval in seconds
+            spool: WAL spool (defaults to settings.buffer.spool_dir)
+            max_buffered_records: Records held in memory before batches spill to the spool
         """
         self.max_buffer_size = max_buffer_size or settings.buffer.max_buffer_size
         self.flush_interval = flush_interval or settings.buffer.flush_interval
+        self.max_retries = settings.buffer.max_retries
+        self.retry_backoff = settings.buffer.retry_backoff
+        self.max_concurrent_flushes = settings.buffer.max_concurrent_flushes
+        self.max_buffered_records = max_buffered_records or settings.buffer.max_buffered_records
+
+        # Write-ahead spool
+        self.spool = spool or WALSpool(
+            settings.buffer.spool_dir,
+            segment_bytes=settings.buffer.spool_segment_bytes,
+            fsync=settings.buffer.spool_fsync
+        )
 
-        # Buffers
+        # Buffers (records plus the spool seqs they came from)
         self.session_buffer: List[Dict] = []
         self.task_buffer: List[Dict] = []
+        self._session_seqs: List[int] = []
+        self._task_seqs: List[int] = []
+        # Spool seqs of batches kept only on disk (buffers were full), in order
+        self._spilled_seqs: List[int] = []
 
         # Timing
         self.last_flush_time = time.time()
@@ -47,6 +80,10 @@ class BufferManager:
         self.total_sessions_written = 0
         self.total_tasks_written = 0
         self.total_flush_count = 0
+        self.total_flush_retries = 0
+        self.total_flush_failures = 0
+        self.total_spilled_records = 0
+        self.total_reloaded_records = 0
         self.last_flush_duration_ms = 0
 
         # Locks for thread safety
@@ -56,14 +93,39 @@ class BufferManager:
 
         # Flush task
         self._flush_task = None
+        self._flush_event = asyncio.Event()
         self._running = False
 
         logger.info(
             f"BufferManager initialized: "
             f"max_size={self.max_buffer_size}, "
-            f"flush_interval={self.flush_interval}s"
+            f"flush_interval={self.flush_interval}s, "
+            f"spool={self.spool.spool_dir}"
         )
 
+    async def recover(self) -> int:
+        """
+        Load unapplied batches from the WAL spool into the buffers
+        Called once on startup, before accepting new writes.
+
+        Returns:
+            Number of recovered records
+        """
+        recovered = await asyncio.to_thread(self.spool.recover)
+        count = 0
+        for seq, collection, data in recovered:
+            if collection not in ("translation_sessions", "translation_tasks"):
+                logger.warning(f"Skipping spooled batch for unknown collection: {collection}")
+                self.spool.mark_applied([seq])
+                continue
+            await self._buffer_batch(collection, seq, data)
+            count += len(data)
+
+        if count:
+            logger.info(f"Recovered {count} records from WAL spool")
+            self._flush_event.set()
+        return count
+
     async def add_sessions(self, sessions: List[Dict]):
         """
         Add sessions to buffer
@@ -74,9 +136,8 @@ class BufferManager:
         if not sessions:
             return
 
-        async with self._session_lock:
-            self.session_buffer.extend(sessions)
-            logger.debug(f"Added {len(sessions)} sessions to buffer (total: {len(self.session_buffer)})")
+        seq = await asyncio.to_thread(self.spool.append, "translation_sessions", sessions)
+        await self._buffer_batch("translation_sessions", seq, sessions)
 
         # Check if flush needed
         await self._check_and_flush()
@@ -91,19 +152,84 @@ class BufferManager:
         if not tasks:
             return
 
-        async with self._task_lock:
-            self.task_buffer.extend(tasks)
-            logger.debug(f"Added {len(tasks)} tasks to buffer (total: {len(self.task_buffer)})")
+        seq = await asyncio.to_thread(self.spool.append, "translation_tasks", tasks)
+        await self._buffer_batch("translation_tasks", seq, tasks)
 
         # Check if flush needed
         await self._check_and_flush()
 
+    @property
+    def buffered_records(self) -> int:
+        return len(self.session_buffer) + len(self.task_buffer)
+
+    async def _hold(self, collection: str, seq: int, data: List[Dict]):
+        """
+        Append a spooled batch to its in-memory buffer
+        """
+        if collection == "translation_sessions":
+            async with self._session_lock:
+                self.session_buffer.extend(data)
+                self._session_seqs.append(seq)
+        else:
+            async with self._task_lock:
+                self.task_buffer.extend(data)
+                self._task_seqs.append(seq)
+
+    async def _buffer_batch(self, collection: str, seq: int, data: List[Dict]):
+        """
+        Hold a spooled batch in memory, or leave it in the spool when full
+        Once anything has spilled, later batches spill too so order is kept.
+        """
+        if self._spilled_seqs or self.buffered_records + len(data) > self.max_buffered_records:
+            self._spilled_seqs.append(seq)
+            self.total_spilled_records += len(data)
+            logger.debug(f"Buffers full, {len(data)} {collection} records left in spool (seq {seq})")
+            return
+
+        await self._hold(collection, seq, data)
+        logger.debug(f"Added {len(data)} {collection} records to buffer (total: {self.buffered_records})")
+
+    async def _reload_spilled(self) -> int:
+        """
+        Move spilled batches from the spool back into the buffers while they fit
+
+        Returns:
+            Number of reloaded records
+        """
+        reloaded = 0
+        while self._spilled_seqs and self.buffered_records < self.max_buffered_records:
+            chunk = self._spilled_seqs[:self.RELOAD_CHUNK]
+            batches = await asyncio.to_thread(self.spool.read, chunk)
+            # Seqs the spool cannot return (corrupt records) are given up
+            done = set(chunk) - {seq for seq, _, _ in batches}
+
+            full = False
+            for seq, collection, data in batches:
+                room = self.max_buffered_records - self.buffered_records
+                # An oversized batch is still loaded into empty buffers so it can make progress
+                if len(data) > room and self.buffered_records:
+                    full = True
+                    break
+                await self._hold(collection, seq, data)
+                done.add(seq)
+                reloaded += len(data)
+
+            self._spilled_seqs = [seq for seq in self._spilled_seqs if seq not in done]
+            if full:
+                break
+
+        self.total_reloaded_records += reloaded
+        if reloaded:
+            logger.info(f"Reloaded {reloaded} spilled records from WAL spool")
+        return reloaded
+
     async def _check_and_flush(self):
         """
-        Check if flush is needed and trigger if necessary
+        Check if flush is needed and wake the background flusher
+        The flush itself never runs inline in the caller's request.
         """
         if self._should_flush():
-            await self.flush()
+            self._flush_event.set()
 
     def _should_flush(self) -> bool:
         """
@@ -115,7 +241,8 @@ class BufferManager:
         # Check buffer size
         buffer_full = (
             len(self.session_buffer) >= self.max_buffer_size or
-            len(self.task_buffer) >= self.max_buffer_size
+            len(self.task_buffer) >= self.max_buffer_size or
+            bool(self._spilled_seqs)
         )
 
         # Check time elapsed
@@ -123,109 +250,196 @@ class BufferManager:
 
         return buffer_full or time_expired
 
-    async def flush(self) -> Dict[str, Any]:
+    async def _take_snapshot(self):
         """
-        Flush buffers to storage
-
-        Returns:
-            Dictionary with flush results
+        Take everything currently buffered (and its spool seqs)
         """
-        async with self._flush_lock:
-            # Check if buffers are empty
-            if not self.session_buffer and not self.task_buffer:
-                return {
-                    "sessions": 0,
-                    "tasks": 0,
-                    "duration_ms": 0
-                }
+        async with self._session_lock:
+            sessions = self.session_buffer
+            session_seqs = self._session_seqs
+            self.session_buffer, self._session_seqs = [], []
 
-            start_time = time.time()
+        async with self._task_lock:
+            tasks = self.task_buffer
+            task_seqs = self._task_seqs
+            self.task_buffer, self._task_seqs = [], []
 
-            # Get snapshots and clear buffers
-            async with self._session_lock:
-                sessions_to_write = self.session_buffer.copy()
-                self.session_buffer.clear()
+        return sessions, session_seqs, tasks, task_seqs
 
-            async with self._task_lock:
-                tasks_to_write = self.task_buffer.copy()
-                self.task_buffer.clear()
+    async def _restore_snapshot(self, sessions, session_seqs, tasks, task_seqs):
+        """
+        Put a failed snapshot back at the front of the buffers
+        """
+        async with self._session_lock:
+            self.session_buffer[:0] = sessions
+            self._session_seqs[:0] = session_seqs
 
-            logger.info(
-                f"Flushing buffers: {len(sessions_to_write)} sessions, "
-                f"{len(tasks_to_write)} tasks"
-            )
+        async with self._task_lock:
+            self.task_buffer[:0] = tasks
+            self._task_seqs[:0] = task_seqs
 
-            sessions_written = 0
-            tasks_written = 0
+    def _partition(self, collection: str, data: List[Dict]) -> List[List[Dict]]:
+        """
+        Split records into key-hashed partitions for concurrent writes
+        All records of one key land in the same partition, in arrival order,
+        so concurrent upserts can never reorder updates to the same row.
+        """
+        partitions = max(1, self.max_concurrent_flushes)
+        if partitions == 1 or len(data) <= 1:
+            return [data]
 
-            try:
-                # Get storage backend
-                session_backend = StorageBackendRegistry.get_backend("translation_sessions")
-                task_backend = StorageBackendRegistry.get_backend("translation_tasks")
-
-                # Flush sessions
-                if sessions_to_write:
-                    sessions_written = await session_backend.write(
-                        "translation_sessions",
-                        sessions_to_write
-                    )
-                    logger.info(f"Wrote {sessions_written} sessions to database")
-
-                # Flush tasks
-                if tasks_to_write:
-                    tasks_written = await task_backend.write(
-                        "translation_tasks",
-                        tasks_to_write
-                    )
-                    logger.info(f"Wrote {tasks_written} tasks to database")
-
-                # Update statistics
-                self.total_sessions_written += sessions_written
-                self.total_tasks_written += tasks_written
-                self.total_flush_count += 1
-                self.last_flush_time = time.time()
-
-                # Calculate duration
-                duration_ms = int((time.time() - start_time) * 1000)
-                self.last_flush_duration_ms = duration_ms
-
-                logger.info(
-                    f"Flush completed: {sessions_written} sessions, "
-                    f"{tasks_written} tasks in {duration_ms}ms"
-                )
+        key_field = "session_id" if collection == "translation_sessions" else "task_id"
+        groups: List[List[Dict]] = [[] for _ in range(partitions)]
+        for record in data:
+            groups[hash(record.get(key_field)) % partitions].append(record)
+        return [group for group in groups if group]
 
-                return {
-                    "sessions": sessions_written,
-                    "tasks": tasks_written,
-                    "duration_ms": duration_ms
-                }
+    async def _write_collection(self, collection: str, data: List[Dict]) -> int:
+        """
+        Write one collection with bounded concurrency across partitions
+        """
+        results = await asyncio.gather(
+            *(self._write_with_retry(collection, part) for part in self._partition(collection, data)),
+            return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+        return sum(results)
 
+    async def _write_with_retry(self, collection: str, data: List[Dict]) -> int:
+        """
+        Write one collection to its backend, retrying with exponential backoff
+        """
+        backend = StorageBackendRegistry.get_backend(collection)
+        attempt = 0
+        while True:
+            try:
+                return await backend.write(collection, data)
             except Exception as e:
-                logger.error(f"Flush failed: {e}")
-
-                # IMPORTANT: Accept data loss on failure
-                # Clear buffers even on error (design trade-off)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                self.total_flush_retries += 1
+                delay = self.retry_backoff * (2 ** (attempt - 1))
                 logger.warning(
-                    f"Data loss: {len(sessions_to_write)} sessions, "
-                    f"{len(tasks_to_write)} tasks"
+                    f"Write of {len(data)} records to {collection} failed "
+                    f"(attempt {attempt}/{self.max_retries}): {e}; retrying in {delay:.1f}s"
                 )
+                await asyncio.sleep(delay)
+
+    async def _flush_once(self) -> Dict[str, Any]:
+        """
+        Flush one snapshot of the buffers to storage
+
+        Returns:
+            Dictionary with flush results
 
-                raise
+        Raises:
+            Exception: If the backend write still fails after retries
+                (the snapshot is restored to the buffers, nothing is lost)
+        """
+        sessions, session_seqs, tasks, task_seqs = await self._take_snapshot()
+        if not sessions and not tasks and self._spilled_seqs:
+            await self._reload_spilled()
+            sessions, session_seqs, tasks, task_seqs = await self._take_snapshot()
+        if not sessions and not tasks:
+            return {
+                "sessions": 0,
+                "tasks": 0,
+                "duration_ms": 0
+            }
+
+        start_time = time.time()
+        logger.info(
+            f"Flushing buffers: {len(sessions)} sessions, "
+            f"{len(tasks)} tasks"
+        )
+
+        sessions_written = 0
+        tasks_written = 0
+
+        try:
+            # Flush sessions
+            if sessions:
+                sessions_written = await self._write_collection("translation_sessions", sessions)
+                self.spool.mark_applied(session_seqs)
+                sessions, session_seqs = [], []
+                logger.info(f"Wrote {sessions_written} sessions to database")
+
+            # Flush tasks
+            if tasks:
+                tasks_written = await self._write_collection("translation_tasks", tasks)
+                self.spool.mark_applied(task_seqs)
+                tasks, task_seqs = [], []
+                logger.info(f"Wrote {tasks_written} tasks to database")
+
+        except Exception as e:
+            self.total_flush_failures += 1
+            logger.error(
+                f"Flush failed after {self.max_retries} retries: {e}; "
+                f"keeping {len(sessions)} sessions, {len(tasks)} tasks in buffer (spooled)"
+            )
+            await self._restore_snapshot(sessions, session_seqs, tasks, task_seqs)
+            raise
+
+        finally:
+            self.total_sessions_written += sessions_written
+            self.total_tasks_written += tasks_written
+
+        # Update statistics
+        self.total_flush_count += 1
+        self.last_flush_time = time.time()
+
+        # Calculate duration
+        duration_ms = int((time.time() - start_time) * 1000)
+        self.last_flush_duration_ms = duration_ms
+
+        logger.info(
+            f"Flush completed: {sessions_written} sessions, "
+            f"{tasks_written} tasks in {duration_ms}ms"
+        )
+
+        # Room was made: bring spilled batches back and flush them next
+        if await self._reload_spilled():
+            self._flush_event.set()
+
+        return {
+            "sessions": sessions_written,
+            "tasks": tasks_written,
+            "duration_ms": duration_ms
+        }
+
+    async def flush(self) -> Dict[str, Any]:
+        """
+        Flush buffers to storage
+        Flushes are serialized so successive snapshots reach storage in order.
+
+        Returns:
+            Dictionary with flush results
+        """
+        async with self._flush_lock:
+            return await self._flush_once()
 
     async def start_periodic_flush(self):
         """
         Start periodic flush task
-        Runs in background and flushes buffers every flush_interval seconds
+        Runs in background and flushes buffers every flush_interval seconds,
+        or as soon as a buffer fills up
         """
         self._running = True
         logger.info(f"Starting periodic flush task (interval: {self.flush_interval}s)")
 
         while self._running:
             try:
-                await asyncio.sleep(self.flush_interval)
-
-                # Flush if there's data
-                if self.session_buffer or self.task_buffer:
+                try:
+                    await asyncio.wait_for(self._flush_event.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_event.clear()
+
+                # Flush if there's data (failures stay buffered and spooled)
+                if self.session_buffer or self.task_buffer or self._spilled_seqs:
                     await self.flush()
 
             except asyncio.CancelledError:
@@ -240,6 +454,7 @@ class BufferManager:
         Stop periodic flush task
         """
         self._running = False
+        self._flush_event.set()
         logger.info("Stopping periodic flush task")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -262,7 +477,15 @@ class BufferManager:
             "last_flush_duration_ms": self.last_flush_duration_ms,
             "total_sessions_written": self.total_sessions_written,
             "total_tasks_written": self.total_tasks_written,
-            "total_flush_count": self.total_flush_count
+            "total_flush_count": self.total_flush_count,
+            "total_flush_retries": self.total_flush_retries,
+            "total_flush_failures": self.total_flush_failures,
+            "max_concurrent_flushes": self.max_concurrent_flushes,
+            "max_buffered_records": self.max_buffered_records,
+            "spilled_batches": len(self._spilled_seqs),
+            "total_spilled_records": self.total_spilled_records,
+            "total_reloaded_records": self.total_reloaded_records,
+            "spool": self.spool.get_stats()
         }
 
 
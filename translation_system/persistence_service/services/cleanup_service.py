@@ -4,9 +4,8 @@ Handles cleanup of old/expired data
 """
 import logging
 from typing import Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from storage.registry import StorageBackendRegistry
-from storage.mysql_plugin import MySQLPlugin
 
 logger = logging.getLogger(__name__)
 
@@ -35,21 +34,18 @@ class CleanupService:
             Dictionary with cleanup results
         """
         try:
-            # Get MySQL backend
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
+            # Get storage backends
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
+            task_backend = StorageBackendRegistry.get_backend("translation_tasks")
 
-            if not isinstance(backend, MySQLPlugin):
-                raise ValueError("MySQL backend not available for cleanup")
-
-            connector = backend.connector
-
-            # Calculate cutoff dates
-            completed_cutoff = (datetime.now() - timedelta(days=completed_days)).strftime('%Y-%m-%d')
-            failed_cutoff = (datetime.now() - timedelta(days=failed_days)).strftime('%Y-%m-%d')
+            # Calculate cutoffs in UTC; each backend converts them to its own clock
+            now = datetime.now(timezone.utc)
+            completed_cutoff = now - timedelta(days=completed_days)
+            failed_cutoff = now - timedelta(days=failed_days)
 
             logger.info(
-                f"Cleanup started: completed_cutoff={completed_cutoff}, "
-                f"failed_cutoff={failed_cutoff}, dry_run={dry_run}"
+                f"Cleanup started: completed_cutoff={completed_cutoff.isoformat()}, "
+                f"failed_cutoff={failed_cutoff.isoformat()}, dry_run={dry_run}"
             )
 
             # Query sessions to delete
@@ -63,7 +59,8 @@ class CleanupService:
             }
 
             # Get completed sessions
-            result_completed = await connector.query_sessions(
+            result_completed = await backend.query(
+                "translation_sessions",
                 filters=filters_completed,
                 page=1,
                 page_size=1000,
@@ -72,7 +69,8 @@ class CleanupService:
             )
 
             # Get failed sessions
-            result_failed = await connector.query_sessions(
+            result_failed = await backend.query(
+                "translation_sessions",
                 filters=filters_failed,
                 page=1,
                 page_size=1000,
@@ -88,7 +86,8 @@ class CleanupService:
                 # Count tasks that would be deleted
                 tasks_count = 0
                 for session in sessions_to_delete:
-                    result = await connector.query_tasks(
+                    result = await task_backend.query(
+                        "translation_tasks",
                         filters={'session_id': session['session_id']},
                         page=1,
                         page_size=1
@@ -115,7 +114,8 @@ class CleanupService:
                 session_id = session['session_id']
 
                 # Count tasks before deletion
-                result = await connector.query_tasks(
+                result = await task_backend.query(
+                    "translation_tasks",
                     filters={'session_id': session_id},
                     page=1,
                     page_size=1
@@ -123,7 +123,7 @@ class CleanupService:
                 task_count = result['total']
 
                 # Delete session (cascade deletes tasks)
-                success = await connector.delete_session(session_id)
+                success = await backend.delete("translation_sessions", session_id)
 
                 if success:
                     deleted_sessions += 1
@@ -2,8 +2,11 @@
 Query Service - Task 5.2
 Handles query operations with filtering, pagination, and sorting
 """
+import time
 import logging
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from config.settings import settings
 from models.api_models import (
     QueryResponse, Pagination, SessionFilters, TaskFilters
 )
@@ -12,12 +15,134 @@ from storage.registry import StorageBackendRegistry
 logger = logging.getLogger(__name__)
 
 
+class CountCache:
+    """
+    TTL cache for query totals
+    Totals are keyed by (collection, filters); a cached total may lag behind
+    writes by up to ttl seconds, which is acceptable for page counters.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        """
+        Initialize count cache
+
+        Args:
+            ttl: Seconds a total stays valid (0 disables caching)
+            max_entries: Maximum cached filter combinations (LRU eviction)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(collection: str, filters: Dict[str, Any]) -> Tuple:
+        return (collection,) + tuple(sorted((k, str(v)) for k, v in filters.items()))
+
+    def get(self, key: Tuple) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple, total: int):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic(), total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, collection: Optional[str] = None):
+        """
+        Drop cached totals
+
+        Args:
+            collection: Only drop totals of this collection (all if None)
+        """
+        if collection is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == collection]:
+            del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
 class QueryService:
     """
     Query service for sessions and tasks
     Provides high-level query interface with pagination
     """
 
+    def __init__(self):
+        self.count_cache = CountCache(
+            ttl=settings.query.count_cache_ttl,
+            max_entries=settings.query.count_cache_size
+        )
+
+    async def _query(
+        self,
+        collection: str,
+        filters: Dict[str, Any],
+        pagination: Pagination
+    ) -> QueryResponse:
+        """
+        Run one page query, reusing a cached total when available
+
+        Args:
+            collection: Collection name
+            filters: Filter conditions
+            pagination: Pagination parameters (page or cursor)
+
+        Returns:
+            QueryResponse with results and next_cursor
+        """
+        backend = StorageBackendRegistry.get_backend(collection)
+
+        cache_key = self.count_cache.make_key(collection, filters)
+        cached_total = self.count_cache.get(cache_key)
+
+        result = await backend.query(
+            collection,
+            filters,
+            page=pagination.page,
+            page_size=pagination.page_size,
+            sort_by=pagination.sort_by,
+            order=pagination.order,
+            cursor=pagination.cursor,
+            include_total=cached_total is None
+        )
+
+        if cached_total is None:
+            total = result['total']
+            self.count_cache.put(cache_key, total)
+        else:
+            total = cached_total
+
+        # Calculate total pages
+        total_pages = (total + pagination.page_size - 1) // pagination.page_size
+
+        return QueryResponse(
+            total=total,
+            page=pagination.page,
+            page_size=pagination.page_size,
+            total_pages=total_pages,
+            items=result['items'],
+            next_cursor=result.get('next_cursor'),
+            total_cached=cached_total is not None
+        )
+
     async def query_sessions(
         self,
         filters: SessionFilters,
@@ -34,29 +159,7 @@ class QueryService:
             QueryResponse with results
         """
         try:
-            # Get storage backend
-            backend = StorageBackendRegistry.get_backend("translation_sessions")
-
-            # Query
-            result = await backend.query(
-                "translation_sessions",
-                filters.model_dump(exclude_none=True),
-                page=pagination.page,
-                page_size=pagination.page_size,
-                sort_by=pagination.sort_by,
-                order=pagination.order
-            )
-
-            # Calculate total pages
-            total_pages = (result['total'] + pagination.page_size - 1) // pagination.page_size
-
-            return QueryResponse(
-                total=result['total'],
-                page=pagination.page,
-                page_size=pagination.page_size,
-                total_pages=total_pages,
-                items=result['items']
-            )
+            return await self._query("translation_sessions", filters.model_dump(exclude_none=True), pagination)
 
         except Exception as e:
             logger.error(f"Failed to query sessions: {e}")
@@ -96,29 +199,7 @@ class QueryService:
             QueryResponse with results
         """
         try:
-            # Get storage backend
-            backend = StorageBackendRegistry.get_backend("translation_tasks")
-
-            # Query
-            result = await backend.query(
-                "translation_tasks",
-                filters.model_dump(exclude_none=True),
-                page=pagination.page,
-                page_size=pagination.page_size,
-                sort_by=pagination.sort_by,
-                order=pagination.order
-            )
-
-            # Calculate total pages
-            total_pages = (result['total'] + pagination.page_size - 1) // pagination.page_size
-
-            return QueryResponse(
-                total=result['total'],
-                page=pagination.page,
-                page_size=pagination.page_size,
-                total_pages=total_pages,
-                items=result['items']
-            )
+            return await self._query("translation_tasks", filters.model_dump(exclude_none=True), pagination)
 
         except Exception as e:
             logger.error(f"Failed to query tasks: {e}")
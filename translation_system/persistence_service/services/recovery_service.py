@@ -6,7 +6,6 @@ import logging
 from typing import List, Dict, Any
 from datetime import datetime
 from storage.registry import StorageBackendRegistry
-from storage.mysql_plugin import MySQLPlugin
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +24,15 @@ class RecoveryService:
             List of incomplete session dictionaries
         """
         try:
-            # Get MySQL backend for special query
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
+            # Get storage backend for special query
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
 
-            if isinstance(backend, MySQLPlugin):
-                sessions = await backend.get_incomplete_sessions()
-                logger.info(f"Found {len(sessions)} incomplete sessions")
-                return sessions
-            else:
-                raise ValueError("MySQL backend not available for recovery")
+            if not hasattr(backend, "get_incomplete_sessions"):
+                raise ValueError("Storage backend does not support recovery")
+
+            sessions = await backend.get_incomplete_sessions()
+            logger.info(f"Found {len(sessions)} incomplete sessions")
+            return sessions
 
         except Exception as e:
             logger.error(f"Failed to get incomplete sessions: {e}")
@@ -50,11 +49,11 @@ class RecoveryService:
             Dictionary with session and all incomplete tasks
         """
         try:
-            # Get MySQL backend for special query
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
+            # Get storage backend for special query
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
 
-            if not isinstance(backend, MySQLPlugin):
-                raise ValueError("MySQL backend not available for recovery")
+            if not hasattr(backend, "get_session_with_tasks"):
+                raise ValueError("Storage backend does not support recovery")
 
             # Get session with tasks
             result = await backend.get_session_with_tasks(session_id)
@@ -5,7 +5,6 @@ Provides system and storage statistics
 import logging
 from typing import Dict, Any
 from storage.registry import StorageBackendRegistry
-from storage.mysql_plugin import MySQLPlugin
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +23,12 @@ class StatsService:
             Dictionary with all statistics
         """
         try:
-            # Get MySQL backend
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
+            # Get storage backend
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
 
-            if isinstance(backend, MySQLPlugin):
-                stats = await backend.get_stats()
-                logger.debug(f"Retrieved statistics: {stats}")
-                return stats
-            else:
-                raise ValueError("MySQL backend not available for stats")
+            stats = await backend.get_stats()
+            logger.debug(f"Retrieved statistics: {stats}")
+            return stats
 
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
@@ -46,13 +42,8 @@ class StatsService:
             Dictionary with session statistics
         """
         try:
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
-
-            if isinstance(backend, MySQLPlugin):
-                stats = await backend.connector.get_sessions_stats()
-                return stats
-            else:
-                raise ValueError("MySQL backend not available")
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
+            return await backend.get_sessions_stats()
 
         except Exception as e:
             logger.error(f"Failed to get session stats: {e}")
@@ -66,13 +57,8 @@ class StatsService:
             Dictionary with task statistics
         """
         try:
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
-
-            if isinstance(backend, MySQLPlugin):
-                stats = await backend.connector.get_tasks_stats()
-                return stats
-            else:
-                raise ValueError("MySQL backend not available")
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
+            return await backend.get_tasks_stats()
 
         except Exception as e:
             logger.error(f"Failed to get task stats: {e}")
@@ -86,13 +72,8 @@ class StatsService:
             Dictionary with storage statistics
         """
         try:
-            backend = StorageBackendRegistry.get_backend_by_name("mysql")
-
-            if isinstance(backend, MySQLPlugin):
-                stats = await backend.connector.get_database_stats()
-                return stats
-            else:
-                raise ValueError("MySQL backend not available")
+            backend = StorageBackendRegistry.get_backend("translation_sessions")
+            return await backend.get_database_stats()
 
         except Exception as e:
             logger.error(f"Failed to get storage stats: {e}")
@@ -0,0 +1,255 @@
+"""
+WAL Spool
+Durable write-ahead spool for buffered writes (sessions/tasks)
+"""
+import os
+import json
+import zlib
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class WALSpool:
+    """
+    Append-only write-ahead spool
+    Every accepted batch is appended (and fsync'ed) before the caller is
+    acknowledged. Records are grouped into segment files; a segment is
+    deleted once every record in it has been applied to the storage backend.
+    Replay after a crash is safe because backend writes are upserts.
+
+    Record format (one per line): "<crc32 hex> <json>\\n"
+    """
+
+    SEGMENT_PREFIX = "spool_"
+    SEGMENT_SUFFIX = ".wal"
+
+    def __init__(
+        self,
+        spool_dir: str,
+        segment_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = True
+    ):
+        """
+        Initialize WAL spool
+
+        Args:
+            spool_dir: Directory for spool segment files
+            segment_bytes: Rotate to a new segment above this size
+            fsync: fsync each append before acknowledging
+        """
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._next_seq = 1
+        self._active_path: Path = None
+        self._active_file = None
+        # segment path -> seqs appended but not yet applied
+        self._outstanding: Dict[Path, Set[int]] = {}
+        self._seq_segment: Dict[int, Path] = {}
+
+        # Statistics
+        self.total_appended = 0
+        self.total_applied = 0
+        self.total_recovered = 0
+        self.corrupt_records = 0
+
+    # ------------------------------------------------------------------
+    # Segment handling
+    # ------------------------------------------------------------------
+
+    def _segment_paths(self) -> List[Path]:
+        return sorted(self.spool_dir.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"))
+
+    def _open_new_segment(self):
+        if self._active_file:
+            self._active_file.close()
+        self._active_path = self.spool_dir / f"{self.SEGMENT_PREFIX}{self._next_seq:012d}{self.SEGMENT_SUFFIX}"
+        self._active_file = open(self._active_path, "ab")
+        self._outstanding.setdefault(self._active_path, set())
+
+    def _read_segment(self, path: Path):
+        """
+        Yield the intact records of a segment file
+
+        Torn or corrupt records (crash mid-append) are counted and skipped.
+        """
+        with open(path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    self.corrupt_records += 1
+                    continue
+                try:
+                    crc_hex, payload = raw.rstrip(b"\n").split(b" ", 1)
+                    if int(crc_hex, 16) != zlib.crc32(payload):
+                        raise ValueError("crc mismatch")
+                    record = json.loads(payload)
+                except ValueError:
+                    self.corrupt_records += 1
+                    continue
+                yield record
+
+    def _release_segment_if_done(self, path: Path):
+        if path == self._active_path or self._outstanding.get(path):
+            return
+        self._outstanding.pop(path, None)
+        try:
+            path.unlink()
+            logger.debug(f"Removed applied spool segment: {path.name}")
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def append(self, collection: str, data: List[Dict]) -> int:
+        """
+        Durably append a batch
+
+        Args:
+            collection: Target collection name
+            data: Records to write
+
+        Returns:
+            Sequence number of the spooled batch
+        """
+        with self._lock:
+            if self._active_file is None or self._active_file.tell() >= self.segment_bytes:
+                self._open_new_segment()
+
+            seq = self._next_seq
+            self._next_seq += 1
+
+            payload = json.dumps(
+                {"seq": seq, "collection": collection, "data": data},
+                ensure_ascii=False,
+                default=str
+            ).encode("utf-8")
+            line = b"%08x " % zlib.crc32(payload) + payload + b"\n"
+
+            self._active_file.write(line)
+            self._active_file.flush()
+            if self.fsync:
+                os.fsync(self._active_file.fileno())
+
+            self._outstanding[self._active_path].add(seq)
+            self._seq_segment[seq] = self._active_path
+            self.total_appended += 1
+            return seq
+
+    def mark_applied(self, seqs: List[int]):
+        """
+        Mark spooled batches as applied to storage
+
+        Args:
+            seqs: Sequence numbers returned by append()/recover()
+        """
+        with self._lock:
+            touched = set()
+            for seq in seqs:
+                path = self._seq_segment.pop(seq, None)
+                if path is None:
+                    continue
+                self._outstanding.get(path, set()).discard(seq)
+                touched.add(path)
+                self.total_applied += 1
+
+            # Rotate a fully-applied active segment so it can be removed too
+            if self._active_path in touched and not self._outstanding.get(self._active_path):
+                self._active_file.close()
+                self._active_file = None
+                active, self._active_path = self._active_path, None
+                self._release_segment_if_done(active)
+                touched.discard(active)
+
+            for path in touched:
+                self._release_segment_if_done(path)
+
+    def recover(self) -> List[Tuple[int, str, List[Dict]]]:
+        """
+        Read every unapplied batch left by a previous run
+
+        Torn or corrupt trailing records (crash mid-append) are skipped.
+
+        Returns:
+            List of (seq, collection, data) in append order
+        """
+        recovered = []
+        with self._lock:
+            for path in self._segment_paths():
+                seqs = set()
+                for record in self._read_segment(path):
+                    seq = record["seq"]
+                    seqs.add(seq)
+                    self._seq_segment[seq] = path
+                    self._next_seq = max(self._next_seq, seq + 1)
+                    recovered.append((seq, record["collection"], record["data"]))
+
+                self._outstanding[path] = seqs
+                if not seqs:
+                    self._release_segment_if_done(path)
+
+        recovered.sort(key=lambda item: item[0])
+        self.total_recovered += len(recovered)
+        if recovered:
+            logger.warning(f"Recovered {len(recovered)} unapplied batches from WAL spool")
+        return recovered
+
+    def read(self, seqs: List[int]) -> List[Tuple[int, str, List[Dict]]]:
+        """
+        Read back unapplied batches by sequence number
+        Used to reload batches that were spooled but not kept in memory.
+
+        Args:
+            seqs: Sequence numbers returned by append()/recover()
+
+        Returns:
+            List of (seq, collection, data) in append order
+        """
+        with self._lock:
+            wanted = {seq for seq in seqs if seq in self._seq_segment}
+            paths = sorted({self._seq_segment[seq] for seq in wanted})
+            found = []
+            for path in paths:
+                for record in self._read_segment(path):
+                    if record["seq"] in wanted:
+                        found.append((record["seq"], record["collection"], record["data"]))
+
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def close(self):
+        """
+        Close the active segment
+        """
+        with self._lock:
+            if self._active_file:
+                self._active_file.close()
+                self._active_file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get spool statistics
+
+        Returns:
+            Dictionary with spool statistics
+        """
+        with self._lock:
+            segments = self._segment_paths()
+            return {
+                "spool_dir": str(self.spool_dir),
+                "segments": len(segments),
+                "size_bytes": sum(p.stat().st_size for p in segments if p.exists()),
+                "pending_batches": len(self._seq_segment),
+                "total_appended": self.total_appended,
+                "total_applied": self.total_applied,
+                "total_recovered": self.total_recovered,
+                "corrupt_records": self.corrupt_records
+            }
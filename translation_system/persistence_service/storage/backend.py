@@ -48,7 +48,9 @@ class StorageBackend(ABC):
         page: int = 1,
         page_size: int = 20,
         sort_by: str = "created_at",
-        order: str = "desc"
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         Query data with filtering, pagination, and sorting
@@ -56,13 +58,16 @@ class StorageBackend(ABC):
         Args:
             collection: Collection/table name
             filters: Filter conditions
-            page: Page number (1-indexed)
+            page: Page number (1-indexed, ignored when cursor is given)
             page_size: Number of items per page
             sort_by: Column/field to sort by
             order: Sort order ('asc' or 'desc')
+            cursor: Keyset cursor returned as 'next_cursor' by the previous page
+            include_total: Whether to count matching records
 
         Returns:
-            Dictionary with 'total' count and 'items' list
+            Dictionary with 'total' count (None if not counted), 'items' list
+            and 'next_cursor' (None on the last page)
         """
         pass
 
@@ -3,6 +3,7 @@ MySQL Storage Plugin - Task 4.2
 Implementation of StorageBackend for MySQL
 """
 import logging
+from datetime import datetime
 from typing import List, Dict, Any, Optional
 from .backend import StorageBackend
 from database.mysql_connector import mysql_connector
@@ -10,6 +11,19 @@ from database.mysql_connector import mysql_connector
 logger = logging.getLogger(__name__)
 
 
+def _local_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert timezone-aware date filters to naive local time
+    TIMESTAMP columns are compared in the session (server local) time zone.
+    """
+    result = dict(filters)
+    for key in ('from_date', 'to_date'):
+        value = result.get(key)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            result[key] = value.astimezone().replace(tzinfo=None)
+    return result
+
+
 class MySQLPlugin(StorageBackend):
     """
     MySQL storage backend implementation
@@ -89,7 +103,9 @@ class MySQLPlugin(StorageBackend):
         page: int = 1,
         page_size: int = 20,
         sort_by: str = "created_at",
-        order: str = "desc"
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         Query data with filtering, pagination, and sorting
@@ -97,21 +113,26 @@ class MySQLPlugin(StorageBackend):
         Args:
             collection: Table name
             filters: Filter conditions
-            page: Page number (1-indexed)
+            page: Page number (1-indexed, ignored when cursor is given)
             page_size: Number of items per page
             sort_by: Column to sort by
             order: Sort order ('asc' or 'desc')
+            cursor: Keyset cursor from the previous page
+            include_total: Whether to count matching rows
 
         Returns:
-            Dictionary with 'total' count and 'items' list
+            Dictionary with 'total' count, 'items' list and 'next_cursor'
         """
+        filters = _local_filters(filters)
         if collection == "translation_sessions":
             return await self.connector.query_sessions(
                 filters=filters,
                 page=page,
                 page_size=page_size,
                 sort_by=sort_by,
-                order=order
+                order=order,
+                cursor=cursor,
+                include_total=include_total
             )
         elif collection == "translation_tasks":
             return await self.connector.query_tasks(
@@ -119,7 +140,9 @@ class MySQLPlugin(StorageBackend):
                 page=page,
                 page_size=page_size,
                 sort_by=sort_by,
-                order=order
+                order=order,
+                cursor=cursor,
+                include_total=include_total
             )
         else:
             raise ValueError(f"Unknown collection: {collection}")
@@ -165,6 +188,24 @@ class MySQLPlugin(StorageBackend):
         """
         return await self.connector.get_session_with_tasks(session_id)
 
+    async def get_sessions_stats(self) -> Dict[str, Any]:
+        """
+        Get session statistics (helper method)
+        """
+        return await self.connector.get_sessions_stats()
+
+    async def get_tasks_stats(self) -> Dict[str, Any]:
+        """
+        Get task statistics (helper method)
+        """
+        return await self.connector.get_tasks_stats()
+
+    async def get_database_stats(self) -> Dict[str, Any]:
+        """
+        Get database storage statistics (helper method)
+        """
+        return await self.connector.get_database_stats()
+
     async def get_stats(self) -> Dict[str, Any]:
         """
         Get storage statistics (helper method)
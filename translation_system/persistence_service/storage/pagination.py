@@ -0,0 +1,135 @@
+"""
+Keyset Pagination Helpers
+Opaque cursors and seek predicates shared by the storage backends
+
+A cursor encodes the (sort_key, primary_key) of the last row of a page. The
+next page is fetched with a seek predicate on that pair instead of OFFSET,
+so each page costs one index range scan regardless of how deep it is.
+"""
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query"""
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        fmt = '%Y-%m-%d %H:%M:%S.%f' if value.microsecond else '%Y-%m-%d %H:%M:%S'
+        return value.strftime(fmt)
+    return value
+
+
+def encode_cursor(sort_by: str, order: str, item: Dict[str, Any], primary_key: str) -> str:
+    """
+    Build the cursor pointing just after an item
+
+    Args:
+        sort_by: Sort column of the query
+        order: Sort order ('ASC' or 'DESC')
+        item: Last item of the current page
+        primary_key: Primary key column (tie-breaker)
+
+    Returns:
+        URL-safe opaque cursor string
+    """
+    payload = {
+        "s": sort_by,
+        "o": order.upper(),
+        "v": _cursor_value(item.get(sort_by)),
+        "k": item.get(primary_key)
+    }
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous page
+        sort_by: Sort column of the current query
+        order: Sort order of the current query
+
+    Returns:
+        (sort_value, primary_key_value) of the last row already returned
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_value, key_value = payload["v"], payload["k"]
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}")
+
+    if cursor_sort != sort_by or cursor_order != order.upper():
+        raise InvalidCursorError(
+            f"Cursor was issued for sort {cursor_sort} {cursor_order}, "
+            f"not {sort_by} {order.upper()}"
+        )
+    if key_value is None:
+        raise InvalidCursorError("Invalid cursor: missing key")
+    return sort_value, key_value
+
+
+def keyset_clause(
+    sort_by: str,
+    order: str,
+    primary_key: str,
+    cursor: Optional[str],
+    placeholder: str = "%s"
+) -> Tuple[Optional[str], List[Any]]:
+    """
+    Build the seek predicate for a cursor
+
+    The predicate is expanded ((a > x) OR (a = x AND pk > y)) rather than a row
+    constructor so both MySQL and SQLite can use the (filter, sort) index for it.
+
+    Args:
+        sort_by: Sort column (already validated)
+        order: 'ASC' or 'DESC'
+        primary_key: Primary key column
+        cursor: Cursor string or None for the first page
+        placeholder: Parameter placeholder of the driver
+
+    Returns:
+        (SQL predicate or None, parameters)
+    """
+    if not cursor:
+        return None, []
+
+    sort_value, key_value = decode_cursor(cursor, sort_by, order)
+    op = ">" if order.upper() == "ASC" else "<"
+
+    if sort_by == primary_key:
+        return f"{primary_key} {op} {placeholder}", [key_value]
+
+    clause = (
+        f"({sort_by} {op} {placeholder} OR "
+        f"({sort_by} = {placeholder} AND {primary_key} {op} {placeholder}))"
+    )
+    return clause, [sort_value, sort_value, key_value]
+
+
+def order_clause(sort_by: str, order: str, primary_key: str) -> str:
+    """
+    ORDER BY expression with the primary key as a deterministic tie-breaker
+
+    Args:
+        sort_by: Sort column (already validated)
+        order: 'ASC' or 'DESC'
+        primary_key: Primary key column
+
+    Returns:
+        ORDER BY expression (without the keyword)
+    """
+    if sort_by == primary_key:
+        return f"{primary_key} {order}"
+    return f"{sort_by} {order}, {primary_key} {order}"
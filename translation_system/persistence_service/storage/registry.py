@@ -164,18 +164,30 @@ def setup_storage_backends():
     Setup and register storage backends
     Called during application startup
     """
-    from .mysql_plugin import MySQLPlugin
+    from config.settings import settings
 
-    # Create MySQL plugin
-    mysql_plugin = MySQLPlugin()
+    backend_name = settings.storage.backend
 
-    # Register MySQL backend
-    StorageBackendRegistry.register("mysql", mysql_plugin)
+    if backend_name == "sqlite":
+        from .sqlite_plugin import SQLitePlugin
+
+        # Create embedded SQLite plugin
+        plugin = SQLitePlugin(settings.storage.sqlite_path)
+    elif backend_name == "mysql":
+        from .mysql_plugin import MySQLPlugin
+
+        # Create MySQL plugin
+        plugin = MySQLPlugin()
+    else:
+        raise ValueError(f"Unknown storage backend: {backend_name}")
+
+    # Register backend
+    StorageBackendRegistry.register(backend_name, plugin)
 
     # Register collection routing rules
-    StorageBackendRegistry.register_collection("translation_sessions", "mysql")
-    StorageBackendRegistry.register_collection("translation_tasks", "mysql")
+    StorageBackendRegistry.register_collection("translation_sessions", backend_name)
+    StorageBackendRegistry.register_collection("translation_tasks", backend_name)
 
     logger.info("Storage backends setup complete")
     logger.info(f"Backends: {StorageBackendRegistry.list_backends()}")
-    logger.info(f"Collections: {StorageBackendRegistry.list_collections()}")
\ No newline at end of file
+    logger.info(f"Collections: {StorageBackendRegistry.list_collections()}")
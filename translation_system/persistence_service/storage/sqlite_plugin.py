@@ -0,0 +1,536 @@
+"""
+SQLite Storage Plugin
+Embedded implementation of StorageBackend for small deployments and CI
+"""
+import os
+import json
+import sqlite3
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+from .backend import StorageBackend
+from .pagination import keyset_clause, order_clause, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+
+# Same tables and indexes as database/schema.sql
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translation_sessions (
+    session_id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    game_info TEXT,
+    llm_provider TEXT NOT NULL,
+    metadata TEXT,
+    total_tasks INTEGER DEFAULT 0,
+    completed_tasks INTEGER DEFAULT 0,
+    failed_tasks INTEGER DEFAULT 0,
+    processing_tasks INTEGER DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON translation_sessions(status);
+CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON translation_sessions(created_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON translation_sessions(updated_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_llm_provider ON translation_sessions(llm_provider);
+
+CREATE TABLE IF NOT EXISTS translation_tasks (
+    task_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES translation_sessions(session_id) ON DELETE CASCADE,
+    batch_id TEXT NOT NULL,
+    sheet_name TEXT NOT NULL,
+    row_index INTEGER NOT NULL,
+    column_name TEXT NOT NULL,
+    source_text TEXT NOT NULL,
+    target_text TEXT,
+    context TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    confidence REAL,
+    error_message TEXT,
+    retry_count INTEGER DEFAULT 0,
+    start_time TEXT,
+    end_time TEXT,
+    duration_ms INTEGER,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_session_id ON translation_tasks(session_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_batch_id ON translation_tasks(batch_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON translation_tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_session_status ON translation_tasks(session_id, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_session_row ON translation_tasks(session_id, row_index, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_sheet_name ON translation_tasks(sheet_name);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON translation_tasks(created_at);
+"""
+
+UPSERT_SESSION_SQL = """
+    INSERT INTO translation_sessions
+    (session_id, filename, file_path, status, game_info, llm_provider,
+     metadata, total_tasks, completed_tasks, failed_tasks, processing_tasks)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        updated_at = CURRENT_TIMESTAMP,
+        status = excluded.status,
+        total_tasks = MAX(total_tasks, excluded.total_tasks),
+        completed_tasks = MAX(completed_tasks, excluded.completed_tasks),
+        failed_tasks = MAX(failed_tasks, excluded.failed_tasks),
+        processing_tasks = excluded.processing_tasks,
+        metadata = excluded.metadata
+"""
+
+UPSERT_TASK_SQL = """
+    INSERT INTO translation_tasks
+    (task_id, session_id, batch_id, sheet_name, row_index, column_name,
+     source_text, target_text, context, status, confidence, error_message,
+     retry_count, start_time, end_time, duration_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(task_id) DO UPDATE SET
+        updated_at = CURRENT_TIMESTAMP,
+        target_text = excluded.target_text,
+        status = excluded.status,
+        confidence = excluded.confidence,
+        error_message = excluded.error_message,
+        retry_count = MAX(retry_count, excluded.retry_count),
+        end_time = excluded.end_time,
+        duration_ms = excluded.duration_ms
+"""
+
+
+def _format_time(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def _utc_time(value: Any) -> Any:
+    """
+    Format a filter datetime in UTC, the clock of SQLite CURRENT_TIMESTAMP
+    Naive datetimes are taken as local time.
+    """
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+class SQLitePlugin(StorageBackend):
+    """
+    SQLite storage backend implementation
+    Same write/read/query/delete contract (and upsert semantics) as MySQLPlugin.
+    Runs in WAL mode; each batch write is one transaction.
+    """
+
+    def __init__(self, db_path: str = "data/persistence.db"):
+        """
+        Initialize SQLite plugin
+
+        Args:
+            db_path: Database file path (':memory:' for tests)
+        """
+        self.db_path = db_path
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        logger.info(f"SQLite Plugin initialized: {db_path}")
+
+    async def _run(self, fn, *args):
+        """
+        Run a blocking database call off the event loop
+        """
+        def call():
+            with self._lock:
+                return fn(*args)
+        return await asyncio.to_thread(call)
+
+    async def initialize(self):
+        """
+        Open database, enable WAL mode and create schema
+        """
+        def init():
+            if self.db_path != ":memory:":
+                db_dir = os.path.dirname(self.db_path)
+                if db_dir:
+                    os.makedirs(db_dir, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            conn.commit()
+            self.conn = conn
+
+        await self._run(init)
+        logger.info(f"SQLite Plugin database ready (WAL mode): {self.db_path}")
+
+    async def close(self):
+        """
+        Close database connection
+        """
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+            logger.info("SQLite Plugin database closed")
+
+    async def health_check(self) -> bool:
+        """
+        Check SQLite database health
+
+        Returns:
+            True if healthy, False otherwise
+        """
+        if not self.conn:
+            return False
+        try:
+            await self._run(lambda: self.conn.execute("SELECT 1").fetchone())
+            return True
+        except Exception as e:
+            logger.error(f"SQLite health check failed: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Row helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _session_row(row: sqlite3.Row) -> Dict:
+        result = dict(row)
+        if result.get('game_info'):
+            result['game_info'] = json.loads(result['game_info'])
+        if result.get('metadata'):
+            result['metadata'] = json.loads(result['metadata'])
+        return result
+
+    def _fetch_all(self, sql: str, params=()) -> List[Dict]:
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def _fetch_one(self, sql: str, params=()) -> Optional[Dict]:
+        row = self.conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    # ------------------------------------------------------------------
+    # StorageBackend contract
+    # ------------------------------------------------------------------
+
+    async def write(self, collection: str, data: List[Dict]) -> int:
+        """
+        Batch write data to SQLite (single transaction per batch)
+
+        Args:
+            collection: Table name (translation_sessions or translation_tasks)
+            data: List of data dictionaries
+
+        Returns:
+            Number of affected rows
+        """
+        if not data:
+            return 0
+
+        if collection == "translation_sessions":
+            sql = UPSERT_SESSION_SQL
+            values = [(
+                s['session_id'],
+                s['filename'],
+                s['file_path'],
+                s['status'],
+                json.dumps(s.get('game_info')) if s.get('game_info') else None,
+                s['llm_provider'],
+                json.dumps(s.get('metadata')) if s.get('metadata') else None,
+                s.get('total_tasks', 0),
+                s.get('completed_tasks', 0),
+                s.get('failed_tasks', 0),
+                s.get('processing_tasks', 0)
+            ) for s in data]
+        elif collection == "translation_tasks":
+            sql = UPSERT_TASK_SQL
+            values = [(
+                t['task_id'],
+                t['session_id'],
+                t['batch_id'],
+                t['sheet_name'],
+                t['row_index'],
+                t['column_name'],
+                t['source_text'],
+                t.get('target_text'),
+                t.get('context'),
+                t['status'],
+                t.get('confidence'),
+                t.get('error_message'),
+                t.get('retry_count', 0),
+                _format_time(t.get('start_time')),
+                _format_time(t.get('end_time')),
+                t.get('duration_ms')
+            ) for t in data]
+        else:
+            raise ValueError(f"Unknown collection: {collection}")
+
+        def upsert():
+            with self.conn:
+                cursor = self.conn.executemany(sql, values)
+                return cursor.rowcount
+
+        try:
+            affected = await self._run(upsert)
+            logger.info(f"Batch upserted {len(data)} rows into {collection} ({affected} rows affected)")
+            return affected
+        except Exception as e:
+            logger.error(f"Failed to batch upsert {collection}: {e}")
+            raise
+
+    async def read(self, collection: str, key: str) -> Optional[Dict]:
+        """
+        Read single record by key
+
+        Args:
+            collection: Table name
+            key: Primary key value (session_id or task_id)
+
+        Returns:
+            Data dictionary or None
+        """
+        if collection == "translation_sessions":
+            row = await self._run(
+                lambda: self.conn.execute(
+                    "SELECT * FROM translation_sessions WHERE session_id = ?", (key,)
+                ).fetchone()
+            )
+            return self._session_row(row) if row else None
+        elif collection == "translation_tasks":
+            return await self._run(
+                self._fetch_one, "SELECT * FROM translation_tasks WHERE task_id = ?", (key,)
+            )
+        else:
+            raise ValueError(f"Unknown collection: {collection}")
+
+    async def query(
+        self,
+        collection: str,
+        filters: Dict[str, Any],
+        page: int = 1,
+        page_size: int = 20,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Query data with filtering, pagination, and sorting
+
+        Args:
+            collection: Table name
+            filters: Filter conditions
+            page: Page number (1-indexed, ignored when cursor is given)
+            page_size: Number of items per page
+            sort_by: Column to sort by
+            order: Sort order ('asc' or 'desc')
+            cursor: Keyset cursor from the previous page
+            include_total: Whether to count matching rows
+
+        Returns:
+            Dictionary with 'total' count, 'items' list and 'next_cursor'
+        """
+        if collection == "translation_sessions":
+            primary_key = 'session_id'
+            filter_columns = ['status', 'llm_provider']
+            allowed_sort_columns = ['session_id', 'filename', 'status', 'created_at', 'updated_at']
+        elif collection == "translation_tasks":
+            primary_key = 'task_id'
+            filter_columns = ['session_id', 'status', 'sheet_name', 'batch_id']
+            allowed_sort_columns = ['task_id', 'session_id', 'status', 'created_at', 'updated_at', 'row_index']
+        else:
+            raise ValueError(f"Unknown collection: {collection}")
+
+        # Build WHERE clause
+        where_clauses = []
+        params = []
+        for column in filter_columns:
+            if filters.get(column):
+                where_clauses.append(f"{column} = ?")
+                params.append(filters[column])
+
+        if filters.get('from_date'):
+            where_clauses.append("created_at >= ?")
+            params.append(_utc_time(filters['from_date']))
+
+        if filters.get('to_date'):
+            where_clauses.append("created_at <= ?")
+            params.append(_utc_time(filters['to_date']))
+
+        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+        # Validate sort_by / order to prevent SQL injection
+        if sort_by not in allowed_sort_columns:
+            sort_by = 'created_at'
+        order = order.upper() if order.upper() in ['ASC', 'DESC'] else 'DESC'
+
+        # Keyset seek from the cursor, OFFSET only for page-numbered access
+        seek_clause, seek_params = keyset_clause(sort_by, order, primary_key, cursor, placeholder="?")
+        page_clause = f"{where_clause} AND {seek_clause}" if seek_clause else where_clause
+        query_sql = (
+            f"SELECT * FROM {collection} WHERE {page_clause} "
+            f"ORDER BY {order_clause(sort_by, order, primary_key)} LIMIT ?"
+        )
+        query_params = params + seek_params + [page_size + 1]
+        if not cursor:
+            query_sql += " OFFSET ?"
+            query_params.append((page - 1) * page_size)
+
+        def run_query():
+            total = None
+            if include_total:
+                total = self.conn.execute(
+                    f"SELECT COUNT(*) FROM {collection} WHERE {where_clause}", params
+                ).fetchone()[0]
+            rows = self.conn.execute(query_sql, query_params).fetchall()
+            return total, rows
+
+        total, rows = await self._run(run_query)
+
+        if collection == "translation_sessions":
+            items = [self._session_row(row) for row in rows]
+        else:
+            items = [dict(row) for row in rows]
+
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor(sort_by, order, items[-1], primary_key)
+
+        return {
+            'total': total,
+            'items': items,
+            'next_cursor': next_cursor
+        }
+
+    async def delete(self, collection: str, key: str) -> bool:
+        """
+        Delete record by key
+
+        Args:
+            collection: Table name
+            key: Primary key value
+
+        Returns:
+            True if deleted, False if not found
+        """
+        if collection == "translation_sessions":
+            def delete_session():
+                with self.conn:
+                    return self.conn.execute(
+                        "DELETE FROM translation_sessions WHERE session_id = ?", (key,)
+                    ).rowcount
+            affected = await self._run(delete_session)
+            logger.info(f"Deleted session {key} ({affected} rows)")
+            return affected > 0
+        elif collection == "translation_tasks":
+            # Tasks are deleted via CASCADE when session is deleted
+            raise NotImplementedError("Direct task deletion not supported")
+        else:
+            raise ValueError(f"Unknown collection: {collection}")
+
+    # ------------------------------------------------------------------
+    # Helper methods (same as MySQLPlugin)
+    # ------------------------------------------------------------------
+
+    async def get_incomplete_sessions(self) -> List[Dict]:
+        """
+        Get all incomplete sessions (pending or processing)
+
+        Returns:
+            List of incomplete session dictionaries
+        """
+        rows = await self._run(lambda: self.conn.execute(
+            "SELECT * FROM translation_sessions "
+            "WHERE status IN ('pending', 'processing') ORDER BY created_at DESC"
+        ).fetchall())
+        return [self._session_row(row) for row in rows]
+
+    async def get_session_with_tasks(self, session_id: str) -> Dict:
+        """
+        Get session with all its incomplete tasks
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Dictionary with session and tasks
+        """
+        session = await self.read("translation_sessions", session_id)
+        if not session:
+            raise ValueError(f"Session not found: {session_id}")
+
+        tasks = await self._run(
+            self._fetch_all,
+            "SELECT * FROM translation_tasks "
+            "WHERE session_id = ? AND status IN ('pending', 'processing') "
+            "ORDER BY row_index, column_name",
+            (session_id,)
+        )
+        return {
+            'session': session,
+            'tasks': tasks
+        }
+
+    async def get_sessions_stats(self) -> Dict[str, Any]:
+        """
+        Get session statistics
+        """
+        return await self._run(self._fetch_one, """
+            SELECT
+                COUNT(*) as total_sessions,
+                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_count,
+                SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as processing_count,
+                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_count,
+                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_count
+            FROM translation_sessions
+        """)
+
+    async def get_tasks_stats(self) -> Dict[str, Any]:
+        """
+        Get task statistics
+        """
+        return await self._run(self._fetch_one, """
+            SELECT
+                COUNT(*) as total_tasks,
+                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending_count,
+                SUM(CASE WHEN status = 'processing' THEN 1 ELSE 0 END) as processing_count,
+                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_count,
+                SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed_count,
+                AVG(confidence) as avg_confidence,
+                AVG(duration_ms) as avg_duration_ms
+            FROM translation_tasks
+        """)
+
+    async def get_database_stats(self) -> Dict[str, Any]:
+        """
+        Get database storage statistics
+        """
+        def stats():
+            result = {}
+            for table in ('translation_sessions', 'translation_tasks'):
+                rows = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                result[table] = {'rows': rows}
+            if self.db_path != ":memory:" and os.path.exists(self.db_path):
+                size = os.path.getsize(self.db_path)
+                wal_path = f"{self.db_path}-wal"
+                if os.path.exists(wal_path):
+                    size += os.path.getsize(wal_path)
+                result['file_size_mb'] = round(size / 1024 / 1024, 2)
+            return result
+
+        return await self._run(stats)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics (helper method)
+
+        Returns:
+            Dictionary with statistics
+        """
+        return {
+            'sessions': await self.get_sessions_stats(),
+            'tasks': await self.get_tasks_stats(),
+            'storage': await self.get_database_stats()
+        }
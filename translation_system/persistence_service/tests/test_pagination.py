@@ -0,0 +1,127 @@
+"""Unit tests for keyset pagination cursors."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from storage.pagination import InvalidCursorError, decode_cursor, encode_cursor, keyset_clause
+from storage.sqlite_plugin import SQLitePlugin
+
+
+def _task(index: int) -> dict:
+    return {
+        "task_id": f"T{index:03d}",
+        "session_id": "s1",
+        "batch_id": "B1",
+        "sheet_name": "UI",
+        "row_index": index % 3,  # Many rows share each sort value
+        "column_name": "PT",
+        "source_text": "开始游戏",
+        "status": "pending"
+    }
+
+
+@pytest.fixture
+def plugin():
+    plugin = SQLitePlugin(":memory:")
+
+    async def setup():
+        await plugin.initialize()
+        await plugin.write("translation_sessions", [{
+            "session_id": "s1", "filename": "game.xlsx", "file_path": "/data/game.xlsx",
+            "status": "processing", "llm_provider": "qwen-plus"
+        }])
+        # One transaction: every row gets the same CURRENT_TIMESTAMP
+        await plugin.write("translation_tasks", [_task(i) for i in range(25)])
+
+    asyncio.run(setup())
+    yield plugin
+    asyncio.run(plugin.close())
+
+
+def _walk(plugin, page_size, sort_by="created_at", order="desc"):
+    """Follow next_cursor until the last page; returns the pages."""
+    pages = []
+    cursor = None
+    while True:
+        result = asyncio.run(plugin.query(
+            "translation_tasks", {"session_id": "s1"}, page_size=page_size,
+            sort_by=sort_by, order=order, cursor=cursor, include_total=False
+        ))
+        pages.append(result)
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 50, "cursor did not advance"
+
+
+class TestKeysetPagination:
+    """Test paging through a table with next_cursor."""
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_equal_timestamps_are_paged_without_gaps_or_duplicates(self, plugin, order):
+        assert len({task["created_at"] for task in plugin._fetch_all("SELECT created_at FROM translation_tasks")}) == 1
+
+        pages = _walk(plugin, page_size=4, order=order)
+        task_ids = [task["task_id"] for page in pages for task in page["items"]]
+
+        assert len(task_ids) == 25
+        assert len(set(task_ids)) == 25
+        # Ties on created_at are broken by the primary key in the same direction
+        assert task_ids == sorted(task_ids, reverse=(order == "desc"))
+
+    def test_non_unique_sort_column(self, plugin):
+        pages = _walk(plugin, page_size=3, sort_by="row_index", order="asc")
+        items = [task for page in pages for task in page["items"]]
+
+        assert len({task["task_id"] for task in items}) == 25
+        assert [(task["row_index"], task["task_id"]) for task in items] == sorted(
+            (task["row_index"], task["task_id"]) for task in items
+        )
+
+    def test_last_page_has_no_cursor(self, plugin):
+        pages = _walk(plugin, page_size=10)
+
+        assert [len(page["items"]) for page in pages] == [10, 10, 5]
+        assert pages[-1]["next_cursor"] is None
+
+    def test_exactly_full_last_page_has_no_cursor(self, plugin):
+        pages = _walk(plugin, page_size=5)
+
+        assert [len(page["items"]) for page in pages] == [5] * 5
+        assert pages[-1]["next_cursor"] is None
+
+    def test_page_size_above_total_returns_single_page(self, plugin):
+        pages = _walk(plugin, page_size=100)
+
+        assert len(pages) == 1
+        assert len(pages[0]["items"]) == 25
+
+
+class TestInvalidCursor:
+    """Test rejection of malformed or mismatched cursors."""
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!!"])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "created_at", "DESC")
+
+    def test_cursor_for_another_sort_is_rejected(self):
+        cursor = encode_cursor("created_at", "desc", {"created_at": datetime(2025, 1, 1), "task_id": "T1"}, "task_id")
+
+        assert decode_cursor(cursor, "created_at", "desc") == ("2025-01-01 00:00:00", "T1")
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "created_at", "asc")
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "row_index", "desc")
+
+    def test_cursor_without_key_is_rejected(self):
+        cursor = encode_cursor("created_at", "desc", {"created_at": "2025-01-01 00:00:00"}, "task_id")
+
+        with pytest.raises(InvalidCursorError):
+            keyset_clause("created_at", "desc", "task_id", cursor)
+
+    def test_backend_query_rejects_invalid_cursor(self, plugin):
+        with pytest.raises(InvalidCursorError):
+            asyncio.run(plugin.query("translation_tasks", {"session_id": "s1"}, cursor="garbage"))
@@ -0,0 +1,200 @@
+"""Unit tests for the embedded SQLite storage backend."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+import pytest
+
+from services.cleanup_service import CleanupService
+from storage.registry import StorageBackendRegistry
+from storage.sqlite_plugin import SQLitePlugin
+
+
+def _session(session_id: str, status: str = "processing", **overrides) -> Dict:
+    return {
+        "session_id": session_id,
+        "filename": f"{session_id}.xlsx",
+        "file_path": f"/data/{session_id}.xlsx",
+        "status": status,
+        "game_info": {"game_name": "Demo"},
+        "llm_provider": "qwen-plus",
+        "metadata": {"sheets": 2},
+        "total_tasks": 2,
+        **overrides
+    }
+
+
+def _task(task_id: str, session_id: str, status: str = "pending", **overrides) -> Dict:
+    return {
+        "task_id": task_id,
+        "session_id": session_id,
+        "batch_id": "B1",
+        "sheet_name": "UI",
+        "row_index": int(task_id.lstrip("T")),
+        "column_name": "PT",
+        "source_text": "开始游戏",
+        "status": status,
+        **overrides
+    }
+
+
+@pytest.fixture
+def plugin():
+    plugin = SQLitePlugin(":memory:")
+    asyncio.run(plugin.initialize())
+    yield plugin
+    asyncio.run(plugin.close())
+
+
+@pytest.fixture
+def utc_plus_8(monkeypatch):
+    """Run with a local time zone ahead of UTC (CURRENT_TIMESTAMP stays UTC)."""
+    monkeypatch.setenv("TZ", "Asia/Shanghai")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def _set_created_at(plugin: SQLitePlugin, session_id: str, created_at: datetime):
+    with plugin.conn:
+        plugin.conn.execute(
+            "UPDATE translation_sessions SET created_at = ? WHERE session_id = ?",
+            (created_at.strftime("%Y-%m-%d %H:%M:%S"), session_id)
+        )
+
+
+class TestSQLitePluginCrud:
+    """Test write/read/query/delete and upsert semantics."""
+
+    def test_write_and_read_round_trip(self, plugin):
+        async def run():
+            assert await plugin.write("translation_sessions", [_session("s1")]) == 1
+            await plugin.write("translation_tasks", [_task("T1", "s1"), _task("T2", "s1")])
+            return (await plugin.read("translation_sessions", "s1"),
+                    await plugin.read("translation_tasks", "T2"),
+                    await plugin.read("translation_tasks", "missing"))
+
+        session, task, missing = asyncio.run(run())
+
+        assert session["game_info"] == {"game_name": "Demo"}
+        assert session["metadata"] == {"sheets": 2}
+        assert task["row_index"] == 2
+        assert task["status"] == "pending"
+        assert missing is None
+
+    def test_upsert_updates_state_and_keeps_counters_monotonic(self, plugin):
+        async def run():
+            await plugin.write("translation_sessions", [_session("s1", completed_tasks=5)])
+            await plugin.write("translation_sessions", [_session("s1", status="completed", completed_tasks=3)])
+            await plugin.write("translation_tasks", [_task("T1", "s1", retry_count=2)])
+            await plugin.write("translation_tasks", [_task("T1", "s1", status="completed",
+                                                           target_text="Iniciar", retry_count=1)])
+            return (await plugin.read("translation_sessions", "s1"),
+                    await plugin.read("translation_tasks", "T1"))
+
+        session, task = asyncio.run(run())
+
+        assert session["status"] == "completed"
+        assert session["completed_tasks"] == 5
+        assert task["status"] == "completed"
+        assert task["target_text"] == "Iniciar"
+        assert task["retry_count"] == 2
+
+    def test_query_filters_and_paginates(self, plugin):
+        async def run():
+            await plugin.write("translation_sessions", [_session("s1")])
+            await plugin.write("translation_tasks", [
+                _task(f"T{i}", "s1", status="completed" if i % 2 else "pending") for i in range(1, 8)
+            ])
+            return await plugin.query("translation_tasks", {"session_id": "s1", "status": "completed"},
+                                      page_size=2, sort_by="row_index", order="asc")
+
+        result = asyncio.run(run())
+
+        assert result["total"] == 4
+        assert [task["task_id"] for task in result["items"]] == ["T1", "T3"]
+        assert result["next_cursor"] is not None
+
+    def test_delete_session_cascades_to_tasks(self, plugin):
+        async def run():
+            await plugin.write("translation_sessions", [_session("s1")])
+            await plugin.write("translation_tasks", [_task("T1", "s1")])
+            deleted = await plugin.delete("translation_sessions", "s1")
+            missing = await plugin.delete("translation_sessions", "s1")
+            return deleted, missing, await plugin.read("translation_tasks", "T1")
+
+        deleted, missing, task = asyncio.run(run())
+
+        assert deleted is True
+        assert missing is False
+        assert task is None
+
+    def test_unknown_collection_and_task_delete_are_rejected(self, plugin):
+        with pytest.raises(ValueError):
+            asyncio.run(plugin.write("unknown", [{"id": 1}]))
+        with pytest.raises(NotImplementedError):
+            asyncio.run(plugin.delete("translation_tasks", "T1"))
+
+
+class TestSQLitePluginCleanup:
+    """Test date filters and cleanup cutoffs against UTC CURRENT_TIMESTAMP."""
+
+    @pytest.fixture
+    def registered(self, plugin, monkeypatch):
+        monkeypatch.setattr(StorageBackendRegistry, "_backends", {})
+        monkeypatch.setattr(StorageBackendRegistry, "_routing_rules", {})
+        StorageBackendRegistry.register("sqlite", plugin)
+        StorageBackendRegistry.register_collection("translation_sessions", "sqlite")
+        StorageBackendRegistry.register_collection("translation_tasks", "sqlite")
+        return plugin
+
+    def test_local_date_filter_is_compared_in_utc(self, plugin, utc_plus_8):
+        asyncio.run(plugin.write("translation_sessions", [_session("s1")]))  # created_at = UTC now
+
+        hour_ago = datetime.now() - timedelta(hours=1)  # Naive local time, 8h ahead of UTC
+        before = asyncio.run(plugin.query("translation_sessions", {"to_date": hour_ago}))
+        after = asyncio.run(plugin.query("translation_sessions", {"from_date": hour_ago}))
+
+        assert before["total"] == 0
+        assert after["total"] == 1
+
+    def test_cleanup_removes_only_sessions_past_the_cutoff(self, registered, utc_plus_8):
+        plugin = registered
+        now = datetime.now(timezone.utc)
+
+        async def run():
+            await plugin.write("translation_sessions", [
+                _session("old-completed", status="completed"),
+                _session("recent-completed", status="completed"),
+                _session("old-failed", status="failed"),
+                _session("recent-failed", status="failed"),
+                _session("old-processing", status="processing")
+            ])
+            await plugin.write("translation_tasks", [
+                _task("T1", "old-completed"), _task("T2", "old-completed"), _task("T3", "recent-completed")
+            ])
+            _set_created_at(plugin, "old-completed", now - timedelta(days=91))
+            # Two hours inside the window: deleted if the cutoff were local time (UTC+8)
+            _set_created_at(plugin, "recent-completed", now - timedelta(days=90) + timedelta(hours=2))
+            _set_created_at(plugin, "old-failed", now - timedelta(days=31))
+            _set_created_at(plugin, "recent-failed", now - timedelta(days=29))
+            _set_created_at(plugin, "old-processing", now - timedelta(days=365))
+
+            service = CleanupService()
+            dry_run = await service.cleanup(completed_days=90, failed_days=30, dry_run=True)
+            result = await service.cleanup(completed_days=90, failed_days=30)
+            remaining = await plugin.query("translation_sessions", {}, page_size=10)
+            return dry_run, result, remaining
+
+        dry_run, result, remaining = asyncio.run(run())
+
+        assert (dry_run["deleted_sessions"], dry_run["deleted_tasks"], dry_run["dry_run"]) == (2, 2, True)
+        assert (result["deleted_sessions"], result["deleted_tasks"]) == (2, 2)
+        assert sorted(item["session_id"] for item in remaining["items"]) == [
+            "old-processing", "recent-completed", "recent-failed"
+        ]
+        assert asyncio.run(plugin.read("translation_tasks", "T1")) is None
+        assert asyncio.run(plugin.read("translation_tasks", "T3")) is not None
@@ -0,0 +1,236 @@
+"""Unit tests for the WAL spool and BufferManager recovery."""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from services.buffer_manager import BufferManager
+from services.wal_spool import WALSpool
+from storage.backend import StorageBackend
+from storage.registry import StorageBackendRegistry
+
+
+class RecordingBackend(StorageBackend):
+    """In-memory backend recording every write."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.writes: List[tuple] = []
+
+    async def write(self, collection: str, data: List[Dict]) -> int:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.writes.append((collection, list(data)))
+        return len(data)
+
+    async def read(self, collection: str, key: str) -> Optional[Dict]:
+        return None
+
+    async def query(self, collection: str, filters: Dict, **kwargs) -> Dict:
+        return {"total": 0, "items": [], "next_cursor": None}
+
+    async def delete(self, collection: str, key: str) -> bool:
+        return False
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def initialize(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def written(self, collection: str) -> List[Dict]:
+        return [record for name, data in self.writes if name == collection for record in data]
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(StorageBackendRegistry, "_backends", {})
+    monkeypatch.setattr(StorageBackendRegistry, "_routing_rules", {})
+    backend = RecordingBackend()
+    StorageBackendRegistry.register("memory", backend)
+    StorageBackendRegistry.register_collection("translation_sessions", "memory")
+    StorageBackendRegistry.register_collection("translation_tasks", "memory")
+    return backend
+
+
+def _tasks(start: int, count: int) -> List[Dict]:
+    return [{"task_id": f"T{i}", "session_id": "s1", "status": "completed"} for i in range(start, start + count)]
+
+
+class TestWALSpool:
+    """Test append, apply and crash recovery of the spool."""
+
+    def test_recovers_unapplied_batches_after_crash(self, tmp_path):
+        # One batch per segment, so the applied batch's segment is released
+        spool = WALSpool(str(tmp_path), segment_bytes=1, fsync=False)
+        first = spool.append("translation_tasks", _tasks(0, 2))
+        second = spool.append("translation_tasks", _tasks(2, 2))
+        spool.mark_applied([first])
+        # Crash: the process dies without close()
+
+        restarted = WALSpool(str(tmp_path), fsync=False)
+        recovered = restarted.recover()
+
+        assert [(seq, collection) for seq, collection, _ in recovered] == [(second, "translation_tasks")]
+        assert [task["task_id"] for task in recovered[0][2]] == ["T2", "T3"]
+        # New appends continue after the recovered sequence numbers
+        assert restarted.append("translation_tasks", _tasks(4, 1)) > second
+
+    def test_replays_applied_batches_of_a_live_segment(self, tmp_path):
+        # Applied marks are not persisted; replay is safe because writes are upserts
+        spool = WALSpool(str(tmp_path), fsync=False)
+        first = spool.append("translation_tasks", _tasks(0, 1))
+        second = spool.append("translation_tasks", _tasks(1, 1))
+        spool.mark_applied([first])
+
+        recovered = WALSpool(str(tmp_path), fsync=False).recover()
+
+        assert [seq for seq, _, _ in recovered] == [first, second]
+
+    def test_skips_torn_last_record(self, tmp_path):
+        spool = WALSpool(str(tmp_path), fsync=False)
+        spool.append("translation_tasks", _tasks(0, 1))
+        spool.append("translation_tasks", _tasks(1, 1))
+        spool.close()
+
+        # Crash mid-append: the last record lost its tail and newline
+        segment = sorted(tmp_path.glob("spool_*.wal"))[-1]
+        content = segment.read_bytes()
+        segment.write_bytes(content[:-10])
+
+        restarted = WALSpool(str(tmp_path), fsync=False)
+        recovered = restarted.recover()
+
+        assert len(recovered) == 1
+        assert recovered[0][2][0]["task_id"] == "T0"
+        assert restarted.corrupt_records == 1
+
+    def test_skips_record_with_bad_checksum(self, tmp_path):
+        spool = WALSpool(str(tmp_path), fsync=False)
+        spool.append("translation_tasks", _tasks(0, 1))
+        spool.append("translation_tasks", _tasks(1, 1))
+        spool.close()
+
+        segment = sorted(tmp_path.glob("spool_*.wal"))[-1]
+        lines = segment.read_bytes().splitlines(keepends=True)
+        segment.write_bytes(lines[0].replace(b'"T0"', b'"TX"') + lines[1])
+
+        recovered = WALSpool(str(tmp_path), fsync=False).recover()
+
+        assert [batch[2][0]["task_id"] for batch in recovered] == ["T1"]
+
+    def test_fully_applied_segments_are_removed(self, tmp_path):
+        spool = WALSpool(str(tmp_path), segment_bytes=1, fsync=False)
+        seqs = [spool.append("translation_tasks", _tasks(i, 1)) for i in range(3)]
+        assert spool.get_stats()["segments"] == 3
+
+        spool.mark_applied(seqs)
+
+        assert list(tmp_path.glob("spool_*.wal")) == []
+        assert WALSpool(str(tmp_path), fsync=False).recover() == []
+
+    def test_read_returns_requested_batches(self, tmp_path):
+        spool = WALSpool(str(tmp_path), segment_bytes=1, fsync=False)
+        seqs = [spool.append("translation_tasks", _tasks(i, 1)) for i in range(4)]
+
+        found = spool.read([seqs[2], seqs[0]])
+
+        assert [seq for seq, _, _ in found] == [seqs[0], seqs[2]]
+        assert found[1][2][0]["task_id"] == "T2"
+
+
+class TestBufferManagerRecovery:
+    """Test restoring buffered writes from the spool."""
+
+    def test_recover_restores_buffers_and_flushes(self, tmp_path, backend):
+        spool = WALSpool(str(tmp_path), fsync=False)
+        spool.append("translation_sessions", [{"session_id": "s1", "filename": "game.xlsx"}])
+        spool.append("translation_tasks", _tasks(0, 3))
+        spool.append("unknown_collection", [{"id": 1}])
+        # Crash before the flush
+
+        manager = BufferManager(max_buffer_size=100, flush_interval=60,
+                                spool=WALSpool(str(tmp_path), fsync=False))
+
+        async def run():
+            recovered = await manager.recover()
+            assert recovered == 4
+            assert len(manager.session_buffer) == 1
+            assert len(manager.task_buffer) == 3
+            return await manager.flush()
+
+        result = asyncio.run(run())
+
+        assert result["sessions"] == 1
+        assert result["tasks"] == 3
+        assert backend.writes[0][0] == "translation_sessions"
+        assert sorted(task["task_id"] for task in backend.written("translation_tasks")) == ["T0", "T1", "T2"]
+        assert list(tmp_path.glob("spool_*.wal")) == []
+
+    def test_failed_flush_keeps_records_spooled(self, tmp_path, backend, monkeypatch):
+        backend.failures = 100
+        manager = BufferManager(max_buffer_size=100, flush_interval=60,
+                                spool=WALSpool(str(tmp_path), fsync=False))
+        monkeypatch.setattr(manager, "max_retries", 0)
+
+        async def run():
+            await manager.add_tasks(_tasks(0, 2))
+            with pytest.raises(RuntimeError):
+                await manager.flush()
+
+        asyncio.run(run())
+
+        assert len(manager.task_buffer) == 2
+        recovered = WALSpool(str(tmp_path), fsync=False).recover()
+        assert [task["task_id"] for _, _, data in recovered for task in data] == ["T0", "T1"]
+
+
+class TestBufferManagerCap:
+    """Test that the in-memory buffers stay bounded."""
+
+    def test_batches_over_the_cap_spill_and_reload_in_order(self, tmp_path, backend, monkeypatch):
+        manager = BufferManager(max_buffer_size=1000, flush_interval=60, max_buffered_records=10,
+                                spool=WALSpool(str(tmp_path), fsync=False))
+        monkeypatch.setattr(manager, "max_concurrent_flushes", 1)  # One write per flush keeps global order
+
+        async def run():
+            for start in range(0, 40, 4):
+                await manager.add_tasks(_tasks(start, 4))
+                assert manager.buffered_records <= 10
+
+            stats = manager.get_stats()
+            assert stats["spilled_batches"] == 8
+            assert stats["total_spilled_records"] == 32
+
+            while manager.buffered_records or manager.get_stats()["spilled_batches"]:
+                await manager.flush()
+                assert manager.buffered_records <= 10
+
+        asyncio.run(run())
+
+        assert [task["task_id"] for task in backend.written("translation_tasks")] == [f"T{i}" for i in range(40)]
+        assert manager.get_stats()["total_reloaded_records"] == 32
+        assert list(tmp_path.glob("spool_*.wal")) == []
+
+    def test_recovery_respects_the_cap(self, tmp_path, backend):
+        spool = WALSpool(str(tmp_path), fsync=False)
+        for start in range(0, 20, 5):
+            spool.append("translation_tasks", _tasks(start, 5))
+
+        manager = BufferManager(max_buffer_size=1000, flush_interval=60, max_buffered_records=5,
+                                spool=WALSpool(str(tmp_path), fsync=False))
+
+        async def run():
+            assert await manager.recover() == 20
+            assert manager.buffered_records == 5
+            for _ in range(4):
+                await manager.flush()
+
+        asyncio.run(run())
+
+        assert len(backend.written("translation_tasks")) == 20